@@ -0,0 +1 @@
+"""Performance benchmarks for the voice pipeline (run with python -m benchmarks.<name>)."""
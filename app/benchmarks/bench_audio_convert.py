@@ -0,0 +1,69 @@
+"""
+Benchmark the realtime factor of PCM conversion per CPU core.
+
+Each case converts a stream of 16-bit audio chunk by chunk with a
+Resampler, as the voice pipelines do: TTS output (24kHz) to the room
+(48kHz), room audio (48kHz, mono or stereo) to STT (16kHz), and the
+one-shot resample() used for single-buffer transcription. The realtime
+factor is CPU time over audio time; its inverse is how many streams one
+core can convert concurrently.
+
+Usage:
+    python -m benchmarks.bench_audio_convert [--seconds 30] [--chunk-ms 20]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.utils.audio import Resampler, resample
+
+CASES = [
+    # name, from_rate, to_rate, channels
+    ("tts -> room", 24000, 48000, 1),
+    ("room -> stt", 48000, 16000, 1),
+    ("room stereo -> stt", 48000, 16000, 2),
+    ("cd -> room", 44100, 48000, 1),
+]
+
+
+def noise(sample_rate: int, seconds: float, channels: int) -> bytes:
+    rng = np.random.default_rng(7)
+    return rng.integers(-8000, 8000, int(sample_rate * seconds) * channels, np.int16).tobytes()
+
+
+def streaming_rtf(
+    from_rate: int, to_rate: int, channels: int, seconds: float, chunk_ms: int
+) -> float:
+    audio = noise(from_rate, seconds, channels)
+    chunk = from_rate * chunk_ms // 1000 * channels * 2
+    resampler = Resampler(from_rate, to_rate, channels)
+    start = time.process_time()
+    for offset in range(0, len(audio), chunk):
+        resampler.process(audio[offset : offset + chunk])
+    return (time.process_time() - start) / seconds
+
+
+def one_shot_rtf(from_rate: int, to_rate: int, channels: int, seconds: float) -> float:
+    audio = noise(from_rate, seconds, channels)
+    start = time.process_time()
+    resample(audio, from_rate, to_rate, channels)
+    return (time.process_time() - start) / seconds
+
+
+def main(seconds: float, chunk_ms: int) -> None:
+    print(f"{seconds}s of audio per case, {chunk_ms}ms chunks when streaming\n")
+    for name, from_rate, to_rate, channels in CASES:
+        rtf = streaming_rtf(from_rate, to_rate, channels, seconds, chunk_ms)
+        print(f"{name:<20} streaming rtf={rtf:.5f} streams/core={1 / rtf:7.0f}")
+    rtf = one_shot_rtf(48000, 16000, 1, seconds)
+    print(f"{'room -> stt':<20} one-shot  rtf={rtf:.5f} streams/core={1 / rtf:7.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--seconds", type=float, default=30)
+    parser.add_argument("--chunk-ms", type=int, default=20)
+    args = parser.parse_args()
+    main(args.seconds, args.chunk_ms)
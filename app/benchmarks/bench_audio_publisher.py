@@ -0,0 +1,86 @@
+"""
+Benchmark publishing TTS audio to a real rtc.AudioSource through AudioPublisher.
+
+A fake provider streams irregular 40-250ms chunks of 24kHz audio faster
+than real time (as ElevenLabs does); AudioPublisher repacketizes them into
+20ms frames and feeds a local AudioSource, which plays out at real time.
+For several queue sizes this reports the first-byte-to-first-published-
+frame latency, the enqueue-to-capture delay, and how far the TTS stream
+was read ahead of playout.
+
+Usage:
+    python -m benchmarks.bench_audio_publisher [--seconds 3] [--runs 3]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import time
+
+from livekit import rtc
+
+from benchmarks.common import quiet_logging
+from src.voice.audio_publisher import AudioPublisher
+
+SAMPLE_RATE = 24000
+
+
+def make_chunks(seconds: float, seed: int = 7) -> list[bytes]:
+    """Irregular 40-250ms chunks totalling `seconds` of audio."""
+    rng = random.Random(seed)
+    remaining = int(seconds * SAMPLE_RATE)
+    chunks = []
+    while remaining:
+        samples = min(remaining, rng.randint(SAMPLE_RATE // 25, SAMPLE_RATE // 4))
+        chunks.append(os.urandom(samples * 2))
+        remaining -= samples
+    return chunks
+
+
+async def tts_stream(chunks: list[bytes], read_ahead: list[float], start: float):
+    """Yield chunks at 5x real time, recording audio read ahead of the wall clock."""
+    produced_ms = 0.0
+    for chunk in chunks:
+        await asyncio.sleep(len(chunk) / 2 / SAMPLE_RATE / 5)
+        produced_ms += len(chunk) / 2 / SAMPLE_RATE * 1000
+        read_ahead.append(produced_ms - (time.perf_counter() - start) * 1000)
+        yield chunk
+
+
+async def run(chunks: list[bytes], queue_frames: int, runs: int) -> None:
+    source = rtc.AudioSource(SAMPLE_RATE, 1, queue_size_ms=100)
+    publisher = AudioPublisher(source=source, frame_ms=20, queue_frames=queue_frames)
+    read_ahead: list[float] = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await publisher.publish(tts_stream(chunks, read_ahead, start), sample_rate=SAMPLE_RATE)
+        await source.wait_for_playout()
+    await source.aclose()
+
+    metrics = publisher.metrics
+    print(
+        f"queue={queue_frames:<3} "
+        f"first_byte_to_publish p50={metrics.first_byte_to_publish_sketch.percentile(50):5.1f}ms "
+        f"enqueue_to_capture p50={metrics.enqueue_to_capture_sketch.percentile(50):6.1f}ms "
+        f"p99={metrics.enqueue_to_capture_sketch.percentile(99):6.1f}ms "
+        f"max_read_ahead={max(read_ahead):6.0f}ms "
+        f"frames={metrics.frames_published}"
+    )
+
+
+async def main(seconds: float, runs: int) -> None:
+    chunks = make_chunks(seconds)
+    print(f"{seconds}s of {SAMPLE_RATE}Hz audio in {len(chunks)} chunks, {runs} runs each\n")
+    for queue_frames in (2, 5, 25):
+        await run(chunks, queue_frames, runs)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--seconds", type=float, default=3)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+    quiet_logging(level=logging.ERROR)
+    asyncio.run(main(args.seconds, args.runs))
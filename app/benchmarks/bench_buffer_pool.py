@@ -0,0 +1,159 @@
+"""
+Soak benchmark: RSS growth and GC pauses with and without the buffer pool.
+
+Simulates a long session as back-to-back utterances: each is synthesized
+sentence by sentence (cache disabled, so segment audio is transient) by
+a fake provider streaming irregular 24kHz chunks, then published through
+an AudioPublisher (resampled to 48kHz, 20ms frames) to a source that
+accepts frames immediately. Each mode runs in a fresh interpreter so RSS
+is comparable; RSS growth is measured after a warm-up.
+
+Usage:
+    python -m benchmarks.bench_buffer_pool [--utterances 2000] [--warmup 100]
+"""
+
+import argparse
+import asyncio
+import gc
+import logging
+import os
+import random
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from livekit import rtc
+
+from benchmarks.common import quiet_logging
+
+os.environ.setdefault("ELEVENLABS_API_KEY", "benchmark")
+
+from src.utils.buffer_pool import BufferPool  # noqa: E402
+from src.voice.audio_publisher import AudioPublisher  # noqa: E402
+from src.voice.config import ElevenLabsConfig  # noqa: E402
+from src.voice.resilience import CircuitBreaker  # noqa: E402
+from src.voice.tts_pipeline import TTSConfig, TTSPipeline  # noqa: E402
+
+SAMPLE_RATE = 24000
+TEXT = (
+    "Thanks for waiting, I found your booking. "
+    "Your flight leaves at nine in the morning from gate twelve. "
+    "Would you like me to add a checked bag?"
+)
+
+
+class FakeProvider:
+    """Provider stand-in streaming ~1s of audio per sentence in irregular chunks."""
+
+    def __init__(self) -> None:
+        self.rng = random.Random(7)
+        self.noise = os.urandom(SAMPLE_RATE * 2)
+
+    async def synthesize(self, text: str):
+        remaining = SAMPLE_RATE
+        while remaining:
+            samples = min(remaining, self.rng.randint(SAMPLE_RATE // 25, SAMPLE_RATE // 4))
+            data = bytearray(self.noise[: samples * 2])
+            yield SimpleNamespace(frame=rtc.AudioFrame(data, SAMPLE_RATE, 1, samples))
+            remaining -= samples
+        await asyncio.sleep(0)
+
+
+class InstantSource:
+    """AudioSource stand-in that consumes frames immediately."""
+
+    sample_rate = 48000
+    num_channels = 1
+
+    async def capture_frame(self, frame: rtc.AudioFrame) -> None:
+        pass
+
+
+def rss_bytes() -> int:
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+async def soak(pooled: bool, utterances: int, warmup: int) -> None:
+    pool = BufferPool() if pooled else None
+    # The fake replaces the provider client, so the plugin is never constructed
+    with patch("src.voice.tts_pipeline.elevenlabs.TTS"):
+        pipeline = TTSPipeline(
+            config=TTSConfig(
+                elevenlabs_config=ElevenLabsConfig(),
+                cache_enabled=False,
+                buffer_pool_enabled=pooled,
+            ),
+            buffer_pool=pool,
+        )
+    pipeline._tts = FakeProvider()
+    pipeline.resilience.hedge = False
+    pipeline.resilience.breaker = CircuitBreaker(provider="benchmark")
+    publisher = AudioPublisher(source=InstantSource(), pool=pool)
+
+    pauses: list[float] = []
+    started: list[float] = []
+
+    def on_gc(phase: str, info: dict) -> None:
+        if phase == "start":
+            started.append(time.perf_counter())
+        elif started:
+            pauses.append((time.perf_counter() - started.pop()) * 1000)
+
+    for _ in range(warmup):
+        await publisher.publish(pipeline.synthesize_segmented(TEXT), sample_rate=SAMPLE_RATE)
+    rss_start = rss_bytes()
+    gc.callbacks.append(on_gc)
+    start = time.perf_counter()
+    for _ in range(utterances):
+        await publisher.publish(pipeline.synthesize_segmented(TEXT), sample_rate=SAMPLE_RATE)
+    elapsed = time.perf_counter() - start
+    gc.callbacks.remove(on_gc)
+
+    line = (
+        f"{'pooled' if pooled else 'unpooled':<9} "
+        f"rss_growth={(rss_bytes() - rss_start) / 1e6:6.2f}MB "
+        f"gc_pauses={len(pauses):5d} gc_total={sum(pauses):7.1f}ms "
+        f"gc_max={max(pauses, default=0):5.2f}ms "
+        f"wall={elapsed:5.1f}s"
+    )
+    if pool is not None:
+        line += (
+            f" hit_rate={pool.metrics.hit_rate:.4f}"
+            f" peak_outstanding={pool.metrics.peak_outstanding}"
+        )
+    print(line, flush=True)
+
+
+def main(utterances: int, warmup: int) -> None:
+    print(f"{utterances} utterances (~{utterances * 3 / 60:.0f} min of audio) after {warmup}\n")
+    for mode in ("unpooled", "pooled"):
+        subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.bench_buffer_pool",
+                "--mode",
+                mode,
+                "--utterances",
+                str(utterances),
+                "--warmup",
+                str(warmup),
+            ],
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--utterances", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--mode", choices=("pooled", "unpooled"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    quiet_logging(level=logging.ERROR)
+    if args.mode is None:
+        main(args.utterances, args.warmup)
+    else:
+        asyncio.run(soak(args.mode == "pooled", args.utterances, args.warmup))
@@ -0,0 +1,103 @@
+"""
+Turn-end latency and false cuts: fixed vs adaptive endpointing.
+
+Simulates two speakers in 20ms frames: a fast one pausing 80-250ms
+within a turn and a hesitant one pausing 200-700ms, often after a
+filler or conjunction. Most turns end with terminal punctuation, and
+turns are 2-3s apart. The fixed threshold is the old 300ms; the
+adaptive controller learns each speaker's pauses and reads transcript
+cues. Latency is the silence from the end of a turn's speech to the
+decision; a false cut is a turn ended while the speaker was pausing.
+Time is simulated, so the run takes well under a second.
+
+Usage:
+    python -m benchmarks.bench_endpointing [--turns 200]
+"""
+
+import argparse
+import logging
+import random
+
+from benchmarks.common import quiet_logging
+from src.voice.endpointing import EndpointingController
+
+FRAME_S = 0.02
+WORDS = "could you move my booking to friday afternoon instead of the morning".split()
+SPEAKERS = {
+    "fast": {"pause_ms": (80, 250), "hold_share": 0.2},
+    "hesitant": {"pause_ms": (200, 700), "hold_share": 0.6},
+}
+
+
+def fixed_controller() -> EndpointingController:
+    """The previous behaviour: one 300ms pause for everyone, no cues."""
+    return EndpointingController(min_pauses=10**9, hold_factor=1.0, commit_factor=1.0)
+
+
+def run(controller: EndpointingController, speaker: dict, turns: int, seed: int) -> list:
+    """Play ``turns`` turns; return the turn-end latencies (ms)."""
+    rng = random.Random(seed)
+    now = 0.0
+    latencies = []
+
+    def speak(seconds: float) -> None:
+        nonlocal now
+        end = now + seconds
+        while now < end:
+            controller.on_speech(now)
+            now += FRAME_S
+
+    def silence(seconds: float) -> float:
+        nonlocal now
+        started, end, decided = now, now + seconds, None
+        while now < end:
+            if controller.on_silence(now) and decided is None:
+                decided = now
+            now += FRAME_S
+        return (decided - started) * 1000 if decided is not None else 0.0
+
+    for _ in range(turns):
+        words = WORDS[: rng.randint(4, len(WORDS))]
+        pauses = set(rng.sample(range(1, len(words)), k=min(2, len(words) - 1)))
+        for count in range(1, len(words) + 1):
+            speak(rng.uniform(0.2, 0.4))
+            text = " ".join(words[:count])
+            if count in pauses:
+                if rng.random() < speaker["hold_share"]:
+                    text += " um"
+                controller.on_transcript(text)
+                silence(rng.uniform(*speaker["pause_ms"]) / 1000)
+        controller.on_transcript(text + ("." if rng.random() < 0.7 else ""))
+        latencies.append(silence(rng.uniform(2.0, 3.0)))
+    return latencies
+
+
+def percentile(values: list, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[round(q * (len(ordered) - 1))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--turns", type=int, default=200, help="Turns per speaker")
+    args = parser.parse_args()
+    quiet_logging(level=logging.ERROR)
+
+    print(f"{args.turns} turns per speaker, 20ms frames\n")
+    print(f"{'speaker':<10} {'mode':<9} {'mean':>7} {'p50':>7} {'p90':>7} {'false cuts':>11}")
+    for name, speaker in SPEAKERS.items():
+        for mode, controller in (
+            ("fixed", fixed_controller()),
+            ("adaptive", EndpointingController()),
+        ):
+            latencies = run(controller, speaker, args.turns, seed=7)
+            metrics = controller.metrics
+            print(
+                f"{name:<10} {mode:<9} {sum(latencies) / len(latencies):>5.0f}ms "
+                f"{percentile(latencies, 0.5):>5.0f}ms {percentile(latencies, 0.9):>5.0f}ms "
+                f"{metrics.false_cuts:>4} ({metrics.false_cut_rate:.0%})"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Downstream work per second of speech with and without interim coalescing.
+
+Replays a synthetic Deepgram interim stream: utterances of 4-20 words
+spoken at ~3 words/s, an interim every 60-120ms (about a third of them
+repeats), the last word revised 15% of the time, and a final per
+utterance. Each delivered result is "processed" by a consumer that
+touches every character it is given: the full text without coalescing,
+only the delta with it. Time is simulated, so the run is instant.
+
+Usage:
+    python -m benchmarks.bench_interim_coalescing [--utterances 500] [--interval-ms 150]
+"""
+
+import argparse
+import random
+
+from src.voice.interim_coalescer import InterimCoalescer
+from src.voice.stt_pipeline import TranscriptionResult
+
+VOCABULARY = "I want to book a flight to Denver next Tuesday morning please for two".split()
+
+
+class SimulatedClock:
+    """Monotonic clock advanced by the replay."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def transcript_events(rng: random.Random, utterances: int):
+    """Yield (time_s, text, is_final) for a synthetic session."""
+    now = 0.0
+    for _ in range(utterances):
+        words = [rng.choice(VOCABULARY) for _ in range(rng.randint(4, 20))]
+        spoken = 0.0
+        while spoken < len(words):
+            now += rng.uniform(0.06, 0.12)
+            spoken = min(len(words), spoken + rng.uniform(0.0, 0.6))
+            heard = words[: int(spoken)]
+            if heard and rng.random() < 0.15:
+                heard = heard[:-1] + [rng.choice(VOCABULARY)]
+            if heard:
+                yield now, " ".join(heard), False
+        now += 0.3
+        yield now, " ".join(words), True
+        now += rng.uniform(1.0, 3.0)
+
+
+def main(utterances: int, interval_ms: float) -> None:
+    speech_s = 0.0
+    received = delivered = full_chars = delta_chars = 0
+    clock = SimulatedClock()
+    coalescer = InterimCoalescer(min_interval_ms=interval_ms, clock=clock)
+    started = None
+
+    for at, text, is_final in transcript_events(random.Random(7), utterances):
+        clock.now = at
+        started = at if started is None else started
+        received += 1
+        full_chars += len(text)
+        # Deliver any held interim whose interval passed before this event
+        if coalescer.holding and coalescer.due_in() == 0:
+            result = coalescer.pop_due()
+            delivered += 1
+            delta_chars += len(result.delta)
+        result = coalescer.push(TranscriptionResult(text, is_final, 0.9, 0.0, 0.0, 0.0))
+        if result is not None:
+            delivered += 1
+            delta_chars += len(result.delta)
+        if is_final:
+            speech_s += at - started
+            started = None
+
+    stability = coalescer.metrics
+    print(f"{utterances} utterances, {speech_s / 60:.1f} min of speech\n")
+    print(f"{'':<14}{'results/s':>10}{'chars/s':>10}")
+    print(f"{'every event':<14}{received / speech_s:>10.1f}{full_chars / speech_s:>10.0f}")
+    print(f"{'coalesced':<14}{delivered / speech_s:>10.1f}{delta_chars / speech_s:>10.0f}")
+    print(
+        f"\nrevision_rate={stability.revision_rate:.3f} "
+        f"final_revision_rate={stability.final_revision_rate:.3f} "
+        f"final_stable_p50={stability.final_stable_sketch.quantile(0.5):.0f}ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--utterances", type=int, default=500)
+    parser.add_argument("--interval-ms", type=float, default=150.0)
+    args = parser.parse_args()
+    main(args.utterances, args.interval_ms)
@@ -0,0 +1,119 @@
+"""
+Benchmark OpenMetrics collection cost with many concurrent sessions.
+
+Measures render time per scrape and the event-loop lag observed while a
+background thread scrapes continuously, to confirm scraping does not
+stall the audio loop.
+
+Usage:
+    python -m benchmarks.bench_metrics_export [--sessions 200] [--scrapes 50]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import threading
+import time
+
+from benchmarks.common import p99, quiet_logging
+from src.voice.audio_quality import AudioQualityMetrics, LatencyTracker, PipelineLatency
+from src.voice.livekit_client import ConnectionMetrics
+from src.voice.metrics_exporter import MetricsRegistry, MetricsSource
+from src.voice.stt_pipeline import STTMetrics
+from src.voice.tts_pipeline import TTSMetrics
+
+
+def build_registry(sessions: int, turns: int) -> MetricsRegistry:
+    """Create a registry with `sessions` fully populated sources."""
+    rng = random.Random(0)
+    registry = MetricsRegistry()
+    for i in range(sessions):
+        stt, tts = STTMetrics(), TTSMetrics()
+        tracker, quality = LatencyTracker(), AudioQualityMetrics()
+        for _ in range(turns):
+            stt_ms = rng.lognormvariate(5.5, 0.4)
+            tts_ms = rng.lognormvariate(5.8, 0.4)
+            stt.total_transcriptions += 1
+            stt.latency_sketch.add(stt_ms)
+            tts.total_syntheses += 1
+            tts.latency_sketch.add(tts_ms)
+            tracker.record(
+                PipelineLatency(
+                    stt_latency_ms=stt_ms,
+                    processing_latency_ms=50.0,
+                    tts_latency_ms=tts_ms,
+                    total_latency_ms=stt_ms + tts_ms + 50.0,
+                )
+            )
+            quality.record_quality_score(rng.uniform(5, 10))
+        registry.register(
+            MetricsSource(
+                room=f"room-{i}",
+                stt_model="nova-2",
+                tts_model="eleven_turbo_v2",
+                stt_metrics=stt,
+                tts_metrics=tts,
+                connection_metrics=ConnectionMetrics(is_connected=True),
+                latency_tracker=tracker,
+                quality_metrics=quality,
+            )
+        )
+    return registry
+
+
+async def measure_loop_lag(duration_s: float, interval_s: float = 0.005) -> list[float]:
+    """Sample how late asyncio.sleep wakes up, in milliseconds."""
+    lags = []
+    deadline = time.perf_counter() + duration_s
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        await asyncio.sleep(interval_s)
+        lags.append((time.perf_counter() - start - interval_s) * 1000)
+    return lags
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--scrapes", type=int, default=50)
+    args = parser.parse_args()
+    quiet_logging()
+
+    registry = build_registry(args.sessions, args.turns)
+
+    render_ms = []
+    for _ in range(args.scrapes):
+        start = time.perf_counter()
+        body = registry.render()
+        render_ms.append((time.perf_counter() - start) * 1000)
+
+    baseline = asyncio.run(measure_loop_lag(1.0))
+
+    stop = threading.Event()
+
+    def scrape_forever() -> None:
+        while not stop.is_set():
+            registry.render()
+
+    scraper = threading.Thread(target=scrape_forever, daemon=True)
+    scraper.start()
+    contended = asyncio.run(measure_loop_lag(1.0))
+    stop.set()
+    scraper.join()
+
+    print(f"sessions={args.sessions} turns/session={args.turns} body={len(body)} bytes")
+    print(
+        f"render: mean={statistics.mean(render_ms):.2f}ms "
+        f"p99={p99(render_ms):.2f}ms "
+        f"per-session={statistics.mean(render_ms) / args.sessions * 1000:.1f}us"
+    )
+    print(
+        f"loop lag idle: p50={statistics.median(baseline):.3f}ms p99={p99(baseline):.3f}ms | "
+        f"while scraping: p50={statistics.median(contended):.3f}ms p99={p99(contended):.3f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Hit rate and end-to-end latency saved by speculative responses.
+
+Simulates turns as Deepgram delivers them: interim text grows every
+100-200ms while the user speaks, a fifth of turns pause mid-sentence
+for 400-800ms, and the final comes 300ms (endpointing) plus 150-350ms
+(finalization) after the last interim, revising the last word 15% of
+the time. The response stage takes 400-900ms. Time is compressed 10x
+so the run is quick; reported times are scaled back to real time.
+
+Usage:
+    python -m benchmarks.bench_speculation [--turns 100] [--stable-ms 250]
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+
+from benchmarks.common import quiet_logging
+from src.voice.speculation import SpeculativeResponder
+
+SCALE = 10  # simulated ms per real ms
+ENDPOINTING_MS = 300
+WORDS = "could you move my booking to Friday afternoon instead of the morning".split()
+
+
+async def sleep_ms(ms: float) -> None:
+    await asyncio.sleep(ms / SCALE / 1000)
+
+
+async def turn(rng: random.Random, responder: SpeculativeResponder, durations: list) -> float:
+    """Play one turn; return how long the response took after the final (simulated ms)."""
+    words = WORDS[: rng.randint(3, len(WORDS))]
+    pause_at = rng.randrange(1, len(words)) if rng.random() < 0.2 else None
+    for count in range(1, len(words) + 1):
+        responder.observe(" ".join(words[:count]))
+        if count == pause_at:
+            await sleep_ms(rng.uniform(400, 800))
+        elif count < len(words):
+            await sleep_ms(rng.uniform(100, 200))
+    await sleep_ms(ENDPOINTING_MS + rng.uniform(150, 350))
+
+    final = list(words)
+    if rng.random() < 0.15:
+        final[-1] = "please"
+    final_text = " ".join(final).capitalize() + "."
+    duration_ms = durations.pop()
+
+    started = time.perf_counter()
+    if await responder.resolve(final_text) is None:
+        await sleep_ms(duration_ms)
+    return (time.perf_counter() - started) * 1000 * SCALE
+
+
+async def main(turns: int, stable_ms: float) -> None:
+    rng = random.Random(7)
+    durations = [rng.uniform(400, 900) for _ in range(turns)]
+    baseline_ms = sum(durations) / turns
+
+    async def generate(text: str) -> str:
+        await sleep_ms(durations[-1])
+        return f"reply to {text}"
+
+    responder = SpeculativeResponder(generate, stable_ms=stable_ms / SCALE)
+    after_final = [await turn(rng, responder, durations) for _ in range(turns)]
+
+    metrics = responder.metrics
+    saved = metrics.latency_saved_sketch
+    print(f"{turns} turns, stage 400-900ms, stability window {stable_ms:.0f}ms\n")
+    print(
+        f"hit_rate={metrics.hit_rate:.2f} precision={metrics.precision:.2f} "
+        f"started={metrics.started} misses={metrics.misses} abandoned={metrics.abandoned}"
+    )
+    print(
+        f"saved per hit: p50={saved.quantile(0.5) * SCALE:.0f}ms "
+        f"p90={saved.quantile(0.9) * SCALE:.0f}ms"
+    )
+    mean_ms = sum(after_final) / turns
+    print(
+        f"final -> response ready: {baseline_ms:.0f}ms without, {mean_ms:.0f}ms with "
+        f"({baseline_ms - mean_ms:.0f}ms saved per turn on average)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--turns", type=int, default=100)
+    parser.add_argument("--stable-ms", type=float, default=250.0)
+    args = parser.parse_args()
+    quiet_logging(level=logging.ERROR)
+    asyncio.run(main(args.turns, args.stable_ms))
@@ -0,0 +1,82 @@
+"""
+Throughput of batch transcription against one-at-a-time calls.
+
+Transcribes a recorded meeting split into utterances (2-8s of 16kHz PCM)
+with a fake recognizer whose latency grows with audio length, as a
+hosted provider's does. Compares serial transcribe_audio calls with
+transcribe_many at several concurrency levels.
+
+Usage:
+    python -m benchmarks.bench_stt_batch [--items 200] [--concurrency 1 4 8 16]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from benchmarks.common import quiet_logging
+
+os.environ.setdefault("DEEPGRAM_API_KEY", "benchmark")
+
+from src.voice.config import DeepgramConfig  # noqa: E402
+from src.voice.resilience import CircuitBreaker  # noqa: E402
+from src.voice.stt_pipeline import STTConfig, STTPipeline  # noqa: E402
+
+SAMPLE_RATE = 16000
+
+
+class FakeRecognizer:
+    """Provider stand-in: 80ms round trip plus 10ms per second of audio."""
+
+    async def recognize(self, buffer: bytes, sample_rate: int) -> SimpleNamespace:
+        await asyncio.sleep(0.08 + len(buffer) / (2 * sample_rate) * 0.01)
+        return SimpleNamespace(text="ok")
+
+
+def make_pipeline() -> STTPipeline:
+    # The fake replaces the provider client, so the plugin is never constructed
+    with patch("src.voice.stt_pipeline.deepgram.STT"):
+        pipeline = STTPipeline(config=STTConfig(deepgram_config=DeepgramConfig()))
+    pipeline._stt = FakeRecognizer()
+    pipeline.resilience.hedge = False
+    pipeline.resilience.breaker = CircuitBreaker(provider="benchmark")
+    return pipeline
+
+
+async def main(items: int, levels: list[int]) -> None:
+    rng = random.Random(7)
+    buffers = [bytes(rng.randint(2, 8) * SAMPLE_RATE * 2) for _ in range(items)]
+    audio_s = sum(len(b) for b in buffers) / (2 * SAMPLE_RATE)
+    print(f"{items} utterances, {audio_s / 60:.1f} min of audio\n")
+
+    pipeline = make_pipeline()
+    start = time.perf_counter()
+    for audio in buffers:
+        await pipeline.transcribe_audio(audio)
+    serial = time.perf_counter() - start
+    print(f"{'serial':<16} wall={serial:6.2f}s  items/s={items / serial:7.1f}")
+
+    for level in levels:
+        pipeline = make_pipeline()
+        start = time.perf_counter()
+        results = await pipeline.transcribe_many(buffers, max_concurrency=level)
+        elapsed = time.perf_counter() - start
+        assert all(result.ok for result in results)
+        print(
+            f"{'concurrency=' + str(level):<16} wall={elapsed:6.2f}s  "
+            f"items/s={items / elapsed:7.1f}  speedup={serial / elapsed:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--items", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8, 16])
+    args = parser.parse_args()
+    quiet_logging(level=logging.ERROR)
+    asyncio.run(main(args.items, args.concurrency))
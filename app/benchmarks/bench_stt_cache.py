@@ -0,0 +1,100 @@
+"""
+Regression-run replay with and without the transcript cache.
+
+Replays a fixture set of utterances (2-8s of 16kHz PCM) several times
+through transcribe_many, as QA runs do, against a fake recognizer with
+80ms + 10ms/s latency. Also reports the cost of hashing the audio,
+which every lookup pays.
+
+Usage:
+    python -m benchmarks.bench_stt_cache [--fixtures 20] [--runs 10]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import tempfile
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from benchmarks.common import quiet_logging
+
+os.environ.setdefault("DEEPGRAM_API_KEY", "benchmark")
+
+from src.voice.config import DeepgramConfig  # noqa: E402
+from src.voice.resilience import CircuitBreaker  # noqa: E402
+from src.voice.stt_cache import transcript_key  # noqa: E402
+from src.voice.stt_pipeline import STTConfig, STTPipeline  # noqa: E402
+
+SAMPLE_RATE = 16000
+
+
+class FakeRecognizer:
+    """Provider stand-in: 80ms round trip plus 10ms per second of audio."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def recognize(self, buffer: bytes, sample_rate: int) -> SimpleNamespace:
+        self.calls += 1
+        await asyncio.sleep(0.08 + len(buffer) / (2 * sample_rate) * 0.01)
+        return SimpleNamespace(text="ok")
+
+
+def make_pipeline(**config_kwargs) -> STTPipeline:
+    # The fake replaces the provider client, so the plugin is never constructed
+    with patch("src.voice.stt_pipeline.deepgram.STT"):
+        pipeline = STTPipeline(config=STTConfig(deepgram_config=DeepgramConfig(), **config_kwargs))
+    pipeline._stt = FakeRecognizer()
+    pipeline.resilience.hedge = False
+    pipeline.resilience.breaker = CircuitBreaker(provider="benchmark")
+    return pipeline
+
+
+async def replay(label: str, pipeline: STTPipeline, fixtures: list[bytes], runs: int) -> None:
+    start = time.perf_counter()
+    for _ in range(runs):
+        await pipeline.transcribe_many(fixtures)
+    elapsed = time.perf_counter() - start
+    metrics = pipeline.metrics
+    print(
+        f"{label:<14} wall={elapsed:6.2f}s  provider_calls={pipeline._stt.calls:4d}  "
+        f"hit_rate={metrics.cache_hit_rate:.2f}"
+    )
+
+
+async def main(fixtures: int, runs: int) -> None:
+    rng = random.Random(7)
+    clips = [os.urandom(rng.randint(2, 8) * SAMPLE_RATE * 2) for _ in range(fixtures)]
+    print(f"{fixtures} fixtures x {runs} runs\n")
+
+    await replay("no cache", make_pipeline(), clips, runs)
+    await replay("memory cache", make_pipeline(cache_enabled=True), clips, runs)
+    with tempfile.TemporaryDirectory() as directory:
+        # A fresh process against a warm disk tier, e.g. the next CI run
+        for label in ("disk (cold)", "disk (warm)"):
+            pipeline = make_pipeline(cache_enabled=True, cache_dir=directory)
+            await replay(label, pipeline, clips, 1)
+
+    audio = clips[0]
+    start = time.perf_counter()
+    for _ in range(200):
+        transcript_key(audio, SAMPLE_RATE, 1, "nova-2", "en-US", True, True)
+    per_key_ms = (time.perf_counter() - start) / 200 * 1000
+    audio_s = len(audio) / (2 * SAMPLE_RATE)
+    print(
+        f"\nkey: {per_key_ms:.3f}ms for {audio_s:.0f}s of audio "
+        f"({per_key_ms / audio_s * 60:.3f}ms per minute)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--fixtures", type=int, default=20)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+    quiet_logging(level=logging.ERROR)
+    asyncio.run(main(args.fixtures, args.runs))
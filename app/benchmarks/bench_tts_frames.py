@@ -0,0 +1,161 @@
+"""
+Benchmark allocation and throughput of collecting and streaming TTS audio.
+
+A fake provider replays a minute of 24kHz 16-bit mono audio as
+rtc.AudioFrames of irregular size (as ElevenLabs chunks arrive). The
+frames are created up front, so only the pipeline's own copies are
+measured. Compared:
+
+- legacy collect: frame.data.tobytes() per chunk into a list, then b"".join
+- collector: frame views copied once into a preallocated PCMCollector
+- synthesize: the pipeline's collection path (PCMCollector)
+- synthesize_stream: one bytes copy per chunk
+- synthesize_frames: zero-copy views
+
+Usage:
+    python -m benchmarks.bench_tts_frames [--seconds 60] [--runs 5]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import statistics
+import time
+import tracemalloc
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from livekit import rtc
+
+from benchmarks.common import quiet_logging
+
+os.environ.setdefault("ELEVENLABS_API_KEY", "benchmark")
+
+from src.voice.audio_buffers import PCMCollector, estimate_pcm_bytes, frame_bytes  # noqa: E402
+from src.voice.config import ElevenLabsConfig  # noqa: E402
+from src.voice.resilience import CircuitBreaker  # noqa: E402
+from src.voice.tts_pipeline import TTSConfig, TTSPipeline  # noqa: E402
+
+SAMPLE_RATE = 24000
+
+
+def make_frames(seconds: int, seed: int = 7) -> list[rtc.AudioFrame]:
+    """Irregular 40-250ms frames totalling `seconds` of audio."""
+    rng = random.Random(seed)
+    remaining = seconds * SAMPLE_RATE
+    frames = []
+    while remaining:
+        samples = min(remaining, rng.randint(SAMPLE_RATE // 25, SAMPLE_RATE // 4))
+        frames.append(rtc.AudioFrame(os.urandom(samples * 2), SAMPLE_RATE, 1, samples))
+        remaining -= samples
+    return frames
+
+
+class FakeProvider:
+    """Provider stand-in replaying pre-built frames."""
+
+    def __init__(self, frames: list[rtc.AudioFrame]) -> None:
+        self.frames = frames
+
+    async def synthesize(self, text: str):
+        for frame in self.frames:
+            yield SimpleNamespace(frame=frame)
+
+
+def build_pipeline(provider: FakeProvider) -> TTSPipeline:
+    # The fake replaces the provider client, so the plugin is never constructed
+    with patch("src.voice.tts_pipeline.elevenlabs.TTS"):
+        pipeline = TTSPipeline(
+            config=TTSConfig(
+                elevenlabs_config=ElevenLabsConfig(),
+                cache_enabled=False,
+                segment_max_chars=1_000_000,
+            )
+        )
+    pipeline._tts = provider
+    pipeline.resilience.hedge = False
+    pipeline.resilience.breaker = CircuitBreaker(provider="benchmark")
+    return pipeline
+
+
+async def legacy_collect(provider: FakeProvider, text: str) -> int:
+    audio_chunks: list[bytes] = []
+    async for chunk in provider.synthesize(text):
+        audio_chunks.append(chunk.frame.data.tobytes())
+    return len(b"".join(audio_chunks))
+
+
+async def collector_collect(provider: FakeProvider, text: str, capacity: int) -> int:
+    collector = PCMCollector(capacity=capacity)
+    async for chunk in provider.synthesize(text):
+        collector.append(frame_bytes(chunk.frame))
+    return len(collector.detach())
+
+
+async def collect(pipeline: TTSPipeline, text: str) -> int:
+    return len((await pipeline.synthesize(text)).audio_data)
+
+
+async def stream_bytes(pipeline: TTSPipeline, text: str) -> int:
+    return sum([len(chunk) async for chunk in pipeline.synthesize_stream(text)])
+
+
+async def stream_frames(pipeline: TTSPipeline, text: str) -> int:
+    return sum([view.nbytes async for view in pipeline.synthesize_frames(text)])
+
+
+async def measure(run, runs: int) -> tuple[float, float, int]:
+    """Median throughput (MB/s) and tracemalloc peak (MB) over `runs` runs."""
+    throughputs, peaks = [], []
+    nbytes = 0
+    for _ in range(runs):
+        # Time untraced; tracemalloc slows allocation-heavy code unevenly
+        start = time.perf_counter()
+        nbytes = await run()
+        throughputs.append(nbytes / (time.perf_counter() - start) / 1e6)
+
+        tracemalloc.start()
+        await run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peaks.append(peak / 1e6)
+    return statistics.median(throughputs), statistics.median(peaks), nbytes
+
+
+async def main(seconds: int, runs: int) -> None:
+    frames = make_frames(seconds)
+    provider = FakeProvider(frames)
+    pipeline = build_pipeline(provider)
+    # One segment, so every variant makes a single provider request; its length
+    # sizes the collector's preallocation (~15 characters per second of speech)
+    text = " ".join(["word"] * (seconds * 3))
+    audio_mb = sum(frame.data.nbytes for frame in frames) / 1e6
+    print(f"{seconds}s of {SAMPLE_RATE}Hz audio = {audio_mb:.2f}MB in {len(frames)} frames\n")
+
+    cases = {
+        "legacy collect": lambda: legacy_collect(provider, text),
+        "collector": lambda: collector_collect(
+            provider, text, estimate_pcm_bytes(text, SAMPLE_RATE)
+        ),
+        "synthesize": lambda: collect(pipeline, text),
+        "synthesize_stream": lambda: stream_bytes(pipeline, text),
+        "synthesize_frames": lambda: stream_frames(pipeline, text),
+    }
+    for name, run in cases.items():
+        throughput, peak, nbytes = await measure(run, runs)
+        assert abs(nbytes / 1e6 - audio_mb) < 1e-6
+        print(
+            f"{name:<18} throughput={throughput:8.0f}MB/s "
+            f"peak_alloc={peak:6.2f}MB ({peak / audio_mb:4.2f}x audio)"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--seconds", type=int, default=60)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    quiet_logging(level=logging.ERROR)
+    asyncio.run(main(args.seconds, args.runs))
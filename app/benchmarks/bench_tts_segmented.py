@@ -0,0 +1,110 @@
+"""
+Benchmark time to first audio and wall time: single-shot vs sentence-pipelined TTS.
+
+A local fake provider models synthesis cost as a fixed per-request overhead
+plus time proportional to the text length, streaming audio as it goes. A
+multi-sentence response is synthesized through TTSPipeline.synthesize (one
+request, audio usable once it completes) and through
+TTSPipeline.synthesize_segmented at several concurrency levels.
+
+Usage:
+    python -m benchmarks.bench_tts_segmented [--sentences 6] [--runs 5]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from benchmarks.common import quiet_logging
+
+os.environ.setdefault("ELEVENLABS_API_KEY", "benchmark")
+
+from src.voice.config import ElevenLabsConfig  # noqa: E402
+from src.voice.resilience import CircuitBreaker  # noqa: E402
+from src.voice.tts_pipeline import TTSConfig, TTSPipeline  # noqa: E402
+
+SENTENCE = "This sentence stands in for one line of a longer spoken answer."
+
+
+class FakeProvider:
+    """Provider stand-in: overhead + per-character synthesis time, streamed."""
+
+    def __init__(self, overhead_ms: float, ms_per_char: float) -> None:
+        self.overhead_ms = overhead_ms
+        self.ms_per_char = ms_per_char
+
+    async def synthesize(self, text: str):
+        await asyncio.sleep(self.overhead_ms / 1000)
+        # ~60 chars of speech per second of 24kHz mono audio, in 4 chunks
+        chunk = SimpleNamespace(
+            frame=SimpleNamespace(data=memoryview(bytes(int(len(text) / 60 * 48000) // 4)))
+        )
+        for _ in range(4):
+            await asyncio.sleep(len(text) * self.ms_per_char / 4000)
+            yield chunk
+
+
+def build_pipeline(provider: FakeProvider) -> TTSPipeline:
+    # The fake replaces the provider client, so the plugin is never constructed
+    with patch("src.voice.tts_pipeline.elevenlabs.TTS"):
+        pipeline = TTSPipeline(
+            config=TTSConfig(elevenlabs_config=ElevenLabsConfig(), cache_enabled=False)
+        )
+    pipeline._tts = provider
+    pipeline.resilience.hedge = False
+    pipeline.resilience.breaker = CircuitBreaker(provider="benchmark")
+    return pipeline
+
+
+async def single_shot(pipeline: TTSPipeline, text: str) -> tuple[float, float]:
+    start = time.perf_counter()
+    await pipeline.synthesize(text)
+    elapsed = (time.perf_counter() - start) * 1000
+    return elapsed, elapsed
+
+
+async def segmented(pipeline: TTSPipeline, text: str, concurrency: int) -> tuple[float, float]:
+    start = time.perf_counter()
+    first_audio = None
+    async for _ in pipeline.synthesize_segmented(text, max_concurrency=concurrency):
+        if first_audio is None:
+            first_audio = (time.perf_counter() - start) * 1000
+    return first_audio, (time.perf_counter() - start) * 1000
+
+
+async def main(sentences: int, runs: int) -> None:
+    provider = FakeProvider(overhead_ms=150, ms_per_char=4)
+    text = " ".join([SENTENCE] * sentences)
+    print(f"{sentences} sentences, {len(text)} chars, {runs} runs each\n")
+
+    baseline = build_pipeline(provider)
+    results = [await single_shot(baseline, text) for _ in range(runs)]
+    print(
+        f"{'single-shot':<16} first_audio={statistics.median(r[0] for r in results):7.1f}ms "
+        f"wall={statistics.median(r[1] for r in results):7.1f}ms"
+    )
+
+    for concurrency in (1, 2, 3, 4):
+        pipeline = build_pipeline(provider)
+        results = [await segmented(pipeline, text, concurrency) for _ in range(runs)]
+        print(
+            f"{'segmented c=' + str(concurrency):<16} "
+            f"first_audio={statistics.median(r[0] for r in results):7.1f}ms "
+            f"wall={statistics.median(r[1] for r in results):7.1f}ms "
+            f"segment_ttfb_p50={pipeline.metrics.segment_ttfb_sketch.percentile(50):6.1f}ms "
+            f"parallelism={pipeline.metrics.segment_parallelism:4.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sentences", type=int, default=6)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    quiet_logging(level=logging.ERROR)
+    asyncio.run(main(args.sentences, args.runs))
@@ -0,0 +1,18 @@
+"""Shared helpers for benchmarks."""
+
+import logging
+import statistics
+
+import structlog
+
+
+def quiet_logging(level: int = logging.WARNING) -> None:
+    """Drop log lines below `level` so they do not dominate timings."""
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(level),
+    )
+
+
+def p99(values: list[float]) -> float:
+    """99th percentile of a sample."""
+    return statistics.quantiles(values, n=100)[98]
@@ -10,12 +10,10 @@ Story 1.2: Will add full LLM integration for intelligent responses.
 """
 
 import asyncio
-import logging
-from typing import Optional
+from contextlib import nullcontext
 
 import structlog
 from dotenv import load_dotenv
-from livekit import rtc
 from livekit.agents import (
     AutoSubscribe,
     JobContext,
@@ -25,15 +23,32 @@ from livekit.agents import (
     llm,
 )
 from livekit.agents.voice_assistant import VoiceAssistant
-from livekit.plugins import deepgram, elevenlabs, silero, openai
+from livekit.plugins import deepgram, elevenlabs, silero
 
+from src.voice.audio_quality import AudioQualityMetrics, LatencyTracker
 from src.voice.config import (
-    LiveKitConfig,
+    DEFAULT_STATIC_PROMPTS,
     DeepgramConfig,
     ElevenLabsConfig,
     VoiceProcessingConfig,
 )
-from src.voice.audio_quality import LatencyTracker, LatencyPhase, AudioQualityMetrics
+from src.voice.deadline import PHASE_PROCESSING
+from src.voice.livekit_client import assistant_audio_source
+from src.voice.metrics_exporter import (
+    MetricsSource,
+    get_metrics_registry,
+    start_metrics_server,
+)
+from src.voice.prompts import PromptLibrary, prewarm_prompts
+from src.voice.tracing import JsonlFileExporter, configure_tracing, get_tracer
+from src.voice.tts_pipeline import create_tts_pipeline
+from src.voice.turn_latency import (
+    TurnEvent,
+    current_deadline,
+    current_turn_span,
+    mark_turn_event,
+    session_latency_scope,
+)
 
 # Load environment variables
 load_dotenv()
@@ -57,10 +72,13 @@ structlog.configure(
 
 logger = structlog.get_logger(__name__)
 
-# Global metrics trackers
+# Worker-wide metrics trackers; each session also keeps its own per-turn tracker
 latency_tracker = LatencyTracker()
 quality_metrics = AudioQualityMetrics()
 
+# Spoken instead of the echo when the turn has no latency budget left
+FALLBACK_RESPONSE = DEFAULT_STATIC_PROMPTS["fallback"]
+
 
 class SimpleEchoLLM(llm.LLM):
     """
@@ -91,44 +109,77 @@ class SimpleEchoStream(llm.LLMStream):
 
     async def _run(self) -> None:
         """Generate echo response."""
-        # Get the last user message
-        last_user_msg = ""
-        for msg in reversed(self._chat_ctx.messages):
-            if msg.role == "user" and msg.content:
-                last_user_msg = msg.content
-                break
-
-        # Generate echo response
-        if last_user_msg:
-            response = f"I heard you say: {last_user_msg}"
-        else:
-            response = "Hello! I'm the LaunchPad voice assistant. How can I help you today?"
-
-        # Track latency for this processing phase
-        latency_tracker.mark_phase_start(LatencyPhase.PROCESSING_START)
-
-        # Emit the response as a single chunk
-        self._event_ch.send_nowait(
-            llm.ChatChunk(
-                choices=[
-                    llm.Choice(
-                        delta=llm.ChoiceDelta(
-                            role="assistant",
-                            content=response,
-                        ),
-                        index=0,
-                    )
-                ],
+        deadline = current_deadline()
+        with (
+            get_tracer().span("llm", parent=current_turn_span(), model="SimpleEchoLLM") as span,
+            deadline.phase(PHASE_PROCESSING) if deadline else nullcontext(),
+        ):
+            # Get the last user message
+            last_user_msg = ""
+            for msg in reversed(self._chat_ctx.messages):
+                if msg.role == "user" and msg.content:
+                    last_user_msg = msg.content
+                    break
+
+            # Generate echo response
+            if deadline is not None and deadline.expired():
+                # Out of budget: answer briefly rather than keep the user waiting
+                response = FALLBACK_RESPONSE
+                span.set_attribute("deadline.fallback", True)
+            elif last_user_msg:
+                response = f"I heard you say: {last_user_msg}"
+            else:
+                response = "Hello! I'm the LaunchPad voice assistant. How can I help you today?"
+            span.set_attribute("input_length", len(last_user_msg))
+            span.set_attribute("text_length", len(response))
+
+            # The whole response goes out as the first (and only) chunk
+            mark_turn_event(TurnEvent.LLM_FIRST_TOKEN)
+            span.add_event("first_token")
+
+            # Emit the response as a single chunk
+            self._event_ch.send_nowait(
+                llm.ChatChunk(
+                    choices=[
+                        llm.Choice(
+                            delta=llm.ChoiceDelta(
+                                role="assistant",
+                                content=response,
+                            ),
+                            index=0,
+                        )
+                    ],
+                )
             )
-        )
-
-        latency_tracker.mark_phase_end(LatencyPhase.PROCESSING_END)
 
     async def aclose(self) -> None:
         """Close the stream."""
         pass
 
 
+async def _greet(
+    assistant: VoiceAssistant,
+    prompts: PromptLibrary | None,
+    voice_config: VoiceProcessingConfig,
+) -> None:
+    """Play the greeting from prewarmed frames, falling back to live synthesis."""
+    greeting = prompts.get("greeting") if prompts else None
+    source = await assistant_audio_source(assistant) if greeting else None
+    if (
+        prompts is None
+        or greeting is None
+        or source is None
+        or (source.sample_rate, source.num_channels) != (greeting.sample_rate, 1)
+    ):
+        await assistant.say(
+            voice_config.static_prompts.get("greeting", DEFAULT_STATIC_PROMPTS["greeting"])
+        )
+        return
+
+    # Same track as the assistant's replies, so the user hears one voice
+    await prompts.play("greeting", source)
+
+
 def prewarm(proc: JobProcess) -> None:
     """
     Prewarm function called when the worker starts.
@@ -141,6 +192,28 @@ def prewarm(proc: JobProcess) -> None:
     # Prewarm VAD model for faster startup
     proc.userdata["vad"] = silero.VAD.load()
 
+    # Expose /metrics from a background thread if a port is configured. Prewarm
+    # runs in every job process and each has its own registry, so each binds
+    # its own port from the configured range.
+    voice_config = VoiceProcessingConfig()
+    if voice_config.metrics_port:
+        proc.userdata["metrics_server"] = start_metrics_server(
+            voice_config.metrics_port, port_range=voice_config.metrics_port_range
+        )
+
+    # Write per-turn traces as OTLP/JSON lines if a trace file is configured
+    if voice_config.trace_file:
+        try:
+            configure_tracing(JsonlFileExporter(voice_config.trace_file))
+        except OSError as e:
+            logger.warning("trace_file_open_failed", path=voice_config.trace_file, error=str(e))
+
+    # Synthesize static prompts once so they play without a provider round-trip
+    if voice_config.prewarm_prompts and voice_config.static_prompts:
+        proc.userdata["prompts"] = prewarm_prompts(
+            create_tts_pipeline(), voice_config.static_prompts
+        )
+
     logger.info("prewarm_complete")
 
 
@@ -205,54 +278,74 @@ async def entrypoint(ctx: JobContext) -> None:
     participant = await ctx.wait_for_participant()
     logger.info("participant_connected", participant=participant.identity)
 
-    # Start pipeline latency tracking
-    latency_tracker.start_pipeline()
-    latency_tracker.mark_phase_start(LatencyPhase.STT_START)
-
-    # Create and start the VoiceAssistant with full STT→LLM→TTS pipeline
-    assistant = VoiceAssistant(
-        vad=vad,
-        stt=stt,
-        llm=echo_llm,
-        tts=tts,
-        chat_ctx=initial_ctx,
-    )
-
-    # Start the assistant - this connects STT→Processing→TTS
-    assistant.start(ctx.room, participant)
-
-    logger.info(
-        "voice_agent_ready",
-        room=ctx.room.name,
-        target_latency_ms=voice_config.target_total_latency_ms,
-        pipeline_status="STT→Processing→TTS connected",
-    )
+    # Per-session latency tracking: one PipelineLatency per conversational turn.
+    # The contextvar binding is inherited by the tasks VoiceAssistant spawns, and
+    # the session targets set each turn's deadline (latency budget).
+    with session_latency_scope(
+        ctx.room.name,
+        aggregate=latency_tracker,
+        participant_identity=participant.identity,
+        session=LatencyTracker(
+            target_total_ms=voice_config.target_total_latency_ms,
+            target_stt_ms=voice_config.target_stt_latency_ms,
+            target_tts_ms=voice_config.target_tts_latency_ms,
+        ),
+    ) as session_tracker:
+        # Create and start the VoiceAssistant with full STT→LLM→TTS pipeline
+        assistant = VoiceAssistant(
+            vad=vad,
+            stt=stt,
+            llm=echo_llm,
+            tts=tts,
+            chat_ctx=initial_ctx,
+        )
+        session_tracker.attach(assistant)
+
+        # VoiceAssistant runs the provider plugins directly rather than
+        # STTPipeline/TTSPipeline, so this entrypoint exports per-turn
+        # pipeline latency only (no STT/TTS provider or throughput metrics).
+        metrics_source = get_metrics_registry().register(
+            MetricsSource(
+                room=ctx.room.name,
+                stt_model=deepgram_config.model,
+                tts_model=elevenlabs_config.model_id,
+                latency_tracker=session_tracker.session,
+            )
+        )
 
-    # Log pipeline status - all components now connected
-    logger.info(
-        "pipeline_status",
-        stt="connected",
-        tts="connected",
-        vad="connected",
-        llm="echo_mode",
-        note="Story 1.2 will add real LLM integration",
-    )
+        # Start the assistant - this connects STT→Processing→TTS
+        assistant.start(ctx.room, participant)
 
-    # Keep the agent running
-    await assistant.say("Hello! I'm the LaunchPad voice assistant. I'm ready to help.")
+        logger.info(
+            "voice_agent_ready",
+            room=ctx.room.name,
+            target_latency_ms=voice_config.target_total_latency_ms,
+            pipeline_status="STT→Processing→TTS connected",
+        )
 
-    # Wait indefinitely (agent will process voice until disconnected)
-    # The VoiceAssistant handles the continuous STT→LLM→TTS loop
-    try:
-        await asyncio.sleep(float("inf"))
-    except asyncio.CancelledError:
-        logger.info("agent_shutting_down")
-        latency_tracker.complete_pipeline()
+        # Log pipeline status - all components now connected
         logger.info(
-            "final_latency_metrics",
-            **latency_tracker.get_average_latencies(),
+            "pipeline_status",
+            stt="connected",
+            tts="connected",
+            vad="connected",
+            llm="echo_mode",
+            note="Story 1.2 will add real LLM integration",
         )
 
+        # Greet from the prewarmed frames if available, otherwise synthesize it
+        await _greet(assistant, ctx.proc.userdata.get("prompts"), voice_config)
+
+        # Wait indefinitely (agent will process voice until disconnected)
+        # The VoiceAssistant handles the continuous STT→LLM→TTS loop
+        try:
+            await asyncio.sleep(float("inf"))
+        except asyncio.CancelledError:
+            logger.info("agent_shutting_down")
+            logger.info("final_latency_metrics", **session_tracker.get_stats())
+        finally:
+            get_metrics_registry().unregister(metrics_source)
+
 
 if __name__ == "__main__":
     logger.info("starting_launchpad_agent")
@@ -0,0 +1,288 @@
+"""PCM format conversion (sample rate, channel count, sample type) and levels."""
+
+from dataclasses import dataclass, field
+from functools import lru_cache
+from math import gcd
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .buffer_pool import BufferPool
+
+BytesLike = bytes | bytearray | memoryview
+
+_INT16_SCALE = 32768.0
+
+
+def pcm_duration_ms(
+    nbytes: int, sample_rate: int, num_channels: int = 1, sample_width: int = 2
+) -> float:
+    """Duration of interleaved PCM of the given layout, in milliseconds."""
+    frames = nbytes // (sample_width * num_channels)
+    return frames / sample_rate * 1000
+
+
+def int16_to_float32(samples: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+    """
+    Scale int16 samples to float32 in [-1, 1).
+
+    Args:
+        samples: int16 samples
+        out: float32 array of the same length to write into, allocated if None
+
+    Returns:
+        The float32 samples (``out`` if given)
+    """
+    if out is None:
+        out = np.empty(len(samples), dtype=np.float32)
+    np.multiply(samples, np.float32(1 / _INT16_SCALE), out=out)
+    return out
+
+
+def float32_to_int16(
+    samples: np.ndarray, out: np.ndarray | None = None, inplace: bool = False
+) -> np.ndarray:
+    """
+    Round float32 samples in [-1, 1) to int16, clipping out-of-range values.
+
+    Args:
+        samples: float32 samples
+        out: int16 array of the same length to write into, allocated if None
+        inplace: Use ``samples`` as scratch space instead of allocating
+
+    Returns:
+        The int16 samples (``out`` if given)
+    """
+    if out is None:
+        out = np.empty(len(samples), dtype=np.int16)
+    scratch = samples if inplace else np.empty_like(samples)
+    np.multiply(samples, _INT16_SCALE, out=scratch)
+    np.clip(scratch, -_INT16_SCALE, _INT16_SCALE - 1, out=scratch)
+    np.rint(scratch, out=scratch)
+    np.copyto(out, scratch, casting="unsafe")
+    return out
+
+
+def downmix(samples: np.ndarray, num_channels: int, out: np.ndarray | None = None) -> np.ndarray:
+    """
+    Average interleaved channels into mono float32.
+
+    Args:
+        samples: Interleaved float32 (or int16, averaged in its own scale) samples
+        num_channels: Channels interleaved in ``samples``
+        out: float32 array of len(samples) // num_channels, allocated if None
+
+    Returns:
+        Mono samples (``out`` if given)
+    """
+    frames = samples.reshape(-1, num_channels)
+    if out is None:
+        out = np.empty(len(frames), dtype=np.float32)
+    return np.mean(frames, axis=1, dtype=np.float32, out=out)
+
+
+def frame_levels_db(pcm: BytesLike, frame_samples: int, num_channels: int = 1) -> np.ndarray:
+    """
+    RMS level of each whole frame of 16-bit PCM, in dBFS.
+
+    Args:
+        pcm: Interleaved 16-bit PCM; a trailing partial frame is ignored
+        frame_samples: Samples per channel in each frame
+        num_channels: Channels interleaved in ``pcm``
+
+    Returns:
+        float32 levels, one per frame (-120 for digital silence)
+    """
+    frame_len = frame_samples * num_channels
+    frame_count = len(memoryview(pcm).cast("B")) // (frame_len * 2)
+    samples = np.frombuffer(pcm, dtype=np.int16, count=frame_count * frame_len)
+    frames = int16_to_float32(samples).reshape(frame_count, frame_len)
+    power = np.einsum("ij,ij->i", frames, frames) / np.float32(frame_len)
+    levels: np.ndarray = 10 * np.log10(power + np.float32(1e-12))
+    return levels
+
+
+@lru_cache(maxsize=32)
+def _polyphase_filter(up: int, down: int, taps_per_phase: int) -> np.ndarray:
+    """
+    Kaiser-windowed sinc lowpass split into ``up`` time-reversed phases.
+
+    The cutoff is the lower of the two Nyquist rates, as in
+    scipy.signal.resample_poly. Row p holds the taps applied, oldest sample
+    first, to produce outputs at phase p of the upsampled grid.
+    """
+    length = up * taps_per_phase
+    cutoff = 1.0 / max(up, down)
+    t = np.arange(length) - (length - 1) / 2
+    taps = cutoff * np.sinc(cutoff * t) * np.kaiser(length, 5.0) * up
+    return np.ascontiguousarray(taps.reshape(taps_per_phase, up).T[:, ::-1], dtype=np.float32)
+
+
+@dataclass
+class Resampler:
+    """
+    Streaming polyphase resampler from interleaved int16 to mono int16.
+
+    Input is downmixed to mono, resampled by the rational factor
+    to_rate / from_rate and converted back to int16, entirely with
+    vectorized NumPy over preallocated buffers: each call reuses the
+    buffers of the last, growing them only for a larger chunk. Filter
+    state carries across calls, so chunk boundaries are seamless; the
+    output lags the input by about taps_per_phase / 2 input samples.
+
+    The returned audio is a view of an internal buffer, overwritten by the
+    next call: copy it if it must outlive that. With a pool, the buffers
+    are borrowed from it and returned by close().
+    """
+
+    from_rate: int
+    to_rate: int
+    num_channels: int = 1
+    taps_per_phase: int = 32
+    pool: BufferPool | None = None
+    _up: int = field(init=False, repr=False)
+    _down: int = field(init=False, repr=False)
+    _phases: np.ndarray = field(init=False, repr=False)
+    _history: np.ndarray = field(init=False, repr=False)
+    _buffers: dict[str, np.ndarray] = field(default_factory=dict, init=False, repr=False)
+    _borrowed: dict[str, bytearray] = field(default_factory=dict, init=False, repr=False)
+    _consumed: int = field(default=0, init=False, repr=False)
+    _next_output: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Design the filter and allocate the filter history."""
+        if self.from_rate <= 0 or self.to_rate <= 0:
+            raise ValueError("Sample rates must be positive")
+        if self.taps_per_phase < 2:
+            raise ValueError("taps_per_phase must be at least 2")
+        divisor = gcd(self.from_rate, self.to_rate)
+        self._up = self.to_rate // divisor
+        self._down = self.from_rate // divisor
+        self._phases = _polyphase_filter(self._up, self._down, self.taps_per_phase)
+        self._history = np.zeros(self.taps_per_phase - 1, dtype=np.float32)
+
+    @property
+    def passthrough(self) -> bool:
+        """Whether the input is already mono at the output rate."""
+        return self.from_rate == self.to_rate and self.num_channels == 1
+
+    @property
+    def delay(self) -> int:
+        """Output samples by which the output lags the input."""
+        # The filter is centered (taps * up - 1) / 2 upsampled samples back
+        return round((self.taps_per_phase * self._up - 1) / 2 / self._down)
+
+    def output_samples(self, input_samples: int) -> int:
+        """Upper bound on the samples produced for a chunk of input samples."""
+        return input_samples * self._up // self._down + 1
+
+    def process(self, pcm: BytesLike) -> memoryview:
+        """
+        Convert a chunk of interleaved 16-bit PCM.
+
+        Returns:
+            Mono 16-bit PCM at to_rate, as a view valid until the next call
+        """
+        samples = np.frombuffer(pcm, dtype=np.int16)
+        if self.passthrough:
+            return samples.data.cast("B")
+        frames = len(samples) // self.num_channels
+        mono = int16_to_float32(samples, out=self._buffer("float", len(samples), np.float32))
+        if self.num_channels > 1:
+            mono = downmix(mono, self.num_channels, out=self._buffer("mono", frames, np.float32))
+        if self.from_rate != self.to_rate:
+            mono = self.process_float(mono)
+        converted = float32_to_int16(
+            mono, out=self._buffer("int16", len(mono), np.int16), inplace=True
+        )
+        return converted.data.cast("B")
+
+    def process_float(self, samples: np.ndarray) -> np.ndarray:
+        """
+        Resample a chunk of mono float32 samples.
+
+        Returns:
+            Resampled float32 samples, as a view valid until the next call
+        """
+        taps = self.taps_per_phase
+        count = len(samples)
+        padded = self._buffer("padded", taps - 1 + count, np.float32)
+        padded[: taps - 1] = self._history
+        padded[taps - 1 :] = samples
+        self._history[:] = padded[count:]
+        # Row i is the filter window ending at input sample self._consumed + i
+        windows = sliding_window_view(padded, taps)
+
+        up, down = self._up, self._down
+        consumed = self._consumed + count
+        first = self._next_output
+        # Every output whose newest input sample has arrived
+        end = (consumed * up - 1) // down + 1 if consumed > 0 else first
+        out = self._buffer("resampled", max(0, end - first), np.float32)
+
+        # Outputs up apart share a filter phase and are down input samples apart
+        for offset in range(min(up, len(out))):
+            position = (first + offset) * down
+            rows = windows[position // up - self._consumed :: down]
+            targets = out[offset::up]
+            np.matmul(rows[: len(targets)], self._phases[position % up], out=targets)
+
+        # Rebase the counters so they stay small on long streams
+        cycles = end // up
+        self._next_output = end - cycles * up
+        self._consumed = consumed - cycles * down
+        return out
+
+    def reset(self) -> None:
+        """Forget the filter history, e.g. between utterances."""
+        self._history[:] = 0
+        self._consumed = 0
+        self._next_output = 0
+
+    def close(self) -> None:
+        """Return borrowed buffers to the pool; the resampler stays usable."""
+        if self.pool is not None:
+            for borrowed in self._borrowed.values():
+                self.pool.release(borrowed)
+        self._borrowed.clear()
+        self._buffers.clear()
+
+    def _buffer(self, name: str, size: int, dtype: type) -> np.ndarray:
+        """A reused buffer of at least size elements, trimmed to size."""
+        buffer = self._buffers.get(name)
+        if buffer is None or len(buffer) < size:
+            capacity = max(size, 2 * len(buffer) if buffer is not None else 0)
+            if self.pool is None:
+                buffer = np.empty(capacity, dtype=dtype)
+            else:
+                if name in self._borrowed:
+                    self.pool.release(self._borrowed[name])
+                borrowed = self._borrowed[name] = self.pool.acquire(
+                    capacity * np.dtype(dtype).itemsize
+                )
+                buffer = np.frombuffer(borrowed, dtype=dtype)
+            self._buffers[name] = buffer
+        return buffer[:size]
+
+
+def resample(pcm: BytesLike, from_rate: int, to_rate: int, num_channels: int = 1) -> bytes:
+    """
+    Convert a complete buffer of interleaved 16-bit PCM to mono at to_rate.
+
+    Unlike Resampler.process, the filter delay is compensated (to within
+    half an output sample) and the tail flushed, so the output lines up
+    with the input and is exactly ceil(frames * to_rate / from_rate)
+    samples long.
+    """
+    resampler = Resampler(from_rate, to_rate, num_channels)
+    if resampler.passthrough:
+        return bytes(pcm)
+    mono = int16_to_float32(np.frombuffer(pcm, dtype=np.int16))
+    if num_channels > 1:
+        mono = downmix(mono, num_channels)
+    if from_rate != to_rate:
+        length = -(-len(mono) * to_rate // from_rate)
+        padded = np.concatenate([mono, np.zeros(resampler.taps_per_phase, dtype=np.float32)])
+        start = resampler.delay
+        mono = resampler.process_float(padded)[start : start + length]
+    return float32_to_int16(mono, inplace=True).tobytes()
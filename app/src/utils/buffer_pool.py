@@ -0,0 +1,119 @@
+"""Per-process pool of reusable fixed-size audio buffers."""
+
+from dataclasses import dataclass, field
+
+# Smallest size class for buffers that are not whole frames
+MIN_SIZE_CLASS = 4096
+
+
+def frame_size(sample_rate: int, frame_ms: int, num_channels: int = 1) -> int:
+    """Bytes of 16-bit PCM in one frame."""
+    return sample_rate * frame_ms // 1000 * num_channels * 2
+
+
+def size_class(nbytes: int) -> int:
+    """Smallest power-of-two size class (at least MIN_SIZE_CLASS) holding nbytes."""
+    return max(MIN_SIZE_CLASS, 1 << (max(nbytes, 1) - 1).bit_length())
+
+
+@dataclass
+class PoolMetrics:
+    """Metrics for a buffer pool."""
+
+    acquired: int = 0
+    hits: int = 0
+    released: int = 0
+    discarded: int = 0  # released into a full bucket and left to the GC
+    ignored: int = 0  # released but not on loan (foreign or already released)
+    outstanding: int = 0
+    peak_outstanding: int = 0
+
+    @property
+    def misses(self) -> int:
+        """Acquisitions that had to allocate."""
+        return self.acquired - self.hits
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of acquisitions served from the pool."""
+        if self.acquired == 0:
+            return 0.0
+        return self.hits / self.acquired
+
+
+@dataclass
+class BufferPool:
+    """
+    Free lists of bytearrays, bucketed by size.
+
+    Frame buffers are sized by frame duration and sample rate (see
+    acquire_frame), so every stream at the same rate and frame size shares
+    a bucket; variable-size work buffers are rounded up to power-of-two
+    size classes (see acquire). Reusing buffers instead of allocating one
+    per frame keeps long sessions from churning the allocator and GC.
+
+    A released buffer must no longer be referenced: the next acquire
+    hands it out as is (contents are not cleared). Buffers that are never
+    released are simply garbage collected, but stay counted as outstanding.
+    Releasing a buffer that is not on loan from this pool (by identity) is
+    ignored, so it can neither join a free list nor skew the metrics.
+    """
+
+    max_free_per_bucket: int = 64
+    metrics: PoolMetrics = field(default_factory=PoolMetrics)
+    _free: dict[int, list[bytearray]] = field(default_factory=dict, init=False, repr=False)
+    _lent: set[int] = field(default_factory=set, init=False, repr=False)
+
+    def acquire_frame(self, sample_rate: int, frame_ms: int, num_channels: int = 1) -> bytearray:
+        """Borrow a buffer of exactly one frame of 16-bit PCM."""
+        return self._acquire(frame_size(sample_rate, frame_ms, num_channels))
+
+    def acquire(self, nbytes: int) -> bytearray:
+        """Borrow a buffer of at least nbytes, sized to its size class."""
+        return self._acquire(size_class(nbytes))
+
+    def release(self, buffer: bytearray) -> None:
+        """Return a borrowed buffer to its bucket."""
+        if id(buffer) not in self._lent:
+            self.metrics.ignored += 1
+            return
+        self._lent.discard(id(buffer))
+        self.metrics.released += 1
+        self.metrics.outstanding -= 1
+        bucket = self._free.setdefault(len(buffer), [])
+        if len(bucket) < self.max_free_per_bucket:
+            bucket.append(buffer)
+        else:
+            self.metrics.discarded += 1
+
+    def free_buffers(self) -> int:
+        """Buffers currently idle in the pool."""
+        return sum(len(bucket) for bucket in self._free.values())
+
+    def clear(self) -> None:
+        """Drop all idle buffers."""
+        self._free.clear()
+
+    def _acquire(self, nbytes: int) -> bytearray:
+        self.metrics.acquired += 1
+        self.metrics.outstanding += 1
+        self.metrics.peak_outstanding = max(self.metrics.peak_outstanding, self.metrics.outstanding)
+        bucket = self._free.get(nbytes)
+        if bucket:
+            self.metrics.hits += 1
+            buffer = bucket.pop()
+        else:
+            buffer = bytearray(nbytes)
+        self._lent.add(id(buffer))
+        return buffer
+
+
+_pool: BufferPool | None = None
+
+
+def get_buffer_pool() -> BufferPool:
+    """Get the process-wide buffer pool."""
+    global _pool
+    if _pool is None:
+        _pool = BufferPool()
+    return _pool
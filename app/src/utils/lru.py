@@ -0,0 +1,88 @@
+"""Size-bounded LRU cache."""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass, field
+from typing import Any, Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+def _len(value: Any) -> int:
+    return len(value)
+
+
+@dataclass
+class LRUCache(Generic[K, V]):
+    """
+    Least-recently-used cache bounded by the total size of its values.
+
+    ``sizeof`` measures each value (``len`` by default, i.e. bytes for
+    audio buffers). Values larger than the whole budget are not cached.
+    With ``ttl_s``, entries also expire that many seconds after they were
+    stored; expired entries are dropped when they are next looked up.
+    """
+
+    max_size: int
+    sizeof: Callable[[V], int] = _len
+    ttl_s: float | None = None
+    clock: Callable[[], float] = time.monotonic
+    size: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    _entries: OrderedDict[K, tuple[V, int, float | None]] = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._entries
+
+    def get(self, key: K) -> V | None:
+        """Get a value and mark it most recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[2] is not None and self.clock() >= entry[2]:
+            self.pop(key)
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: K, value: V) -> bool:
+        """
+        Insert or replace a value, evicting least-recently-used entries.
+
+        Returns:
+            False if the value alone exceeds the budget and was not cached
+        """
+        value_size = self.sizeof(value)
+        if value_size > self.max_size:
+            return False
+        self.pop(key)
+        expires_at = self.clock() + self.ttl_s if self.ttl_s is not None else None
+        self._entries[key] = (value, value_size, expires_at)
+        self.size += value_size
+        while self.size > self.max_size:
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self.size -= evicted_size
+            self.evictions += 1
+        return True
+
+    def pop(self, key: K) -> V | None:
+        """Remove a value, returning it if present."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        self.size -= entry[1]
+        return entry[0]
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+        self.size = 0
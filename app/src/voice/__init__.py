@@ -1,9 +1,10 @@
 """Voice processing module for LaunchPad."""
 
-from .stt_pipeline import STTPipeline, STTConfig
-from .tts_pipeline import TTSPipeline, TTSConfig
-from .livekit_client import LiveKitClient, LiveKitConfig
 from .audio_quality import AudioQualityMetrics, LatencyTracker
+from .livekit_client import LiveKitClient, LiveKitConfig
+from .stt_pipeline import STTConfig, STTPipeline
+from .tts_pipeline import TTSConfig, TTSPipeline
+from .turn_latency import SessionLatencyTracker, TurnEvent, session_latency_scope
 
 __all__ = [
     "STTPipeline",
@@ -14,4 +15,7 @@ __all__ = [
     "LiveKitConfig",
     "AudioQualityMetrics",
     "LatencyTracker",
+    "SessionLatencyTracker",
+    "TurnEvent",
+    "session_latency_scope",
 ]
@@ -0,0 +1,110 @@
+"""Zero-copy views over audio frames and a single-buffer PCM collector."""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+from livekit import rtc
+
+from ..utils.buffer_pool import BufferPool
+
+BytesLike = bytes | bytearray | memoryview
+
+
+def frame_bytes(frame: rtc.AudioFrame) -> memoryview:
+    """Byte view over a frame's 16-bit PCM, without copying it."""
+    return memoryview(frame.data).cast("B")
+
+
+def as_int16(audio: BytesLike) -> np.ndarray:
+    """NumPy int16 view over 16-bit PCM, without copying it."""
+    return np.frombuffer(audio, dtype=np.int16)
+
+
+def estimate_pcm_bytes(text: str, sample_rate: int, chars_per_second: float = 15.0) -> int:
+    """Rough size of 16-bit mono speech for text, used to preallocate buffers."""
+    return int(len(text) / chars_per_second * sample_rate) * 2
+
+
+@dataclass
+class PCMCollector:
+    """
+    Collects PCM chunks into one preallocated, growable bytearray.
+
+    Each chunk is copied exactly once, from its frame into the buffer; the
+    collected audio is handed out as a view or as the (trimmed) buffer
+    itself. When the preallocation is exceeded the bytearray is resized in
+    place, which CPython over-allocates so growth is amortized.
+
+    Views returned by view() pin the buffer: release them before appending
+    more audio.
+
+    With a pool, the buffer is borrowed from it (rounded up to a size
+    class) and swapped for a larger one to grow. Call release() once the
+    audio is no longer needed to return it; detach() copies the audio out
+    and returns the buffer.
+    """
+
+    capacity: int = 64 * 1024
+    nbytes: int = 0
+    pool: BufferPool | None = None
+    _buffer: bytearray = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Preallocate the buffer."""
+        capacity = max(0, self.capacity)
+        self._buffer = self.pool.acquire(capacity) if self.pool else bytearray(capacity)
+
+    def __len__(self) -> int:
+        return self.nbytes
+
+    def append(self, chunk: BytesLike) -> None:
+        """Copy a chunk (any contiguous buffer) onto the end of the audio."""
+        view = memoryview(chunk)
+        end = self.nbytes + view.nbytes
+        if end <= len(self._buffer):
+            self._buffer[self.nbytes : end] = view
+        elif self.pool is not None:
+            grown = self.pool.acquire(end)
+            grown[: self.nbytes] = memoryview(self._buffer)[: self.nbytes]
+            grown[self.nbytes : end] = view
+            self.pool.release(self._buffer)
+            self._buffer = grown
+        else:
+            self._buffer[self.nbytes :] = view
+        self.nbytes = end
+
+    def truncate(self, nbytes: int) -> None:
+        """Drop audio after the first nbytes (the buffer is kept for reuse)."""
+        self.nbytes = min(self.nbytes, max(0, nbytes))
+
+    def view(self) -> memoryview:
+        """View of the collected audio."""
+        return memoryview(self._buffer)[: self.nbytes]
+
+    def detach(self) -> bytearray:
+        """
+        Take the collected audio as a trimmed bytearray and reset.
+
+        The buffer itself is handed over, so this does not copy (unless
+        it is borrowed from a pool, or a view() of it is still alive).
+        """
+        if self.pool is not None:
+            audio = bytearray(self.view())
+            self.release()
+            return audio
+        try:
+            del self._buffer[self.nbytes :]
+            audio = self._buffer
+        except BufferError:
+            # An exported view pins the buffer's size; the view keeps the original
+            audio = bytearray(self.view())
+        self._buffer = bytearray()
+        self.nbytes = 0
+        return audio
+
+    def release(self) -> None:
+        """Return a pooled buffer to its pool and reset (the audio is discarded)."""
+        if self.pool is not None and len(self._buffer):
+            self.pool.release(self._buffer)
+        self._buffer = bytearray()
+        self.nbytes = 0
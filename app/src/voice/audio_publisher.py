@@ -0,0 +1,289 @@
+"""Publish TTS audio to a room as fixed-size frames with bounded buffering."""
+
+import asyncio
+from collections.abc import AsyncIterable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+import structlog
+from livekit import rtc
+
+from ..utils.audio import Resampler
+from ..utils.buffer_pool import BufferPool, get_buffer_pool
+from .audio_buffers import BytesLike
+from .clock import monotonic
+from .quantile_sketch import QuantileSketch
+
+logger = structlog.get_logger(__name__)
+
+# A frame and when it was queued; None marks the end of the utterance
+_QueueItem = tuple[rtc.AudioFrame, float] | None
+
+
+@dataclass
+class FrameRepacketizer:
+    """
+    Re-slices irregular PCM chunks into frames of exactly frame_ms.
+
+    Every frame gets its own buffer, copied out of the chunk once, so the
+    chunk's buffer may be reused after push returns (e.g. resampler
+    output). rtc.AudioFrame would copy a slice of a larger buffer anyway.
+    With a pool, frame buffers are borrowed from it; hand frames back with
+    release() once the source has consumed them. Audio straddling two
+    chunks is assembled in a frame buffer, which becomes the frame
+    without another copy.
+    """
+
+    sample_rate: int
+    num_channels: int = 1
+    frame_ms: int = 20
+    pool: BufferPool | None = None
+    _pending: bytearray | None = field(default=None, init=False, repr=False)
+    _pending_bytes: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Validate the frame duration."""
+        if (self.sample_rate * self.frame_ms) % 1000:
+            raise ValueError(f"{self.frame_ms}ms is not a whole number of samples")
+
+    @property
+    def samples_per_frame(self) -> int:
+        """Samples per channel in each frame."""
+        return self.sample_rate * self.frame_ms // 1000
+
+    @property
+    def frame_bytes(self) -> int:
+        """Bytes of 16-bit PCM in each frame."""
+        return self.samples_per_frame * self.num_channels * 2
+
+    @property
+    def pending_bytes(self) -> int:
+        """Bytes carried over, waiting for the rest of their frame."""
+        return self._pending_bytes
+
+    def push(self, chunk: BytesLike) -> list[rtc.AudioFrame]:
+        """
+        Add a chunk of audio.
+
+        Returns:
+            Every frame completed by the chunk, in order
+        """
+        view = memoryview(chunk).cast("B")
+        frame_bytes = self.frame_bytes
+        frames: list[rtc.AudioFrame] = []
+        offset = 0
+
+        if self._pending is not None:
+            offset = min(frame_bytes - self._pending_bytes, len(view))
+            self._pending[self._pending_bytes : self._pending_bytes + offset] = view[:offset]
+            self._pending_bytes += offset
+            if self._pending_bytes < frame_bytes:
+                return frames
+            frames.append(self._frame(self._pending))
+            self._pending, self._pending_bytes = None, 0
+
+        while len(view) - offset >= frame_bytes:
+            buffer = self._new_buffer()
+            buffer[:] = view[offset : offset + frame_bytes]
+            frames.append(self._frame(buffer))
+            offset += frame_bytes
+
+        rest = len(view) - offset
+        if rest:
+            self._pending = self._new_buffer()
+            self._pending[:rest] = view[offset:]
+            self._pending_bytes = rest
+        return frames
+
+    def flush(self) -> rtc.AudioFrame | None:
+        """Emit the carried-over audio as a final frame padded with silence."""
+        if self._pending is None:
+            return None
+        frame, self._pending = self._pending, None
+        frame[self._pending_bytes :] = bytes(len(frame) - self._pending_bytes)
+        self._pending_bytes = 0
+        return self._frame(frame)
+
+    def release(self, frame: rtc.AudioFrame) -> None:
+        """Return a frame's buffer to the pool once the frame is consumed."""
+        buffer = frame.data.obj
+        if self.pool is not None and isinstance(buffer, bytearray):
+            self.pool.release(buffer)
+
+    def close(self) -> None:
+        """Drop carried-over audio, returning its buffer to the pool."""
+        if self._pending is not None and self.pool is not None:
+            self.pool.release(self._pending)
+        self._pending, self._pending_bytes = None, 0
+
+    def _new_buffer(self) -> bytearray:
+        if self.pool is not None:
+            return self.pool.acquire_frame(self.sample_rate, self.frame_ms, self.num_channels)
+        return bytearray(self.frame_bytes)
+
+    def _frame(self, data: BytesLike) -> rtc.AudioFrame:
+        return rtc.AudioFrame(data, self.sample_rate, self.num_channels, self.samples_per_frame)
+
+
+@dataclass
+class PublisherMetrics:
+    """Metrics for publishing audio to a room."""
+
+    utterances: int = 0
+    frames_published: int = 0
+    queue_high_water: int = 0
+    # Frame enqueued -> accepted by AudioSource.capture_frame
+    enqueue_to_capture_sketch: QuantileSketch = field(default_factory=QuantileSketch, repr=False)
+    # First TTS byte received -> first frame accepted by the source
+    first_byte_to_publish_sketch: QuantileSketch = field(default_factory=QuantileSketch, repr=False)
+
+
+@dataclass
+class AudioPublisher:
+    """
+    Feeds a TTS audio stream to an rtc.AudioSource as fixed-size frames.
+
+    Audio at another sample rate is resampled to the source's rate (the
+    room runs at 48kHz, ElevenLabs at 24kHz). The stream is then
+    repacketized into exact frame_ms frames and handed to a capture task
+    through a small bounded queue. When the source falls behind, the
+    queue fills and pulling from the TTS stream pauses (backpressure)
+    instead of buffering the whole utterance, and the source always
+    receives evenly sized frames for smooth playout.
+
+    Frame and resampler buffers are borrowed from ``pool`` (the
+    process-wide pool by default, None to allocate them) and returned
+    once the source has consumed them.
+    """
+
+    source: rtc.AudioSource
+    frame_ms: int = 20
+    queue_frames: int = 5
+    metrics: PublisherMetrics = field(default_factory=PublisherMetrics)
+    pool: BufferPool | None = field(default_factory=get_buffer_pool)
+
+    async def publish(
+        self, audio: AsyncIterable[BytesLike], sample_rate: int | None = None
+    ) -> None:
+        """
+        Publish a stream of 16-bit PCM chunks of any size.
+
+        Args:
+            audio: PCM chunks, e.g. TTSPipeline.synthesize_frames output
+            sample_rate: Sample rate of the chunks, defaults to the source's
+
+        Raises:
+            ValueError: If resampling is needed for a multi-channel source
+            Any error raised by the stream or by capture_frame
+        """
+        resampler = None
+        if sample_rate is not None and sample_rate != self.source.sample_rate:
+            if self.source.num_channels != 1:
+                raise ValueError("Resampled audio can only be published to a mono source")
+            resampler = Resampler(sample_rate, self.source.sample_rate, pool=self.pool)
+        repacketizer = FrameRepacketizer(
+            self.source.sample_rate,
+            self.source.num_channels,
+            self.frame_ms,
+            pool=self.pool,
+        )
+        queue: asyncio.Queue[_QueueItem] = asyncio.Queue(maxsize=self.queue_frames)
+        first_byte_at: float | None = None
+
+        async def capture() -> None:
+            published = 0
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                frame, enqueued_at = item
+                try:
+                    await self.source.capture_frame(frame)
+                finally:
+                    repacketizer.release(frame)
+                now = monotonic()
+                self.metrics.enqueue_to_capture_sketch.add((now - enqueued_at) * 1000)
+                self.metrics.frames_published += 1
+                if published == 0 and first_byte_at is not None:
+                    first_publish_ms = (now - first_byte_at) * 1000
+                    self.metrics.first_byte_to_publish_sketch.add(first_publish_ms)
+                    logger.debug(
+                        "audio_first_frame_published", latency_ms=round(first_publish_ms, 2)
+                    )
+                published += 1
+
+        capturer = asyncio.ensure_future(capture())
+        try:
+            async for chunk in audio:
+                if first_byte_at is None:
+                    first_byte_at = monotonic()
+                if resampler is not None:
+                    chunk = resampler.process(chunk)
+                await self._enqueue_frames(queue, repacketizer.push(chunk), capturer, repacketizer)
+            tail = repacketizer.flush()
+            if tail is not None:
+                await self._enqueue_frames(queue, [tail], capturer, repacketizer)
+            await self._enqueue(queue, None, capturer)
+            await capturer
+            self.metrics.utterances += 1
+        finally:
+            if not capturer.done():
+                capturer.cancel()
+            while not queue.empty():
+                item = queue.get_nowait()
+                if item is not None:
+                    repacketizer.release(item[0])
+            repacketizer.close()
+            if resampler is not None:
+                resampler.close()
+
+    async def _enqueue_frames(
+        self,
+        queue: asyncio.Queue[_QueueItem],
+        frames: list[rtc.AudioFrame],
+        capturer: asyncio.Task[None],
+        repacketizer: FrameRepacketizer,
+    ) -> None:
+        """Enqueue frames for capture, releasing any that are never queued."""
+        for index, frame in enumerate(frames):
+            try:
+                await self._enqueue(
+                    queue,
+                    (frame, monotonic()),
+                    capturer,
+                    discard=lambda item: repacketizer.release(item[0]),
+                )
+            except BaseException:
+                for unsent in frames[index + 1 :]:
+                    repacketizer.release(unsent)
+                raise
+
+    async def _enqueue(
+        self,
+        queue: asyncio.Queue[_QueueItem],
+        item: _QueueItem,
+        capturer: asyncio.Task[None],
+        discard: Callable[[Any], None] | None = None,
+    ) -> None:
+        """
+        Put an item, waiting while the queue is full unless capture has failed.
+
+        If the item is not queued (capture failed, or this was cancelled),
+        it is passed to ``discard``.
+        """
+        if queue.full():
+            put = asyncio.ensure_future(queue.put(item))
+            try:
+                await asyncio.wait({put, capturer}, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                queued = put.done()
+                if not queued:
+                    put.cancel()
+                    if discard is not None:
+                        discard(item)
+            if not queued:
+                capturer.result()  # raises the capture error
+                return
+        else:
+            queue.put_nowait(item)
+        self.metrics.queue_high_water = max(self.metrics.queue_high_water, queue.qsize())
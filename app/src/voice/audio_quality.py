@@ -1,14 +1,17 @@
 """Audio quality metrics and latency tracking for voice pipeline."""
 
-import time
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
-from typing import Optional
+from datetime import UTC, datetime
 from enum import Enum
-from statistics import mean, stdev
+from typing import Any
 
 import structlog
 
+from .clock import monotonic
+from .quantile_sketch import QuantileSketch
+from .ring_buffer import ColumnarRingBuffer
+from .rollups import DEFAULT_RESOLUTIONS, MetricRollups, RollupResolution
+
 logger = structlog.get_logger(__name__)
 
 
@@ -30,8 +33,12 @@ class LatencyMeasurement:
 
     phase: LatencyPhase
     duration_ms: float
-    timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
-    metadata: dict = field(default_factory=dict)
+    timestamp: datetime = field(default_factory=lambda: datetime.now(UTC))
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+
+# Phases recorded per measurement; each maps to PipelineLatency.<phase>_latency_ms
+LATENCY_PHASES = ("stt", "processing", "tts", "total")
 
 
 @dataclass
@@ -42,7 +49,7 @@ class PipelineLatency:
     processing_latency_ms: float
     tts_latency_ms: float
     total_latency_ms: float
-    timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    timestamp: datetime = field(default_factory=lambda: datetime.now(UTC))
 
     @property
     def meets_target(self) -> bool:
@@ -57,7 +64,9 @@ class LatencyTracker:
 
     Provides:
     - Per-phase timing
-    - Rolling averages
+    - Rolling averages (O(1) reads from a columnar ring buffer)
+    - Streaming per-phase percentiles (all-time and time-windowed)
+    - Time-bucketed rollups (1s/10s/1m/1h) with constant memory
     - Target compliance tracking
     """
 
@@ -65,20 +74,31 @@ class LatencyTracker:
     target_stt_ms: float = 500.0
     target_tts_ms: float = 500.0
     window_size: int = 100
-
-    _measurements: list[PipelineLatency] = field(default_factory=list)
-    _current_phases: dict = field(default_factory=dict)
-    _start_time: Optional[float] = None
+    rollup_resolutions: tuple[RollupResolution, ...] = DEFAULT_RESOLUTIONS
+
+    _window: ColumnarRingBuffer = field(init=False, repr=False)
+    _current_phases: dict[str, float] = field(default_factory=dict)
+    _start_time: float | None = None
+    _sketches: dict[str, QuantileSketch] = field(default_factory=dict)
+    _rollups: MetricRollups = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Create the rolling window, per-phase sketches and rollups."""
+        self._window = ColumnarRingBuffer(
+            columns=LATENCY_PHASES + ("meets_target",), capacity=self.window_size
+        )
+        self._sketches = {phase: QuantileSketch() for phase in LATENCY_PHASES}
+        self._rollups = MetricRollups(metrics=LATENCY_PHASES, resolutions=self.rollup_resolutions)
 
     def start_pipeline(self) -> None:
         """Mark the start of a new pipeline execution."""
-        self._start_time = time.perf_counter()
+        self._start_time = monotonic()
         self._current_phases = {}
         logger.debug("pipeline_latency_tracking_started")
 
     def mark_phase_start(self, phase: LatencyPhase) -> None:
         """Mark the start of a phase."""
-        self._current_phases[f"{phase.value}_start"] = time.perf_counter()
+        self._current_phases[f"{phase.value}_start"] = monotonic()
 
     def mark_phase_end(self, phase: LatencyPhase) -> float:
         """
@@ -87,7 +107,7 @@ class LatencyTracker:
         Returns:
             Duration in milliseconds
         """
-        end_time = time.perf_counter()
+        end_time = monotonic()
         start_key = f"{phase.value}_start"
 
         if start_key not in self._current_phases:
@@ -108,7 +128,7 @@ class LatencyTracker:
         if self._start_time is None:
             raise RuntimeError("Pipeline tracking not started")
 
-        total_ms = (time.perf_counter() - self._start_time) * 1000
+        total_ms = (monotonic() - self._start_time) * 1000
 
         latency = PipelineLatency(
             stt_latency_ms=self._current_phases.get("stt_end_duration", 0.0),
@@ -116,61 +136,135 @@ class LatencyTracker:
             tts_latency_ms=self._current_phases.get("tts_end_duration", 0.0),
             total_latency_ms=total_ms,
         )
+        self.record(latency)
 
+        # Reset for next pipeline
+        self._start_time = None
+        self._current_phases = {}
+
+        return latency
+
+    def record(self, latency: PipelineLatency, **log_context: object) -> None:
+        """
+        Record a measurement produced outside of start/complete_pipeline.
+
+        Per-turn trackers compute their own phase breakdown and feed it here,
+        so a shared tracker never has its in-flight phase state overwritten.
+
+        Args:
+            latency: Completed pipeline latency breakdown
+            **log_context: Extra fields for the log line (e.g. room, turn)
+        """
         # Add to rolling window
-        self._measurements.append(latency)
-        if len(self._measurements) > self.window_size:
-            self._measurements.pop(0)
+        row = {phase: getattr(latency, f"{phase}_latency_ms") for phase in LATENCY_PHASES}
+        row["meets_target"] = 1.0 if latency.meets_target else 0.0
+        self._window.append(row, timestamp=latency.timestamp.timestamp())
+
+        for phase in LATENCY_PHASES:
+            self._sketches[phase].add(row[phase])
+        self._rollups.record({phase: row[phase] for phase in LATENCY_PHASES})
 
         logger.info(
             "pipeline_latency_recorded",
-            total_ms=round(total_ms, 2),
+            total_ms=round(latency.total_latency_ms, 2),
             stt_ms=round(latency.stt_latency_ms, 2),
             tts_ms=round(latency.tts_latency_ms, 2),
             meets_target=latency.meets_target,
+            **log_context,
         )
 
-        # Reset for next pipeline
-        self._start_time = None
-        self._current_phases = {}
-
-        return latency
-
-    def get_average_latencies(self) -> dict:
+    def get_average_latencies(self) -> dict[str, Any]:
         """Get average latencies across the measurement window."""
-        if not self._measurements:
-            return {
-                "stt_avg_ms": 0.0,
-                "processing_avg_ms": 0.0,
-                "tts_avg_ms": 0.0,
-                "total_avg_ms": 0.0,
-                "sample_count": 0,
-            }
-
+        averages = {f"{phase}_avg_ms": self._window.mean(phase) for phase in LATENCY_PHASES}
+        averages["sample_count"] = len(self._window)
+        return averages
+
+    def get_window_stats(self, phase: str = "total") -> dict[str, Any]:
+        """Get mean, min, max and standard deviation of a phase over the window."""
+        if phase not in LATENCY_PHASES:
+            raise ValueError(f"Unknown latency phase: {phase}")
         return {
-            "stt_avg_ms": mean(m.stt_latency_ms for m in self._measurements),
-            "processing_avg_ms": mean(m.processing_latency_ms for m in self._measurements),
-            "tts_avg_ms": mean(m.tts_latency_ms for m in self._measurements),
-            "total_avg_ms": mean(m.total_latency_ms for m in self._measurements),
-            "sample_count": len(self._measurements),
+            "mean_ms": self._window.mean(phase),
+            "min_ms": self._window.min(phase),
+            "max_ms": self._window.max(phase),
+            "std_dev_ms": self._window.std_dev(phase),
+            "sample_count": len(self._window),
         }
 
-    def get_percentile_latency(self, percentile: float = 95.0) -> float:
-        """Get the specified percentile of total latency."""
-        if not self._measurements:
-            return 0.0
+    @property
+    def window(self) -> ColumnarRingBuffer:
+        """Raw measurement window, for vectorized ad-hoc queries."""
+        return self._window
+
+    def get_percentile_latency(
+        self,
+        percentile: float = 95.0,
+        phase: str = "total",
+        window_seconds: float | None = None,
+    ) -> float:
+        """
+        Get the specified percentile of a phase's latency.
 
-        sorted_latencies = sorted(m.total_latency_ms for m in self._measurements)
-        index = int(len(sorted_latencies) * (percentile / 100))
-        return sorted_latencies[min(index, len(sorted_latencies) - 1)]
+        Args:
+            percentile: Percentile from 0 to 100
+            phase: One of LATENCY_PHASES
+            window_seconds: Only consider the most recent window (up to the
+                longest rollup span); all-time when None
+
+        Returns:
+            Estimated latency in milliseconds (within 1% relative error)
+        """
+        return self.get_sketch(phase, window_seconds).percentile(percentile)
+
+    def get_percentiles(
+        self,
+        phase: str = "total",
+        window_seconds: float | None = None,
+        percentiles: tuple[float, ...] = (50.0, 95.0, 99.0),
+    ) -> dict[str, Any]:
+        """Get several percentiles of a phase's latency at once."""
+        sketch = self.get_sketch(phase, window_seconds)
+        return {f"p{p:g}": sketch.percentile(p) for p in percentiles}
+
+    def get_sketch(
+        self, phase: str = "total", window_seconds: float | None = None
+    ) -> QuantileSketch:
+        """
+        Get a phase's quantile sketch.
+
+        The all-time sketch is returned as a copy so callers can merge
+        sketches from several workers without touching live state.
+        """
+        if phase not in self._sketches:
+            raise ValueError(f"Unknown latency phase: {phase}")
+        if window_seconds is None:
+            return self._sketches[phase].copy()
+        return self._rollups.query(phase, window_seconds)
+
+    def get_window_summary(self, window_seconds: float, phase: str = "total") -> dict[str, Any]:
+        """
+        Summarize a phase over a recent time window from the rollups.
+
+        e.g. ``get_window_summary(300)["p95"]`` is the p95 total latency
+        over the last five minutes, answered without scanning samples.
+        """
+        if phase not in LATENCY_PHASES:
+            raise ValueError(f"Unknown latency phase: {phase}")
+        return self._rollups.summary(phase, window_seconds)
+
+    @property
+    def rollups(self) -> MetricRollups:
+        """Time-bucketed rollups for every phase."""
+        return self._rollups
+
+    def merge_sketches(self, sketches: dict[str, QuantileSketch]) -> None:
+        """Fold all-time sketches from another tracker (e.g. another worker) into this one."""
+        for phase, sketch in sketches.items():
+            self._sketches[phase].merge(sketch)
 
     def get_target_compliance_rate(self) -> float:
         """Get the percentage of measurements meeting the target."""
-        if not self._measurements:
-            return 0.0
-
-        compliant = sum(1 for m in self._measurements if m.meets_target)
-        return compliant / len(self._measurements)
+        return self._window.mean("meets_target")
 
 
 @dataclass
@@ -181,18 +275,37 @@ class AudioQualityMetrics:
     Provides:
     - Signal-to-noise ratio estimation
     - Voice activity detection stats
-    - Quality scoring
+    - Quality scoring with O(1) windowed statistics
+    - Time-bucketed rollups of quality scores
     """
 
-    quality_scores: list[float] = field(default_factory=list)
     window_size: int = 50
+    rollup_resolutions: tuple[RollupResolution, ...] = DEFAULT_RESOLUTIONS
 
     # Quality thresholds
     excellent_threshold: float = 8.0
     good_threshold: float = 6.0
     acceptable_threshold: float = 4.0
 
-    def record_quality_score(self, score: float, metadata: Optional[dict] = None) -> None:
+    _scores: ColumnarRingBuffer = field(init=False, repr=False)
+    _rollups: MetricRollups = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Allocate the score window and rollups."""
+        self._scores = ColumnarRingBuffer(
+            columns=("score", "acceptable"), capacity=self.window_size
+        )
+        self._rollups = self._new_rollups()
+
+    def _new_rollups(self) -> MetricRollups:
+        return MetricRollups(metrics=("score",), resolutions=self.rollup_resolutions)
+
+    @property
+    def recent_scores(self) -> tuple[float, ...]:
+        """Scores in the current window, oldest first (read-only)."""
+        return tuple(self._scores.column("score").tolist())
+
+    def record_quality_score(self, score: float, metadata: dict[str, Any] | None = None) -> None:
         """
         Record a quality score (0-10 scale).
 
@@ -201,10 +314,13 @@ class AudioQualityMetrics:
             metadata: Optional additional context
         """
         clamped_score = max(0.0, min(10.0, score))
-        self.quality_scores.append(clamped_score)
-
-        if len(self.quality_scores) > self.window_size:
-            self.quality_scores.pop(0)
+        self._scores.append(
+            {
+                "score": clamped_score,
+                "acceptable": 1.0 if clamped_score >= self.acceptable_threshold else 0.0,
+            }
+        )
+        self._rollups.record({"score": clamped_score})
 
         quality_level = self._get_quality_level(clamped_score)
         logger.debug(
@@ -227,40 +343,31 @@ class AudioQualityMetrics:
 
     def get_average_quality(self) -> float:
         """Get average quality score."""
-        if not self.quality_scores:
-            return 0.0
-        return mean(self.quality_scores)
+        return self._scores.mean("score")
 
-    def get_quality_stats(self) -> dict:
+    def get_quality_stats(self) -> dict[str, Any]:
         """Get comprehensive quality statistics."""
-        if not self.quality_scores:
-            return {
-                "average": 0.0,
-                "min": 0.0,
-                "max": 0.0,
-                "std_dev": 0.0,
-                "sample_count": 0,
-                "acceptable_rate": 0.0,
-            }
-
         return {
-            "average": mean(self.quality_scores),
-            "min": min(self.quality_scores),
-            "max": max(self.quality_scores),
-            "std_dev": stdev(self.quality_scores) if len(self.quality_scores) > 1 else 0.0,
-            "sample_count": len(self.quality_scores),
-            "acceptable_rate": sum(
-                1 for s in self.quality_scores if s >= self.acceptable_threshold
-            ) / len(self.quality_scores),
+            "average": self._scores.mean("score"),
+            "min": self._scores.min("score"),
+            "max": self._scores.max("score"),
+            "std_dev": self._scores.std_dev("score"),
+            "sample_count": len(self._scores),
+            "acceptable_rate": self._scores.mean("acceptable"),
         }
 
+    def get_window_summary(self, window_seconds: float) -> dict[str, Any]:
+        """Summarize quality scores over a recent time window from the rollups."""
+        return self._rollups.summary("score", window_seconds)
+
     def meets_minimum_standard(self, min_score: float = 6.0) -> bool:
         """Check if average quality meets minimum standard."""
         return self.get_average_quality() >= min_score
 
     def reset(self) -> None:
-        """Reset all quality measurements."""
-        self.quality_scores = []
+        """Reset all quality measurements, windowed and rolled up."""
+        self._scores.clear()
+        self._rollups = self._new_rollups()
 
 
 def create_latency_tracker(
@@ -0,0 +1,106 @@
+"""Shared monotonic clock, and mapping of audio-stream offsets onto it."""
+
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+# Gap between where a stream's audio should have been captured and where
+# it was, beyond which the stream is re-anchored (e.g. silence dropped by
+# a SpeechGate); smaller differences are delivery jitter
+REANCHOR_TOLERANCE_S = 0.1
+
+
+def monotonic() -> float:
+    """
+    High-resolution monotonic time in seconds.
+
+    Every pipeline latency (STT, TTS, turn tracking, deadlines) is taken
+    from this clock so marks from different stages can be subtracted.
+    It is time.perf_counter(), so marks taken with that directly agree.
+    """
+    return time.perf_counter()
+
+
+def elapsed_ms(since: float, now: float | None = None) -> float:
+    """Milliseconds from a monotonic() mark to ``now`` (defaults to now)."""
+    return ((monotonic() if now is None else now) - since) * 1000
+
+
+def to_epoch_ns(at: float) -> int:
+    """Convert a monotonic() mark to unix nanoseconds, e.g. for trace spans."""
+    return time.time_ns() - int((monotonic() - at) * 1e9)
+
+
+@dataclass
+class StreamClock:
+    """
+    Maps offsets into an audio stream to monotonic() time.
+
+    Providers report transcript times as offsets into the audio they have
+    received, not wall-clock times. The clock is anchored when the stream
+    starts and advanced by every chunk sent, so an offset resolves to the
+    moment that audio was captured. Chunks sent after a gap (silence a
+    gate dropped, or a stall) add an anchor, so offsets after the gap still
+    resolve correctly; only the most recent ``max_anchors`` are kept.
+    """
+
+    clock: Callable[[], float] = monotonic
+    max_anchors: int = 256
+    _anchors: deque[tuple[float, float]] = field(init=False, repr=False)
+    _sent_s: float = field(default=0.0, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Create the anchor window."""
+        self._anchors = deque(maxlen=self.max_anchors)
+
+    @property
+    def started(self) -> bool:
+        """Whether the stream has been anchored."""
+        return bool(self._anchors)
+
+    @property
+    def sent_s(self) -> float:
+        """Seconds of audio sent on the stream so far."""
+        return self._sent_s
+
+    def start(self, at: float | None = None) -> None:
+        """Anchor offset 0 at ``at`` (defaults to now), unless already started."""
+        if not self._anchors:
+            self._anchors.append((0.0, self.clock() if at is None else at))
+
+    def push(self, duration_s: float, captured_at: float | None = None) -> None:
+        """
+        Note audio sent on the stream.
+
+        Args:
+            duration_s: Length of the audio
+            captured_at: monotonic() time its first sample was captured,
+                defaults to ``duration_s`` before now (a live frame that
+                has just arrived)
+        """
+        if captured_at is None:
+            captured_at = self.clock() - duration_s
+        if not self._anchors:
+            self._anchors.append((self._sent_s, captured_at))
+        elif captured_at - self.to_monotonic(self._sent_s) > REANCHOR_TOLERANCE_S:
+            self._anchors.append((self._sent_s, captured_at))
+        self._sent_s += duration_s
+
+    def to_monotonic(self, offset_s: float) -> float:
+        """
+        Resolve a stream offset to monotonic() time.
+
+        Offsets before the oldest kept anchor resolve relative to it. An
+        unstarted clock is started now.
+        """
+        self.start()
+        for anchor_offset, anchor_at in reversed(self._anchors):
+            if anchor_offset <= offset_s:
+                break
+        return anchor_at + (offset_s - anchor_offset)
+
+    def latency_ms(self, offset_s: float, now: float | None = None) -> float:
+        """Milliseconds from when the audio at ``offset_s`` was captured to ``now``."""
+        now = self.clock() if now is None else now
+        return max(0.0, (now - self.to_monotonic(offset_s)) * 1000)
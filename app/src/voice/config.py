@@ -1,7 +1,16 @@
 """Configuration management for voice processing."""
 
-from pydantic_settings import BaseSettings
 from pydantic import Field
+from pydantic_settings import BaseSettings
+
+# Prompts spoken verbatim, pre-synthesized at worker prewarm
+DEFAULT_STATIC_PROMPTS = {
+    "greeting": "Hello! I'm the LaunchPad voice assistant. I'm ready to help.",
+    "fallback": "Sorry, one moment please.",
+    "one_moment": "One moment please.",
+    "error_apology": "I'm sorry, something went wrong on my end. Could you say that again?",
+    "not_heard_apology": "Sorry, I didn't catch that. Could you repeat it?",
+}
 
 
 class LiveKitConfig(BaseSettings):
@@ -50,4 +59,27 @@ class VoiceProcessingConfig(BaseSettings):
     min_audio_quality_score: float = Field(default=6.0)
     min_stt_accuracy: float = Field(default=0.95)
 
+    # Metrics endpoint (0 disables it); each job process binds the first free
+    # port of METRICS_PORT .. METRICS_PORT + METRICS_PORT_RANGE - 1
+    metrics_port: int = Field(default=0, alias="METRICS_PORT")
+    metrics_port_range: int = Field(default=16, alias="METRICS_PORT_RANGE")
+
+    # Per-turn trace output as OTLP/JSON lines (empty disables it)
+    trace_file: str = Field(default="", alias="TRACE_FILE")
+
+    # Directory for the on-disk TTS audio cache (empty keeps it in memory only)
+    tts_cache_dir: str = Field(default="", alias="TTS_CACHE_DIR")
+
+    # Start the response on an interim transcript stable this long, where
+    # STTPipeline.enable_speculation is given the response stage (see speculation.py)
+    speculative_responses: bool = Field(default=False, alias="SPECULATIVE_RESPONSES")
+    speculation_stable_ms: int = Field(default=300, alias="SPECULATION_STABLE_MS")
+
+    # Static prompts synthesized at prewarm (STATIC_PROMPTS is a JSON object). Off
+    # by default: it calls the TTS provider from every job process as it starts.
+    prewarm_prompts: bool = Field(default=False, alias="PREWARM_PROMPTS")
+    static_prompts: dict[str, str] = Field(
+        default_factory=lambda: dict(DEFAULT_STATIC_PROMPTS), alias="STATIC_PROMPTS"
+    )
+
     model_config = {"env_file": ".env", "extra": "ignore"}
@@ -0,0 +1,201 @@
+"""Per-turn latency budget shared by the STT, LLM and TTS stages."""
+
+import asyncio
+from collections.abc import Awaitable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import TypeVar
+
+import structlog
+
+from .clock import monotonic
+
+logger = structlog.get_logger(__name__)
+
+T = TypeVar("T")
+
+# Phase names match LATENCY_PHASES in audio_quality
+PHASE_STT = "stt"
+PHASE_PROCESSING = "processing"
+PHASE_TTS = "tts"
+
+
+class DeadlineExceededError(TimeoutError):
+    """Raised when a stage runs out of turn budget."""
+
+    def __init__(self, phase: str, budget_ms: float) -> None:
+        super().__init__(f"Turn deadline of {budget_ms:.0f}ms exceeded during {phase or 'turn'}")
+        self.phase = phase
+
+
+@dataclass
+class DeadlineMiss:
+    """A turn whose budget ran out, and where it went."""
+
+    phase: str
+    budget_ms: float
+    elapsed_ms: float
+    consumed_ms: dict[str, float]
+
+
+@dataclass
+class TurnDeadline:
+    """
+    Latency budget for one conversational turn.
+
+    Created when the user stops speaking, the deadline is handed to every
+    stage of the turn. Each stage runs inside phase(), which accounts the
+    time it consumed; retries only run while budget remains, and awaiting
+    through run() cancels a stage as soon as the budget is exhausted. The
+    first time the budget runs out the miss is recorded with the phase that
+    was running at the time.
+    """
+
+    budget_ms: float
+    phase_budgets_ms: dict[str, float] = field(default_factory=dict)
+    started_at: float = field(default_factory=monotonic)
+    consumed_ms: dict[str, float] = field(default_factory=dict)
+    miss: DeadlineMiss | None = None
+    _phase_started: dict[str, float] = field(default_factory=dict, init=False, repr=False)
+
+    @property
+    def elapsed_ms(self) -> float:
+        """Milliseconds since the turn started."""
+        return (monotonic() - self.started_at) * 1000
+
+    def remaining_ms(self, phase: str | None = None) -> float:
+        """
+        Get the budget left, never negative.
+
+        Args:
+            phase: Also cap by this phase's own budget, if it has one
+
+        Returns:
+            Remaining milliseconds
+        """
+        remaining = self.budget_ms - self.elapsed_ms
+        if phase is not None and phase in self.phase_budgets_ms:
+            phase_remaining = self.phase_budgets_ms[phase] - self._phase_elapsed_ms(phase)
+            remaining = min(remaining, phase_remaining)
+        return max(0.0, remaining)
+
+    def _phase_elapsed_ms(self, phase: str) -> float:
+        elapsed = self.consumed_ms.get(phase, 0.0)
+        started = self._phase_started.get(phase)
+        if started is not None:
+            elapsed += (monotonic() - started) * 1000
+        return elapsed
+
+    def expired(self, phase: str | None = None) -> bool:
+        """Whether the (phase) budget is used up."""
+        return self.remaining_ms(phase) <= 0.0
+
+    def can_retry(self, delay_s: float, phase: str | None = None) -> bool:
+        """Whether sleeping for a backoff delay still leaves budget for another attempt."""
+        return self.remaining_ms(phase) > delay_s * 1000
+
+    @contextmanager
+    def phase(self, phase: str) -> Iterator["TurnDeadline"]:
+        """
+        Account the time spent in a block to a phase.
+
+        A block entered while the phase is already running (nested, or a
+        concurrent hedged request) is accounted by the block that started it.
+        """
+        if phase in self._phase_started:
+            yield self
+            return
+        self._phase_started[phase] = monotonic()
+        try:
+            yield self
+        finally:
+            started = self._phase_started.pop(phase)
+            self.consumed_ms[phase] = (
+                self.consumed_ms.get(phase, 0.0) + (monotonic() - started) * 1000
+            )
+            if self.expired():
+                self.record_miss(phase)
+
+    def check(self, phase: str) -> None:
+        """
+        Fail fast if the budget is already gone.
+
+        Raises:
+            DeadlineExceededError: If the (phase) budget is exhausted
+        """
+        if self.expired(phase):
+            self.record_miss(phase)
+            raise DeadlineExceededError(phase, self.budget_ms)
+
+    async def run(self, awaitable: Awaitable[T], phase: str) -> T:
+        """
+        Await a stage, cancelling it when the budget runs out.
+
+        Raises:
+            DeadlineExceededError: If the budget is exhausted before it completes
+        """
+        self.check(phase)
+        try:
+            return await asyncio.wait_for(awaitable, timeout=self.remaining_ms(phase) / 1000)
+        except DeadlineExceededError:
+            raise
+        except TimeoutError:
+            self.record_miss(phase)
+            raise DeadlineExceededError(phase, self.budget_ms) from None
+
+    def record_miss(self, phase: str) -> DeadlineMiss | None:
+        """
+        Record the budget running out during a phase. Only the first miss counts.
+
+        Returns:
+            The new miss, or None if one was already recorded
+        """
+        if self.miss is not None:
+            return None
+        consumed = dict(self.consumed_ms)
+        for running in self._phase_started:
+            consumed[running] = self._phase_elapsed_ms(running)
+        self.miss = DeadlineMiss(
+            phase=phase,
+            budget_ms=self.budget_ms,
+            elapsed_ms=self.elapsed_ms,
+            consumed_ms={name: round(ms, 2) for name, ms in consumed.items()},
+        )
+        logger.warning(
+            "turn_deadline_missed",
+            phase=phase,
+            budget_ms=self.budget_ms,
+            elapsed_ms=round(self.miss.elapsed_ms, 2),
+            consumed_ms=self.miss.consumed_ms,
+        )
+        return self.miss
+
+
+def create_turn_deadline(
+    total_ms: float,
+    stt_ms: float | None = None,
+    tts_ms: float | None = None,
+    started_at: float | None = None,
+) -> TurnDeadline:
+    """
+    Factory function to create a turn deadline from latency targets.
+
+    Args:
+        total_ms: Budget for the whole turn
+        stt_ms: Optional STT phase budget
+        tts_ms: Optional TTS phase budget
+        started_at: monotonic() timestamp the turn started, defaults to now
+
+    Returns:
+        Configured TurnDeadline
+    """
+    phase_budgets = {}
+    if stt_ms:
+        phase_budgets[PHASE_STT] = stt_ms
+    if tts_ms:
+        phase_budgets[PHASE_TTS] = tts_ms
+    return TurnDeadline(
+        budget_ms=total_ms,
+        phase_budgets_ms=phase_budgets,
+        started_at=monotonic() if started_at is None else started_at,
+    )
@@ -0,0 +1,187 @@
+"""Adaptive end-of-turn detection from silence and transcript cues."""
+
+import re
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from enum import Enum
+
+import structlog
+
+from .quantile_sketch import QuantileSketch
+
+logger = structlog.get_logger(__name__)
+
+# Words that leave a sentence unfinished when they end a transcript
+HOLD_WORDS = frozenset(
+    """
+    and but or so because if when while although though then than that which who
+    to of for with from in on at by about into like a an the my your our their
+    um uh er erm hmm mm
+    """.split()
+)
+
+_LAST_WORD = re.compile(r"([\w']+)\W*$")
+
+
+class TurnCue(Enum):
+    """What the transcript suggests about the end of the turn."""
+
+    HOLD = "hold"  # trailing conjunction, preposition or filler: keep waiting
+    COMMIT = "commit"  # terminal punctuation: the thought is complete
+    NEUTRAL = "neutral"
+
+
+def turn_cue(text: str) -> TurnCue:
+    """Classify the end of a transcript."""
+    stripped = text.rstrip()
+    if not stripped:
+        return TurnCue.NEUTRAL
+    if stripped.endswith("..."):
+        return TurnCue.HOLD
+    if stripped[-1] in ".?!":
+        return TurnCue.COMMIT
+    match = _LAST_WORD.search(stripped)
+    if match and match.group(1).casefold() in HOLD_WORDS:
+        return TurnCue.HOLD
+    return TurnCue.NEUTRAL
+
+
+@dataclass
+class EndpointingMetrics:
+    """Turn-end detection latency and accuracy."""
+
+    turns: int = 0
+    false_cuts: int = 0  # the speaker resumed soon after the turn was ended
+    pauses: int = 0  # silences that did not end the turn
+    held: int = 0  # turns whose end a hold cue delayed
+    committed_early: int = 0  # turns a commit cue ended sooner
+    # Silence from the end of speech to the end-of-turn decision
+    turn_end_sketch: QuantileSketch = field(default_factory=QuantileSketch, repr=False)
+
+    @property
+    def false_cut_rate(self) -> float:
+        """Share of turn ends where the speaker had not finished."""
+        if self.turns == 0:
+            return 0.0
+        return self.false_cuts / self.turns
+
+
+@dataclass
+class EndpointingController:
+    """
+    Decides when a participant's turn has ended; use one per participant.
+
+    The silence needed to end a turn starts at ``base_ms`` and, once
+    ``min_pauses`` pauses have been seen, follows the participant's own
+    pauses: the ``pause_quantile`` of their recent within-turn pauses plus
+    ``margin_ms``, kept within [min_ms, max_ms]. A turn end followed by
+    speech within ``resume_window_ms`` is counted as a false cut, and that
+    silence is learned as a pause.
+
+    The latest transcript scales the threshold: a trailing conjunction,
+    preposition or filler multiplies it by ``hold_factor``, terminal
+    punctuation by ``commit_factor``.
+
+    Drive it with on_speech() and on_silence() per audio frame (e.g. from
+    a SpeechGate) and on_transcript() per transcript. Times are monotonic
+    seconds supplied by the caller.
+    """
+
+    base_ms: float = 300.0
+    min_ms: float = 100.0
+    max_ms: float = 1200.0
+    hold_factor: float = 1.6
+    commit_factor: float = 0.5
+    pause_quantile: float = 0.9
+    margin_ms: float = 50.0
+    min_pauses: int = 5
+    pause_window: int = 50
+    resume_window_ms: float = 1000.0
+    on_turn_end: Callable[[str], None] | None = None
+    metrics: EndpointingMetrics = field(default_factory=EndpointingMetrics)
+    _pauses: deque[float] = field(init=False, repr=False)
+    _text: str = field(default="", init=False, repr=False)
+    _silence_started: float | None = field(default=None, init=False, repr=False)
+    _turn_ended_at: float | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Create the pause window."""
+        self._pauses = deque(maxlen=self.pause_window)
+
+    @property
+    def threshold_ms(self) -> float:
+        """Silence that ends a turn, before transcript cues."""
+        if len(self._pauses) < self.min_pauses:
+            return self.base_ms
+        pauses = sorted(self._pauses)
+        learned = pauses[round(self.pause_quantile * (len(pauses) - 1))] + self.margin_ms
+        return min(self.max_ms, max(self.min_ms, learned))
+
+    @property
+    def hold_ms(self) -> float:
+        """Silence that ends a turn after a hold cue: the longest the controller waits."""
+        return min(self.max_ms, self.threshold_ms * self.hold_factor)
+
+    @property
+    def turn_ended(self) -> bool:
+        """Whether the turn has ended and no speech has followed yet."""
+        return self._turn_ended_at is not None
+
+    def endpoint_ms(self, text: str | None = None) -> float:
+        """Silence that ends a turn whose transcript so far is ``text``."""
+        threshold = self.threshold_ms
+        cue = turn_cue(self._text if text is None else text)
+        if cue is TurnCue.HOLD:
+            return self.hold_ms
+        if cue is TurnCue.COMMIT:
+            return max(self.min_ms, threshold * self.commit_factor)
+        return threshold
+
+    def on_transcript(self, text: str) -> None:
+        """Note the latest transcript of the current turn (ignored once it has ended)."""
+        if self._turn_ended_at is None:
+            self._text = text
+
+    def on_speech(self, now: float) -> None:
+        """Note speech at ``now``, ending any silence."""
+        if self._silence_started is not None:
+            pause_ms = (now - self._silence_started) * 1000
+            if self._turn_ended_at is None:
+                self._pauses.append(pause_ms)
+                self.metrics.pauses += 1
+            elif (now - self._turn_ended_at) * 1000 <= self.resume_window_ms:
+                self._pauses.append(pause_ms)
+                self.metrics.false_cuts += 1
+                logger.debug("endpointing_false_cut", pause_ms=round(pause_ms, 1))
+            self._silence_started = None
+        self._turn_ended_at = None
+
+    def on_silence(self, now: float) -> bool:
+        """
+        Note silence at ``now``.
+
+        Returns:
+            True when this silence ends the turn (once per turn)
+        """
+        if self._turn_ended_at is not None:
+            return False
+        if self._silence_started is None:
+            self._silence_started = now
+            return False
+        silence_ms = (now - self._silence_started) * 1000
+        endpoint_ms = self.endpoint_ms()
+        if silence_ms < endpoint_ms:
+            return False
+
+        self._turn_ended_at = now
+        self.metrics.turns += 1
+        self.metrics.turn_end_sketch.add(silence_ms)
+        if endpoint_ms > self.threshold_ms:
+            self.metrics.held += 1
+        elif endpoint_ms < self.threshold_ms:
+            self.metrics.committed_early += 1
+        text, self._text = self._text, ""
+        if self.on_turn_end is not None:
+            self.on_turn_end(text)
+        return True
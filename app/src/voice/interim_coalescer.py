@@ -0,0 +1,180 @@
+"""Coalesce streaming interim transcripts into rate-limited deltas."""
+
+import re
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Optional
+
+from .quantile_sketch import QuantileSketch
+
+if TYPE_CHECKING:
+    from .stt_pipeline import TranscriptionResult
+
+_WORD = re.compile(r"\S+")
+
+
+def common_prefix_words(previous: str, current: str) -> tuple[int, int]:
+    """
+    Compare two transcripts word by word.
+
+    Returns:
+        Words the two share from the start, and the character offset in
+        ``current`` where the shared words end
+    """
+    shared = 0
+    offset = 0
+    for before, after in zip(_WORD.finditer(previous), _WORD.finditer(current)):
+        if before.group() != after.group():
+            break
+        shared += 1
+        offset = after.end()
+    return shared, offset
+
+
+@dataclass
+class StabilityMetrics:
+    """How often streaming interims are revised, and how early finals settle."""
+
+    interims_received: int = 0
+    interims_delivered: int = 0
+    interim_revisions: int = 0  # interims changing words an earlier interim had
+    revised_words: int = 0
+    finals: int = 0
+    final_revisions: int = 0  # finals changing words of the last interim
+    # Last interim change -> final, for finals that kept every interim word
+    final_stable_sketch: QuantileSketch = field(default_factory=QuantileSketch, repr=False)
+
+    @property
+    def interims_coalesced(self) -> int:
+        """Interims never delivered: repeats, or superseded within the interval."""
+        return self.interims_received - self.interims_delivered
+
+    @property
+    def revision_rate(self) -> float:
+        """Share of interims that revised an earlier interim's words."""
+        if self.interims_received == 0:
+            return 0.0
+        return self.interim_revisions / self.interims_received
+
+    @property
+    def final_revision_rate(self) -> float:
+        """Share of finals that revised the last interim's words."""
+        if self.finals == 0:
+            return 0.0
+        return self.final_revisions / self.finals
+
+
+@dataclass
+class InterimCoalescer:
+    """
+    Turns every-event transcripts into rate-limited deltas.
+
+    Each delivered result carries ``stable_length``, the characters it
+    shares (whole words) with the previously delivered result of the same
+    utterance, and ``delta``, the changed suffix after them; consumers
+    update what they hold with ``held[:stable_length] + delta``.
+
+    Interims repeating the last delivered text are dropped. Otherwise at
+    most one interim is delivered per ``min_interval_ms``; one arriving
+    sooner is held, replacing any held before it, until ``due_in`` says
+    it is time (see pop_due). Finals are delivered at once, discarding
+    any held interim, and start a new utterance.
+    """
+
+    min_interval_ms: float = 150.0
+    metrics: StabilityMetrics = field(default_factory=StabilityMetrics)
+    clock: Callable[[], float] = time.monotonic
+    _delivered_text: str = field(default="", init=False, repr=False)
+    _delivered_at: float | None = field(default=None, init=False, repr=False)
+    _received_text: str = field(default="", init=False, repr=False)
+    _changed_at: float | None = field(default=None, init=False, repr=False)
+    _held: Optional["TranscriptionResult"] = field(default=None, init=False, repr=False)
+
+    @property
+    def text(self) -> str:
+        """Latest interim text of the current utterance, delivered or not."""
+        return self._received_text
+
+    def stable_for_ms(self) -> float:
+        """Time since the current utterance's interim text last changed."""
+        if self._changed_at is None:
+            return 0.0
+        return (self.clock() - self._changed_at) * 1000
+
+    def push(self, result: "TranscriptionResult") -> Optional["TranscriptionResult"]:
+        """
+        Add a transcript.
+
+        Returns:
+            The result to deliver now, with its delta, or None if it was
+            dropped or held
+        """
+        now = self.clock()
+        if result.is_final:
+            return self._final(result, now)
+
+        self.metrics.interims_received += 1
+        if result.text != self._received_text:
+            shared, _ = common_prefix_words(self._received_text, result.text)
+            lost = len(_WORD.findall(self._received_text)) - shared
+            if lost:
+                self.metrics.interim_revisions += 1
+                self.metrics.revised_words += lost
+            self._received_text = result.text
+            self._changed_at = now
+
+        if result.text == self._delivered_text:
+            self._held = None
+            return None
+        if self.due_in(now) > 0:
+            self._held = result
+            return None
+        self._held = None
+        return self._deliver(result, now)
+
+    def due_in(self, now: float | None = None) -> float:
+        """Seconds until a held interim may be delivered (0 if it may be now)."""
+        if self._delivered_at is None:
+            return 0.0
+        now = self.clock() if now is None else now
+        return max(0.0, self._delivered_at + self.min_interval_ms / 1000 - now)
+
+    def pop_due(self) -> Optional["TranscriptionResult"]:
+        """Deliver the held interim if its interval has passed."""
+        if self._held is None or self.due_in() > 0:
+            return None
+        held, self._held = self._held, None
+        return self._deliver(held, self.clock())
+
+    @property
+    def holding(self) -> bool:
+        """Whether an interim is waiting for its interval."""
+        return self._held is not None
+
+    def _final(self, result: "TranscriptionResult", now: float) -> "TranscriptionResult":
+        self.metrics.finals += 1
+        shared, _ = common_prefix_words(self._received_text, result.text)
+        if shared < len(_WORD.findall(self._received_text)):
+            self.metrics.final_revisions += 1
+        elif self._changed_at is not None:
+            self.metrics.final_stable_sketch.add((now - self._changed_at) * 1000)
+
+        delivered = self._with_delta(result)
+        self._held = None
+        self._delivered_text = ""
+        self._delivered_at = None
+        self._received_text = ""
+        self._changed_at = None
+        return delivered
+
+    def _deliver(self, result: "TranscriptionResult", now: float) -> "TranscriptionResult":
+        self.metrics.interims_delivered += 1
+        delivered = self._with_delta(result)
+        self._delivered_text = result.text
+        self._delivered_at = now
+        return delivered
+
+    def _with_delta(self, result: "TranscriptionResult") -> "TranscriptionResult":
+        _, stable_length = common_prefix_words(self._delivered_text, result.text)
+        return replace(result, stable_length=stable_length, delta=result.text[stable_length:])
@@ -1,14 +1,14 @@
 """LiveKit client wrapper for voice agent infrastructure."""
 
 import asyncio
+from collections.abc import Callable
 from dataclasses import dataclass, field
-from typing import Callable, Optional
-from datetime import datetime, timezone
+from datetime import UTC, datetime
 
 import structlog
-from livekit import rtc, api
-from livekit.agents import JobContext, WorkerOptions, cli
+from livekit import api, rtc
 
+from .audio_publisher import AudioPublisher
 from .config import LiveKitConfig
 
 logger = structlog.get_logger(__name__)
@@ -18,10 +18,10 @@ logger = structlog.get_logger(__name__)
 class ConnectionMetrics:
     """Metrics for LiveKit connection health."""
 
-    connected_at: Optional[datetime] = None
-    disconnected_at: Optional[datetime] = None
+    connected_at: datetime | None = None
+    disconnected_at: datetime | None = None
     reconnect_count: int = 0
-    last_error: Optional[str] = None
+    last_error: str | None = None
     is_connected: bool = False
 
 
@@ -39,8 +39,8 @@ class LiveKitClient:
 
     config: LiveKitConfig
     metrics: ConnectionMetrics = field(default_factory=ConnectionMetrics)
-    _room: Optional[rtc.Room] = field(default=None, init=False)
-    _api_client: Optional[api.LiveKitAPI] = field(default=None, init=False)
+    _room: rtc.Room | None = field(default=None, init=False)
+    _api_client: api.LiveKitAPI | None = field(default=None, init=False)
 
     def __post_init__(self) -> None:
         """Initialize the LiveKit API client."""
@@ -55,7 +55,7 @@ class LiveKitClient:
         self,
         room_name: str,
         participant_identity: str,
-        on_track_subscribed: Optional[Callable] = None,
+        on_track_subscribed: Callable | None = None,
     ) -> rtc.Room:
         """
         Connect to a LiveKit room.
@@ -116,7 +116,7 @@ class LiveKitClient:
         def on_disconnected() -> None:
             logger.warning("room_disconnected")
             self.metrics.is_connected = False
-            self.metrics.disconnected_at = datetime.now(timezone.utc)
+            self.metrics.disconnected_at = datetime.now(UTC)
 
         @self._room.on("reconnecting")
         def on_reconnecting() -> None:
@@ -131,7 +131,7 @@ class LiveKitClient:
         try:
             await self._room.connect(self.config.url, token)
             self.metrics.is_connected = True
-            self.metrics.connected_at = datetime.now(timezone.utc)
+            self.metrics.connected_at = datetime.now(UTC)
             logger.info("room_connected", room_name=room_name)
             return self._room
 
@@ -146,7 +146,7 @@ class LiveKitClient:
             await self._room.disconnect()
             self._room = None
             self.metrics.is_connected = False
-            self.metrics.disconnected_at = datetime.now(timezone.utc)
+            self.metrics.disconnected_at = datetime.now(UTC)
             logger.info("disconnected_from_room")
 
     async def publish_audio_track(self, source: rtc.AudioSource) -> rtc.LocalAudioTrack:
@@ -172,12 +172,43 @@ class LiveKitClient:
         logger.info("audio_track_published", track_sid=publication.sid)
         return track
 
+    async def create_audio_publisher(
+        self,
+        sample_rate: int = 48000,
+        num_channels: int = 1,
+        frame_ms: int = 20,
+        queue_frames: int = 5,
+    ) -> AudioPublisher:
+        """
+        Publish a new audio track and return a publisher feeding it.
+
+        Args:
+            sample_rate: Sample rate of the track's source; TTS audio at
+                other rates is resampled to it
+            num_channels: Channels of the track's source
+            frame_ms: Frame duration handed to the source, 10 or 20ms
+            queue_frames: Frames buffered ahead of the source before the
+                TTS stream is paused
+
+        Returns:
+            An AudioPublisher for the published track
+
+        Raises:
+            ValueError: If frame_ms is not 10 or 20
+            RuntimeError: If not connected to a room
+        """
+        if frame_ms not in (10, 20):
+            raise ValueError("frame_ms must be 10 or 20")
+        source = rtc.AudioSource(sample_rate, num_channels)
+        await self.publish_audio_track(source)
+        return AudioPublisher(source=source, frame_ms=frame_ms, queue_frames=queue_frames)
+
     def get_connection_metrics(self) -> ConnectionMetrics:
         """Get current connection metrics."""
         return self.metrics
 
     @property
-    def room(self) -> Optional[rtc.Room]:
+    def room(self) -> rtc.Room | None:
         """Get the current room instance."""
         return self._room
 
@@ -187,7 +218,7 @@ class LiveKitClient:
         return self.metrics.is_connected
 
 
-def create_livekit_client(config: Optional[LiveKitConfig] = None) -> LiveKitClient:
+def create_livekit_client(config: LiveKitConfig | None = None) -> LiveKitClient:
     """
     Factory function to create a LiveKit client.
 
@@ -200,3 +231,27 @@ def create_livekit_client(config: Optional[LiveKitConfig] = None) -> LiveKitClie
     if config is None:
         config = LiveKitConfig()
     return LiveKitClient(config=config)
+
+
+async def assistant_audio_source(assistant: object) -> rtc.AudioSource | None:
+    """
+    Get the audio source a VoiceAssistant publishes its voice on.
+
+    VoiceAssistant does not expose it, so this waits on its private
+    published-track future and reads its playout's private source. If a
+    LiveKit release renames either, this logs and returns None so the
+    caller can fall back (e.g. to assistant.say()).
+    """
+    published = getattr(assistant, "_track_published_fut", None)
+    if not asyncio.isfuture(published):
+        logger.warning("assistant_audio_source_unavailable", missing="_track_published_fut")
+        return None
+    await published
+    playout = getattr(getattr(assistant, "_agent_output", None), "playout", None)
+    source = getattr(playout, "_audio_source", None)
+    if not isinstance(source, rtc.AudioSource):
+        logger.warning(
+            "assistant_audio_source_unavailable", missing="_agent_output.playout._audio_source"
+        )
+        return None
+    return source
@@ -0,0 +1,321 @@
+"""OpenMetrics/Prometheus exporter for voice pipeline metrics."""
+
+import math
+import os
+import threading
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Optional
+
+import structlog
+
+from .audio_quality import LATENCY_PHASES, AudioQualityMetrics, LatencyTracker
+from .quantile_sketch import QuantileSketch
+
+if TYPE_CHECKING:
+    from .livekit_client import ConnectionMetrics
+    from .stt_pipeline import STTMetrics
+    from .throughput import ThroughputBreakdown
+    from .tts_pipeline import TTSMetrics
+
+logger = structlog.get_logger(__name__)
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Histogram bucket upper bounds in milliseconds
+LATENCY_BUCKETS_MS = (
+    50.0,
+    100.0,
+    200.0,
+    300.0,
+    500.0,
+    750.0,
+    1000.0,
+    1500.0,
+    2000.0,
+    3000.0,
+    5000.0,
+)
+
+
+@dataclass
+class MetricsSource:
+    """
+    Metrics objects belonging to one session, plus their labels.
+
+    Any metrics object may be omitted; only the ones present are exported.
+    """
+
+    room: str
+    stt_model: str = ""
+    tts_model: str = ""
+    stt_metrics: Optional["STTMetrics"] = None
+    tts_metrics: Optional["TTSMetrics"] = None
+    connection_metrics: Optional["ConnectionMetrics"] = None
+    latency_tracker: LatencyTracker | None = None
+    quality_metrics: AudioQualityMetrics | None = None
+
+
+_BUCKET_LABELS = tuple(repr(bound) for bound in LATENCY_BUCKETS_MS)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    return ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items())
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Family:
+    """Samples for one metric family, rendered in OpenMetrics text format."""
+
+    def __init__(self, name: str, metric_type: str, help_text: str) -> None:
+        self.name = name
+        self.metric_type = metric_type
+        self.help_text = help_text
+        self.lines: list[str] = []
+
+    def sample(self, value: float, suffix: str = "", **labels: str) -> None:
+        self.sample_with(_labels(**labels), value, suffix)
+
+    def sample_with(self, label_str: str, value: float, suffix: str = "") -> None:
+        """Add a sample using an already-rendered label string."""
+        self.lines.append(f"{self.name}{suffix}{{{label_str}}} {_number(value)}")
+
+    def histogram(self, sketch: QuantileSketch, **labels: str) -> None:
+        label_str = _labels(**labels)
+        bucket = f"{self.name}_bucket{{{label_str},le="
+        counts = sketch.cumulative_counts(LATENCY_BUCKETS_MS)
+        self.lines.extend(f'{bucket}"{le}"}} {count}' for le, count in zip(_BUCKET_LABELS, counts))
+        self.lines.append(f'{bucket}"+Inf"}} {sketch.count}')
+        self.sample_with(label_str, sketch.count, "_count")
+        self.sample_with(label_str, sketch.total, "_sum")
+
+    def render(self) -> str:
+        header = f"# TYPE {self.name} {self.metric_type}\n# HELP {self.name} {self.help_text}\n"
+        return header + "".join(line + "\n" for line in self.lines)
+
+
+class MetricsRegistry:
+    """
+    Registry of per-session metrics sources.
+
+    Registration swaps an immutable tuple, so a scrape running on another
+    thread reads a consistent source list without taking any lock. Metric
+    values are read straight from the live dataclasses; each individual
+    read is atomic under the GIL and the audio event loop is never
+    blocked or awaited on.
+    """
+
+    def __init__(self, namespace: str = "launchpad") -> None:
+        self.namespace = namespace
+        self._sources: tuple[MetricsSource, ...] = ()
+
+    def register(self, source: MetricsSource) -> MetricsSource:
+        """Start exporting a session's metrics."""
+        self._sources = self._sources + (source,)
+        return source
+
+    def unregister(self, source: MetricsSource) -> None:
+        """Stop exporting a session's metrics."""
+        self._sources = tuple(s for s in self._sources if s is not source)
+
+    @property
+    def sources(self) -> tuple[MetricsSource, ...]:
+        """Currently registered sources."""
+        return self._sources
+
+    def render(self) -> str:
+        """Render every registered source in OpenMetrics text format."""
+        ns = self.namespace
+        families = {
+            name: _Family(f"{ns}_{name}", metric_type, help_text)
+            for name, metric_type, help_text in (
+                ("stt_transcriptions", "counter", "Transcription events processed"),
+                ("stt_failures", "counter", "Failed transcriptions"),
+                ("stt_latency_ms", "histogram", "Transcription latency in milliseconds"),
+                ("tts_syntheses", "counter", "Synthesis requests processed"),
+                ("tts_failures", "counter", "Failed syntheses"),
+                ("tts_characters", "counter", "Characters synthesized"),
+                ("tts_latency_ms", "histogram", "Synthesis latency in milliseconds"),
+                ("stt_audio_seconds", "counter", "Audio sent for transcription, in seconds"),
+                ("stt_processing_seconds", "counter", "Transcription time; over audio, the RTF"),
+                ("stt_ttfb_ms", "histogram", "Transcription time to first result in ms"),
+                ("stt_bytes_sent", "counter", "Bytes sent to the STT provider"),
+                ("stt_bytes_received", "counter", "Bytes from the STT provider"),
+                ("tts_audio_seconds", "counter", "Audio synthesized, in seconds"),
+                ("tts_processing_seconds", "counter", "Synthesis time; over audio, the RTF"),
+                ("tts_ttfb_ms", "histogram", "Synthesis time to first result in ms"),
+                ("tts_bytes_sent", "counter", "Bytes sent to the TTS provider"),
+                ("tts_bytes_received", "counter", "Bytes from the TTS provider"),
+                ("livekit_connected", "gauge", "1 while connected to the room"),
+                ("livekit_reconnects", "counter", "Room reconnect attempts"),
+                ("pipeline_latency_ms", "histogram", "Per-turn pipeline latency by phase"),
+                ("pipeline_target_compliance", "gauge", "Share of turns under target"),
+                ("audio_quality_score", "gauge", "Average audio quality score (0-10)"),
+                ("audio_quality_samples", "gauge", "Quality scores in the window"),
+            )
+        }
+
+        for source in self._sources:
+            self._collect(source, families)
+
+        return "".join(family.render() for family in families.values()) + "# EOF\n"
+
+    def _collect(self, source: MetricsSource, families: dict[str, _Family]) -> None:
+        room = source.room
+
+        stt = source.stt_metrics
+        if stt is not None:
+            labels = {"room": room, "model": source.stt_model}
+            families["stt_transcriptions"].sample(stt.total_transcriptions, "_total", **labels)
+            families["stt_failures"].sample(stt.failed_transcriptions, "_total", **labels)
+            families["stt_latency_ms"].histogram(stt.latency_sketch.copy(), **labels)
+            self._collect_throughput("stt", "model", stt.throughput, room, families)
+
+        tts = source.tts_metrics
+        if tts is not None:
+            labels = {"room": room, "model": source.tts_model}
+            families["tts_syntheses"].sample(tts.total_syntheses, "_total", **labels)
+            families["tts_failures"].sample(tts.failed_syntheses, "_total", **labels)
+            families["tts_characters"].sample(tts.total_characters_processed, "_total", **labels)
+            families["tts_latency_ms"].histogram(tts.latency_sketch.copy(), **labels)
+            self._collect_throughput("tts", "voice", tts.throughput, room, families)
+
+        connection = source.connection_metrics
+        if connection is not None:
+            families["livekit_connected"].sample(int(connection.is_connected), room=room)
+            families["livekit_reconnects"].sample(connection.reconnect_count, "_total", room=room)
+
+        tracker = source.latency_tracker
+        if tracker is not None:
+            for phase in LATENCY_PHASES:
+                families["pipeline_latency_ms"].histogram(
+                    tracker.get_sketch(phase), room=room, phase=phase
+                )
+            families["pipeline_target_compliance"].sample(
+                tracker.get_target_compliance_rate(), room=room
+            )
+
+        quality = source.quality_metrics
+        if quality is not None:
+            families["audio_quality_score"].sample(quality.get_average_quality(), room=room)
+            families["audio_quality_samples"].sample(
+                quality.get_quality_stats()["sample_count"], room=room
+            )
+
+    @staticmethod
+    def _collect_throughput(
+        stage: str,
+        label: str,
+        throughput: "ThroughputBreakdown",
+        room: str,
+        families: dict[str, _Family],
+    ) -> None:
+        """Export a stage's throughput per model or voice."""
+        for key, metrics in list(throughput.by_key.items()):
+            labels = {"room": room, label: key}
+            families[f"{stage}_audio_seconds"].sample(metrics.audio_ms / 1000, "_total", **labels)
+            families[f"{stage}_processing_seconds"].sample(
+                metrics.processing_ms / 1000, "_total", **labels
+            )
+            families[f"{stage}_ttfb_ms"].histogram(metrics.ttfb_sketch.copy(), **labels)
+            families[f"{stage}_bytes_sent"].sample(metrics.bytes_sent, "_total", **labels)
+            families[f"{stage}_bytes_received"].sample(metrics.bytes_received, "_total", **labels)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        """Silence per-request access logs."""
+
+
+class MetricsServer:
+    """
+    HTTP endpoint serving ``/metrics`` from a daemon thread.
+
+    Rendering happens on the server thread, never on the audio event loop.
+    """
+
+    def __init__(self, registry: MetricsRegistry, host: str = "0.0.0.0", port: int = 9464):
+        handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def port(self) -> int:
+        """Bound port (useful when started with port 0)."""
+        return self._server.server_address[1]
+
+    def start(self) -> None:
+        """Start serving in a background daemon thread."""
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="metrics-server", daemon=True
+        )
+        self._thread.start()
+        logger.info("metrics_server_started", port=self.port, pid=os.getpid())
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        logger.info("metrics_server_stopped")
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Get the process-wide metrics registry."""
+    return _registry
+
+
+def start_metrics_server(
+    port: int,
+    host: str = "0.0.0.0",
+    registry: MetricsRegistry | None = None,
+    port_range: int = 1,
+) -> MetricsServer | None:
+    """
+    Start the metrics endpoint, logging instead of failing if no port is free.
+
+    The registry is per process, so each worker process needs its own
+    endpoint: with ``port_range`` > 1 the first free port from ``port``
+    upwards is bound, and the scraper targets the whole range.
+
+    Returns:
+        The running server, or None if it could not bind
+    """
+    error: OSError | None = None
+    for candidate in range(port, port + max(1, port_range)):
+        try:
+            server = MetricsServer(registry or _registry, host=host, port=candidate)
+        except OSError as e:
+            error = e
+            continue
+        server.start()
+        return server
+    logger.warning("metrics_server_bind_failed", port=port, port_range=port_range, error=str(error))
+    return None
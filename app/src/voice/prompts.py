@@ -0,0 +1,173 @@
+"""Static prompts pre-synthesized at worker prewarm, held as ready-to-publish frames."""
+
+import asyncio
+import os
+import resource
+import time
+from dataclasses import dataclass, field
+
+import structlog
+from livekit import rtc
+
+from .tts_pipeline import TTSPipeline
+
+logger = structlog.get_logger(__name__)
+
+
+def _rss_bytes() -> int:
+    """Current resident set size (falls back to the peak where /proc is missing)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def pcm_to_frames(
+    pcm: bytes | bytearray | memoryview, sample_rate: int, frame_ms: int = 20
+) -> list[rtc.AudioFrame]:
+    """
+    Split 16-bit mono PCM into fixed-duration frames.
+
+    The last frame is padded with silence so every frame has the same size.
+    """
+    samples_per_frame = sample_rate * frame_ms // 1000
+    frame_bytes = samples_per_frame * 2
+    frames = []
+    for offset in range(0, len(pcm), frame_bytes):
+        chunk = pcm[offset : offset + frame_bytes]
+        if len(chunk) < frame_bytes:
+            chunk = bytes(chunk) + bytes(frame_bytes - len(chunk))
+        frames.append(rtc.AudioFrame(chunk, sample_rate, 1, samples_per_frame))
+    return frames
+
+
+@dataclass
+class PreparedPrompt:
+    """A prompt synthesized ahead of time."""
+
+    name: str
+    text: str
+    frames: list[rtc.AudioFrame]
+    sample_rate: int
+
+    @property
+    def duration_ms(self) -> float:
+        """Playback duration."""
+        return sum(frame.samples_per_channel for frame in self.frames) / self.sample_rate * 1000
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes of audio held by the frames."""
+        return sum(frame.data.nbytes for frame in self.frames)
+
+
+@dataclass
+class PrewarmReport:
+    """What prewarming the prompts cost, for sizing worker processes."""
+
+    prompt_count: int = 0
+    failed: list[str] = field(default_factory=list)
+    duration_ms: float = 0.0
+    audio_bytes: int = 0
+    rss_delta_bytes: int = 0
+
+
+@dataclass
+class PromptLibrary:
+    """Prepared prompts by name."""
+
+    prompts: dict[str, PreparedPrompt] = field(default_factory=dict)
+    report: PrewarmReport = field(default_factory=PrewarmReport)
+
+    def get(self, name: str) -> PreparedPrompt | None:
+        """Get a prepared prompt, or None if it was not (successfully) prewarmed."""
+        return self.prompts.get(name)
+
+    @property
+    def memory_bytes(self) -> int:
+        """Bytes of audio held by all prompts."""
+        return sum(prompt.nbytes for prompt in self.prompts.values())
+
+    async def play(self, name: str, source: rtc.AudioSource) -> bool:
+        """
+        Publish a prepared prompt's frames to an audio source.
+
+        Returns:
+            False if the prompt is not available, so the caller can synthesize it
+        """
+        prompt = self.prompts.get(name)
+        if prompt is None:
+            return False
+        for frame in prompt.frames:
+            await source.capture_frame(frame)
+        logger.debug("prompt_played", prompt=name, duration_ms=round(prompt.duration_ms, 1))
+        return True
+
+
+async def prepare_prompts(
+    pipeline: TTSPipeline, prompts: dict[str, str], frame_ms: int = 20
+) -> PromptLibrary:
+    """
+    Synthesize prompts concurrently into ready-to-publish frames.
+
+    Prompts that fail to synthesize are skipped and listed in the report.
+
+    Args:
+        pipeline: TTS pipeline for the configured voice
+        prompts: Prompt text by name
+        frame_ms: Frame duration
+
+    Returns:
+        PromptLibrary with a PrewarmReport
+    """
+    start = time.perf_counter()
+    rss_before = _rss_bytes()
+    library = PromptLibrary()
+
+    names = list(prompts)
+    results = await asyncio.gather(
+        *(pipeline.synthesize(prompts[name]) for name in names), return_exceptions=True
+    )
+    for name, result in zip(names, results):
+        if isinstance(result, BaseException):
+            library.report.failed.append(name)
+            logger.warning("prompt_prewarm_failed", prompt=name, error=str(result))
+            continue
+        library.prompts[name] = PreparedPrompt(
+            name=name,
+            text=prompts[name],
+            frames=pcm_to_frames(result.audio_data, result.sample_rate, frame_ms),
+            sample_rate=result.sample_rate,
+        )
+
+    report = library.report
+    report.prompt_count = len(library.prompts)
+    report.duration_ms = (time.perf_counter() - start) * 1000
+    report.audio_bytes = library.memory_bytes
+    report.rss_delta_bytes = _rss_bytes() - rss_before
+    logger.info(
+        "prompts_prewarmed",
+        prompt_count=report.prompt_count,
+        failed=report.failed,
+        duration_ms=round(report.duration_ms, 1),
+        audio_bytes=report.audio_bytes,
+        rss_delta_bytes=report.rss_delta_bytes,
+    )
+    return library
+
+
+def prewarm_prompts(
+    pipeline: TTSPipeline, prompts: dict[str, str], frame_ms: int = 20
+) -> PromptLibrary:
+    """
+    Synchronous prepare_prompts for the worker prewarm hook.
+
+    Never raises: a failure yields an empty library and callers fall back
+    to synthesizing on demand.
+    """
+    try:
+        return asyncio.run(prepare_prompts(pipeline, prompts, frame_ms))
+    except Exception as e:
+        logger.warning("prompt_prewarm_skipped", error=str(e))
+        return PromptLibrary(report=PrewarmReport(failed=list(prompts)))
@@ -0,0 +1,361 @@
+"""Mergeable streaming quantile sketches for latency percentiles."""
+
+import heapq
+import math
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass
+class QuantileSketch:
+    """
+    Log-bucketed streaming quantile sketch (DDSketch-style).
+
+    Values fall into buckets whose bounds grow geometrically, so every
+    quantile estimate is within ``relative_accuracy`` of the true value.
+    Recording is O(1) for an existing bucket and O(log buckets) for a new
+    one (its key joins a heap, so the lowest buckets collapse without a
+    sort), memory is bounded by ``max_buckets``, and two
+    sketches with the same parameters merge exactly by adding bucket
+    counts - merging per-worker sketches gives the same result as one
+    sketch fed every sample.
+    """
+
+    relative_accuracy: float = 0.01
+    max_buckets: int = 2048
+    min_value: float = 1e-3  # values at or below count as zero
+
+    count: int = 0
+    total: float = 0.0
+    min: float = math.inf
+    max: float = -math.inf
+    _bins: dict[int, int] = field(default_factory=dict, repr=False)
+    _keys: list[int] = field(default_factory=list, repr=False)  # heap of _bins keys
+    _zero_count: int = field(default=0, repr=False)
+
+    def __post_init__(self) -> None:
+        """Derive the bucket growth factor from the accuracy target."""
+        if not 0.0 < self.relative_accuracy < 1.0:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self._gamma = (1 + self.relative_accuracy) / (1 - self.relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+
+    def add(self, value: float, weight: int = 1) -> None:
+        """
+        Record a value.
+
+        Args:
+            value: Sample to record (negative values count as zero, NaN
+                and infinities are ignored)
+            weight: Number of occurrences of the value
+        """
+        if not math.isfinite(value):
+            return
+        self.count += weight
+        self.total += value * weight
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+        if value <= self.min_value:
+            self._zero_count += weight
+            return
+
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self._add_to_bin(key, weight)
+        if len(self._bins) > self.max_buckets:
+            self._collapse_lowest()
+
+    def _add_to_bin(self, key: int, weight: int) -> None:
+        """Add to a bucket, tracking new keys in the heap."""
+        if key in self._bins:
+            self._bins[key] += weight
+        else:
+            self._bins[key] = weight
+            heapq.heappush(self._keys, key)
+
+    def _collapse_lowest(self) -> None:
+        """Fold the two lowest buckets together to respect max_buckets."""
+        lowest = heapq.heappop(self._keys)
+        self._bins[self._keys[0]] += self._bins.pop(lowest)
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """
+        Merge another sketch into this one.
+
+        Raises:
+            ValueError: If the sketches were built with different parameters
+        """
+        if (
+            other.relative_accuracy != self.relative_accuracy
+            or other.max_buckets != self.max_buckets
+            or other.min_value != self.min_value
+        ):
+            raise ValueError("Cannot merge sketches with different parameters")
+        if other.count == 0:
+            return
+
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._zero_count += other._zero_count
+        for key, bin_count in other._bins.copy().items():
+            self._add_to_bin(key, bin_count)
+        while len(self._bins) > self.max_buckets:
+            self._collapse_lowest()
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate the q-quantile.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Estimated value, 0.0 for an empty sketch
+        """
+        if not 0.0 <= q <= 1.0:
+            raise ValueError("q must be between 0 and 1")
+        if self.count == 0:
+            return 0.0
+
+        rank = q * (self.count - 1)
+        if rank < self._zero_count:
+            return max(0.0, self.min)
+
+        cumulative = self._zero_count
+        for key in sorted(self._bins):
+            cumulative += self._bins[key]
+            if cumulative > rank:
+                estimate = 2 * self._gamma**key / (self._gamma + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    def percentile(self, percentile: float) -> float:
+        """Estimate a percentile (0-100)."""
+        return self.quantile(percentile / 100)
+
+    @property
+    def mean(self) -> float:
+        """Mean of all recorded values."""
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def bucket_count(self) -> int:
+        """Number of non-empty buckets currently held."""
+        return len(self._bins) + (1 if self._zero_count else 0)
+
+    def copy(self) -> "QuantileSketch":
+        """
+        Return an independent copy of this sketch.
+
+        The bucket dict is copied in a single C-level call, so a copy taken
+        from another thread (e.g. a metrics scrape) never sees a dict that
+        changes size mid-iteration.
+        """
+        clone = self.empty_like()
+        clone._bins = self._bins.copy()
+        clone._keys = list(clone._bins)
+        heapq.heapify(clone._keys)
+        clone._zero_count = self._zero_count
+        clone.count = self.count
+        clone.total = self.total
+        clone.min = self.min
+        clone.max = self.max
+        return clone
+
+    def cumulative_counts(self, bounds: Iterable[float]) -> list[int]:
+        """
+        Count values at or below each bound, for histogram export.
+
+        Each bucket is attributed to its representative value, so counts
+        carry the same relative error as quantile estimates.
+
+        Args:
+            bounds: Ascending upper bounds
+
+        Returns:
+            Cumulative count per bound
+        """
+        bins = sorted(self._bins.copy().items())
+        counts: list[int] = []
+        cumulative = self._zero_count
+        index = 0
+        for bound in bounds:
+            while index < len(bins):
+                key, bin_count = bins[index]
+                if 2 * self._gamma**key / (self._gamma + 1) > bound:
+                    break
+                cumulative += bin_count
+                index += 1
+            counts.append(cumulative)
+        return counts
+
+    def empty_like(self) -> "QuantileSketch":
+        """Return an empty sketch with the same parameters."""
+        return QuantileSketch(
+            relative_accuracy=self.relative_accuracy,
+            max_buckets=self.max_buckets,
+            min_value=self.min_value,
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize for shipping between worker processes."""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "max_buckets": self.max_buckets,
+            "min_value": self.min_value,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "zero_count": self._zero_count,
+            "bins": {str(k): v for k, v in self._bins.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "QuantileSketch":
+        """Rebuild a sketch serialized with to_dict."""
+        sketch = cls(
+            relative_accuracy=data["relative_accuracy"],
+            max_buckets=data["max_buckets"],
+            min_value=data["min_value"],
+        )
+        sketch.count = data["count"]
+        sketch.total = data["total"]
+        if data["min"] is not None:
+            sketch.min = data["min"]
+            sketch.max = data["max"]
+        sketch._zero_count = data["zero_count"]
+        sketch._bins = {int(k): v for k, v in data["bins"].items()}
+        sketch._keys = list(sketch._bins)
+        heapq.heapify(sketch._keys)
+        return sketch
+
+
+@dataclass
+class SlidingWindowSketch:
+    """
+    Quantile sketch over a sliding time window.
+
+    Time is split into fixed slots, each holding its own QuantileSketch.
+    Queries merge the slots that fall inside the requested window, so the
+    cost depends on the number of slots rather than the number of samples.
+    """
+
+    slot_seconds: float = 10.0
+    num_slots: int = 30
+    relative_accuracy: float = 0.01
+    _slots: list[QuantileSketch | None] = field(default_factory=list, repr=False)
+    _slot_ids: list[int] = field(default_factory=list, repr=False)
+
+    def __post_init__(self) -> None:
+        """Allocate the slot ring."""
+        self._slots = [None] * self.num_slots
+        self._slot_ids = [-1] * self.num_slots
+
+    @property
+    def window_seconds(self) -> float:
+        """Longest window this sketch can answer."""
+        return self.slot_seconds * self.num_slots
+
+    def slot_id(self, now: float | None = None) -> int:
+        """Id of the slot covering ``now`` (time.monotonic(), defaults to now)."""
+        return int((time.monotonic() if now is None else now) // self.slot_seconds)
+
+    def _slot(self, slot_id: int) -> QuantileSketch:
+        """Get a slot's sketch, replacing the expired slot that held its index."""
+        index = slot_id % self.num_slots
+        sketch = self._slots[index]
+        if sketch is None or self._slot_ids[index] != slot_id:
+            sketch = QuantileSketch(relative_accuracy=self.relative_accuracy)
+            self._slots[index] = sketch
+            self._slot_ids[index] = slot_id
+        return sketch
+
+    def get_slot(self, slot_id: int) -> QuantileSketch | None:
+        """Get a slot's sketch if the ring still holds it."""
+        index = slot_id % self.num_slots
+        return self._slots[index] if self._slot_ids[index] == slot_id else None
+
+    def add(self, value: float, now: float | None = None) -> None:
+        """
+        Record a value in the slot for the current time.
+
+        Args:
+            value: Sample to record
+            now: time.monotonic() timestamp, defaults to now
+        """
+        self._slot(self.slot_id(now)).add(value)
+
+    def add_sketch(self, sketch: QuantileSketch, now: float | None = None) -> None:
+        """Merge a sketch of samples (e.g. a finer bucket) into the slot for ``now``."""
+        self._slot(self.slot_id(now)).merge(sketch)
+
+    def _oldest_slot_id(self, window_seconds: float | None, now: float | None) -> int:
+        """Id of the oldest slot in the most recent window."""
+        window = self.window_seconds if window_seconds is None else window_seconds
+        slots_back = min(self.num_slots, max(1, math.ceil(window / self.slot_seconds)))
+        return self.slot_id(now) - slots_back + 1
+
+    def window_start(self, window_seconds: float | None = None, now: float | None = None) -> float:
+        """Start time of the oldest slot in the most recent window (slot-granular)."""
+        return self._oldest_slot_id(window_seconds, now) * self.slot_seconds
+
+    def merged(
+        self, window_seconds: float | None = None, now: float | None = None
+    ) -> QuantileSketch:
+        """
+        Merge the slots covering the most recent window.
+
+        Args:
+            window_seconds: Window length, defaults to the full ring
+            now: time.monotonic() timestamp, defaults to now
+
+        Returns:
+            A new QuantileSketch for the window (slot-granular)
+        """
+        now = time.monotonic() if now is None else now
+        current_id = self.slot_id(now)
+        oldest_id = self._oldest_slot_id(window_seconds, now)
+
+        result = QuantileSketch(relative_accuracy=self.relative_accuracy)
+        for sketch, slot_id in zip(self._slots, self._slot_ids):
+            if sketch is not None and oldest_id <= slot_id <= current_id:
+                result.merge(sketch)
+        return result
+
+    def slots(self, now: float | None = None) -> list[tuple[float, QuantileSketch]]:
+        """
+        Get the live slots, oldest first.
+
+        Returns:
+            (slot start time, sketch) pairs for every non-expired slot
+        """
+        current_id = self.slot_id(now)
+        oldest_id = current_id - self.num_slots + 1
+        live = [
+            (slot_id, sketch)
+            for sketch, slot_id in zip(self._slots, self._slot_ids)
+            if sketch is not None and oldest_id <= slot_id <= current_id
+        ]
+        live.sort(key=lambda item: item[0])
+        return [(slot_id * self.slot_seconds, sketch) for slot_id, sketch in live]
+
+
+def merge_sketches(sketches: Iterable[QuantileSketch]) -> QuantileSketch:
+    """
+    Merge many sketches (e.g. one per worker process) into a new sketch.
+
+    Raises:
+        ValueError: If no sketches are given or their parameters differ
+    """
+    sketches = list(sketches)
+    if not sketches:
+        raise ValueError("No sketches to merge")
+    result = sketches[0].empty_like()
+    for sketch in sketches:
+        result.merge(sketch)
+    return result
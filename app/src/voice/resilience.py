@@ -0,0 +1,558 @@
+"""Shared retry, hedging and circuit-breaking for STT/TTS provider calls."""
+
+import asyncio
+import random
+from collections.abc import Awaitable, Callable
+from dataclasses import InitVar, dataclass, field
+from enum import Enum
+from typing import TypeVar
+
+import structlog
+from livekit.agents import APIError
+
+from .clock import monotonic
+from .deadline import DeadlineExceededError, TurnDeadline
+from .quantile_sketch import QuantileSketch
+
+logger = structlog.get_logger(__name__)
+
+T = TypeVar("T")
+
+
+async def retry_async(
+    func: Callable[[], Awaitable[T]],
+    max_retries: int = 3,
+    base_delay: float = 0.5,
+    max_delay: float = 5.0,
+    exponential_base: float = 2.0,
+    deadline: TurnDeadline | None = None,
+    phase: str = "",
+) -> T:
+    """
+    Retry an async function with exponential backoff.
+
+    Kept for callers that want plain serial retries; provider calls go
+    through ResiliencePolicy instead.
+
+    Args:
+        func: Async callable to retry
+        max_retries: Maximum number of retry attempts
+        base_delay: Initial delay between retries in seconds
+        max_delay: Maximum delay between retries
+        exponential_base: Base for exponential backoff calculation
+        deadline: Optional turn budget; attempts are cancelled when it runs
+            out and no backoff is slept that would outlast it
+        phase: Phase charged for a deadline miss
+
+    Returns:
+        Result from successful function call
+
+    Raises:
+        DeadlineExceededError: If the turn budget runs out first
+        Last exception if all retries fail
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            if deadline is not None:
+                return await deadline.run(func(), phase)
+            return await func()
+        except DeadlineExceededError:
+            raise
+        except Exception as e:
+            if attempt >= max_retries:
+                logger.error(
+                    "retry_exhausted",
+                    max_retries=max_retries,
+                    error=str(e),
+                )
+                raise
+            delay = min(base_delay * (exponential_base**attempt), max_delay)
+            if deadline is not None and not deadline.can_retry(delay, phase):
+                logger.warning(
+                    "retry_skipped_deadline",
+                    attempt=attempt + 1,
+                    delay=delay,
+                    remaining_ms=round(deadline.remaining_ms(phase), 2),
+                    error=str(e),
+                )
+                deadline.record_miss(phase)
+                raise DeadlineExceededError(phase, deadline.budget_ms) from e
+            logger.warning(
+                "retry_attempt",
+                attempt=attempt + 1,
+                max_retries=max_retries,
+                delay=delay,
+                error=str(e),
+            )
+            await asyncio.sleep(delay)
+    raise AssertionError("unreachable")
+
+
+def is_provider_failure(error: BaseException) -> bool:
+    """
+    Whether an error reflects the provider's health.
+
+    Only these count against a circuit breaker: connection errors,
+    timeouts and retryable provider API errors (5xx, 408, 429). Caller
+    and validation errors, and 4xx responses, say nothing about the
+    provider and must not open its circuit; neither does running out of
+    turn budget.
+    """
+    if isinstance(error, DeadlineExceededError):
+        return False
+    if isinstance(error, APIError):
+        return error.retryable
+    return isinstance(error, (OSError, TimeoutError))
+
+
+def decorrelated_jitter(
+    previous_delay: float,
+    base_delay: float,
+    max_delay: float,
+    rng: random.Random | None = None,
+) -> float:
+    """
+    Next backoff delay using decorrelated jitter.
+
+    Each delay is drawn uniformly from [base, 3 * previous], capped, so
+    clients that failed together spread out instead of retrying in lockstep.
+    """
+    upper = max(base_delay, previous_delay * 3)
+    return min(max_delay, (rng or random).uniform(base_delay, upper))
+
+
+class CircuitState(Enum):
+    """State of a circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a provider whose circuit is open."""
+
+    def __init__(self, provider: str, retry_in_s: float) -> None:
+        super().__init__(f"Circuit for {provider} is open, retry in {retry_in_s:.1f}s")
+        self.provider = provider
+        self.retry_in_s = retry_in_s
+
+
+@dataclass
+class CircuitBreaker:
+    """
+    Per-provider circuit breaker.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls fail fast for ``recovery_timeout_s``. It then half-opens and lets
+    a single probe through: success closes it, failure reopens it. A probe
+    that ends without a verdict (cancelled, or a caller error) must be
+    handed back with release_probe(); one never handed back expires after
+    ``recovery_timeout_s`` so the circuit cannot stay half-open for good.
+    """
+
+    provider: str
+    failure_threshold: int = 5
+    recovery_timeout_s: float = 10.0
+    state: CircuitState = CircuitState.CLOSED
+    consecutive_failures: int = 0
+    times_opened: int = 0
+    _opened_at: float = field(default=0.0, init=False, repr=False)
+    _probe_in_flight: bool = field(default=False, init=False, repr=False)
+    _probe_started_at: float = field(default=0.0, init=False, repr=False)
+
+    def _refresh(self, now: float) -> None:
+        if self.state == CircuitState.OPEN and now - self._opened_at >= self.recovery_timeout_s:
+            self.state = CircuitState.HALF_OPEN
+            self._probe_in_flight = False
+        elif (
+            self.state == CircuitState.HALF_OPEN
+            and self._probe_in_flight
+            and now - self._probe_started_at >= self.recovery_timeout_s
+        ):
+            logger.warning("circuit_probe_expired", provider=self.provider)
+            self._probe_in_flight = False
+
+    def allow_request(self, now: float | None = None) -> bool:
+        """Whether a call may go to the provider right now."""
+        now = monotonic() if now is None else now
+        self._refresh(now)
+        if self.state == CircuitState.CLOSED:
+            return True
+        if self.state == CircuitState.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            self._probe_started_at = now
+            return True
+        return False
+
+    def before_call(self, now: float | None = None) -> None:
+        """
+        Gate a call on the circuit.
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        now = monotonic() if now is None else now
+        if not self.allow_request(now):
+            retry_in = max(0.0, self.recovery_timeout_s - (now - self._opened_at))
+            raise CircuitOpenError(self.provider, retry_in)
+
+    def record_success(self) -> None:
+        """Record a successful call."""
+        if self.state != CircuitState.CLOSED:
+            logger.info("circuit_closed", provider=self.provider)
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """Let another probe through after one ended without a success or failure."""
+        if self.state == CircuitState.HALF_OPEN:
+            self._probe_in_flight = False
+
+    def record_failure(self, now: float | None = None) -> None:
+        """Record a failed call, opening the circuit past the threshold."""
+        self.consecutive_failures += 1
+        if (
+            self.state == CircuitState.HALF_OPEN
+            or self.consecutive_failures >= self.failure_threshold
+        ) and self.state != CircuitState.OPEN:
+            self.state = CircuitState.OPEN
+            self._opened_at = monotonic() if now is None else now
+            self._probe_in_flight = False
+            self.times_opened += 1
+            logger.warning(
+                "circuit_opened",
+                provider=self.provider,
+                consecutive_failures=self.consecutive_failures,
+            )
+
+
+@dataclass
+class RetryBudget:
+    """
+    Caps retries and hedges at a fraction of request traffic.
+
+    Every request deposits ``ratio`` tokens and every retry or hedge spends
+    one, so extra load stays under ``ratio`` of traffic during an outage.
+    ``min_tokens`` lets a quiet client still retry occasionally.
+    """
+
+    ratio: float = 0.2
+    min_tokens: float = 10.0
+    max_tokens: float = 100.0
+    tokens: float = field(default=-1.0)
+    exhausted: int = 0
+
+    def __post_init__(self) -> None:
+        """Start with the reserve."""
+        if self.tokens < 0:
+            self.tokens = self.min_tokens
+
+    def record_request(self) -> None:
+        """Deposit for one original request."""
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Spend a token for a retry or hedge, if there is one."""
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        self.exhausted += 1
+        return False
+
+
+@dataclass
+class ResilienceStats:
+    """Counters for one provider's resilience policy."""
+
+    calls: int = 0
+    attempts: int = 0
+    retries: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    fast_failures: int = 0
+
+
+@dataclass
+class ProviderHealth:
+    """
+    Resilience state shared by every policy for one provider in a process.
+
+    Pipelines create their own ResiliencePolicy, but the circuit, the
+    retry budget and the latency that sets the hedge delay describe the
+    provider, so they are pooled across all of them.
+    """
+
+    breaker: CircuitBreaker
+    budget: RetryBudget = field(default_factory=RetryBudget)
+    latency_sketch: QuantileSketch = field(default_factory=QuantileSketch, repr=False)
+
+
+@dataclass
+class ResiliencePolicy:
+    """
+    Retry, hedging and circuit breaking for one provider.
+
+    A call is first gated by the provider's circuit breaker. Each attempt
+    is hedged: if it has not finished after the provider's observed p95
+    latency, a second identical request is started and whichever finishes
+    first wins. Failed attempts are retried with decorrelated jitter while
+    the retry budget, the circuit and the turn deadline allow it.
+
+    The breaker, retry budget and latency sketch are the provider's
+    ProviderHealth, shared by every policy for that provider unless one is
+    given; ``stats`` count this policy's calls only.
+
+    Hedging sends duplicate requests, so it must only be used for
+    idempotent calls such as single-shot transcription or synthesis.
+    """
+
+    provider: str
+    max_retries: int = 3
+    base_delay: float = 0.05
+    max_delay: float = 2.0
+    hedge: bool = True
+    hedge_percentile: float = 95.0
+    hedge_min_samples: int = 20
+    default_hedge_delay: float = 0.5
+    min_hedge_delay: float = 0.02
+    stats: ResilienceStats = field(default_factory=ResilienceStats)
+    rng: random.Random = field(default_factory=random.Random, repr=False)
+    health: InitVar[ProviderHealth | None] = None
+    breaker: CircuitBreaker = field(init=False)
+    budget: RetryBudget = field(init=False)
+    latency_sketch: QuantileSketch = field(init=False, repr=False)
+
+    def __post_init__(self, health: ProviderHealth | None) -> None:
+        """Use the provider-wide health unless one was given."""
+        health = health or get_provider_health(self.provider)
+        self.breaker = health.breaker
+        self.budget = health.budget
+        self.latency_sketch = health.latency_sketch
+
+    @property
+    def hedge_delay(self) -> float:
+        """Seconds to wait before hedging: the observed p95, once known."""
+        if self.latency_sketch.count < self.hedge_min_samples:
+            return self.default_hedge_delay
+        return max(
+            self.min_hedge_delay,
+            self.latency_sketch.percentile(self.hedge_percentile) / 1000,
+        )
+
+    async def call(
+        self,
+        func: Callable[[], Awaitable[T]],
+        max_retries: int | None = None,
+        deadline: TurnDeadline | None = None,
+        phase: str = "",
+        discard: Callable[[T], None] | None = None,
+        bound_attempts: bool = True,
+    ) -> T:
+        """
+        Call a provider with hedging, retries and circuit breaking.
+
+        Args:
+            func: Async callable making one provider request
+            max_retries: Override the policy's retry limit
+            deadline: Optional turn budget bounding attempts and backoff
+            phase: Phase charged for a deadline miss
+            discard: Called with the result of a hedged request that lost,
+                e.g. to release a pooled buffer
+            bound_attempts: Cancel attempts that overrun the deadline; off
+                when ``func`` bounds itself (e.g. only until its first
+                audio), so the deadline only stops further retries
+
+        Returns:
+            Result of the first successful attempt
+
+        Raises:
+            CircuitOpenError: If the provider's circuit is open
+            DeadlineExceededError: If the turn budget runs out first
+            Last exception if all retries fail
+        """
+        retries = self.max_retries if max_retries is None else max_retries
+        self.stats.calls += 1
+        self.budget.record_request()
+        try:
+            self.breaker.before_call()
+        except CircuitOpenError:
+            self.stats.fast_failures += 1
+            raise
+
+        # Whether this call holds the half-open probe, to hand back if it ends without a verdict
+        probing = self.breaker.state == CircuitState.HALF_OPEN
+        delay = self.base_delay
+        try:
+            for attempt in range(retries + 1):
+                try:
+                    if deadline is not None and bound_attempts:
+                        result = await deadline.run(self._hedged(func, discard), phase)
+                    else:
+                        result = await self._hedged(func, discard)
+                    self.breaker.record_success()
+                    return result
+                except DeadlineExceededError:
+                    raise
+                except Exception as e:
+                    if is_provider_failure(e):
+                        self.breaker.record_failure()
+                    elif probing:
+                        # Says nothing about the provider: the retry probes again
+                        self.breaker.release_probe()
+                    delay = await self.backoff(e, attempt, retries, delay, deadline, phase)
+                    probing = self.breaker.state == CircuitState.HALF_OPEN
+            raise AssertionError("unreachable")
+        finally:
+            if probing:
+                self.breaker.release_probe()
+
+    async def backoff(
+        self,
+        error: Exception,
+        attempt: int,
+        retries: int,
+        delay: float,
+        deadline: TurnDeadline | None = None,
+        phase: str = "",
+    ) -> float:
+        """
+        Decide whether a failed attempt may be retried, and wait before it.
+
+        Used by call() and by callers that manage their own attempts, such
+        as streamed synthesis resuming from a checkpoint.
+
+        Args:
+            error: The attempt's failure
+            attempt: Zero-based number of the failed attempt
+            retries: Retry limit
+            delay: Previous backoff delay (base_delay before the first retry)
+            deadline: Optional turn budget bounding the backoff
+            phase: Phase charged for a deadline miss
+
+        Returns:
+            The delay waited, to pass back in after the next failure
+
+        Raises:
+            error: If retries or the retry budget are exhausted
+            CircuitOpenError: If the provider's circuit has opened
+            DeadlineExceededError: If the backoff would overrun the turn budget
+        """
+        if attempt >= retries:
+            logger.error(
+                "retry_exhausted", provider=self.provider, max_retries=retries, error=str(error)
+            )
+            raise error
+        if not self.breaker.allow_request():
+            self.stats.fast_failures += 1
+            raise CircuitOpenError(self.provider, self.breaker.recovery_timeout_s) from error
+        if not self.budget.try_spend():
+            logger.warning("retry_budget_exhausted", provider=self.provider, error=str(error))
+            raise error
+
+        delay = decorrelated_jitter(delay, self.base_delay, self.max_delay, self.rng)
+        if deadline is not None and not deadline.can_retry(delay, phase):
+            logger.warning(
+                "retry_skipped_deadline",
+                provider=self.provider,
+                attempt=attempt + 1,
+                delay=round(delay, 3),
+                remaining_ms=round(deadline.remaining_ms(phase), 2),
+                error=str(error),
+            )
+            deadline.record_miss(phase)
+            raise DeadlineExceededError(phase, deadline.budget_ms) from error
+
+        self.stats.retries += 1
+        logger.warning(
+            "retry_attempt",
+            provider=self.provider,
+            attempt=attempt + 1,
+            max_retries=retries,
+            delay=round(delay, 3),
+            error=str(error),
+        )
+        await asyncio.sleep(delay)
+        return delay
+
+    async def _timed(self, func: Callable[[], Awaitable[T]]) -> T:
+        """Run one request, feeding its latency into the hedge-delay sketch."""
+        self.stats.attempts += 1
+        start = monotonic()
+        result = await func()
+        self.latency_sketch.add((monotonic() - start) * 1000)
+        return result
+
+    async def _hedged(
+        self,
+        func: Callable[[], Awaitable[T]],
+        discard: Callable[[T], None] | None = None,
+    ) -> T:
+        """
+        Run one attempt, hedging it with a second request if it is slow.
+
+        A request that also succeeded but lost (both finished in the same
+        wait) has its result passed to ``discard``.
+        """
+        primary = asyncio.ensure_future(self._timed(func))
+        if not self.hedge:
+            return await primary
+
+        tasks = {primary}
+        winner: asyncio.Future[T] | None = None
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_delay)
+            if not done and self.budget.try_spend():
+                self.stats.hedges += 1
+                logger.debug(
+                    "request_hedged", provider=self.provider, after_s=round(self.hedge_delay, 3)
+                )
+                tasks.add(asyncio.ensure_future(self._timed(func)))
+
+            # Return the first success; fail only once every request failed
+            pending = tasks
+            error: BaseException | None = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self.stats.hedge_wins += 1
+                        winner = task
+                        return task.result()
+                    error = task.exception()
+            assert error is not None
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif (
+                    discard is not None
+                    and task is not winner
+                    and not task.cancelled()
+                    and task.exception() is None
+                ):
+                    discard(task.result())
+
+
+_providers: dict[str, ProviderHealth] = {}
+
+
+def get_provider_health(provider: str) -> ProviderHealth:
+    """Get the process-wide breaker, retry budget and latency sketch for a provider."""
+    health = _providers.get(provider)
+    if health is None:
+        health = _providers[provider] = ProviderHealth(breaker=CircuitBreaker(provider=provider))
+    return health
+
+
+def get_circuit_breaker(provider: str) -> CircuitBreaker:
+    """Get the process-wide circuit breaker for a provider."""
+    return get_provider_health(provider).breaker
+
+
+def reset_provider_health() -> None:
+    """Forget all shared provider state (e.g. between tests)."""
+    _providers.clear()
@@ -0,0 +1,248 @@
+"""Columnar ring buffer with O(1) incremental statistics for metric windows."""
+
+import math
+import time
+from collections import deque
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+
+import numpy as np
+
+
+@dataclass
+class RunningStats:
+    """
+    Welford running mean/variance that supports removing samples.
+
+    Adding and removing are O(1), which makes it suitable for sliding
+    windows where the oldest sample is evicted on every append.
+    """
+
+    count: int = 0
+    mean: float = 0.0
+    total: float = 0.0
+    _m2: float = 0.0
+
+    def add(self, value: float) -> None:
+        """Add a sample."""
+        self.count += 1
+        self.total += value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def remove(self, value: float) -> None:
+        """Remove a previously added sample."""
+        if self.count <= 1:
+            self.reset()
+            return
+        delta = value - self.mean
+        self.count -= 1
+        self.total -= value
+        self.mean -= delta / self.count
+        self._m2 = max(0.0, self._m2 - delta * (value - self.mean))
+
+    def variance(self, ddof: int = 1) -> float:
+        """Variance of the current samples (sample variance by default)."""
+        if self.count <= ddof:
+            return 0.0
+        return self._m2 / (self.count - ddof)
+
+    def reset(self) -> None:
+        """Forget all samples."""
+        self.count = 0
+        self.mean = 0.0
+        self.total = 0.0
+        self._m2 = 0.0
+
+    def resync(self, values: np.ndarray) -> None:
+        """Recompute from scratch to shed accumulated floating-point drift."""
+        self.count = int(values.size)
+        if self.count == 0:
+            self.reset()
+            return
+        self.total = float(values.sum())
+        self.mean = float(values.mean())
+        self._m2 = float(((values - self.mean) ** 2).sum())
+
+
+@dataclass
+class ColumnarRingBuffer:
+    """
+    Fixed-capacity ring buffer storing one contiguous float64 column per
+    metric plus a timestamp column.
+
+    Appends overwrite the oldest row once full. Count, sum, mean, variance
+    and min/max of every column are maintained incrementally (min/max via
+    monotonic deques), so reading them is O(1). The raw columns are
+    exposed as NumPy arrays for vectorized ad-hoc queries.
+    """
+
+    columns: tuple[str, ...]
+    capacity: int
+    resync_interval: int = 0  # evictions between drift resyncs, 0 = 16 * capacity
+
+    _data: np.ndarray = field(init=False, repr=False)
+    _timestamps: np.ndarray = field(init=False, repr=False)
+    _index: dict[str, int] = field(init=False, repr=False)
+    _stats: list[RunningStats] = field(init=False, repr=False)
+    _mins: list[deque[tuple[int, float]]] = field(init=False, repr=False)
+    _maxs: list[deque[tuple[int, float]]] = field(init=False, repr=False)
+    _head: int = field(default=0, init=False)
+    _size: int = field(default=0, init=False)
+    _seq: int = field(default=0, init=False)
+    _evictions: int = field(default=0, init=False)
+
+    def __post_init__(self) -> None:
+        """Allocate column storage."""
+        if self.capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if not self.columns:
+            raise ValueError("at least one column is required")
+        self.columns = tuple(self.columns)
+        if not self.resync_interval:
+            self.resync_interval = 16 * self.capacity
+        # Row-major 2D array: each metric's column is one contiguous row
+        self._data = np.zeros((len(self.columns), self.capacity), dtype=np.float64)
+        self._timestamps = np.zeros(self.capacity, dtype=np.float64)
+        self._index = {name: i for i, name in enumerate(self.columns)}
+        self._reset_stats()
+
+    def _reset_stats(self) -> None:
+        self._stats = [RunningStats() for _ in self.columns]
+        self._mins = [deque() for _ in self.columns]
+        self._maxs = [deque() for _ in self.columns]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, values: Mapping[str, float], timestamp: float | None = None) -> None:
+        """
+        Append one row, evicting the oldest row when full.
+
+        Args:
+            values: Value for every column
+            timestamp: Row timestamp (epoch seconds), defaults to now
+        """
+        if self._size == self.capacity:
+            self._evict_oldest()
+
+        seq = self._seq
+        slot = self._head
+        self._timestamps[slot] = time.time() if timestamp is None else timestamp
+        for i, name in enumerate(self.columns):
+            value = float(values[name])
+            self._data[i, slot] = value
+            self._stats[i].add(value)
+
+            mins = self._mins[i]
+            while mins and mins[-1][1] >= value:
+                mins.pop()
+            mins.append((seq, value))
+
+            maxs = self._maxs[i]
+            while maxs and maxs[-1][1] <= value:
+                maxs.pop()
+            maxs.append((seq, value))
+
+        self._head = (slot + 1) % self.capacity
+        self._size += 1
+        self._seq += 1
+
+        if self._evictions and self._evictions % self.resync_interval == 0:
+            for i in range(len(self.columns)):
+                self._stats[i].resync(self._ordered(self._data[i]))
+
+    def _evict_oldest(self) -> None:
+        """Drop the oldest row from the running statistics."""
+        oldest_seq = self._seq - self._size
+        slot = self._head  # the oldest row is the next one to be overwritten
+        for i in range(len(self.columns)):
+            self._stats[i].remove(self._data[i, slot])
+            if self._mins[i] and self._mins[i][0][0] == oldest_seq:
+                self._mins[i].popleft()
+            if self._maxs[i] and self._maxs[i][0][0] == oldest_seq:
+                self._maxs[i].popleft()
+        self._size -= 1
+        self._evictions += 1
+
+    def _ordered(self, array: np.ndarray) -> np.ndarray:
+        """Return the valid rows of a column in insertion order."""
+        if self._size < self.capacity:
+            return array[: self._size]
+        return np.concatenate((array[self._head :], array[: self._head]))
+
+    def _col(self, column: str) -> int:
+        try:
+            return self._index[column]
+        except KeyError:
+            raise ValueError(f"Unknown column: {column}") from None
+
+    def mean(self, column: str) -> float:
+        """O(1) mean of a column, 0.0 when empty."""
+        return self._stats[self._col(column)].mean
+
+    def total(self, column: str) -> float:
+        """O(1) sum of a column."""
+        return self._stats[self._col(column)].total
+
+    def min(self, column: str) -> float:
+        """O(1) minimum of a column, 0.0 when empty."""
+        mins = self._mins[self._col(column)]
+        return mins[0][1] if mins else 0.0
+
+    def max(self, column: str) -> float:
+        """O(1) maximum of a column, 0.0 when empty."""
+        maxs = self._maxs[self._col(column)]
+        return maxs[0][1] if maxs else 0.0
+
+    def variance(self, column: str, ddof: int = 1) -> float:
+        """O(1) variance of a column (sample variance by default)."""
+        return self._stats[self._col(column)].variance(ddof)
+
+    def std_dev(self, column: str, ddof: int = 1) -> float:
+        """O(1) standard deviation of a column."""
+        return math.sqrt(self.variance(column, ddof))
+
+    def column(self, column: str) -> np.ndarray:
+        """
+        Get a column's values, oldest first.
+
+        Returns a view while the buffer has not wrapped, a copy otherwise.
+        """
+        return self._ordered(self._data[self._col(column)])
+
+    def timestamps(self) -> np.ndarray:
+        """Get row timestamps, oldest first."""
+        return self._ordered(self._timestamps)
+
+    def reduce(
+        self,
+        column: str,
+        func: Callable[[np.ndarray], float],
+        since: float | None = None,
+    ) -> float:
+        """
+        Run a vectorized reduction over a column.
+
+        Args:
+            column: Column name
+            func: Reduction such as np.median or lambda a: np.percentile(a, 95)
+            since: Only include rows with timestamp >= since
+
+        Returns:
+            The reduction result, 0.0 when no rows match
+        """
+        values = self.column(column)
+        if since is not None:
+            values = values[self.timestamps() >= since]
+        if values.size == 0:
+            return 0.0
+        return float(func(values))
+
+    def clear(self) -> None:
+        """Drop all rows."""
+        self._head = 0
+        self._size = 0
+        self._evictions = 0
+        self._reset_stats()
@@ -0,0 +1,221 @@
+"""Multi-resolution time-bucketed metric rollups with bounded memory."""
+
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from .quantile_sketch import QuantileSketch, SlidingWindowSketch
+
+
+@dataclass(frozen=True)
+class RollupResolution:
+    """One rollup level: fixed-width buckets kept for a fixed span."""
+
+    step_seconds: float
+    num_buckets: int
+
+    @property
+    def span_seconds(self) -> float:
+        """How far back this level reaches."""
+        return self.step_seconds * self.num_buckets
+
+
+# 1s for the last minute, 10s for 10 minutes, 1m for an hour, 1h for a week
+DEFAULT_RESOLUTIONS = (
+    RollupResolution(step_seconds=1.0, num_buckets=60),
+    RollupResolution(step_seconds=10.0, num_buckets=60),
+    RollupResolution(step_seconds=60.0, num_buckets=60),
+    RollupResolution(step_seconds=3600.0, num_buckets=168),
+)
+
+
+@dataclass
+class MetricRollups:
+    """
+    Time-bucketed rollups for a fixed set of metrics.
+
+    Samples land in the open bucket of the finest resolution. When a
+    bucket closes (the next sample falls in a later one) its sketch is
+    folded into the coarser level's bucket, so each sample is written once
+    and each closed bucket merged once per level. A bucket is a
+    QuantileSketch, so it carries count, sum, min, max and quantiles.
+    Fine buckets expire after their level's span, leaving only the coarser
+    levels for older data, so memory stays constant however long the
+    worker runs. Window queries merge one level's buckets plus the open
+    (not yet folded) bucket of each finer level, instead of scanning raw
+    samples.
+    """
+
+    metrics: tuple[str, ...]
+    resolutions: tuple[RollupResolution, ...] = DEFAULT_RESOLUTIONS
+    relative_accuracy: float = 0.01
+    _levels: dict[str, list[SlidingWindowSketch]] = field(default_factory=dict, repr=False)
+    # Per metric, the open bucket (slot id) of each level, not yet folded up
+    _open: dict[str, list[int | None]] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self) -> None:
+        """Create one bucket ring per metric per resolution, finest first."""
+        self.resolutions = tuple(sorted(self.resolutions, key=lambda r: r.step_seconds))
+        for metric in self.metrics:
+            self._levels[metric] = [
+                SlidingWindowSketch(
+                    slot_seconds=resolution.step_seconds,
+                    num_slots=resolution.num_buckets,
+                    relative_accuracy=self.relative_accuracy,
+                )
+                for resolution in self.resolutions
+            ]
+            self._open[metric] = [None] * len(self.resolutions)
+
+    @property
+    def max_window_seconds(self) -> float:
+        """Longest window that can be queried."""
+        return max(r.span_seconds for r in self.resolutions)
+
+    def _metric_levels(self, metric: str) -> list[SlidingWindowSketch]:
+        try:
+            return self._levels[metric]
+        except KeyError:
+            raise ValueError(f"Unknown rollup metric: {metric}") from None
+
+    def record(self, values: Mapping[str, float], now: float | None = None) -> None:
+        """
+        Record one sample per metric.
+
+        Args:
+            values: Value per metric; metrics not present are skipped
+            now: time.monotonic() timestamp, defaults to now
+        """
+        now = time.monotonic() if now is None else now
+        for metric, value in values.items():
+            levels = self._metric_levels(metric)
+            levels[0].add(value, self._open_bucket(metric, 0, now))
+
+    def _open_bucket(self, metric: str, level: int, at: float) -> float:
+        """
+        Open the bucket covering ``at``, folding the one it replaces upwards.
+
+        Returns:
+            A time inside the open bucket; data older than the open bucket
+            (a late sample) is filed in it rather than in a folded bucket
+        """
+        levels = self._levels[metric]
+        opened = self._open[metric]
+        step = self.resolutions[level].step_seconds
+        slot_id = levels[level].slot_id(at)
+        previous = opened[level]
+        if previous is None or slot_id > previous:
+            if previous is not None and level + 1 < len(levels):
+                closed = levels[level].get_slot(previous)
+                if closed is not None:
+                    fold_at = self._open_bucket(metric, level + 1, (previous + 0.5) * step)
+                    levels[level + 1].add_sketch(closed, fold_at)
+            opened[level] = previous = slot_id
+        return (previous + 0.5) * step
+
+    def _pending(self, metric: str, level: int) -> tuple[float, QuantileSketch] | None:
+        """The open bucket of a level (start, sketch): data not yet in coarser levels."""
+        slot_id = self._open[metric][level]
+        if slot_id is None:
+            return None
+        sketch = self._levels[metric][level].get_slot(slot_id)
+        if sketch is None:
+            return None
+        return slot_id * self.resolutions[level].step_seconds, sketch
+
+    def query(self, metric: str, window_seconds: float, now: float | None = None) -> QuantileSketch:
+        """
+        Merge the buckets covering the most recent window.
+
+        Uses the finest resolution whose span covers the window, so the
+        result is accurate to one bucket of that resolution.
+
+        Args:
+            metric: Metric name
+            window_seconds: Window length
+            now: time.monotonic() timestamp, defaults to now
+
+        Returns:
+            A new QuantileSketch summarizing the window
+        """
+        now = time.monotonic() if now is None else now
+        levels = self._metric_levels(metric)
+        selected = len(levels) - 1
+        window: float | None = None
+        for index, resolution in enumerate(self.resolutions):
+            if resolution.span_seconds >= window_seconds:
+                selected, window = index, window_seconds
+                break
+
+        result = levels[selected].merged(window, now)
+        oldest = levels[selected].window_start(window, now)
+        for finer in range(selected):
+            pending = self._pending(metric, finer)
+            if pending is not None and oldest <= pending[0] <= now:
+                result.merge(pending[1])
+        return result
+
+    def summary(
+        self,
+        metric: str,
+        window_seconds: float,
+        percentiles: tuple[float, ...] = (50.0, 95.0, 99.0),
+        now: float | None = None,
+    ) -> dict[str, Any]:
+        """Get count, sum, mean, min, max and percentiles over a window."""
+        sketch = self.query(metric, window_seconds, now)
+        summary = {
+            "count": sketch.count,
+            "sum": sketch.total,
+            "mean": sketch.mean,
+            "min": sketch.min if sketch.count else 0.0,
+            "max": sketch.max if sketch.count else 0.0,
+        }
+        for p in percentiles:
+            summary[f"p{p:g}"] = sketch.percentile(p)
+        return summary
+
+    def series(
+        self, metric: str, step_seconds: float, now: float | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Get the per-bucket time series of one resolution.
+
+        Args:
+            metric: Metric name
+            step_seconds: Bucket width of the resolution to read
+            now: time.monotonic() timestamp, defaults to now
+
+        Returns:
+            One dict per live bucket, oldest first
+        """
+        now = time.monotonic() if now is None else now
+        levels = self._metric_levels(metric)
+        for index, resolution in enumerate(self.resolutions):
+            if resolution.step_seconds == step_seconds:
+                break
+        else:
+            raise ValueError(f"No rollup resolution with step {step_seconds}s")
+
+        level = levels[index]
+        buckets = {start: sketch.copy() for start, sketch in level.slots(now)}
+        oldest = level.window_start(None, now)
+        for finer in range(index):
+            pending = self._pending(metric, finer)
+            if pending is None or not oldest <= pending[0] <= now:
+                continue
+            start = (pending[0] // step_seconds) * step_seconds
+            if start not in buckets:
+                buckets[start] = pending[1].empty_like()
+            buckets[start].merge(pending[1])
+        return [
+            {
+                "start": start,
+                "count": sketch.count,
+                "sum": sketch.total,
+                "min": sketch.min,
+                "max": sketch.max,
+            }
+            for start, sketch in sorted(buckets.items())
+        ]
@@ -0,0 +1,213 @@
+"""Start the response on a stable interim transcript, before the final arrives."""
+
+import asyncio
+import re
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any, Generic, TypeVar
+
+import structlog
+
+from .clock import monotonic
+from .config import VoiceProcessingConfig
+from .quantile_sketch import QuantileSketch
+
+logger = structlog.get_logger(__name__)
+
+T = TypeVar("T")
+
+_NON_WORD = re.compile(r"[^\w\s']+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_transcript(text: str) -> str:
+    """
+    Reduce a transcript to what matters for reusing a response.
+
+    Case and punctuation are dropped, since smart formatting often adds
+    them only to the final.
+    """
+    return _WHITESPACE.sub(" ", _NON_WORD.sub(" ", text.casefold())).strip()
+
+
+@dataclass
+class SpeculationMetrics:
+    """Outcome of speculative responses."""
+
+    turns: int = 0  # finals resolved
+    started: int = 0
+    hits: int = 0  # final matched, speculative response used
+    misses: int = 0  # final differed, speculative response cancelled
+    abandoned: int = 0  # cancelled by a changed interim before the final
+    failed: int = 0  # speculative response raised; the turn regenerated
+    # Time the response finished earlier than it would have from the final
+    latency_saved_sketch: QuantileSketch = field(default_factory=QuantileSketch, repr=False)
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of turns answered with a speculative response."""
+        if self.turns == 0:
+            return 0.0
+        return self.hits / self.turns
+
+    @property
+    def precision(self) -> float:
+        """Share of started speculations that were used."""
+        if self.started == 0:
+            return 0.0
+        return self.hits / self.started
+
+    @property
+    def wasted(self) -> int:
+        """Speculations started and thrown away."""
+        return self.started - self.hits
+
+
+@dataclass
+class SpeculativeResponder(Generic[T]):
+    """
+    Runs the response stage on an interim transcript once it is stable.
+
+    Feed it every delivered interim with observe() and each final with
+    resolve(). Once the interim text (ignoring case and punctuation) has
+    not changed for ``stable_ms``, ``generate`` is started on it. If the
+    final matches, resolve() returns the speculative output, waiting for
+    it if needed (commit); otherwise the speculation is cancelled and
+    resolve() returns None, so the caller generates from the final as
+    usual. A later interim with different text cancels it as well.
+
+    ``generate`` must not have side effects that outlive a cancellation
+    (e.g. appending to the chat context); commit those once resolve()
+    returns its output. It may include synthesizing the first sentence,
+    e.g. by returning the reply together with its first segment's audio.
+    """
+
+    generate: Callable[[str], Awaitable[T]]
+    stable_ms: float = 300.0
+    metrics: SpeculationMetrics = field(default_factory=SpeculationMetrics)
+    _text: str = field(default="", init=False, repr=False)
+    _key: str = field(default="", init=False, repr=False)
+    _timer: asyncio.TimerHandle | None = field(default=None, init=False, repr=False)
+    _task: asyncio.Task[tuple[T, float]] | None = field(default=None, init=False, repr=False)
+    _task_key: str = field(default="", init=False, repr=False)
+    _started_at: float = field(default=0.0, init=False, repr=False)
+
+    @property
+    def speculating(self) -> bool:
+        """Whether a speculative response is running or ready."""
+        return self._task is not None
+
+    def observe(self, text: str, stable_for_ms: float = 0.0) -> None:
+        """
+        Note the latest interim transcript of the current utterance.
+
+        Args:
+            text: The interim text
+            stable_for_ms: How long the text has already been unchanged,
+                e.g. InterimCoalescer.stable_for_ms()
+        """
+        key = normalize_transcript(text)
+        if key == self._key:
+            return
+        self._text, self._key = text, key
+        if self._task is not None and self._task_key != key:
+            self._cancel_task()
+            self.metrics.abandoned += 1
+        self._cancel_timer()
+        if key:
+            delay_s = max(0.0, self.stable_ms - stable_for_ms) / 1000
+            self._timer = asyncio.get_running_loop().call_later(delay_s, self._start)
+
+    async def resolve(self, final_text: str) -> T | None:
+        """
+        Settle the turn on its final transcript.
+
+        Returns:
+            The speculative output if it was started on the same text and
+            succeeded, otherwise None
+        """
+        self.metrics.turns += 1
+        resolved_at = monotonic()
+        task, task_key = self._task, self._task_key
+        started_at = self._started_at
+        self._task = None
+        self.reset()
+        if task is None:
+            return None
+        if task_key != normalize_transcript(final_text):
+            task.cancel()
+            self.metrics.misses += 1
+            logger.info("speculation_missed")
+            return None
+
+        try:
+            output, finished_at = await task
+        except Exception as e:
+            self.metrics.failed += 1
+            logger.warning("speculation_failed", error=str(e))
+            return None
+        # Without speculation the stage would have run from the final
+        duration = finished_at - started_at
+        saved_ms = max(0.0, min(duration, resolved_at - started_at)) * 1000
+        self.metrics.hits += 1
+        self.metrics.latency_saved_sketch.add(saved_ms)
+        logger.info("speculation_committed", latency_saved_ms=round(saved_ms, 2))
+        return output
+
+    def reset(self) -> None:
+        """Cancel any speculation and forget the utterance, e.g. on barge-in."""
+        self._cancel_timer()
+        self._cancel_task()
+        self._text = self._key = ""
+
+    def _start(self) -> None:
+        self._timer = None
+        if self._task is not None:
+            return
+        self.metrics.started += 1
+        self._task_key = self._key
+        self._started_at = monotonic()
+        self._task = asyncio.ensure_future(self._run(self._text))
+        self._task.add_done_callback(_retrieve_exception)
+        logger.debug("speculation_started", text_length=len(self._text))
+
+    async def _run(self, text: str) -> tuple[T, float]:
+        """Run the stage, noting when it finished."""
+        output = await self.generate(text)
+        return output, monotonic()
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _cancel_task(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+def create_speculative_responder(
+    generate: Callable[[str], Awaitable[T]],
+    config: VoiceProcessingConfig | None = None,
+) -> SpeculativeResponder[T] | None:
+    """
+    Create a speculative responder if speculative responses are enabled.
+
+    Args:
+        generate: The response stage, run on the transcript text
+        config: Voice processing config, loaded from the environment if None
+
+    Returns:
+        The responder, or None when speculation is off
+    """
+    config = config or VoiceProcessingConfig()
+    if not config.speculative_responses:
+        return None
+    return SpeculativeResponder(generate, stable_ms=config.speculation_stable_ms)
+
+
+def _retrieve_exception(task: asyncio.Task[Any]) -> None:
+    """Mark a failure as retrieved, whether or not the turn uses the task."""
+    if not task.cancelled():
+        task.exception()
@@ -0,0 +1,161 @@
+"""Energy-based speech gating: keep audio near speech, drop the silence."""
+
+from collections import deque
+from dataclasses import dataclass, field
+
+import numpy as np
+from livekit import rtc
+
+from ..utils.audio import frame_levels_db
+from .audio_buffers import BytesLike
+
+# Analysis frame for single-shot trimming
+TRIM_FRAME_MS = 10
+
+
+def trim_silence(
+    pcm: BytesLike,
+    sample_rate: int,
+    num_channels: int = 1,
+    threshold_db: float = -45.0,
+    padding_ms: int = 200,
+) -> memoryview:
+    """
+    Cut leading and trailing silence from a buffer, keeping some padding.
+
+    Levels are measured over 10ms frames in one vectorized pass. Buffers
+    shorter than one frame are returned whole, since there is nothing to
+    measure.
+
+    Args:
+        pcm: Interleaved 16-bit PCM
+        sample_rate: Sample rate in Hz
+        num_channels: Channels interleaved in ``pcm``
+        threshold_db: Frames at or above this RMS level (dBFS) are speech
+        padding_ms: Audio kept before the first and after the last speech frame
+
+    Returns:
+        A view of the speech span of ``pcm`` (no copy), empty if there is
+        no speech at all
+    """
+    view = memoryview(pcm).cast("B")
+    frame_samples = sample_rate * TRIM_FRAME_MS // 1000
+    frame_bytes = frame_samples * num_channels * 2
+    if len(view) < frame_bytes:
+        return view
+
+    speech = np.flatnonzero(frame_levels_db(view, frame_samples, num_channels) >= threshold_db)
+    if len(speech) == 0:
+        return view[:0]
+    padding = padding_ms // TRIM_FRAME_MS * frame_bytes
+    start = max(0, int(speech[0]) * frame_bytes - padding)
+    end = min(len(view), (int(speech[-1]) + 1) * frame_bytes + padding)
+    return view[start:end]
+
+
+@dataclass
+class GateMetrics:
+    """Metrics for a speech gate."""
+
+    frames_in: int = 0
+    frames_out: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    speech_segments: int = 0
+
+    @property
+    def bytes_saved(self) -> int:
+        """Audio bytes withheld from the provider."""
+        return self.bytes_in - self.bytes_out
+
+    @property
+    def saved_ratio(self) -> float:
+        """Share of the audio withheld from the provider."""
+        if self.bytes_in == 0:
+            return 0.0
+        return self.bytes_saved / self.bytes_in
+
+
+@dataclass
+class SpeechGate:
+    """
+    Drops silent frames from a live audio stream before it is sent to STT.
+
+    A frame is speech when its RMS level reaches ``threshold_db``. Up to
+    ``padding_before_ms`` of the silence preceding speech is held back and
+    released with the first speech frame, so onsets are not clipped; after
+    the last speech frame, ``padding_after_ms`` more audio is passed so the
+    provider still hears the pause that ends an utterance (keep it above
+    the provider's endpointing delay, or finals will wait for the next
+    speech). Everything else is dropped.
+
+    Frames are passed through as is, never copied.
+    """
+
+    threshold_db: float = -45.0
+    padding_before_ms: int = 200
+    padding_after_ms: int = 500
+    metrics: GateMetrics = field(default_factory=GateMetrics)
+    _held: deque[tuple[rtc.AudioFrame, float]] = field(
+        default_factory=deque, init=False, repr=False
+    )
+    _held_ms: float = field(default=0.0, init=False, repr=False)
+    _hangover_ms: float = field(default=0.0, init=False, repr=False)
+    _speaking: bool = field(default=False, init=False, repr=False)
+
+    @property
+    def speaking(self) -> bool:
+        """Whether the last frame pushed was speech (not padding or silence)."""
+        return self._speaking
+
+    @property
+    def in_speech(self) -> bool:
+        """Whether frames are currently being passed."""
+        return self._hangover_ms > 0
+
+    def push(self, frame: rtc.AudioFrame) -> list[rtc.AudioFrame]:
+        """
+        Add a frame.
+
+        Returns:
+            Frames to send now, in order (empty while silent)
+        """
+        nbytes = len(frame.data) * 2
+        duration_ms = frame.samples_per_channel / frame.sample_rate * 1000
+        self.metrics.frames_in += 1
+        self.metrics.bytes_in += nbytes
+
+        level = frame_levels_db(frame.data, frame.samples_per_channel, frame.num_channels)
+        self._speaking = bool(len(level)) and level[0] >= self.threshold_db
+        if self._speaking:
+            if not self.in_speech:
+                self.metrics.speech_segments += 1
+            self._hangover_ms = self.padding_after_ms + duration_ms
+            out = [held for held, _ in self._held]
+            out.append(frame)
+            self._held.clear()
+            self._held_ms = 0.0
+        elif self.in_speech:
+            out = [frame]
+        else:
+            self._hold(frame, duration_ms)
+            return []
+
+        self._hangover_ms = max(0.0, self._hangover_ms - duration_ms)
+        self.metrics.frames_out += len(out)
+        self.metrics.bytes_out += sum(len(f.data) * 2 for f in out)
+        return out
+
+    def reset(self) -> None:
+        """Drop held audio and end any speech segment, e.g. between streams."""
+        self._held.clear()
+        self._held_ms = 0.0
+        self._hangover_ms = 0.0
+        self._speaking = False
+
+    def _hold(self, frame: rtc.AudioFrame, duration_ms: float) -> None:
+        """Keep a silent frame as padding, dropping the oldest beyond padding_before_ms."""
+        self._held.append((frame, duration_ms))
+        self._held_ms += duration_ms
+        while self._held and self._held_ms > self.padding_before_ms:
+            self._held_ms -= self._held.popleft()[1]
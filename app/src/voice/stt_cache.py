@@ -0,0 +1,194 @@
+"""Content-addressed cache of transcripts for repeated audio."""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+import structlog
+
+from ..utils.lru import LRUCache
+from .audio_buffers import BytesLike
+
+logger = structlog.get_logger(__name__)
+
+
+def transcript_key(
+    audio: BytesLike,
+    sample_rate: int,
+    num_channels: int,
+    model: str,
+    language: str,
+    punctuate: bool,
+    smart_format: bool,
+) -> str:
+    """
+    Build the content address for a transcription request.
+
+    The PCM is hashed in place (no copy); with hardware SHA support this
+    costs about 2ms per minute of 16kHz audio.
+
+    Returns:
+        Hex SHA-256 of the audio and every option that affects the transcript
+    """
+    options = json.dumps(
+        {
+            "sample_rate": sample_rate,
+            "num_channels": num_channels,
+            "model": model,
+            "language": language,
+            "punctuate": punctuate,
+            "smart_format": smart_format,
+        },
+        sort_keys=True,
+    )
+    digest = hashlib.sha256(options.encode("utf-8"))
+    digest.update(audio)
+    return digest.hexdigest()
+
+
+@dataclass
+class DiskTranscriptCache:
+    """
+    On-disk tier storing one JSON file per cache key.
+
+    Files are written atomically (temp file + rename), so several worker
+    processes can share a directory. Entries older than ``ttl_s`` (from
+    when they were written) are treated as missing and deleted. When the
+    directory exceeds ``max_bytes`` the least recently used files (by
+    modification time, refreshed on every hit) are deleted.
+    """
+
+    directory: str
+    max_bytes: int = 64 * 1024 * 1024
+    ttl_s: float | None = None
+
+    def __post_init__(self) -> None:
+        """Create the cache directory."""
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> str | None:
+        """Read a cached transcript, or return None."""
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry: dict[str, Any] = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("stt_cache_read_failed", error=str(e))
+            return None
+        if self.ttl_s is not None and time.time() - entry["created_at"] >= self.ttl_s:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return str(entry["text"])
+
+    def put(self, key: str, text: str) -> None:
+        """Write an entry atomically and enforce the size bound."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"text": text, "created_at": time.time()}, f)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            logger.warning("stt_cache_write_failed", error=str(e))
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            return
+        self._enforce_limit()
+
+    def _enforce_limit(self) -> None:
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        if total <= self.max_bytes:
+            return
+        for _, size, path in sorted(entries):
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    @property
+    def size_bytes(self) -> int:
+        """Bytes currently stored on disk."""
+        return sum(
+            entry.stat().st_size
+            for entry in os.scandir(self.directory)
+            if entry.name.endswith(".json")
+        )
+
+
+@dataclass
+class TranscriptCache:
+    """
+    Two-tier transcript cache: an in-memory LRU bounded by entry count in
+    front of an optional disk tier, both expiring entries after ``ttl_s``.
+
+    Disk hits are promoted to the memory tier, since transcripts are small.
+    """
+
+    memory_max_entries: int = 1024
+    directory: str | None = None
+    disk_max_bytes: int = 64 * 1024 * 1024
+    ttl_s: float | None = None
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    _memory: LRUCache[str, str] = field(init=False, repr=False)
+    _disk: DiskTranscriptCache | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Create the tiers."""
+        self._memory = LRUCache(
+            max_size=self.memory_max_entries, sizeof=lambda _: 1, ttl_s=self.ttl_s
+        )
+        if self.directory:
+            self._disk = DiskTranscriptCache(
+                self.directory, max_bytes=self.disk_max_bytes, ttl_s=self.ttl_s
+            )
+
+    def get(self, key: str) -> str | None:
+        """Look up a transcript by cache key."""
+        text = self._memory.get(key)
+        if text is not None:
+            self.memory_hits += 1
+            return text
+        if self._disk is not None:
+            text = self._disk.get(key)
+            if text is not None:
+                self.disk_hits += 1
+                self._memory.put(key, text)
+                return text
+        self.misses += 1
+        return None
+
+    def put(self, key: str, text: str) -> None:
+        """Store a transcript in every tier."""
+        self._memory.put(key, text)
+        if self._disk is not None:
+            self._disk.put(key, text)
+
+    def clear_memory(self) -> None:
+        """Drop the in-memory tier (the disk tier is kept)."""
+        self._memory.clear()
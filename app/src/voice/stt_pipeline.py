@@ -1,69 +1,37 @@
 """Speech-to-Text pipeline using Deepgram via LiveKit Agents."""
 
 import asyncio
+from collections import deque
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable
+from contextlib import nullcontext
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
-from typing import AsyncIterator, Callable, Optional
 from enum import Enum
-from functools import wraps
+from typing import Any
 
 import structlog
+from livekit import rtc
 from livekit.agents import stt
 from livekit.plugins import deepgram
 
-from .config import DeepgramConfig
+from ..utils.audio import pcm_duration_ms, resample
+from .audio_buffers import BytesLike
+from .clock import StreamClock, elapsed_ms, monotonic
+from .config import DeepgramConfig, VoiceProcessingConfig
+from .deadline import PHASE_STT, TurnDeadline
+from .endpointing import EndpointingController
+from .interim_coalescer import InterimCoalescer, StabilityMetrics
+from .quantile_sketch import QuantileSketch
+from .resilience import ResiliencePolicy, retry_async  # noqa: F401 - retry_async re-exported
+from .speculation import SpeculativeResponder, create_speculative_responder
+from .speech_gate import GateMetrics, SpeechGate, trim_silence
+from .stt_cache import TranscriptCache, transcript_key
+from .throughput import ThroughputBreakdown
+from .tracing import get_tracer
+from .turn_latency import current_deadline, current_turn_span
 
 logger = structlog.get_logger(__name__)
 
 
-async def retry_async(
-    func,
-    max_retries: int = 3,
-    base_delay: float = 0.5,
-    max_delay: float = 5.0,
-    exponential_base: float = 2.0,
-):
-    """
-    Retry an async function with exponential backoff.
-
-    Args:
-        func: Async callable to retry
-        max_retries: Maximum number of retry attempts
-        base_delay: Initial delay between retries in seconds
-        max_delay: Maximum delay between retries
-        exponential_base: Base for exponential backoff calculation
-
-    Returns:
-        Result from successful function call
-
-    Raises:
-        Last exception if all retries fail
-    """
-    last_exception = None
-    for attempt in range(max_retries + 1):
-        try:
-            return await func()
-        except Exception as e:
-            last_exception = e
-            if attempt < max_retries:
-                delay = min(base_delay * (exponential_base ** attempt), max_delay)
-                logger.warning(
-                    "retry_attempt",
-                    attempt=attempt + 1,
-                    max_retries=max_retries,
-                    delay=delay,
-                    error=str(e),
-                )
-                await asyncio.sleep(delay)
-            else:
-                logger.error(
-                    "retry_exhausted",
-                    max_retries=max_retries,
-                    error=str(e),
-                )
-    raise last_exception
-
-
 class TranscriptionState(Enum):
     """State of the transcription pipeline."""
 
@@ -84,6 +52,25 @@ class TranscriptionResult:
     end_time: float
     latency_ms: float
     language: str = "en"
+    # Characters (whole words) shared with the previous result of the
+    # utterance; the rest of the text is the changed suffix, ``delta``
+    stable_length: int = 0
+    delta: str = ""
+
+
+@dataclass
+class BatchTranscription:
+    """Outcome of one buffer in a batch transcription."""
+
+    index: int
+    text: str | None = None
+    error: Exception | None = None
+    latency_ms: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Whether the buffer was transcribed."""
+        return self.error is None
 
 
 @dataclass
@@ -97,6 +84,17 @@ class STTMetrics:
     min_latency_ms: float = float("inf")
     max_latency_ms: float = 0.0
     total_audio_duration_ms: float = 0.0
+    latency_sketch: QuantileSketch = field(default_factory=QuantileSketch, repr=False)
+    cache_hits: int = 0
+    cache_misses: int = 0
+    cache_coalesced: int = 0  # joined an identical request already in flight
+    vad_bytes_in: int = 0  # audio reaching the speech gate
+    vad_bytes_kept: int = 0  # audio left after dropping silence
+    vad_skipped: int = 0  # single-shot buffers with no speech, never sent
+    vad_time_ms: float = 0.0  # spent trimming single-shot buffers
+    stability: StabilityMetrics = field(default_factory=StabilityMetrics, repr=False)
+    # Provider audio, RTF, TTFB and bytes, per model
+    throughput: ThroughputBreakdown = field(default_factory=ThroughputBreakdown, repr=False)
 
     @property
     def average_latency_ms(self) -> float:
@@ -112,6 +110,24 @@ class STTMetrics:
             return 0.0
         return self.successful_transcriptions / self.total_transcriptions
 
+    @property
+    def cache_hit_rate(self) -> float:
+        """Share of cache lookups served without a provider call of their own."""
+        lookups = self.cache_hits + self.cache_coalesced + self.cache_misses
+        if lookups == 0:
+            return 0.0
+        return (self.cache_hits + self.cache_coalesced) / lookups
+
+    @property
+    def vad_bytes_saved(self) -> int:
+        """Audio bytes dropped as silence instead of being sent."""
+        return self.vad_bytes_in - self.vad_bytes_kept
+
+    @property
+    def realtime_factor(self) -> float:
+        """Processing time per second of audio sent, over every model."""
+        return self.throughput.total.realtime_factor
+
 
 @dataclass
 class STTConfig:
@@ -121,8 +137,29 @@ class STTConfig:
     interim_results: bool = True
     punctuate: bool = True
     smart_format: bool = True
-    vad_enabled: bool = True
+    # Drop silence before audio is sent (see speech_gate). Off by default: a
+    # fixed level gate can clip quiet speakers.
+    vad_enabled: bool = False
+    vad_threshold_db: float = -45.0  # RMS level (dBFS) counted as speech
+    vad_padding_ms: int = 200  # kept around speech; streams add endpointing_ms after it
+    interim_interval_ms: int = 150  # at most one interim per interval; finals are immediate
+    adaptive_endpointing: bool = False  # learn per participant; needs vad_enabled
+    endpointing_min_ms: int = 100
+    endpointing_max_ms: int = 1200
     endpointing_ms: int = 300
+    sample_rate: int = 16000  # audio is converted to mono at this rate before upload
+    batch_concurrency: int = 4  # recognitions in flight in transcribe_many
+    cache_enabled: bool = False  # cache single-shot transcripts of repeated audio
+    cache_memory_entries: int = 1024
+    cache_dir: str | None = None  # enables the disk tier
+    cache_disk_bytes: int = 64 * 1024 * 1024
+    cache_ttl_s: float | None = 24 * 3600
+
+    def __post_init__(self) -> None:
+        """Reject settings that would silently do nothing."""
+        if self.adaptive_endpointing and not self.vad_enabled:
+            # The controller is driven by the gate's per-frame speech decisions
+            raise ValueError("adaptive_endpointing requires vad_enabled")
 
 
 @dataclass
@@ -140,11 +177,41 @@ class STTPipeline:
     config: STTConfig
     metrics: STTMetrics = field(default_factory=STTMetrics)
     state: TranscriptionState = TranscriptionState.IDLE
-    _stt: Optional[stt.STT] = field(default=None, init=False)
-    _on_transcription: Optional[Callable[[TranscriptionResult], None]] = None
+    _stt: deepgram.STT | None = field(default=None, init=False)
+    _on_transcription: Callable[[TranscriptionResult], None] | None = None
+    resilience: ResiliencePolicy = field(
+        default_factory=lambda: ResiliencePolicy(provider="deepgram")
+    )
+    cache: TranscriptCache | None = None
+    endpointing: EndpointingController | None = None
+    speculation: SpeculativeResponder[Any] | None = None
+    _in_flight: int = field(default=0, init=False, repr=False)
+    _pending: dict[str, asyncio.Future[str]] = field(default_factory=dict, init=False, repr=False)
+    _on_turn_end: Callable[[str], None] | None = None
+    _endpointing_ms: float = field(default=0.0, init=False, repr=False)
+    _pending_endpointing_ms: float | None = field(default=None, init=False, repr=False)
 
     def __post_init__(self) -> None:
         """Initialize the Deepgram STT instance."""
+        if self.cache is None and self.config.cache_enabled:
+            self.cache = TranscriptCache(
+                memory_max_entries=self.config.cache_memory_entries,
+                directory=self.config.cache_dir,
+                disk_max_bytes=self.config.cache_disk_bytes,
+                ttl_s=self.config.cache_ttl_s,
+            )
+        if self.endpointing is None and self.config.adaptive_endpointing:
+            self.endpointing = EndpointingController(
+                base_ms=self.config.endpointing_ms,
+                min_ms=self.config.endpointing_min_ms,
+                max_ms=self.config.endpointing_max_ms,
+                on_turn_end=self._turn_ended,
+            )
+        # With adaptive endpointing the controller ends turns; Deepgram's own
+        # endpointing only backstops it, at the longest the controller waits
+        self._endpointing_ms = (
+            self.endpointing.hold_ms if self.endpointing is not None else self.config.endpointing_ms
+        )
         self._stt = deepgram.STT(
             api_key=self.config.deepgram_config.api_key,
             model=self.config.deepgram_config.model,
@@ -152,6 +219,7 @@ class STTPipeline:
             interim_results=self.config.interim_results,
             punctuate=self.config.punctuate,
             smart_format=self.config.smart_format,
+            endpointing_ms=int(self._endpointing_ms),
         )
         logger.info(
             "stt_pipeline_initialized",
@@ -159,45 +227,136 @@ class STTPipeline:
             language=self.config.deepgram_config.language,
         )
 
-    def set_transcription_callback(
-        self, callback: Callable[[TranscriptionResult], None]
-    ) -> None:
+    def set_transcription_callback(self, callback: Callable[[TranscriptionResult], None]) -> None:
         """Set callback for transcription results."""
         self._on_transcription = callback
 
+    def enable_speculation(
+        self,
+        generate: Callable[[str], Awaitable[Any]],
+        config: VoiceProcessingConfig | None = None,
+    ) -> SpeculativeResponder[Any] | None:
+        """
+        Start the response stage on stable interims, if speculative_responses is on.
+
+        Interims from process_audio_stream are then observed with the
+        coalescer's stability; settle each final with speculative_response().
+
+        Args:
+            generate: The response stage, run on the transcript text
+            config: Voice processing config, loaded from the environment if None
+
+        Returns:
+            The responder, or None when speculation is off
+        """
+        self.speculation = create_speculative_responder(generate, config)
+        return self.speculation
+
+    async def speculative_response(self, final_text: str) -> Any | None:
+        """
+        Settle a turn on its final transcript.
+
+        Returns:
+            The response speculated on the same text, or None: generate it
+            from the final as usual
+        """
+        if self.speculation is None:
+            return None
+        return await self.speculation.resolve(final_text)
+
+    def set_turn_end_callback(self, callback: Callable[[str], None]) -> None:
+        """Set callback for turns ended by adaptive endpointing, given the turn's transcript."""
+        self._on_turn_end = callback
+
     async def process_audio_stream(
-        self, audio_stream: stt.SpeechStream
+        self, audio_stream: stt.SpeechStream, clock: StreamClock | None = None
     ) -> AsyncIterator[TranscriptionResult]:
         """
         Process an audio stream and yield transcription results.
 
+        Interims are coalesced (see InterimCoalescer): repeats are dropped
+        and at most one is delivered per interim_interval_ms, while finals
+        are delivered as soon as they arrive. Every result carries the
+        changed suffix relative to the previous one of its utterance.
+
+        Latency is measured from the end of the transcribed speech, resolved
+        through ``clock``. Pass the clock given to forward_audio so offsets
+        account for silence the gate dropped; without one, the stream's
+        audio is assumed to be sent live and without gaps from now on.
+
+        The stream counts as one request in metrics.throughput, processing
+        from now until it ends, with TTFB at its first transcript; the
+        audio sent is counted by forward_audio.
+
+        With adaptive endpointing, transcripts feed the controller's turn
+        cues, and once an ended turn's final arrives the threshold it has
+        learned is pushed to Deepgram as the backstop for the next turn.
+
+        With speculation enabled (see enable_speculation), interims start
+        the response stage once the coalescer has seen their text stable
+        for speculation_stable_ms; a speculation still pending when the
+        stream ends is cancelled.
+
         Args:
             audio_stream: The speech stream to process
+            clock: The stream's clock, see create_stream_clock
 
         Yields:
-            TranscriptionResult for each transcription event
+            TranscriptionResult for each delivered transcript
         """
         self.state = TranscriptionState.LISTENING
         logger.info("stt_processing_started")
+        coalescer = self.create_interim_coalescer()
+        clock = clock if clock is not None else self.create_stream_clock()
+        clock.start()
+        started_at = monotonic()
+        ttfb_ms: float | None = None
+        bytes_received = 0
+        events = aiter(audio_stream)
+        next_event: asyncio.Future[stt.SpeechEvent] | None = None
 
         try:
-            async for event in audio_stream:
-                if event.type == stt.SpeechEventType.FINAL_TRANSCRIPT:
-                    result = await self._handle_transcript(event, is_final=True)
+            while True:
+                if next_event is None:
+                    next_event = asyncio.ensure_future(anext(events))
+                timeout = coalescer.due_in() if coalescer.holding else None
+                done, _ = await asyncio.wait({next_event}, timeout=timeout)
+                if not done:
+                    # A held interim's interval has passed with no new event
+                    result = coalescer.pop_due()
                     if result:
-                        yield result
-                        if self._on_transcription:
-                            self._on_transcription(result)
+                        yield self._deliver_transcript(result)
+                    continue
 
-                elif event.type == stt.SpeechEventType.INTERIM_TRANSCRIPT:
-                    result = await self._handle_transcript(event, is_final=False)
-                    if result:
-                        yield result
-                        if self._on_transcription:
-                            self._on_transcription(result)
+                try:
+                    event = next_event.result()
+                except StopAsyncIteration:
+                    break
+                finally:
+                    next_event = None
 
-                elif event.type == stt.SpeechEventType.END_OF_SPEECH:
+                if event.type == stt.SpeechEventType.END_OF_SPEECH:
                     logger.debug("end_of_speech_detected")
+                    continue
+                is_final = event.type == stt.SpeechEventType.FINAL_TRANSCRIPT
+                if not is_final and event.type != stt.SpeechEventType.INTERIM_TRANSCRIPT:
+                    continue
+
+                result = self._handle_transcript(event, is_final=is_final, clock=clock)
+                if not result:
+                    continue
+                if self.endpointing is not None:
+                    self._observe_transcript(self.endpointing, result)
+                if ttfb_ms is None:
+                    ttfb_ms = elapsed_ms(started_at)
+                bytes_received += len(result.text.encode("utf-8"))
+                is_final = result.is_final
+                result = coalescer.push(result)
+                if self.speculation is not None and not is_final:
+                    # Every interim, delivered or held, times the text's stability
+                    self.speculation.observe(coalescer.text, coalescer.stable_for_ms())
+                if result:
+                    yield self._deliver_transcript(result)
 
         except Exception as e:
             self.state = TranscriptionState.ERROR
@@ -206,17 +365,172 @@ class STTPipeline:
             raise
 
         finally:
+            if next_event is not None:
+                next_event.cancel()
+            if self.speculation is not None:
+                self.speculation.reset()
             self.state = TranscriptionState.IDLE
+            self._record_throughput(
+                requests=1,
+                processing_ms=elapsed_ms(started_at),
+                ttfb_ms=ttfb_ms,
+                bytes_received=bytes_received,
+            )
+            stability = self.metrics.stability
             logger.info(
                 "stt_processing_completed",
                 total_transcriptions=self.metrics.total_transcriptions,
                 success_rate=self.metrics.success_rate,
+                interims_coalesced=stability.interims_coalesced,
+                revision_rate=round(stability.revision_rate, 3),
+            )
+
+    def create_interim_coalescer(self) -> InterimCoalescer:
+        """Create an interim coalescer for one stream, counting into metrics.stability."""
+        return InterimCoalescer(
+            min_interval_ms=self.config.interim_interval_ms,
+            metrics=self.metrics.stability,
+        )
+
+    def create_stream_clock(self) -> StreamClock:
+        """Create the clock mapping one stream's audio offsets to monotonic time."""
+        return StreamClock()
+
+    def create_speech_gate(self) -> SpeechGate:
+        """
+        Create a speech gate for one live stream.
+
+        The trailing padding includes endpointing_ms (endpointing_max_ms
+        with adaptive endpointing), so Deepgram still hears enough of the
+        pause after speech to finalize the utterance.
+        """
+        endpointing_ms = (
+            self.config.endpointing_max_ms
+            if self.endpointing is not None
+            else self.config.endpointing_ms
+        )
+        return SpeechGate(
+            threshold_db=self.config.vad_threshold_db,
+            padding_before_ms=self.config.vad_padding_ms,
+            padding_after_ms=self.config.vad_padding_ms + endpointing_ms,
+        )
+
+    async def forward_audio(
+        self,
+        frames: AsyncIterable[rtc.AudioFrame],
+        stream: stt.SpeechStream,
+        clock: StreamClock | None = None,
+    ) -> GateMetrics:
+        """
+        Push live frames into a speech stream, dropping silence if vad_enabled.
+
+        With adaptive endpointing, every frame's speech or silence also
+        drives the endpointing controller. When it ends a turn (silence
+        scaled by the transcript's cues) the stream is flushed, so Deepgram
+        finalizes at once instead of waiting out its own endpointing.
+
+        Args:
+            frames: Audio frames, e.g. from an rtc.AudioStream
+            stream: The speech stream to feed; the caller closes it
+            clock: The stream's clock, advanced with the capture time of
+                every frame sent; pass the same one to process_audio_stream
+
+        Returns:
+            The stream's gate metrics (all frames kept when gating is off)
+        """
+        gate = self.create_speech_gate() if self.config.vad_enabled else None
+        passed = GateMetrics()
+        sent_s = 0.0
+        try:
+            async for frame in frames:
+                now = monotonic()
+                if gate is None:
+                    stream.push_frame(frame)
+                    sent_s += frame.duration
+                    if clock is not None:
+                        clock.push(frame.duration, now - frame.duration)
+                    passed.frames_in += 1
+                    passed.frames_out += 1
+                    passed.bytes_in += len(frame.data) * 2
+                    passed.bytes_out += len(frame.data) * 2
+                    continue
+                kept = gate.push(frame)
+                for out in kept:
+                    stream.push_frame(out)
+                    sent_s += out.duration
+                if clock is not None and kept:
+                    # Held padding was captured back to back before this frame
+                    captured_at = now - sum(out.duration for out in kept)
+                    for out in kept:
+                        clock.push(out.duration, captured_at)
+                        captured_at += out.duration
+                if self.endpointing is not None:
+                    self._update_endpointing(self.endpointing, gate.speaking, now, stream)
+        finally:
+            metrics = gate.metrics if gate is not None else passed
+            self.metrics.vad_bytes_in += metrics.bytes_in
+            self.metrics.vad_bytes_kept += metrics.bytes_out
+            self._record_throughput(audio_ms=sent_s * 1000, bytes_sent=metrics.bytes_out)
+            logger.info(
+                "stt_stream_forwarded",
+                frames=metrics.frames_in,
+                bytes_saved=metrics.bytes_saved,
+                saved_ratio=round(metrics.saved_ratio, 3),
+                speech_segments=metrics.speech_segments,
             )
+        return metrics
 
-    async def _handle_transcript(
-        self, event: stt.SpeechEvent, is_final: bool
-    ) -> Optional[TranscriptionResult]:
-        """Handle a transcription event and create result."""
+    def _update_endpointing(
+        self,
+        endpointing: EndpointingController,
+        speaking: bool,
+        now: float,
+        stream: stt.SpeechStream,
+    ) -> None:
+        """Feed one frame's speech decision to the controller, committing turns it ends."""
+        if speaking:
+            endpointing.on_speech(now)
+        elif endpointing.on_silence(now):
+            stream.flush()
+            # Reconfiguring reconnects the stream, which would lose the turn's
+            # final: the learned backstop is pushed once that final is in
+            self._pending_endpointing_ms = endpointing.hold_ms
+
+    def _observe_transcript(
+        self, endpointing: EndpointingController, result: TranscriptionResult
+    ) -> None:
+        """Feed a transcript's cues to the controller; between turns, push its threshold."""
+        endpointing.on_transcript(result.text)
+        if result.is_final and endpointing.turn_ended and self._pending_endpointing_ms is not None:
+            self.set_endpointing(self._pending_endpointing_ms)
+            self._pending_endpointing_ms = None
+
+    def _turn_ended(self, text: str) -> None:
+        logger.info("stt_turn_end_detected", text_length=len(text))
+        if self._on_turn_end is not None:
+            self._on_turn_end(text)
+
+    def set_endpointing(self, endpointing_ms: float, min_change_ms: float = 50.0) -> None:
+        """
+        Change the silence Deepgram waits for before finalizing.
+
+        Changes smaller than ``min_change_ms`` are skipped, since each one
+        reconfigures (reconnects) the live stream: call it between turns.
+        """
+        if self._stt is None or abs(endpointing_ms - self._endpointing_ms) < min_change_ms:
+            return
+        self._stt.update_options(endpointing_ms=int(endpointing_ms))
+        logger.info(
+            "stt_endpointing_updated",
+            previous_ms=round(self._endpointing_ms),
+            endpointing_ms=int(endpointing_ms),
+        )
+        self._endpointing_ms = endpointing_ms
+
+    def _handle_transcript(
+        self, event: stt.SpeechEvent, is_final: bool, clock: StreamClock
+    ) -> TranscriptionResult | None:
+        """Create a result from a transcription event."""
         if not event.alternatives:
             return None
 
@@ -224,19 +538,29 @@ class STTPipeline:
         if not best_alternative.text.strip():
             return None
 
-        # Calculate latency (time from speech end to transcription)
-        receive_time = datetime.now(timezone.utc).timestamp()
-        latency_ms = (receive_time - event.alternatives[0].start_time) * 1000
+        # Latency from the end of the transcribed speech to now
+        end_time = getattr(best_alternative, "end_time", 0.0)
+        latency_ms = clock.latency_ms(end_time)
 
         result = TranscriptionResult(
             text=best_alternative.text,
             is_final=is_final,
-            confidence=best_alternative.confidence if hasattr(best_alternative, 'confidence') else 0.95,
-            start_time=best_alternative.start_time if hasattr(best_alternative, 'start_time') else 0.0,
-            end_time=best_alternative.end_time if hasattr(best_alternative, 'end_time') else 0.0,
+            confidence=best_alternative.confidence
+            if hasattr(best_alternative, "confidence")
+            else 0.95,
+            start_time=best_alternative.start_time
+            if hasattr(best_alternative, "start_time")
+            else 0.0,
+            end_time=best_alternative.end_time if hasattr(best_alternative, "end_time") else 0.0,
             latency_ms=latency_ms,
             language=self.config.deepgram_config.language,
         )
+        return result
+
+    def _deliver_transcript(self, result: TranscriptionResult) -> TranscriptionResult:
+        """Record a result being delivered and pass it to the callback."""
+        is_final = result.is_final
+        latency_ms = result.latency_ms
 
         # Update metrics
         self.metrics.total_transcriptions += 1
@@ -245,6 +569,16 @@ class STTPipeline:
             self.metrics.total_latency_ms += latency_ms
             self.metrics.min_latency_ms = min(self.metrics.min_latency_ms, latency_ms)
             self.metrics.max_latency_ms = max(self.metrics.max_latency_ms, latency_ms)
+            self.metrics.latency_sketch.add(latency_ms)
+            get_tracer().start_span(
+                "stt.final_transcript",
+                parent=current_turn_span(),
+                model=self.config.deepgram_config.model,
+                language=result.language,
+                text_length=len(result.text),
+                confidence=float(result.confidence),
+                latency_ms=round(latency_ms, 2),
+            ).end()
 
         logger.debug(
             "transcription_received",
@@ -253,6 +587,8 @@ class STTPipeline:
             latency_ms=round(latency_ms, 2),
         )
 
+        if self._on_transcription:
+            self._on_transcription(result)
         return result
 
     async def transcribe_audio(
@@ -260,54 +596,357 @@ class STTPipeline:
         audio_data: bytes,
         sample_rate: int = 16000,
         max_retries: int = 3,
+        deadline: TurnDeadline | None = None,
+        num_channels: int = 1,
     ) -> str:
         """
         Transcribe a single audio buffer with retry support.
 
+        Audio that is not mono at ``config.sample_rate`` is converted first,
+        e.g. 48kHz room audio is sent as 16kHz, a third of the bytes.
+
         Args:
-            audio_data: Raw audio bytes
+            audio_data: Raw 16-bit PCM bytes
             sample_rate: Audio sample rate in Hz
             max_retries: Maximum retry attempts for transient failures
+            deadline: Turn budget, defaults to the current turn's deadline
+            num_channels: Channels interleaved in audio_data
 
         Returns:
             Transcribed text
+
+        Raises:
+            DeadlineExceededError: If the turn budget runs out before a transcript
         """
-        self.state = TranscriptionState.PROCESSING
-        start_time = datetime.now(timezone.utc)
+        deadline = deadline if deadline is not None else current_deadline()
+        self._begin_request()
+        try:
+            text, _ = await self._recognize(
+                audio_data, sample_rate, num_channels, max_retries, deadline
+            )
+            return text
 
-        async def _do_transcribe():
-            return await self._stt.recognize(
-                buffer=audio_data,
-                sample_rate=sample_rate,
+        except Exception as e:
+            logger.error("transcription_failed", error=str(e))
+            raise
+
+        finally:
+            self._end_request()
+
+    async def transcribe_many(
+        self,
+        buffers: Iterable[bytes],
+        sample_rate: int = 16000,
+        max_concurrency: int | None = None,
+        max_retries: int = 3,
+        num_channels: int = 1,
+    ) -> list[BatchTranscription]:
+        """
+        Transcribe many audio buffers concurrently, e.g. a recorded meeting.
+
+        At most ``max_concurrency`` recognitions run at once. A failed item
+        is reported in its result instead of failing the batch. Items are
+        not bound by any turn deadline.
+
+        Args:
+            buffers: Raw 16-bit PCM buffers
+            sample_rate: Sample rate of every buffer in Hz
+            max_concurrency: Concurrent recognitions, defaults to config.batch_concurrency
+            max_retries: Maximum retry attempts per item
+            num_channels: Channels interleaved in every buffer
+
+        Returns:
+            One result per buffer, in input order
+        """
+        return [
+            result
+            async for result in self.transcribe_iter(
+                buffers, sample_rate, max_concurrency, max_retries, num_channels
             )
+        ]
 
-        try:
-            # Use recognize for single-shot transcription with retry
-            result = await retry_async(_do_transcribe, max_retries=max_retries)
+    async def transcribe_iter(
+        self,
+        buffers: Iterable[bytes] | AsyncIterable[bytes],
+        sample_rate: int = 16000,
+        max_concurrency: int | None = None,
+        max_retries: int = 3,
+        num_channels: int = 1,
+    ) -> AsyncIterator[BatchTranscription]:
+        """
+        Transcribe buffers concurrently, yielding results in input order.
 
-            latency_ms = (datetime.now(timezone.utc) - start_time).total_seconds() * 1000
-            text = result.text if result else ""
+        Buffers are pulled lazily, at most twice ``max_concurrency`` ahead
+        of the result being yielded, so an arbitrarily long (or still
+        arriving) input is never read into memory at once.
 
-            self.metrics.total_transcriptions += 1
-            self.metrics.successful_transcriptions += 1
-            self.metrics.total_latency_ms += latency_ms
+        Args:
+            buffers: Raw 16-bit PCM buffers, from a sync or async iterable
+            sample_rate: Sample rate of every buffer in Hz
+            max_concurrency: Concurrent recognitions, defaults to config.batch_concurrency
+            max_retries: Maximum retry attempts per item
+            num_channels: Channels interleaved in every buffer
 
+        Yields:
+            One result per buffer, in input order, as soon as it and every
+            earlier result are done
+        """
+        concurrency = max(1, max_concurrency or self.config.batch_concurrency)
+        slots = asyncio.Semaphore(concurrency)
+        pending: deque[asyncio.Task[BatchTranscription]] = deque()
+        start = monotonic()
+        completed = failed = 0
+
+        async def _one(index: int, audio: bytes) -> BatchTranscription:
+            async with slots:
+                try:
+                    text, latency_ms = await self._recognize(
+                        audio, sample_rate, num_channels, max_retries, deadline=None
+                    )
+                    return BatchTranscription(index=index, text=text, latency_ms=latency_ms)
+                except Exception as e:
+                    logger.warning("batch_item_failed", index=index, error=str(e))
+                    return BatchTranscription(index=index, error=e)
+
+        async def _inputs() -> AsyncIterator[bytes]:
+            if isinstance(buffers, AsyncIterable):
+                async for audio in buffers:
+                    yield audio
+            else:
+                for audio in buffers:
+                    yield audio
+
+        self._begin_request()
+        try:
+            index = 0
+            async for audio in _inputs():
+                pending.append(asyncio.ensure_future(_one(index, audio)))
+                index += 1
+                if len(pending) >= 2 * concurrency:
+                    result = await pending.popleft()
+                    completed += 1
+                    failed += not result.ok
+                    yield result
+            while pending:
+                result = await pending.popleft()
+                completed += 1
+                failed += not result.ok
+                yield result
+
+            elapsed = monotonic() - start
             logger.info(
-                "audio_transcribed",
-                text_length=len(text),
-                latency_ms=round(latency_ms, 2),
+                "stt_batch_completed",
+                items=completed,
+                failed=failed,
+                concurrency=concurrency,
+                items_per_second=round(completed / elapsed, 2) if elapsed > 0 else 0.0,
             )
+        finally:
+            for task in pending:
+                task.cancel()
+            self._end_request()
+
+    def _cache_key(self, audio_data: BytesLike, sample_rate: int, num_channels: int) -> str:
+        """Content address of the transcript this pipeline would produce for audio."""
+        return transcript_key(
+            audio_data,
+            sample_rate=sample_rate,
+            num_channels=num_channels,
+            model=self.config.deepgram_config.model,
+            language=self.config.deepgram_config.language,
+            punctuate=self.config.punctuate,
+            smart_format=self.config.smart_format,
+        )
 
-            return text
+    async def _recognize(
+        self,
+        audio_data: BytesLike,
+        sample_rate: int,
+        num_channels: int,
+        max_retries: int,
+        deadline: TurnDeadline | None,
+    ) -> tuple[str, float]:
+        """
+        Recognize one buffer, serving repeated audio from the cache.
+
+        With vad_enabled, leading and trailing silence is trimmed first,
+        and a buffer with no speech is answered with an empty transcript
+        without calling the provider. Identical requests arriving while
+        one is in flight wait for its result (or error) instead of calling
+        the provider again. Cache hits, coalesced requests and skipped
+        silence do not count as transcriptions.
+
+        Returns:
+            Transcribed text and latency in ms
+        """
+        if self.config.vad_enabled:
+            audio_data = self._trim_silence(audio_data, sample_rate, num_channels)
+            if not audio_data:
+                self.metrics.vad_skipped += 1
+                logger.info("stt_skipped_silence")
+                return "", 0.0
+
+        if self.cache is None:
+            return await self._recognize_uncached(
+                audio_data, sample_rate, num_channels, max_retries, deadline
+            )
 
+        start = monotonic()
+        key = self._cache_key(audio_data, sample_rate, num_channels)
+        while True:
+            text = self.cache.get(key)
+            if text is not None:
+                self.metrics.cache_hits += 1
+                latency_ms = elapsed_ms(start)
+                logger.info("stt_cache_hit", latency_ms=round(latency_ms, 3))
+                return text, latency_ms
+
+            pending = self._pending.get(key)
+            if pending is None:
+                break
+            self.metrics.cache_coalesced += 1
+            try:
+                shared = asyncio.shield(pending)
+                text = await (deadline.run(shared, PHASE_STT) if deadline else shared)
+                return text, elapsed_ms(start)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The request we joined was cancelled, not us: look again
+                self.metrics.cache_coalesced -= 1
+
+        self.metrics.cache_misses += 1
+        pending = asyncio.get_running_loop().create_future()
+        self._pending[key] = pending
+        try:
+            text, latency_ms = await self._recognize_uncached(
+                audio_data, sample_rate, num_channels, max_retries, deadline
+            )
+        except asyncio.CancelledError:
+            pending.cancel()
+            raise
         except Exception as e:
-            self.metrics.total_transcriptions += 1
-            self.metrics.failed_transcriptions += 1
-            self.state = TranscriptionState.ERROR
-            logger.error("transcription_failed", error=str(e))
+            pending.set_exception(e)
+            pending.exception()  # retrieved, whether or not anyone joined
             raise
-
         finally:
+            del self._pending[key]
+        pending.set_result(text)
+        self.cache.put(key, text)
+        return text, latency_ms
+
+    async def _recognize_uncached(
+        self,
+        audio_data: BytesLike,
+        sample_rate: int,
+        num_channels: int,
+        max_retries: int,
+        deadline: TurnDeadline | None,
+    ) -> tuple[str, float]:
+        """
+        Recognize one buffer, hedged and retried, and record its metrics.
+
+        Holds no state outside its own frame, so any number may run at once.
+
+        Returns:
+            Transcribed text and latency in ms
+        """
+        start = monotonic()
+        if sample_rate != self.config.sample_rate or num_channels != 1:
+            audio_data = resample(audio_data, sample_rate, self.config.sample_rate, num_channels)
+            sample_rate = self.config.sample_rate
+
+        async def _do_transcribe() -> Any:
+            return await self.stt_instance.recognize(
+                buffer=audio_data,
+                sample_rate=sample_rate,
+            )
+
+        try:
+            # Use recognize for single-shot transcription, hedged and retried
+            with deadline.phase(PHASE_STT) if deadline else nullcontext():
+                result = await self.resilience.call(
+                    _do_transcribe,
+                    max_retries=max_retries,
+                    deadline=deadline,
+                    phase=PHASE_STT,
+                )
+        except Exception:
+            self._record_transcription(None)
+            raise
+
+        latency_ms = elapsed_ms(start)
+        text = result.text if result else ""
+        self._record_transcription(latency_ms, audio_bytes=len(audio_data), text=text)
+        logger.info(
+            "audio_transcribed",
+            text_length=len(text),
+            latency_ms=round(latency_ms, 2),
+        )
+        return text, latency_ms
+
+    def _trim_silence(
+        self, audio_data: BytesLike, sample_rate: int, num_channels: int
+    ) -> memoryview:
+        """Trim silence from a single-shot buffer, counting the bytes dropped."""
+        start = monotonic()
+        trimmed = trim_silence(
+            audio_data,
+            sample_rate,
+            num_channels,
+            threshold_db=self.config.vad_threshold_db,
+            padding_ms=self.config.vad_padding_ms,
+        )
+        self.metrics.vad_time_ms += elapsed_ms(start)
+        self.metrics.vad_bytes_in += len(audio_data)
+        self.metrics.vad_bytes_kept += len(trimmed)
+        return trimmed
+
+    def _record_transcription(
+        self, latency_ms: float | None, audio_bytes: int = 0, text: str = ""
+    ) -> None:
+        """
+        Count one single-shot transcription, successful if it has a latency.
+
+        ``audio_bytes`` is the mono PCM sent at config.sample_rate. The
+        transcript reaches the caller all at once, so TTFB is the latency.
+
+        Runs without awaiting, so concurrent requests on the event loop
+        never interleave partial updates.
+        """
+        metrics = self.metrics
+        metrics.total_transcriptions += 1
+        if latency_ms is None:
+            metrics.failed_transcriptions += 1
+            return
+        metrics.successful_transcriptions += 1
+        metrics.total_latency_ms += latency_ms
+        metrics.min_latency_ms = min(metrics.min_latency_ms, latency_ms)
+        metrics.max_latency_ms = max(metrics.max_latency_ms, latency_ms)
+        metrics.latency_sketch.add(latency_ms)
+        self._record_throughput(
+            requests=1,
+            audio_ms=pcm_duration_ms(audio_bytes, self.config.sample_rate),
+            processing_ms=latency_ms,
+            ttfb_ms=latency_ms,
+            bytes_sent=audio_bytes,
+            bytes_received=len(text.encode("utf-8")),
+        )
+
+    def _record_throughput(self, **work: Any) -> None:
+        """Count provider work for the configured model (see ThroughputMetrics.record)."""
+        self.metrics.total_audio_duration_ms += work.get("audio_ms", 0.0)
+        self.metrics.throughput.record(self.config.deepgram_config.model, **work)
+
+    def _begin_request(self) -> None:
+        """Mark a single-shot request in flight."""
+        self._in_flight += 1
+        self.state = TranscriptionState.PROCESSING
+
+    def _end_request(self) -> None:
+        """Mark a request done; the pipeline is idle once none are in flight."""
+        self._in_flight -= 1
+        if self._in_flight == 0:
             self.state = TranscriptionState.IDLE
 
     def get_metrics(self) -> STTMetrics:
@@ -326,7 +965,7 @@ class STTPipeline:
         return self._stt
 
 
-def create_stt_pipeline(config: Optional[STTConfig] = None) -> STTPipeline:
+def create_stt_pipeline(config: STTConfig | None = None) -> STTPipeline:
     """
     Factory function to create an STT pipeline.
 
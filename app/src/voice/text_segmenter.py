@@ -0,0 +1,125 @@
+"""Split text into speakable segments for pipelined synthesis."""
+
+import re
+from dataclasses import dataclass, field
+
+# Sentence terminators, optionally followed by closing quotes or brackets,
+# counted only when whitespace follows (so "3.5" and "example.com" stay whole)
+_SENTENCE_END = re.compile(r"[.!?…]+[\"')\]]*(?=\s)")
+_CLAUSE_END = re.compile(r"[,;:—–]+(?=\s)")
+_ABBREVIATIONS = frozenset(
+    {"mr.", "mrs.", "ms.", "dr.", "prof.", "sr.", "jr.", "st.", "vs.", "etc.", "e.g.", "i.e."}
+)
+
+
+def _is_abbreviation(text: str, end: int) -> bool:
+    """Whether the word ending at `end` is a known abbreviation."""
+    word_start = text.rfind(" ", 0, end) + 1
+    return text[word_start:end].lower() in _ABBREVIATIONS
+
+
+def find_boundary(text: str, min_chars: int = 20, max_chars: int = 250) -> int:
+    """
+    Find where the first speakable segment of `text` ends.
+
+    Sentence ends are preferred; sentences shorter than ``min_chars`` are
+    merged with the next. If no sentence ends within ``max_chars``, the
+    segment is cut at the last clause boundary (comma, semicolon, dash),
+    else at the last space, before ``max_chars``.
+
+    Args:
+        text: Text to scan
+        min_chars: Minimum segment length
+        max_chars: Maximum segment length
+
+    Returns:
+        Index just past the boundary, or -1 if the text holds no complete
+        segment yet (it is shorter than max_chars and has no sentence end)
+    """
+    for match in _SENTENCE_END.finditer(text):
+        end = match.end()
+        if end > max_chars:
+            break
+        if end < min_chars or _is_abbreviation(text, end):
+            continue
+        return end
+
+    if len(text) <= max_chars:
+        return -1
+
+    window = text[:max_chars]
+    clause_ends = [m.end() for m in _CLAUSE_END.finditer(window) if m.end() >= min_chars]
+    if clause_ends:
+        return clause_ends[-1]
+    space = window.rfind(" ")
+    if space >= min_chars:
+        return space
+    return max_chars
+
+
+def split_segments(text: str, min_chars: int = 20, max_chars: int = 250) -> list[str]:
+    """
+    Split finished text into speakable segments.
+
+    Args:
+        text: Text to split
+        min_chars: Minimum segment length (shorter sentences are merged)
+        max_chars: Maximum segment length (longer sentences are cut at clauses)
+
+    Returns:
+        Non-empty, stripped segments in order
+    """
+    segments = []
+    rest = text.strip()
+    while rest:
+        cut = find_boundary(rest, min_chars, max_chars)
+        if cut < 0:
+            segments.append(rest)
+            break
+        segments.append(rest[:cut].strip())
+        rest = rest[cut:].strip()
+    return [segment for segment in segments if segment]
+
+
+@dataclass
+class SegmentBuffer:
+    """
+    Aggregates streamed text (e.g. LLM tokens) into speakable segments.
+
+    A sentence is only complete once the whitespace after it arrives, so
+    "3." followed by "5" is never cut.
+    """
+
+    min_chars: int = 20
+    max_chars: int = 250
+    _text: str = field(default="", init=False, repr=False)
+
+    @property
+    def pending(self) -> str:
+        """Buffered text not yet part of a segment."""
+        return self._text
+
+    def push(self, text: str) -> list[str]:
+        """
+        Add text and take every segment it completes.
+
+        Returns:
+            Completed segments in order (possibly none)
+        """
+        self._text += text
+        segments = []
+        while True:
+            cut = find_boundary(self._text, self.min_chars, self.max_chars)
+            if cut < 0:
+                break
+            segment = self._text[:cut].strip()
+            self._text = self._text[cut:].lstrip()
+            if segment:
+                segments.append(segment)
+        return segments
+
+    def flush(self) -> str | None:
+        """Take the buffered remainder as a segment, or None if there is none."""
+        segment = self._text.strip()
+        self._text = ""
+        return segment or None
@@ -0,0 +1,77 @@
+"""Audio throughput accounting: audio processed, realtime factor, TTFB, bytes."""
+
+from dataclasses import dataclass, field
+from typing import Any
+
+from .quantile_sketch import QuantileSketch
+
+
+@dataclass
+class ThroughputMetrics:
+    """
+    Provider work for one model or voice (or all of them).
+
+    Every path records the same quantities, so streaming and single-shot
+    requests are directly comparable:
+
+    - ``audio_ms``: audio sent to STT, or synthesized by TTS
+    - ``processing_ms``: request start to the last result; for a live STT
+      stream, the stream's lifetime
+    - TTFB: request start to the first audio or transcript the caller
+      can use; for single-shot requests that is the whole response
+    - ``bytes_sent``/``bytes_received``: payload to and from the provider
+      (PCM one way, UTF-8 text the other)
+    """
+
+    requests: int = 0
+    audio_ms: float = 0.0
+    processing_ms: float = 0.0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    ttfb_sketch: QuantileSketch = field(default_factory=QuantileSketch, repr=False)
+
+    @property
+    def audio_seconds(self) -> float:
+        """Seconds of audio processed."""
+        return self.audio_ms / 1000
+
+    @property
+    def realtime_factor(self) -> float:
+        """Processing time per second of audio (below 1 is faster than realtime)."""
+        if self.audio_ms == 0:
+            return 0.0
+        return self.processing_ms / self.audio_ms
+
+    def record(
+        self,
+        requests: int = 0,
+        audio_ms: float = 0.0,
+        processing_ms: float = 0.0,
+        ttfb_ms: float | None = None,
+        bytes_sent: int = 0,
+        bytes_received: int = 0,
+    ) -> None:
+        """Add one request's work, or part of it for a stream."""
+        self.requests += requests
+        self.audio_ms += audio_ms
+        self.processing_ms += processing_ms
+        self.bytes_sent += bytes_sent
+        self.bytes_received += bytes_received
+        if ttfb_ms is not None:
+            self.ttfb_sketch.add(ttfb_ms)
+
+
+@dataclass
+class ThroughputBreakdown:
+    """Throughput overall and per model or voice."""
+
+    total: ThroughputMetrics = field(default_factory=ThroughputMetrics)
+    by_key: dict[str, ThroughputMetrics] = field(default_factory=dict)
+
+    def record(self, key: str, **work: Any) -> None:
+        """Record work (see ThroughputMetrics.record) overall and under ``key``."""
+        self.total.record(**work)
+        metrics = self.by_key.get(key)
+        if metrics is None:
+            metrics = self.by_key[key] = ThroughputMetrics()
+        metrics.record(**work)
@@ -0,0 +1,335 @@
+"""Lightweight OpenTelemetry-style tracing for conversational turns."""
+
+import asyncio
+import json
+import os
+import queue
+import threading
+import time
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Optional, Protocol
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+def _new_id(num_bytes: int) -> str:
+    return os.urandom(num_bytes).hex()
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    """Encode an attribute value as an OTLP AnyValue."""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: dict[str, Any]) -> list[dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()]
+
+
+class SpanStatus:
+    """OTLP span status codes."""
+
+    UNSET = "STATUS_CODE_UNSET"
+    OK = "STATUS_CODE_OK"
+    ERROR = "STATUS_CODE_ERROR"
+
+
+@dataclass
+class Span:
+    """A timed operation within a trace."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_span_id: str | None = None
+    start_time_ns: int = field(default_factory=time.time_ns)
+    end_time_ns: int | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    events: list[dict[str, Any]] = field(default_factory=list)
+    status: str = SpanStatus.UNSET
+    status_message: str = ""
+    _tracer: Optional["Tracer"] = field(default=None, repr=False)
+
+    @property
+    def is_ended(self) -> bool:
+        """Whether end() has been called."""
+        return self.end_time_ns is not None
+
+    @property
+    def duration_ms(self) -> float:
+        """Span duration, 0.0 while still open."""
+        if self.end_time_ns is None:
+            return 0.0
+        return (self.end_time_ns - self.start_time_ns) / 1e6
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Set a span attribute."""
+        self.attributes[key] = value
+
+    def add_event(self, name: str, **attributes: Any) -> None:
+        """Record a point-in-time event (e.g. first byte) on the span."""
+        self.events.append(
+            {"name": name, "time_unix_nano": time.time_ns(), "attributes": attributes}
+        )
+
+    def record_exception(self, error: BaseException) -> None:
+        """Mark the span as failed."""
+        self.status = SpanStatus.ERROR
+        self.status_message = str(error)
+        self.add_event("exception", type=type(error).__name__, message=str(error))
+
+    def record_cancellation(self) -> None:
+        """
+        Note that the operation was cancelled (e.g. by barge-in).
+
+        Cancellation is not a failure, so the status stays unset; the span
+        carries a ``cancelled`` attribute and event instead.
+        """
+        self.set_attribute("cancelled", True)
+        self.add_event("cancelled")
+
+    def end(self, end_time_ns: int | None = None) -> None:
+        """End the span and hand it to the exporter. Ending twice is a no-op."""
+        if self.end_time_ns is not None:
+            return
+        self.end_time_ns = time.time_ns() if end_time_ns is None else end_time_ns
+        if self._tracer is not None:
+            self._tracer._on_end(self)
+
+    def to_otlp(self) -> dict[str, Any]:
+        """Encode as an OTLP/JSON span."""
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(self.start_time_ns),
+            "endTimeUnixNano": str(self.end_time_ns or self.start_time_ns),
+            "attributes": _otlp_attributes(self.attributes),
+            "events": [
+                {
+                    "name": event["name"],
+                    "timeUnixNano": str(event["time_unix_nano"]),
+                    "attributes": _otlp_attributes(event["attributes"]),
+                }
+                for event in self.events
+            ],
+            "status": {"code": self.status, "message": self.status_message},
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        return span
+
+
+class SpanExporter(Protocol):
+    """Receives ended spans."""
+
+    def export(self, spans: list[Span]) -> None: ...
+
+    def shutdown(self) -> None: ...
+
+
+@dataclass
+class InMemorySpanExporter:
+    """Keeps ended spans in memory (tests and debugging)."""
+
+    spans: list[Span] = field(default_factory=list)
+
+    def export(self, spans: list[Span]) -> None:
+        self.spans.extend(spans)
+
+    def shutdown(self) -> None:
+        pass
+
+    def by_name(self, name: str) -> list[Span]:
+        """Get exported spans with the given name."""
+        return [span for span in self.spans if span.name == name]
+
+
+class JsonlFileExporter:
+    """
+    Appends spans to a file as OTLP/JSON lines.
+
+    Each line is an ExportTraceServiceRequest, the format written by the
+    OpenTelemetry Collector file exporter, so the file can be replayed into
+    any OTLP backend. Encoding and file I/O run on a background thread;
+    export() only enqueues and never blocks the event loop. The file is
+    opened up front, so a bad path fails in the constructor, and the queue
+    is bounded: if the writer falls behind, new spans are dropped and
+    counted in ``dropped_spans``.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        path: str,
+        service_name: str = "launchpad-voice-agent",
+        max_queue_size: int = 4096,
+    ) -> None:
+        self.path = path
+        self.service_name = service_name
+        self.dropped_spans = 0
+        self._file = open(path, "a", encoding="utf-8")
+        self._queue: queue.Queue[object] = queue.Queue(maxsize=max_queue_size)
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, spans: list[Span]) -> None:
+        for span in spans:
+            try:
+                self._queue.put_nowait(span)
+            except queue.Full:
+                self.dropped_spans += 1
+                if self.dropped_spans == 1:
+                    logger.warning("trace_queue_full", path=self.path, span=span.name)
+
+    def _run(self) -> None:
+        with self._file as trace_file:
+            while True:
+                batch = [self._queue.get()]
+                while True:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                stop = any(item is self._STOP for item in batch)
+                spans = [item for item in batch if isinstance(item, Span)]
+                if spans:
+                    try:
+                        trace_file.write(json.dumps(self._encode(spans)) + "\n")
+                        trace_file.flush()
+                    except (OSError, ValueError) as e:
+                        self.dropped_spans += len(spans)
+                        logger.warning("trace_write_failed", path=self.path, error=str(e))
+                if stop:
+                    return
+
+    def _encode(self, spans: list[Span]) -> dict[str, Any]:
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": _otlp_attributes({"service.name": self.service_name})
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "launchpad.voice"},
+                            "spans": [span.to_otlp() for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+
+    def shutdown(self) -> None:
+        """Flush pending spans and stop the writer thread."""
+        try:
+            self._queue.put(self._STOP, timeout=5.0)
+        except queue.Full:
+            logger.warning("trace_exporter_stop_timeout", path=self.path)
+        self._thread.join(timeout=5.0)
+
+
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+@dataclass
+class Tracer:
+    """Creates spans and forwards ended spans to an exporter."""
+
+    exporter: SpanExporter | None = None
+
+    def start_span(
+        self,
+        name: str,
+        parent: Span | None = None,
+        start_time_ns: int | None = None,
+        attributes: Mapping[str, Any] | None = None,
+        **extra_attributes: Any,
+    ) -> Span:
+        """
+        Start a span that the caller must end().
+
+        Args:
+            name: Span name
+            parent: Parent span, defaults to the span active in this context
+            start_time_ns: Start time (unix ns), defaults to now
+            attributes: Initial span attributes, as a mapping
+            **extra_attributes: More initial attributes, as keywords
+
+        Returns:
+            The started span
+        """
+        parent = parent or _current_span.get()
+        return Span(
+            name=name,
+            trace_id=parent.trace_id if parent else _new_id(16),
+            span_id=_new_id(8),
+            parent_span_id=parent.span_id if parent else None,
+            start_time_ns=time.time_ns() if start_time_ns is None else start_time_ns,
+            attributes={**(attributes or {}), **extra_attributes},
+            _tracer=self,
+        )
+
+    @contextmanager
+    def span(self, name: str, parent: Span | None = None, **attributes: Any) -> Iterator[Span]:
+        """
+        Run a block inside a span that is active for nested spans.
+
+        Exceptions are recorded on the span and re-raised; cancellation is
+        recorded as such, not as an error.
+        """
+        span = self.start_span(name, parent=parent, attributes=attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except asyncio.CancelledError:
+            span.record_cancellation()
+            raise
+        except BaseException as e:
+            span.record_exception(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+
+    def _on_end(self, span: Span) -> None:
+        if self.exporter is None:
+            return
+        try:
+            self.exporter.export([span])
+        except Exception as e:
+            logger.warning("span_export_failed", span=span.name, error=str(e))
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Get the process-wide tracer."""
+    return _tracer
+
+
+def configure_tracing(exporter: SpanExporter | None) -> Tracer:
+    """Install an exporter on the process-wide tracer, shutting down the old one."""
+    previous = _tracer.exporter
+    _tracer.exporter = exporter
+    if previous is not None and previous is not exporter:
+        previous.shutdown()
+    return _tracer
+
+
+def get_current_span() -> Span | None:
+    """Get the span active in this context, if any."""
+    return _current_span.get()
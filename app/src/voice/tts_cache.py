@@ -0,0 +1,234 @@
+"""Content-addressed cache of synthesized audio for repeated utterances."""
+
+import asyncio
+import hashlib
+import json
+import mmap
+import os
+import re
+import tempfile
+import threading
+import unicodedata
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+import structlog
+
+from ..utils.lru import LRUCache
+
+logger = structlog.get_logger(__name__)
+
+AudioBuffer = bytes | bytearray | memoryview
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text so trivially different spellings share a cache entry.
+
+    Applies Unicode NFC and collapses whitespace. Case and punctuation are
+    kept because they change how the text is spoken.
+    """
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def cache_key(
+    text: str,
+    voice_id: str,
+    model_id: str,
+    sample_rate: int,
+    voice_settings: dict[str, Any] | None = None,
+) -> str:
+    """
+    Build the content address for a synthesis request.
+
+    Returns:
+        Hex SHA-256 of everything that affects the produced audio
+    """
+    payload = json.dumps(
+        {
+            "text": normalize_text(text),
+            "voice_id": voice_id,
+            "model_id": model_id,
+            "sample_rate": sample_rate,
+            "voice_settings": voice_settings or {},
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def iter_chunks(audio: AudioBuffer, chunk_bytes: int) -> Iterator[memoryview]:
+    """Slice audio into fixed-size chunks without copying."""
+    view = memoryview(audio)
+    for offset in range(0, len(view), chunk_bytes):
+        yield view[offset : offset + chunk_bytes]
+
+
+@dataclass
+class DiskAudioCache:
+    """
+    On-disk tier storing one raw PCM file per cache key.
+
+    Files are written atomically (temp file + rename), so several worker
+    processes can share a directory. Reads memory-map the file, so a hit
+    costs no read syscall and the audio is paged in as it is streamed.
+    When the directory exceeds ``max_bytes`` the least recently used files
+    (by modification time, refreshed on every hit) are deleted.
+
+    The directory is only scanned when a running total of the bytes
+    written (seeded from a scan at startup) passes ``max_bytes``; the scan
+    resyncs it with what every process sharing the directory wrote. put()
+    blocks on file I/O, so call it off the event loop (TTSCache does).
+    """
+
+    directory: str
+    max_bytes: int = 512 * 1024 * 1024
+    _total_bytes: int = field(default=0, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Create the cache directory and total what it already holds."""
+        os.makedirs(self.directory, exist_ok=True)
+        self._total_bytes = self.size_bytes
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pcm")
+
+    def get(self, key: str) -> memoryview | None:
+        """Memory-map a cached entry, or return None."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            # ValueError: empty file, which cannot be mapped
+            if not isinstance(e, FileNotFoundError):
+                logger.warning("tts_cache_read_failed", error=str(e))
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass  # e.g. evicted by another process; the mapping stays valid
+        return memoryview(mapped)
+
+    def put(self, key: str, audio: AudioBuffer) -> None:
+        """Write an entry atomically and enforce the size bound."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(audio)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            logger.warning("tts_cache_write_failed", error=str(e))
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            return
+        with self._lock:
+            # Overwrites count twice until the next scan resyncs the total
+            self._total_bytes += memoryview(audio).nbytes
+            if self._total_bytes > self.max_bytes:
+                self._enforce_limit()
+
+    def _enforce_limit(self) -> None:
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".pcm"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._total_bytes = total
+
+    @property
+    def size_bytes(self) -> int:
+        """Bytes currently stored on disk."""
+        return sum(
+            entry.stat().st_size
+            for entry in os.scandir(self.directory)
+            if entry.name.endswith(".pcm")
+        )
+
+
+@dataclass
+class TTSCache:
+    """
+    Two-tier audio cache: a byte-bounded in-memory LRU in front of an
+    optional memory-mapped disk tier.
+
+    Disk hits are returned as views over the mapped file rather than
+    copied into the memory tier, so large cached prompts do not count
+    against the process heap. Disk writes run in a worker thread when
+    called from the event loop; see wait_for_writes.
+    """
+
+    memory_max_bytes: int = 32 * 1024 * 1024
+    directory: str | None = None
+    disk_max_bytes: int = 512 * 1024 * 1024
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    _memory: LRUCache[str, AudioBuffer] = field(init=False, repr=False)
+    _disk: DiskAudioCache | None = field(default=None, init=False, repr=False)
+    _writes: set[asyncio.Task[None]] = field(default_factory=set, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Create the tiers."""
+        self._memory = LRUCache(max_size=self.memory_max_bytes)
+        if self.directory:
+            self._disk = DiskAudioCache(self.directory, max_bytes=self.disk_max_bytes)
+
+    def get(self, key: str) -> AudioBuffer | None:
+        """Look up audio by cache key."""
+        audio = self._memory.get(key)
+        if audio is not None:
+            self.memory_hits += 1
+            return audio
+        if self._disk is not None:
+            audio = self._disk.get(key)
+            if audio is not None:
+                self.disk_hits += 1
+                return audio
+        self.misses += 1
+        return None
+
+    def put(self, key: str, audio: AudioBuffer) -> None:
+        """Store audio in every tier."""
+        if not audio:
+            return
+        self._memory.put(key, audio)
+        if self._disk is None:
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop to keep responsive
+            self._disk.put(key, audio)
+            return
+        task = asyncio.ensure_future(asyncio.to_thread(self._disk.put, key, audio))
+        self._writes.add(task)
+        task.add_done_callback(self._writes.discard)
+
+    async def wait_for_writes(self) -> None:
+        """Wait for disk writes started by put() to finish."""
+        if self._writes:
+            await asyncio.gather(*self._writes)
+
+    @property
+    def memory_bytes(self) -> int:
+        """Bytes held by the in-memory tier."""
+        return self._memory.size
+
+    def clear_memory(self) -> None:
+        """Drop the in-memory tier (the disk tier is kept)."""
+        self._memory.clear()
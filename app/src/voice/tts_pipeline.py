@@ -1,66 +1,32 @@
 """Text-to-Speech pipeline using ElevenLabs via LiveKit Agents."""
 
 import asyncio
+from collections.abc import AsyncIterable, AsyncIterator
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
-from typing import AsyncIterator, Optional
 from enum import Enum
 
 import structlog
 from livekit.agents import tts
 from livekit.plugins import elevenlabs
 
-from .config import ElevenLabsConfig
+from ..utils.audio import pcm_duration_ms
+from ..utils.buffer_pool import BufferPool, get_buffer_pool
+from .audio_buffers import PCMCollector, estimate_pcm_bytes, frame_bytes
+from .clock import elapsed_ms, monotonic
+from .config import ElevenLabsConfig, VoiceProcessingConfig
+from .deadline import PHASE_TTS, DeadlineExceededError, TurnDeadline
+from .quantile_sketch import QuantileSketch
+from .resilience import CircuitOpenError, CircuitState, ResiliencePolicy, is_provider_failure
+from .text_segmenter import SegmentBuffer, split_segments
+from .throughput import ThroughputBreakdown
+from .tracing import Span, get_tracer
+from .tts_cache import AudioBuffer, TTSCache, cache_key, iter_chunks
+from .turn_latency import TurnEvent, current_deadline, current_turn_span, mark_turn_event
 
 logger = structlog.get_logger(__name__)
 
-
-async def retry_async(
-    func,
-    max_retries: int = 3,
-    base_delay: float = 0.5,
-    max_delay: float = 5.0,
-    exponential_base: float = 2.0,
-):
-    """
-    Retry an async function with exponential backoff.
-
-    Args:
-        func: Async callable to retry
-        max_retries: Maximum number of retry attempts
-        base_delay: Initial delay between retries in seconds
-        max_delay: Maximum delay between retries
-        exponential_base: Base for exponential backoff calculation
-
-    Returns:
-        Result from successful function call
-
-    Raises:
-        Last exception if all retries fail
-    """
-    last_exception = None
-    for attempt in range(max_retries + 1):
-        try:
-            return await func()
-        except Exception as e:
-            last_exception = e
-            if attempt < max_retries:
-                delay = min(base_delay * (exponential_base ** attempt), max_delay)
-                logger.warning(
-                    "tts_retry_attempt",
-                    attempt=attempt + 1,
-                    max_retries=max_retries,
-                    delay=delay,
-                    error=str(e),
-                )
-                await asyncio.sleep(delay)
-            else:
-                logger.error(
-                    "tts_retry_exhausted",
-                    max_retries=max_retries,
-                    error=str(e),
-                )
-    raise last_exception
+# A segment synthesis: its audio, synthesis time (ms) and when it finished
+_SegmentTask = asyncio.Task[tuple[AudioBuffer, float, float]]
 
 
 class SynthesisState(Enum):
@@ -74,14 +40,21 @@ class SynthesisState(Enum):
 
 @dataclass
 class SynthesisResult:
-    """Result from text-to-speech synthesis."""
+    """
+    Result from text-to-speech synthesis.
+
+    audio_data is shared with the cache rather than copied, whether it was
+    just synthesized or served from it (then it may be a view of a mapped
+    file): treat it as read-only.
+    """
 
-    audio_data: bytes
+    audio_data: bytes | bytearray | memoryview
     text: str
     duration_ms: float
     latency_ms: float
     sample_rate: int
     voice_id: str
+    num_channels: int = 1
 
 
 @dataclass
@@ -96,6 +69,23 @@ class TTSMetrics:
     max_latency_ms: float = 0.0
     total_audio_duration_ms: float = 0.0
     total_characters_processed: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    latency_sketch: QuantileSketch = field(default_factory=QuantileSketch, repr=False)
+    # Sentence-pipelined synthesis
+    segmented_syntheses: int = 0
+    segments_synthesized: int = 0
+    segment_synthesis_ms: float = 0.0
+    segmented_wall_ms: float = 0.0
+    segment_ttfb_sketch: QuantileSketch = field(default_factory=QuantileSketch, repr=False)
+    # Streamed synthesis resumed from a segment checkpoint after a failure, and
+    # audio of the interrupted segments that was heard again from their start
+    stream_resumes: int = 0
+    resume_replayed_bytes: int = 0
+    # Streamed text input: first text (e.g. LLM first token) to first audio chunk
+    first_text_to_audio_sketch: QuantileSketch = field(default_factory=QuantileSketch, repr=False)
+    # Provider audio, RTF, TTFB and bytes, per "model_id/voice_id"
+    throughput: ThroughputBreakdown = field(default_factory=ThroughputBreakdown, repr=False)
 
     @property
     def average_latency_ms(self) -> float:
@@ -118,6 +108,47 @@ class TTSMetrics:
             return 0.0
         return self.total_characters_processed / (self.total_audio_duration_ms / 1000)
 
+    @property
+    def realtime_factor(self) -> float:
+        """Synthesis time per second of audio produced, over every voice."""
+        return self.throughput.total.realtime_factor
+
+    @property
+    def cache_hit_rate(self) -> float:
+        """Share of cache lookups served without calling the provider."""
+        lookups = self.cache_hits + self.cache_misses
+        if lookups == 0:
+            return 0.0
+        return self.cache_hits / lookups
+
+    @property
+    def cache_miss_rate(self) -> float:
+        """Share of cache lookups that went to the provider."""
+        lookups = self.cache_hits + self.cache_misses
+        if lookups == 0:
+            return 0.0
+        return self.cache_misses / lookups
+
+    @property
+    def average_first_text_to_audio_ms(self) -> float:
+        """Mean time from the first streamed text to the first audio chunk."""
+        if self.first_text_to_audio_sketch.count == 0:
+            return 0.0
+        return self.first_text_to_audio_sketch.mean
+
+    @property
+    def segment_parallelism(self) -> float:
+        """
+        Average number of segments being synthesized at once.
+
+        The sum of the segments' synthesis times over the wall time of the
+        segmented syntheses. It measures overlap, not a speedup over the
+        single-shot path, whose cost per request differs.
+        """
+        if self.segmented_wall_ms == 0:
+            return 0.0
+        return self.segment_synthesis_ms / self.segmented_wall_ms
+
 
 @dataclass
 class TTSConfig:
@@ -129,6 +160,158 @@ class TTSConfig:
     style: float = 0.0
     use_speaker_boost: bool = True
     optimize_streaming_latency: int = 3  # 0-4, higher = more optimization
+    num_channels: int = 1  # channels in the provider's 16-bit PCM output
+    cache_enabled: bool = True
+    cache_memory_bytes: int = 32 * 1024 * 1024
+    cache_dir: str | None = None  # enables the memory-mapped disk tier
+    cache_chunk_ms: int = 20  # chunk size when streaming cached audio
+    segment_concurrency: int = 3  # segments synthesized ahead of playback
+    # One provider request per sentence in synthesize() and synthesize_frames(),
+    # so a failure retries a sentence rather than the utterance. Off, the
+    # utterance is one request (prosody flows across sentences) and a failure
+    # requests all of it again.
+    segment_requests: bool = True
+    segment_min_chars: int = 20
+    segment_max_chars: int = 250
+    buffer_pool_enabled: bool = True  # borrow transient segment buffers from the process pool
+
+
+@dataclass
+class SynthesisCheckpoint:
+    """
+    Progress of a streamed synthesis, by text segment.
+
+    Segments before ``delivered`` have had all their audio yielded and are
+    never requested again. A retry requests segment ``delivered`` again
+    and plays it from its start: the provider does not render a repeated
+    request identically, so its audio cannot be spliced onto what was
+    already heard. If ``audio`` is set, delivered audio is collected into
+    it (e.g. to cache the utterance), without the interrupted attempts.
+    """
+
+    segments: list[str]
+    delivered: int = 0
+    audio: PCMCollector | None = field(default=None, repr=False)
+    _partial_bytes: int = 0
+    _segment_start: int = 0
+
+    def add_chunk(self, chunk: memoryview) -> None:
+        """Record audio yielded for the current segment."""
+        self._partial_bytes += chunk.nbytes
+        if self.audio is not None:
+            self.audio.append(chunk)
+
+    def complete_segment(self) -> None:
+        """Mark the current segment as fully delivered."""
+        self.delivered += 1
+        self._partial_bytes = 0
+        if self.audio is not None:
+            self._segment_start = self.audio.nbytes
+
+    def rewind(self) -> int:
+        """
+        Prepare to request the current segment again after a failure.
+
+        Returns:
+            Bytes of the segment already yielded, which are heard again
+        """
+        replayed, self._partial_bytes = self._partial_bytes, 0
+        if self.audio is not None:
+            self.audio.truncate(self._segment_start)
+        return replayed
+
+
+@dataclass
+class TextSink:
+    """
+    Push-based text input for streaming synthesis.
+
+    Feed text as it is generated with push(). flush() makes whatever is
+    buffered a segment right away (e.g. before a pause in generation),
+    close() ends the input after flushing, and cancel() drops everything
+    not yet spoken: the audio stream stops at the next chunk.
+    """
+
+    min_chars: int = 20
+    max_chars: int = 250
+    first_text_at: float | None = None
+    closed: bool = False
+    cancelled: bool = False
+    _buffer: SegmentBuffer = field(init=False, repr=False)
+    _segments: asyncio.Queue[str | Exception | None] = field(
+        default_factory=asyncio.Queue, init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        """Create the segment buffer."""
+        self._buffer = SegmentBuffer(min_chars=self.min_chars, max_chars=self.max_chars)
+
+    def push(self, text: str) -> None:
+        """Add generated text; completed segments are queued for synthesis."""
+        if self.closed:
+            raise RuntimeError("TextSink is closed")
+        if self.first_text_at is None and text.strip():
+            self.first_text_at = monotonic()
+        for segment in self._buffer.push(text):
+            self._segments.put_nowait(segment)
+
+    def push_segment(self, segment: str) -> None:
+        """Queue an already segmented piece of text."""
+        if self.closed:
+            raise RuntimeError("TextSink is closed")
+        self.flush()
+        if self.first_text_at is None:
+            self.first_text_at = monotonic()
+        self._segments.put_nowait(segment)
+
+    def flush(self) -> None:
+        """Queue the buffered text as a segment now."""
+        segment = self._buffer.flush()
+        if segment is not None:
+            self._segments.put_nowait(segment)
+
+    def close(self) -> None:
+        """End the input, flushing buffered text."""
+        if self.closed:
+            return
+        self.flush()
+        self.closed = True
+        self._segments.put_nowait(None)
+
+    def cancel(self) -> None:
+        """Drop unspoken text and stop the audio stream."""
+        self.cancelled = True
+        self._buffer.flush()
+        while not self._segments.empty():
+            self._segments.get_nowait()
+        self.closed = True
+        self._segments.put_nowait(None)
+
+    def fail(self, error: Exception) -> None:
+        """End the input with an error raised to the audio consumer."""
+        self.closed = True
+        self._segments.put_nowait(error)
+
+    async def feed(self, text: AsyncIterable[str]) -> None:
+        """Push every fragment of an async text iterator, then close."""
+        try:
+            async for fragment in text:
+                if self.cancelled:
+                    return
+                self.push(fragment)
+        except Exception as e:
+            self.fail(e)
+            return
+        self.close()
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        while True:
+            item = await self._segments.get()
+            if item is None:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
 
 
 @dataclass
@@ -140,16 +323,31 @@ class TTSPipeline:
     - Text synthesis to audio
     - Streaming audio generation
     - Voice configuration
+    - Caching of repeated utterances
+    - Sentence-pipelined synthesis of long responses
+    - Incremental synthesis of streamed (LLM) text
     - Performance metrics collection
     """
 
     config: TTSConfig
     metrics: TTSMetrics = field(default_factory=TTSMetrics)
     state: SynthesisState = SynthesisState.IDLE
-    _tts: Optional[tts.TTS] = field(default=None, init=False)
+    _tts: tts.TTS | None = field(default=None, init=False)
+    resilience: ResiliencePolicy = field(
+        default_factory=lambda: ResiliencePolicy(provider="elevenlabs")
+    )
+    cache: TTSCache | None = None
+    buffer_pool: BufferPool | None = None
 
     def __post_init__(self) -> None:
         """Initialize the ElevenLabs TTS instance."""
+        if self.buffer_pool is None and self.config.buffer_pool_enabled:
+            self.buffer_pool = get_buffer_pool()
+        if self.cache is None and self.config.cache_enabled:
+            self.cache = TTSCache(
+                memory_max_bytes=self.config.cache_memory_bytes,
+                directory=self.config.cache_dir,
+            )
         self._tts = elevenlabs.TTS(
             api_key=self.config.elevenlabs_config.api_key,
             voice_id=self.config.elevenlabs_config.voice_id,
@@ -163,49 +361,114 @@ class TTSPipeline:
             sample_rate=self.config.elevenlabs_config.sample_rate,
         )
 
-    async def synthesize(self, text: str, max_retries: int = 3) -> SynthesisResult:
+    def _cache_key(self, text: str) -> str:
+        """Content address of the audio this pipeline would produce for text."""
+        elevenlabs_config = self.config.elevenlabs_config
+        return cache_key(
+            text,
+            voice_id=elevenlabs_config.voice_id,
+            model_id=elevenlabs_config.model_id,
+            sample_rate=elevenlabs_config.sample_rate,
+            voice_settings={
+                "stability": self.config.stability,
+                "similarity_boost": self.config.similarity_boost,
+                "style": self.config.style,
+                "use_speaker_boost": self.config.use_speaker_boost,
+            },
+        )
+
+    def _cache_lookup(self, key: str) -> AudioBuffer | None:
+        """Look up cached audio, counting the hit or miss."""
+        if self.cache is None:
+            return None
+        audio = self.cache.get(key)
+        if audio is None:
+            self.metrics.cache_misses += 1
+        else:
+            self.metrics.cache_hits += 1
+        return audio
+
+    async def synthesize(
+        self,
+        text: str,
+        max_retries: int = 3,
+        deadline: TurnDeadline | None = None,
+    ) -> SynthesisResult:
         """
         Synthesize text to audio with retry support.
 
         Args:
             text: The text to synthesize
             max_retries: Maximum retry attempts for transient failures
+            deadline: Turn budget, defaults to the current turn's deadline
 
         Returns:
             SynthesisResult containing audio data and metrics
 
         Raises:
             RuntimeError: If synthesis fails after all retries
+            DeadlineExceededError: If the provider's first audio misses the
+                turn budget, so the caller can fall back to a shorter or
+                cached reply, or a retry would overrun it; once audio
+                arrives the rest of the attempt is not bound by it
         """
         if not text.strip():
             raise ValueError("Cannot synthesize empty text")
 
         self.state = SynthesisState.SYNTHESIZING
-        start_time = datetime.now(timezone.utc)
-        audio_chunks: list[bytes] = []
+        start_time = monotonic()
+        deadline = deadline if deadline is not None else current_deadline()
+        sample_rate = self.config.elevenlabs_config.sample_rate
 
-        logger.info("tts_synthesis_started", text_length=len(text))
+        key = self._cache_key(text)
+        cached = self._cache_lookup(key)
+        if cached is not None:
+            self.state = SynthesisState.IDLE
+            latency_ms = elapsed_ms(start_time)
+            logger.info("tts_cache_hit", text_length=len(text), latency_ms=round(latency_ms, 3))
+            return SynthesisResult(
+                audio_data=cached,
+                text=text,
+                duration_ms=self._duration_ms(len(cached)),
+                latency_ms=latency_ms,
+                sample_rate=sample_rate,
+                voice_id=self.config.elevenlabs_config.voice_id,
+                num_channels=self.config.num_channels,
+            )
 
-        async def _collect_audio():
-            nonlocal audio_chunks
-            audio_chunks = []
-            stream = self._tts.synthesize(text)
-            async for chunk in stream:
+        segments = self._request_segments(text)
+        logger.info("tts_synthesis_started", text_length=len(text), segments=len(segments))
+
+        # Only the wait for the first audio is bound by the turn budget
+        first_audio_deadline = deadline
+
+        async def _collect_audio() -> bytearray:
+            nonlocal first_audio_deadline
+            # Each (possibly hedged) attempt collects into its own buffer
+            collector = PCMCollector(capacity=estimate_pcm_bytes(text, sample_rate))
+            async for chunk in self._provider_stream(text, first_audio_deadline):
                 if chunk.frame and chunk.frame.data:
-                    audio_chunks.append(chunk.frame.data.tobytes())
-            return audio_chunks
+                    first_audio_deadline = None
+                    collector.append(frame_bytes(chunk.frame))
+            return collector.detach()
 
         try:
-            # Use streaming synthesis and collect all chunks with retry
-            await retry_async(_collect_audio, max_retries=max_retries)
+            # Use streaming synthesis and collect all chunks, hedged and retried.
+            # With segment_requests, each sentence is retried on its own.
+            if len(segments) > 1:
+                audio_data = await self._collect_segments(segments, max_retries, deadline)
+            else:
+                audio_data = await self.resilience.call(
+                    _collect_audio,
+                    max_retries=max_retries,
+                    deadline=deadline,
+                    phase=PHASE_TTS,
+                    bound_attempts=False,
+                )
 
-            audio_data = b"".join(audio_chunks)
-            latency_ms = (datetime.now(timezone.utc) - start_time).total_seconds() * 1000
+            latency_ms = elapsed_ms(start_time)
 
-            # Estimate audio duration (assuming 16-bit samples)
-            sample_rate = self.config.elevenlabs_config.sample_rate
-            num_samples = len(audio_data) // 2  # 16-bit = 2 bytes per sample
-            duration_ms = (num_samples / sample_rate) * 1000
+            duration_ms = self._duration_ms(len(audio_data))
 
             result = SynthesisResult(
                 audio_data=audio_data,
@@ -214,16 +477,15 @@ class TTSPipeline:
                 latency_ms=latency_ms,
                 sample_rate=sample_rate,
                 voice_id=self.config.elevenlabs_config.voice_id,
+                num_channels=self.config.num_channels,
             )
 
-            # Update metrics
-            self.metrics.total_syntheses += 1
-            self.metrics.successful_syntheses += 1
-            self.metrics.total_latency_ms += latency_ms
-            self.metrics.min_latency_ms = min(self.metrics.min_latency_ms, latency_ms)
-            self.metrics.max_latency_ms = max(self.metrics.max_latency_ms, latency_ms)
-            self.metrics.total_audio_duration_ms += duration_ms
-            self.metrics.total_characters_processed += len(text)
+            # The whole audio reaches the caller at once
+            self._record_synthesis(
+                text, latency_ms, ttfb_ms=latency_ms, audio_bytes=len(audio_data)
+            )
+            if self.cache is not None:
+                self.cache.put(key, audio_data)
 
             logger.info(
                 "tts_synthesis_completed",
@@ -240,50 +502,173 @@ class TTSPipeline:
             self.metrics.total_syntheses += 1
             self.metrics.failed_syntheses += 1
             logger.error("tts_synthesis_failed", error=str(e), text_length=len(text))
+            if isinstance(e, DeadlineExceededError):
+                raise
             raise RuntimeError(f"TTS synthesis failed: {e}") from e
 
         finally:
             self.state = SynthesisState.IDLE
 
-    async def synthesize_stream(self, text: str) -> AsyncIterator[bytes]:
+    async def synthesize_stream(
+        self,
+        text: str,
+        deadline: TurnDeadline | None = None,
+        max_retries: int = 3,
+    ) -> AsyncIterator[bytes]:
         """
-        Stream synthesized audio chunks.
+        Stream synthesized audio chunks as bytes.
+
+        Copies each chunk; see synthesize_frames for the zero-copy variant
+        and for retry and deadline behavior.
 
         Args:
             text: The text to synthesize
+            deadline: Turn budget, defaults to the current turn's deadline
+            max_retries: Maximum resumes after transient failures
 
         Yields:
             Audio data chunks as they are generated
+
+        Raises:
+            DeadlineExceededError: If no audio arrives within the turn budget
+        """
+        async for chunk in self.synthesize_frames(text, deadline, max_retries):
+            yield chunk.tobytes()
+
+    async def synthesize_frames(
+        self,
+        text: str,
+        deadline: TurnDeadline | None = None,
+        max_retries: int = 3,
+    ) -> AsyncIterator[memoryview]:
+        """
+        Stream synthesized audio as zero-copy views.
+
+        Each chunk is a byte view over the provider's rtc.AudioFrame buffer
+        (or over the cached audio); wrap it with as_int16 for a NumPy view.
+        Views stay valid for as long as they are held.
+
+        Cached audio is streamed straight from the cache (memory or mapped
+        file) in cache_chunk_ms chunks. Otherwise the text is streamed in
+        one request per sentence (segment_requests), checkpointing the
+        sentences delivered so far. A transient failure resumes at the
+        interrupted sentence, which is played again from its start, so a
+        blip costs one sentence rather than the response. With
+        segment_requests off the whole utterance is one request and is
+        played again from its start.
+
+        The deadline bounds the wait for the first chunk (and retries
+        before it): once audio is flowing the turn has met its latency
+        target and streaming continues.
+
+        Args:
+            text: The text to synthesize
+            deadline: Turn budget, defaults to the current turn's deadline
+            max_retries: Maximum resumes after transient failures
+
+        Yields:
+            Byte views of 16-bit PCM as it is generated
+
+        Raises:
+            DeadlineExceededError: If no audio arrives within the turn budget
         """
         if not text.strip():
             raise ValueError("Cannot synthesize empty text")
+        deadline = deadline if deadline is not None else current_deadline()
 
         self.state = SynthesisState.STREAMING
-        start_time = datetime.now(timezone.utc)
-        first_chunk_time: Optional[datetime] = None
+        start_time = monotonic()
+        ttfb_ms: float | None = None
         total_bytes = 0
 
         logger.info("tts_streaming_started", text_length=len(text))
+        span = get_tracer().start_span(
+            "tts.synthesize_stream",
+            parent=current_turn_span(),
+            voice_id=self.config.elevenlabs_config.voice_id,
+            model=self.config.elevenlabs_config.model_id,
+            text_length=len(text),
+        )
+        key = self._cache_key(text)
+        cached = self._cache_lookup(key)
+        span.set_attribute("cache_hit", cached is not None)
+        recorded_failure: Exception | None = None
+        # Whether this stream holds the circuit's half-open probe
+        probing = False
 
         try:
-            stream = self._tts.synthesize(text)
-            async for chunk in stream:
-                if chunk.frame and chunk.frame.data:
-                    if first_chunk_time is None:
-                        first_chunk_time = datetime.now(timezone.utc)
-                        ttfb_ms = (first_chunk_time - start_time).total_seconds() * 1000
-                        logger.debug("tts_first_chunk", ttfb_ms=round(ttfb_ms, 2))
+            if cached is not None:
+                chunk_bytes = (
+                    self.config.elevenlabs_config.sample_rate * 2 * self.config.cache_chunk_ms
+                ) // 1000
+                for index, chunk in enumerate(iter_chunks(cached, chunk_bytes)):
+                    if index == 0:
+                        ttfb_ms = self._record_first_audio(span, start_time, None)
+                    total_bytes += len(chunk)
+                    yield chunk
+                logger.info("tts_cache_hit", text_length=len(text), total_bytes=total_bytes)
+                return
 
-                    audio_bytes = chunk.frame.data.tobytes()
-                    total_bytes += len(audio_bytes)
-                    yield audio_bytes
+            # Streams cannot be hedged, but still fail fast on an open circuit
+            self.resilience.stats.calls += 1
+            self.resilience.budget.record_request()
+            self.resilience.breaker.before_call()
+            probing = self.resilience.breaker.state == CircuitState.HALF_OPEN
+            sample_rate = self.config.elevenlabs_config.sample_rate
+            checkpoint = SynthesisCheckpoint(
+                segments=self._request_segments(text),
+                audio=(
+                    PCMCollector(capacity=estimate_pcm_bytes(text, sample_rate))
+                    if self.cache is not None
+                    else None
+                ),
+            )
+            attempt = 0
+            delay = self.resilience.base_delay
+            while True:
+                try:
+                    # Only the wait for the first audio is bound by the turn budget
+                    first_deadline = deadline if total_bytes == 0 else None
+                    async for chunk in self._stream_segments(checkpoint, first_deadline):
+                        if ttfb_ms is None:
+                            ttfb_ms = self._record_first_audio(span, start_time, None)
+                            logger.debug("tts_first_chunk", ttfb_ms=round(ttfb_ms, 2))
+                        total_bytes += chunk.nbytes
+                        yield chunk
+                    break
+                except (CircuitOpenError, DeadlineExceededError):
+                    raise
+                except Exception as e:
+                    if is_provider_failure(e):
+                        self.resilience.breaker.record_failure()
+                    elif probing:
+                        self.resilience.breaker.release_probe()
+                    recorded_failure = e
+                    delay = await self.resilience.backoff(
+                        e, attempt, max_retries, delay, first_deadline, PHASE_TTS
+                    )
+                    probing = self.resilience.breaker.state == CircuitState.HALF_OPEN
+                    attempt += 1
+                    replayed_bytes = checkpoint.rewind()
+                    self.metrics.stream_resumes += 1
+                    self.metrics.resume_replayed_bytes += replayed_bytes
+                    span.add_event(
+                        "resumed", segment=checkpoint.delivered, replayed_bytes=replayed_bytes
+                    )
+                    logger.warning(
+                        "tts_stream_resumed",
+                        segment=checkpoint.delivered,
+                        segments=len(checkpoint.segments),
+                        replayed_bytes=replayed_bytes,
+                        error=str(e),
+                    )
 
             # Update metrics after streaming completes
-            latency_ms = (datetime.now(timezone.utc) - start_time).total_seconds() * 1000
-            self.metrics.total_syntheses += 1
-            self.metrics.successful_syntheses += 1
-            self.metrics.total_latency_ms += latency_ms
-            self.metrics.total_characters_processed += len(text)
+            latency_ms = elapsed_ms(start_time)
+            self._record_synthesis(text, latency_ms, ttfb_ms=ttfb_ms, audio_bytes=total_bytes)
+            self.resilience.breaker.record_success()
+            if checkpoint.audio is not None and self.cache is not None:
+                self.cache.put(key, checkpoint.audio.detach())
 
             logger.info(
                 "tts_streaming_completed",
@@ -296,11 +681,459 @@ class TTSPipeline:
             self.state = SynthesisState.ERROR
             self.metrics.total_syntheses += 1
             self.metrics.failed_syntheses += 1
+            span.record_exception(e)
+            if is_provider_failure(e) and e is not recorded_failure:
+                self.resilience.breaker.record_failure()
             logger.error("tts_streaming_failed", error=str(e))
             raise
 
         finally:
+            # Closed early (barge-in), cut off by the deadline or failed by the
+            # caller: the probe has no verdict, so let the next call probe
+            if probing:
+                self.resilience.breaker.release_probe()
             self.state = SynthesisState.IDLE
+            span.set_attribute("audio_bytes", total_bytes)
+            span.end()
+
+    def create_text_sink(self) -> "TextSink":
+        """Create a push-based text input segmented with this pipeline's settings."""
+        return TextSink(
+            min_chars=self.config.segment_min_chars, max_chars=self.config.segment_max_chars
+        )
+
+    async def synthesize_segmented(
+        self,
+        text: str,
+        deadline: TurnDeadline | None = None,
+        max_concurrency: int | None = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream audio for long text, synthesizing its sentences in parallel.
+
+        The text is split at sentence (for long sentences, clause)
+        boundaries. Up to max_concurrency segments are synthesized ahead of
+        playback, each as its own hedged and retried request, and their
+        audio is yielded strictly in order. Playback of the first sentence
+        starts while the rest are still being synthesized, and a failure
+        retries one sentence rather than the whole response.
+
+        Args:
+            text: The text to synthesize
+            deadline: Turn budget for the first segment's audio, defaults to
+                the current turn's deadline
+            max_concurrency: Segments in flight, defaults to segment_concurrency
+
+        Yields:
+            Audio data chunks of cache_chunk_ms, in text order
+
+        Raises:
+            RuntimeError: If a segment fails after all retries
+            DeadlineExceededError: If the first segment's audio misses the turn budget
+        """
+        if not text.strip():
+            raise ValueError("Cannot synthesize empty text")
+        sink = self.create_text_sink()
+        for segment in split_segments(
+            text, self.config.segment_min_chars, self.config.segment_max_chars
+        ):
+            sink.push_segment(segment)
+        sink.close()
+        async for chunk in self._synthesize_segments(
+            sink, "tts.synthesize_segmented", deadline, max_concurrency
+        ):
+            yield chunk
+
+    async def synthesize_text_stream(
+        self,
+        text: TextSink | AsyncIterable[str],
+        deadline: TurnDeadline | None = None,
+        max_concurrency: int | None = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream audio for text that is still being generated.
+
+        Tokens are aggregated until a speakable boundary, and each segment
+        is synthesized as soon as it is complete, so the first phrase is
+        spoken while the LLM is still generating the rest. Segments are
+        synthesized and ordered as in synthesize_segmented.
+
+        Input is either a TextSink fed by the caller (push/flush/close/
+        cancel) or an async iterator of text, e.g. an LLM token stream,
+        which is closed (flushed) when it is exhausted. Closing this
+        generator cancels any synthesis in flight.
+
+        Args:
+            text: TextSink or async iterator of text fragments
+            deadline: Turn budget for the first segment's audio, defaults to
+                the current turn's deadline
+            max_concurrency: Segments in flight, defaults to segment_concurrency
+
+        Yields:
+            Audio data chunks of cache_chunk_ms, in text order
+
+        Raises:
+            RuntimeError: If a segment fails after all retries
+            DeadlineExceededError: If the first segment's audio misses the turn budget
+            Any exception raised by the text iterator
+        """
+        if isinstance(text, TextSink):
+            sink, feeder = text, None
+        else:
+            sink = self.create_text_sink()
+            feeder = asyncio.ensure_future(sink.feed(text))
+        try:
+            async for chunk in self._synthesize_segments(
+                sink, "tts.synthesize_text_stream", deadline, max_concurrency
+            ):
+                yield chunk
+        finally:
+            if feeder is not None and not feeder.done():
+                feeder.cancel()
+
+    async def _synthesize_segments(
+        self,
+        sink: "TextSink",
+        span_name: str,
+        deadline: TurnDeadline | None,
+        max_concurrency: int | None,
+    ) -> AsyncIterator[bytes]:
+        """Synthesize segments from a sink with bounded concurrency, in order."""
+        deadline = deadline if deadline is not None else current_deadline()
+        concurrency = max(1, max_concurrency or self.config.segment_concurrency)
+        chunk_bytes = (
+            self.config.elevenlabs_config.sample_rate * 2 * self.config.cache_chunk_ms
+        ) // 1000
+
+        self.state = SynthesisState.STREAMING
+        start = monotonic()
+        span = get_tracer().start_span(
+            span_name,
+            parent=current_turn_span(),
+            voice_id=self.config.elevenlabs_config.voice_id,
+            model=self.config.elevenlabs_config.model_id,
+            concurrency=concurrency,
+        )
+        logger.info("tts_segmented_started", concurrency=concurrency)
+
+        # A slot is held from a segment's launch until its audio has been yielded,
+        # bounding both provider concurrency and audio buffered ahead of playback
+        slots = asyncio.Semaphore(concurrency)
+        scheduled: asyncio.Queue[_SegmentTask | Exception | None] = asyncio.Queue()
+        tasks: list[_SegmentTask] = []
+        scheduled_text: list[str] = []
+
+        async def schedule() -> None:
+            try:
+                async for segment in sink:
+                    await slots.acquire()
+                    scheduled_text.append(segment)
+                    # Only the first audio is bound by the turn budget
+                    task = asyncio.ensure_future(
+                        self._synthesize_segment(segment, deadline if not tasks else None)
+                    )
+                    tasks.append(task)
+                    scheduled.put_nowait(task)
+            except Exception as e:
+                scheduled.put_nowait(e)
+            scheduled.put_nowait(None)
+
+        scheduler = asyncio.ensure_future(schedule())
+        input_error: Exception | None = None
+        synthesis_ms = 0.0
+        ttfb_ms: float | None = None
+        synthesized_at = start
+        total_bytes = 0
+        segments = 0
+        try:
+            while not sink.cancelled:
+                item = await scheduled.get()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    input_error = item
+                    raise item
+                audio, segment_ms, done_at = await item
+                synthesis_ms += segment_ms
+                synthesized_at = max(synthesized_at, done_at)
+                segments += 1
+
+                try:
+                    for chunk in iter_chunks(audio, chunk_bytes):
+                        if sink.cancelled:
+                            break
+                        if ttfb_ms is None:
+                            ttfb_ms = self._record_first_audio(span, start, sink.first_text_at)
+                        total_bytes += len(chunk)
+                        yield bytes(chunk)
+                finally:
+                    self._release_segment(audio)
+                slots.release()
+
+            wall_ms = (synthesized_at - start) * 1000
+            self._record_synthesis(
+                "".join(scheduled_text), wall_ms, ttfb_ms=ttfb_ms, audio_bytes=total_bytes
+            )
+            self.metrics.segmented_syntheses += 1
+            self.metrics.segments_synthesized += segments
+            self.metrics.segment_synthesis_ms += synthesis_ms
+            self.metrics.segmented_wall_ms += wall_ms
+
+            logger.info(
+                "tts_segmented_completed",
+                segments=segments,
+                cancelled=sink.cancelled,
+                total_bytes=total_bytes,
+                wall_ms=round(wall_ms, 2),
+                synthesis_ms=round(synthesis_ms, 2),
+            )
+
+        except Exception as e:
+            self.state = SynthesisState.ERROR
+            self.metrics.total_syntheses += 1
+            self.metrics.failed_syntheses += 1
+            span.record_exception(e)
+            logger.error("tts_segmented_failed", error=str(e))
+            if e is input_error or isinstance(e, (CircuitOpenError, DeadlineExceededError)):
+                raise
+            raise RuntimeError(f"TTS synthesis failed: {e}") from e
+
+        finally:
+            scheduler.cancel()
+            for index, task in enumerate(tasks):
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled() and task.exception() is None and index >= segments:
+                    # Synthesized but never played
+                    self._release_segment(task.result()[0])
+            self.state = SynthesisState.IDLE
+            span.set_attribute("segments", segments)
+            span.set_attribute("text_length", sum(map(len, scheduled_text)))
+            span.set_attribute("audio_bytes", total_bytes)
+            span.end()
+
+    def _release_segment(self, audio: AudioBuffer) -> None:
+        """
+        Return consumed segment audio to the pool, if it was borrowed.
+
+        Synthesized segment audio is a view of a pooled bytearray; audio
+        served from the cache never is (bytes, or a view of a mapped file).
+        """
+        if (
+            self.buffer_pool is not None
+            and isinstance(audio, memoryview)
+            and isinstance(audio.obj, bytearray)
+        ):
+            self.buffer_pool.release(audio.obj)
+
+    def _duration_ms(self, nbytes: int) -> float:
+        """Duration of nbytes of the provider's 16-bit PCM output."""
+        return pcm_duration_ms(
+            nbytes, self.config.elevenlabs_config.sample_rate, self.config.num_channels
+        )
+
+    def _record_first_audio(self, span: Span, start: float, first_text_at: float | None) -> float:
+        """
+        Record time to the first audio chunk, from the call and from the first text.
+
+        Also marks the turn's TTS first frame, replacing any estimate.
+
+        Returns:
+            Milliseconds from the call to the first audio
+        """
+        now = monotonic()
+        ttfb_ms = (now - start) * 1000
+        span.add_event("first_byte", ttfb_ms=round(ttfb_ms, 2))
+        mark_turn_event(TurnEvent.TTS_FIRST_FRAME)
+        if first_text_at is not None:
+            text_to_audio_ms = (now - first_text_at) * 1000
+            self.metrics.first_text_to_audio_sketch.add(text_to_audio_ms)
+            logger.debug("tts_first_audio", first_text_to_audio_ms=round(text_to_audio_ms, 2))
+        return ttfb_ms
+
+    def _record_synthesis(
+        self, text: str, latency_ms: float, ttfb_ms: float | None, audio_bytes: int
+    ) -> None:
+        """
+        Count one successful synthesis from the provider, on any path.
+
+        ``latency_ms`` runs from the request to the last audio, and
+        ``ttfb_ms`` to the first audio the caller could use.
+        """
+        metrics = self.metrics
+        duration_ms = self._duration_ms(audio_bytes)
+        metrics.total_syntheses += 1
+        metrics.successful_syntheses += 1
+        metrics.total_latency_ms += latency_ms
+        metrics.min_latency_ms = min(metrics.min_latency_ms, latency_ms)
+        metrics.max_latency_ms = max(metrics.max_latency_ms, latency_ms)
+        metrics.latency_sketch.add(latency_ms)
+        metrics.total_audio_duration_ms += duration_ms
+        metrics.total_characters_processed += len(text)
+        elevenlabs_config = self.config.elevenlabs_config
+        metrics.throughput.record(
+            f"{elevenlabs_config.model_id}/{elevenlabs_config.voice_id}",
+            requests=1,
+            audio_ms=duration_ms,
+            processing_ms=latency_ms,
+            ttfb_ms=ttfb_ms,
+            bytes_sent=len(text.encode("utf-8")),
+            bytes_received=audio_bytes,
+        )
+
+    async def _collect_segments(
+        self, segments: list[str], max_retries: int, deadline: TurnDeadline | None
+    ) -> bytearray:
+        """
+        Synthesize segments concurrently, each retried on its own.
+
+        A failure re-synthesizes only the failed segment; segments already
+        synthesized are kept.
+        """
+        slots = asyncio.Semaphore(max(1, self.config.segment_concurrency))
+
+        async def _one(segment: str) -> AudioBuffer:
+            async with slots:
+                # The utterance is cached whole by the caller, not per segment
+                audio, _, _ = await self._synthesize_segment(
+                    segment, deadline, max_retries, use_cache=False
+                )
+                return audio
+
+        tasks = [asyncio.ensure_future(_one(segment)) for segment in segments]
+        audios: list[AudioBuffer] = []
+        try:
+            audios = await asyncio.gather(*tasks)
+            collector = PCMCollector(capacity=sum(len(audio) for audio in audios))
+            for audio in audios:
+                collector.append(audio)
+                self._release_segment(audio)
+            return collector.detach()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled() and task.exception() is None and not audios:
+                    # Synthesized, but another segment failed
+                    self._release_segment(task.result())
+
+    async def _synthesize_segment(
+        self,
+        segment: str,
+        deadline: TurnDeadline | None,
+        max_retries: int | None = None,
+        use_cache: bool = True,
+    ) -> tuple[AudioBuffer, float, float]:
+        """
+        Synthesize one segment, from the cache if possible.
+
+        Synthesized audio is a view of a pooled buffer (the cache stores a
+        copy): hand it to _release_segment once consumed.
+
+        Args:
+            segment: Text of the segment
+            deadline: Turn budget for its first audio
+            max_retries: Override the resilience policy's retry limit
+            use_cache: Look the segment up in and store it to the cache;
+                off when the caller caches the whole utterance
+
+        Returns:
+            Audio, synthesis time in ms, and monotonic() time it completed
+        """
+        start = monotonic()
+        key = self._cache_key(segment)
+        cached = self._cache_lookup(key) if use_cache else None
+        if cached is not None:
+            done_at = monotonic()
+            return cached, (done_at - start) * 1000, done_at
+
+        # Only the wait for the first audio is bound by the turn budget
+        first_audio_deadline = deadline
+
+        async def _collect() -> tuple[AudioBuffer, float | None]:
+            nonlocal first_audio_deadline
+            attempt_start = monotonic()
+            ttfb_ms: float | None = None
+            collector = PCMCollector(
+                capacity=estimate_pcm_bytes(segment, self.config.elevenlabs_config.sample_rate),
+                pool=self.buffer_pool,
+            )
+            try:
+                async for chunk in self._provider_stream(segment, first_audio_deadline):
+                    if chunk.frame and chunk.frame.data:
+                        if ttfb_ms is None:
+                            ttfb_ms = elapsed_ms(attempt_start)
+                        first_audio_deadline = None
+                        collector.append(frame_bytes(chunk.frame))
+            except BaseException:
+                collector.release()
+                raise
+            if collector.pool is not None:
+                return collector.view(), ttfb_ms
+            return collector.detach(), ttfb_ms
+
+        audio, ttfb_ms = await self.resilience.call(
+            _collect,
+            max_retries=max_retries,
+            deadline=deadline,
+            phase=PHASE_TTS,
+            discard=lambda result: self._release_segment(result[0]),
+            bound_attempts=False,
+        )
+        if ttfb_ms is not None:
+            self.metrics.segment_ttfb_sketch.add(ttfb_ms)
+        if use_cache and self.cache is not None:
+            # The pooled buffer is reused once released, so the cache keeps a copy
+            self.cache.put(key, bytes(audio))
+        done_at = monotonic()
+        return audio, (done_at - start) * 1000, done_at
+
+    async def _stream_segments(
+        self, checkpoint: "SynthesisCheckpoint", deadline: TurnDeadline | None
+    ) -> AsyncIterator[memoryview]:
+        """Stream the undelivered segments of a checkpoint, one request each."""
+        for segment in checkpoint.segments[checkpoint.delivered :]:
+            stream = self._provider_stream(segment, deadline)
+            deadline = None
+            async for chunk in stream:
+                if chunk.frame and chunk.frame.data:
+                    view = frame_bytes(chunk.frame)
+                    checkpoint.add_chunk(view)
+                    yield view
+            checkpoint.complete_segment()
+
+    def _request_segments(self, text: str) -> list[str]:
+        """Split text into one provider request per sentence, if segment_requests is on."""
+        if not self.config.segment_requests:
+            return [text]
+        return split_segments(text, self.config.segment_min_chars, self.config.segment_max_chars)
+
+    def _provider_stream(
+        self, text: str, deadline: TurnDeadline | None
+    ) -> AsyncIterable[tts.SynthesizedAudio]:
+        """Provider synthesis stream; a deadline bounds only the wait for its first audio."""
+        stream = self._tts.synthesize(text)
+        if deadline is None:
+            return stream
+        return self._bound_first_chunk(stream, deadline)
+
+    @staticmethod
+    async def _bound_first_chunk(
+        stream: AsyncIterable[tts.SynthesizedAudio], deadline: TurnDeadline
+    ) -> AsyncIterator[tts.SynthesizedAudio]:
+        """Pass chunks through, cancelling if the first audio misses the deadline."""
+        iterator = stream.__aiter__()
+        with deadline.phase(PHASE_TTS):
+            while True:
+                try:
+                    chunk = await deadline.run(iterator.__anext__(), PHASE_TTS)
+                except StopAsyncIteration:
+                    return
+                yield chunk
+                if chunk.frame and chunk.frame.data:
+                    break
+        async for chunk in iterator:
+            yield chunk
 
     def get_metrics(self) -> TTSMetrics:
         """Get current TTS metrics."""
@@ -318,7 +1151,7 @@ class TTSPipeline:
         return self._tts
 
 
-def create_tts_pipeline(config: Optional[TTSConfig] = None) -> TTSPipeline:
+def create_tts_pipeline(config: TTSConfig | None = None) -> TTSPipeline:
     """
     Factory function to create a TTS pipeline.
 
@@ -330,5 +1163,8 @@ def create_tts_pipeline(config: Optional[TTSConfig] = None) -> TTSPipeline:
     """
     if config is None:
         elevenlabs_config = ElevenLabsConfig()
-        config = TTSConfig(elevenlabs_config=elevenlabs_config)
+        config = TTSConfig(
+            elevenlabs_config=elevenlabs_config,
+            cache_dir=VoiceProcessingConfig().tts_cache_dir or None,
+        )
     return TTSPipeline(config=config)
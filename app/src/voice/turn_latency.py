@@ -0,0 +1,367 @@
+"""Per-session, per-turn latency tracking for the voice pipeline."""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any
+
+import structlog
+
+from .audio_quality import LatencyTracker, PipelineLatency
+from .clock import monotonic, to_epoch_ns
+from .deadline import TurnDeadline, create_turn_deadline
+from .tracing import Span, get_tracer
+
+logger = structlog.get_logger(__name__)
+
+
+class TurnEvent(Enum):
+    """Events that delimit the phases of a single conversational turn."""
+
+    USER_STOPPED_SPEAKING = "user_stopped_speaking"
+    FINAL_TRANSCRIPT = "final_transcript"
+    LLM_FIRST_TOKEN = "llm_first_token"
+    TTS_FIRST_FRAME = "tts_first_frame"
+    AGENT_STARTED_SPEAKING = "agent_started_speaking"
+
+
+@dataclass
+class TurnTimeline:
+    """Monotonic timestamps (monotonic() seconds) for one conversational turn."""
+
+    turn_id: int
+    marks: dict[TurnEvent, float] = field(default_factory=dict)
+    estimated: set[TurnEvent] = field(default_factory=set)
+    span: Span | None = field(default=None, repr=False)
+    deadline: TurnDeadline | None = field(default=None, repr=False)
+
+    def mark(self, event: TurnEvent, at: float | None = None, estimated: bool = False) -> bool:
+        """
+        Record when an event happened.
+
+        The first mark for an event wins, except that a measured mark
+        replaces an estimated one.
+
+        Args:
+            event: The turn event
+            at: monotonic() timestamp, defaults to now
+            estimated: Whether the time was derived rather than observed
+
+        Returns:
+            True if the mark was recorded, False if already present
+        """
+        if event in self.marks and (estimated or event not in self.estimated):
+            return False
+        self.marks[event] = monotonic() if at is None else at
+        if estimated:
+            self.estimated.add(event)
+        else:
+            self.estimated.discard(event)
+        return True
+
+    def elapsed_ms(self, start: TurnEvent, end: TurnEvent) -> float:
+        """Get milliseconds between two marks, 0.0 if either is missing."""
+        if start not in self.marks or end not in self.marks:
+            return 0.0
+        return max(0.0, (self.marks[end] - self.marks[start]) * 1000)
+
+    def epoch_ns(self, event: TurnEvent) -> int | None:
+        """Convert an event's monotonic mark to unix nanoseconds for tracing."""
+        if event not in self.marks:
+            return None
+        return to_epoch_ns(self.marks[event])
+
+    def to_pipeline_latency(self) -> PipelineLatency:
+        """
+        Build the phase breakdown for this turn.
+
+        TTS latency is measured to the first synthesized frame when that
+        mark exists, otherwise to the moment the agent started speaking.
+        """
+        tts_end = (
+            TurnEvent.TTS_FIRST_FRAME
+            if TurnEvent.TTS_FIRST_FRAME in self.marks
+            else TurnEvent.AGENT_STARTED_SPEAKING
+        )
+        return PipelineLatency(
+            stt_latency_ms=self.elapsed_ms(
+                TurnEvent.USER_STOPPED_SPEAKING, TurnEvent.FINAL_TRANSCRIPT
+            ),
+            processing_latency_ms=self.elapsed_ms(
+                TurnEvent.FINAL_TRANSCRIPT, TurnEvent.LLM_FIRST_TOKEN
+            ),
+            tts_latency_ms=self.elapsed_ms(TurnEvent.LLM_FIRST_TOKEN, tts_end),
+            total_latency_ms=self.elapsed_ms(
+                TurnEvent.USER_STOPPED_SPEAKING, TurnEvent.AGENT_STARTED_SPEAKING
+            ),
+        )
+
+
+@dataclass
+class SessionLatencyTracker:
+    """
+    Latency tracker scoped to a single room session.
+
+    Each turn starts when the user stops speaking and completes when the
+    agent starts speaking, producing one PipelineLatency per turn. Completed
+    turns are recorded in the session's own tracker and, when given, in a
+    worker-wide aggregate tracker.
+
+    Every turn is also a trace: a root "turn" span that pipeline stages
+    attach child spans to via current_turn_span(). Every turn also gets a
+    TurnDeadline built from the session tracker's latency targets, which
+    stages pick up via current_deadline(); budget misses are counted per
+    phase.
+    """
+
+    room_name: str
+    aggregate: LatencyTracker | None = None
+    session: LatencyTracker = field(default_factory=LatencyTracker)
+    participant_identity: str | None = None
+    completed_turns: int = 0
+    abandoned_turns: int = 0
+    deadline_misses: dict[str, int] = field(default_factory=dict)
+    _turn: TurnTimeline | None = field(default=None, init=False)
+    _turn_count: int = field(default=0, init=False)
+
+    @property
+    def current_turn(self) -> TurnTimeline | None:
+        """Get the in-flight turn, if any."""
+        return self._turn
+
+    def mark(self, event: TurnEvent, at: float | None = None) -> PipelineLatency | None:
+        """
+        Mark a turn event for this session.
+
+        Args:
+            event: The turn event
+            at: monotonic() timestamp, defaults to now
+
+        Returns:
+            The completed PipelineLatency when the event closes a turn
+        """
+        if event == TurnEvent.USER_STOPPED_SPEAKING:
+            self._start_turn(at)
+            return None
+
+        if self._turn is None:
+            # e.g. the greeting, which is not a response to a user turn
+            logger.debug("turn_event_without_turn", turn_event=event.value, room=self.room_name)
+            return None
+
+        self._turn.mark(event, at)
+        if event == TurnEvent.AGENT_STARTED_SPEAKING:
+            return self._complete_turn()
+        return None
+
+    def _start_turn(self, at: float | None) -> None:
+        """Begin a new turn, abandoning any turn that never got a reply."""
+        if self._turn is not None:
+            self.abandoned_turns += 1
+            logger.debug(
+                "turn_abandoned",
+                room=self.room_name,
+                turn_id=self._turn.turn_id,
+                marks=[e.value for e in self._turn.marks],
+            )
+            self._count_deadline_miss(self._turn)
+            if self._turn.span is not None:
+                self._turn.span.set_attribute("turn.abandoned", True)
+                self._turn.span.end()
+        self._turn_count += 1
+        self._turn = TurnTimeline(turn_id=self._turn_count)
+        self._turn.mark(TurnEvent.USER_STOPPED_SPEAKING, at)
+        self._turn.deadline = create_turn_deadline(
+            self.session.target_total_ms,
+            stt_ms=self.session.target_stt_ms,
+            tts_ms=self.session.target_tts_ms,
+            started_at=self._turn.marks[TurnEvent.USER_STOPPED_SPEAKING],
+        )
+        self._start_turn_span(self._turn)
+
+    def _count_deadline_miss(self, turn: TurnTimeline) -> None:
+        """Count a turn's budget miss against the phase that consumed it."""
+        if turn.deadline is None or turn.deadline.miss is None:
+            return
+        phase = turn.deadline.miss.phase
+        self.deadline_misses[phase] = self.deadline_misses.get(phase, 0) + 1
+        if turn.span is not None:
+            turn.span.set_attribute("deadline.missed_phase", phase)
+
+    def _start_turn_span(self, turn: TurnTimeline) -> None:
+        """Open the turn's root span and record VAD end of speech under it."""
+        attributes: dict[str, Any] = {"room": self.room_name, "turn.id": turn.turn_id}
+        if self.participant_identity:
+            attributes["participant"] = self.participant_identity
+        stopped_at = turn.epoch_ns(TurnEvent.USER_STOPPED_SPEAKING)
+        tracer = get_tracer()
+        turn.span = tracer.start_span("turn", start_time_ns=stopped_at, attributes=attributes)
+        vad_span = tracer.start_span(
+            "vad.end_of_speech", parent=turn.span, start_time_ns=stopped_at, attributes=attributes
+        )
+        vad_span.end(end_time_ns=stopped_at)
+
+    def _complete_turn(self) -> PipelineLatency:
+        """Close the current turn and record its latency breakdown."""
+        assert self._turn is not None
+        turn = self._turn
+        self._turn = None
+        self.completed_turns += 1
+
+        latency = turn.to_pipeline_latency()
+        log_context = {"room": self.room_name, "turn_id": turn.turn_id}
+        self.session.record(latency, **log_context)
+        if self.aggregate is not None:
+            self.aggregate.record(latency, **log_context)
+        self._count_deadline_miss(turn)
+        self._end_turn_span(turn, latency)
+        return latency
+
+    def _end_turn_span(self, turn: TurnTimeline, latency: PipelineLatency) -> None:
+        """Record room publication and close the turn's root span."""
+        span = turn.span
+        if span is None:
+            return
+        published_at = turn.epoch_ns(TurnEvent.AGENT_STARTED_SPEAKING)
+        publish_from = next(
+            (
+                turn.epoch_ns(event)
+                for event in (TurnEvent.TTS_FIRST_FRAME, TurnEvent.LLM_FIRST_TOKEN)
+                if event in turn.marks
+            ),
+            published_at,
+        )
+        get_tracer().start_span(
+            "room.publish", parent=span, start_time_ns=publish_from, room=self.room_name
+        ).end(end_time_ns=published_at)
+
+        span.set_attribute("latency.stt_ms", round(latency.stt_latency_ms, 2))
+        span.set_attribute("latency.processing_ms", round(latency.processing_latency_ms, 2))
+        span.set_attribute("latency.tts_ms", round(latency.tts_latency_ms, 2))
+        span.set_attribute("latency.tts_estimated", TurnEvent.TTS_FIRST_FRAME in turn.estimated)
+        span.set_attribute("latency.total_ms", round(latency.total_latency_ms, 2))
+        span.end(end_time_ns=published_at)
+
+    def attach(self, assistant: Any) -> None:
+        """
+        Subscribe to a VoiceAssistant's events.
+
+        Speaking events are marked directly. The final transcript is
+        reconstructed from the EOU metrics, which report the transcription
+        delay after end of speech. LLM first token is marked by the LLM
+        stream via mark_turn_event.
+
+        The TTS metrics only report time to first byte after the request,
+        so LLM first token plus that TTFB is an estimate of the first
+        frame: it is marked as estimated (``latency.tts_estimated`` on the
+        turn span) and replaced by a measured mark, e.g. from TTSPipeline.
+        """
+        assistant.on(
+            "user_stopped_speaking",
+            lambda: self.mark(TurnEvent.USER_STOPPED_SPEAKING),
+        )
+        assistant.on(
+            "agent_started_speaking",
+            lambda: self.mark(TurnEvent.AGENT_STARTED_SPEAKING),
+        )
+        assistant.on("metrics_collected", self._on_pipeline_metrics)
+
+    def _on_pipeline_metrics(self, pipeline_metrics: Any) -> None:
+        """Translate LiveKit pipeline metrics into turn marks."""
+        turn = self._turn
+        if turn is None:
+            return
+
+        transcription_delay = getattr(pipeline_metrics, "transcription_delay", None)
+        if transcription_delay is not None:
+            stopped_at = turn.marks.get(TurnEvent.USER_STOPPED_SPEAKING)
+            if stopped_at is not None:
+                turn.mark(TurnEvent.FINAL_TRANSCRIPT, stopped_at + transcription_delay)
+            return
+
+        ttfb = getattr(pipeline_metrics, "ttfb", None)
+        if ttfb is not None and ttfb >= 0:
+            first_token_at = turn.marks.get(TurnEvent.LLM_FIRST_TOKEN)
+            if first_token_at is not None:
+                turn.mark(TurnEvent.TTS_FIRST_FRAME, first_token_at + ttfb, estimated=True)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get per-session latency statistics."""
+        return {
+            "room": self.room_name,
+            "completed_turns": self.completed_turns,
+            "abandoned_turns": self.abandoned_turns,
+            "deadline_misses": dict(self.deadline_misses),
+            **self.session.get_average_latencies(),
+        }
+
+
+_session_tracker: ContextVar[SessionLatencyTracker | None] = ContextVar(
+    "session_latency_tracker", default=None
+)
+
+
+def get_session_tracker() -> SessionLatencyTracker | None:
+    """Get the latency tracker for the session running in this context."""
+    return _session_tracker.get()
+
+
+def current_turn_span() -> Span | None:
+    """Get the root span of the in-flight turn for this session, if any."""
+    tracker = _session_tracker.get()
+    if tracker is None or tracker.current_turn is None:
+        return None
+    return tracker.current_turn.span
+
+
+def current_deadline() -> TurnDeadline | None:
+    """Get the latency budget of the in-flight turn for this session, if any."""
+    tracker = _session_tracker.get()
+    if tracker is None or tracker.current_turn is None:
+        return None
+    return tracker.current_turn.deadline
+
+
+def mark_turn_event(event: TurnEvent) -> None:
+    """Mark a turn event on the current session's tracker, if there is one."""
+    tracker = _session_tracker.get()
+    if tracker is not None:
+        tracker.mark(event)
+
+
+@contextmanager
+def session_latency_scope(
+    room_name: str,
+    aggregate: LatencyTracker | None = None,
+    participant_identity: str | None = None,
+    session: LatencyTracker | None = None,
+) -> Iterator[SessionLatencyTracker]:
+    """
+    Bind a fresh SessionLatencyTracker to the current context.
+
+    Tasks created inside the scope (e.g. by VoiceAssistant.start) inherit
+    the binding, so pipeline stages can mark events with mark_turn_event
+    without a reference to the JobContext.
+
+    Args:
+        room_name: Room the session belongs to
+        aggregate: Optional worker-wide tracker that also receives each turn
+        participant_identity: Identity of the remote participant
+        session: Tracker for this session's turns; its targets set the turn budget
+
+    Yields:
+        The session tracker
+    """
+    tracker = SessionLatencyTracker(
+        room_name=room_name,
+        aggregate=aggregate,
+        participant_identity=participant_identity,
+        session=session or LatencyTracker(),
+    )
+    token = _session_tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _session_tracker.reset(token)
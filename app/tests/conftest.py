@@ -1,9 +1,12 @@
 """Pytest configuration and fixtures."""
 
 import os
-import pytest
 from unittest.mock import patch
 
+import pytest
+
+from src.voice.resilience import reset_provider_health
+
 
 @pytest.fixture(autouse=True)
 def mock_env_vars():
@@ -21,6 +24,14 @@ def mock_env_vars():
         yield
 
 
+@pytest.fixture(autouse=True)
+def fresh_provider_health():
+    """Give each test its own circuit breakers and retry budgets."""
+    reset_provider_health()
+    yield
+    reset_provider_health()
+
+
 @pytest.fixture
 def sample_audio_data() -> bytes:
     """Generate sample audio data for testing."""
@@ -0,0 +1,123 @@
+"""Tests for PCM resampling, downmixing and sample type conversion."""
+
+import numpy as np
+import pytest
+
+from src.utils.audio import (
+    Resampler,
+    downmix,
+    float32_to_int16,
+    frame_levels_db,
+    int16_to_float32,
+    pcm_duration_ms,
+    resample,
+)
+
+
+def tone(sample_rate: int, frequency: float = 440.0, seconds: float = 0.5) -> np.ndarray:
+    """Half-scale int16 sine."""
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    return np.round(0.5 * np.sin(2 * np.pi * frequency * t) * 32767).astype(np.int16)
+
+
+def snr_db(signal: np.ndarray, reference: np.ndarray) -> float:
+    noise = signal.astype(np.float64) - reference
+    return 10 * np.log10(np.mean(reference**2) / np.mean(noise**2))
+
+
+class TestConversions:
+    """Tests for sample type and channel conversion."""
+
+    def test_duration_accounts_for_channels(self) -> None:
+        """Test duration depends on the channel count, not just the byte count."""
+        assert pcm_duration_ms(48000, 24000) == 1000
+        assert pcm_duration_ms(48000, 24000, num_channels=2) == 500
+
+    def test_int16_float32_round_trip(self) -> None:
+        """Test conversion round-trips exactly and clips out-of-range floats."""
+        samples = np.array([-32768, -1, 0, 1, 32767], dtype=np.int16)
+        out = np.empty(5, dtype=np.float32)
+        floats = int16_to_float32(samples, out=out)
+        assert floats is out
+        assert floats[0] == -1.0
+        assert np.array_equal(float32_to_int16(floats), samples)
+
+        loud = np.array([1.5, -1.5], dtype=np.float32)
+        assert float32_to_int16(loud).tolist() == [32767, -32768]
+        assert loud.tolist() == [1.5, -1.5]
+
+    def test_downmix_averages_channels(self) -> None:
+        """Test interleaved stereo is averaged into mono."""
+        stereo = np.array([1.0, 0.0, 0.5, 0.5, -1.0, 1.0], dtype=np.float32)
+        assert downmix(stereo, 2).tolist() == [0.5, 0.5, 0.0]
+
+    def test_frame_levels(self) -> None:
+        """Test per-frame RMS levels in dBFS, ignoring a trailing partial frame."""
+        pcm = tone(16000, seconds=0.02).tobytes() + bytes(320) + b"\x01"
+        levels = frame_levels_db(pcm, 160)
+        assert len(levels) == 3
+        # Half-scale sine: -6dB amplitude, -3dB sine RMS
+        np.testing.assert_allclose(levels[:2], -9.03, atol=0.1)
+        assert levels[2] < -100
+
+
+class TestResample:
+    """Tests for one-shot resampling."""
+
+    @pytest.mark.parametrize(
+        "from_rate,to_rate", [(24000, 48000), (48000, 16000), (16000, 48000), (44100, 48000)]
+    )
+    def test_preserves_tone(self, from_rate: int, to_rate: int) -> None:
+        """Test a tone keeps its pitch and length when resampled."""
+        out = np.frombuffer(resample(tone(from_rate).tobytes(), from_rate, to_rate), np.int16)
+        reference = tone(to_rate).astype(np.float64)
+        assert len(out) == len(reference)
+        # Alignment is to within half a sample, so compare away from the edges
+        assert snr_db(out[100:-100], reference[100:-100]) > 25
+
+    def test_attenuates_content_above_the_new_nyquist(self) -> None:
+        """Test downsampling filters out what the lower rate cannot represent."""
+        out = np.frombuffer(resample(tone(48000, 10000).tobytes(), 48000, 16000), np.int16)
+        assert np.sqrt(np.mean(out[100:-100].astype(np.float64) ** 2)) < 0.05 * 16383
+
+    def test_downmixes_stereo(self) -> None:
+        """Test stereo input comes out mono."""
+        stereo = np.repeat(tone(16000), 2)
+        out = resample(stereo.tobytes(), 16000, 16000, num_channels=2)
+        assert out == tone(16000).tobytes()
+
+
+class TestResampler:
+    """Tests for streaming resampling."""
+
+    def test_chunking_does_not_change_output(self) -> None:
+        """Test output is identical however the input is chunked."""
+        audio = tone(24000).tobytes()
+        whole = bytes(Resampler(24000, 16000).process(audio))
+
+        resampler = Resampler(24000, 16000)
+        chunked = b"".join(
+            bytes(resampler.process(audio[i : i + 482])) for i in range(0, len(audio), 482)
+        )
+        assert chunked == whole
+        assert len(whole) // 2 == len(tone(24000)) * 2 // 3
+
+    def test_reuses_output_buffers(self) -> None:
+        """Test equal-sized chunks are converted into the same buffer."""
+        resampler = Resampler(24000, 48000)
+        first = resampler.process(bytes(960))
+        second = resampler.process(bytes(960))
+        assert first.obj.base is second.obj.base
+
+    def test_passthrough_returns_input(self) -> None:
+        """Test mono audio already at the target rate is not converted."""
+        resampler = Resampler(16000, 16000)
+        assert resampler.passthrough
+        assert resampler.process(b"\x01\x00\x02\x00") == b"\x01\x00\x02\x00"
+
+    def test_close_without_pool(self) -> None:
+        """Test an unpooled resampler can be closed and reused."""
+        resampler = Resampler(24000, 48000)
+        resampler.process(bytes(960))
+        resampler.close()
+        assert len(resampler.process(bytes(960))) == 1920
@@ -0,0 +1,70 @@
+"""Tests for the audio buffer pool."""
+
+from src.utils.buffer_pool import BufferPool, frame_size, get_buffer_pool, size_class
+
+
+class TestBufferPool:
+    """Tests for borrowing and returning buffers."""
+
+    def test_frame_buckets_by_rate_and_duration(self) -> None:
+        """Test frame buffers are sized by sample rate, duration and channels."""
+        pool = BufferPool()
+        assert len(pool.acquire_frame(48000, 20)) == frame_size(48000, 20) == 1920
+        assert len(pool.acquire_frame(24000, 10, num_channels=2)) == 960
+
+    def test_released_buffers_are_reused(self) -> None:
+        """Test a released buffer is handed out again, counting hits."""
+        pool = BufferPool()
+        first = pool.acquire_frame(24000, 20)
+        pool.release(first)
+        assert pool.acquire_frame(24000, 20) is first
+        # Same size, so the bucket is shared
+        pool.release(first)
+        assert pool.acquire_frame(48000, 10) is first
+
+        assert pool.metrics.acquired == 3
+        assert pool.metrics.hits == 2
+        assert pool.metrics.misses == 1
+        assert pool.metrics.hit_rate == 2 / 3
+
+    def test_tracks_peak_outstanding(self) -> None:
+        """Test outstanding buffers are counted and their peak kept."""
+        pool = BufferPool()
+        buffers = [pool.acquire(100) for _ in range(3)]
+        for buffer in buffers:
+            pool.release(buffer)
+        pool.acquire(100)
+        assert pool.metrics.outstanding == 1
+        assert pool.metrics.peak_outstanding == 3
+
+    def test_size_classes(self) -> None:
+        """Test variable sizes round up to power-of-two classes."""
+        pool = BufferPool()
+        assert size_class(1) == 4096
+        assert size_class(4097) == 8192
+        assert len(pool.acquire(5000)) == 8192
+
+    def test_full_buckets_discard(self) -> None:
+        """Test releases beyond the bucket limit are left to the GC."""
+        pool = BufferPool(max_free_per_bucket=1)
+        buffers = [pool.acquire(10), pool.acquire(10)]
+        for buffer in buffers:
+            pool.release(buffer)
+        assert pool.free_buffers() == 1
+        assert pool.metrics.discarded == 1
+
+    def test_foreign_and_repeated_releases_ignored(self) -> None:
+        """Test only buffers on loan are taken back, once."""
+        pool = BufferPool()
+        buffer = pool.acquire(10)
+        pool.release(bytearray(4096))
+        pool.release(buffer)
+        pool.release(buffer)
+        assert pool.metrics.outstanding == 0
+        assert pool.metrics.released == 1
+        assert pool.metrics.ignored == 2
+        assert pool.free_buffers() == 1
+
+    def test_process_wide_pool(self) -> None:
+        """Test the process-wide pool is shared."""
+        assert get_buffer_pool() is get_buffer_pool()
@@ -0,0 +1,89 @@
+"""Tests for zero-copy frame views and the PCM collector."""
+
+import numpy as np
+from livekit import rtc
+
+from src.utils.buffer_pool import BufferPool
+from src.voice.audio_buffers import PCMCollector, as_int16, estimate_pcm_bytes, frame_bytes
+
+
+class TestFrameViews:
+    """Tests for views over frame buffers."""
+
+    def test_frame_bytes_shares_frame_memory(self) -> None:
+        """Test the byte view and NumPy view alias the frame's buffer."""
+        frame = rtc.AudioFrame(b"\x01\x00\x02\x00", 24000, 1, 2)
+        view = frame_bytes(frame)
+        assert view.nbytes == 4
+        assert view.obj is frame.data.obj
+
+        samples = as_int16(view)
+        assert samples.tolist() == [1, 2]
+        assert not samples.flags.owndata
+
+
+class TestPCMCollector:
+    """Tests for single-buffer collection."""
+
+    def test_appends_within_and_beyond_capacity(self) -> None:
+        """Test audio is collected in order and the buffer grows when needed."""
+        collector = PCMCollector(capacity=4)
+        collector.append(b"ab")
+        collector.append(memoryview(b"cdef"))
+        collector.append(np.array([0x6867], dtype=np.int16))
+        assert len(collector) == 8
+        assert collector.view() == b"abcdefgh"
+
+    def test_truncate_rewinds(self) -> None:
+        """Test truncated audio is overwritten by later appends."""
+        collector = PCMCollector(capacity=16)
+        collector.append(b"keep")
+        collector.append(b"drop")
+        collector.truncate(4)
+        collector.append(b"next")
+        assert bytes(collector.view()) == b"keepnext"
+
+    def test_detach_hands_over_trimmed_buffer(self) -> None:
+        """Test detach returns the collected audio and resets the collector."""
+        collector = PCMCollector(capacity=1024)
+        collector.append(b"audio")
+        audio = collector.detach()
+        assert isinstance(audio, bytearray)
+        assert audio == b"audio"
+        assert len(collector) == 0
+
+    def test_detach_with_view_alive_copies(self) -> None:
+        """Test detach copies instead of truncating a buffer a view still pins."""
+        collector = PCMCollector(capacity=1024)
+        collector.append(b"audio")
+        view = collector.view()
+        audio = collector.detach()
+        assert audio == b"audio"
+        assert bytes(view) == b"audio"
+        assert len(collector) == 0
+
+    def test_pooled_buffer_grows_and_returns(self) -> None:
+        """Test a pooled collector swaps buffers to grow and returns them on release."""
+        pool = BufferPool()
+        collector = PCMCollector(capacity=10, pool=pool)
+        collector.append(b"a" * 4000)
+        collector.append(b"b" * 200)
+        assert bytes(collector.view()) == b"a" * 4000 + b"b" * 200
+        assert pool.metrics.outstanding == 1
+
+        collector.release()
+        collector.release()
+        assert pool.metrics.outstanding == 0
+        assert pool.free_buffers() == 2
+
+    def test_pooled_detach_copies(self) -> None:
+        """Test detaching from a pooled collector copies and returns the buffer."""
+        pool = BufferPool()
+        collector = PCMCollector(capacity=10, pool=pool)
+        collector.append(b"audio")
+        assert collector.detach() == b"audio"
+        assert pool.metrics.outstanding == 0
+
+    def test_estimate(self) -> None:
+        """Test the preallocation estimate scales with text and sample rate."""
+        assert estimate_pcm_bytes("x" * 15, 24000) == 48000
@@ -0,0 +1,168 @@
+"""Tests for frame repacketizing and publishing audio to a source."""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from src.utils.audio import Resampler
+from src.utils.buffer_pool import BufferPool
+from src.voice.audio_publisher import AudioPublisher, FrameRepacketizer
+
+
+class FakeSource:
+    """AudioSource stand-in recording captured frames, optionally slowly."""
+
+    def __init__(self, sample_rate: int = 1000, delay: float = 0.0, fail_after: int = -1) -> None:
+        self.sample_rate = sample_rate
+        self.num_channels = 1
+        self.delay = delay
+        self.fail_after = fail_after
+        self.frames: list[bytes] = []
+
+    async def capture_frame(self, frame) -> None:
+        if len(self.frames) == self.fail_after:
+            raise RuntimeError("source closed")
+        await asyncio.sleep(self.delay)
+        self.frames.append(bytes(frame.data.cast("B")))
+
+
+async def chunks(*parts: bytes, produced: list | None = None):
+    for part in parts:
+        if produced is not None:
+            produced.append(part)
+        yield part
+
+
+class TestFrameRepacketizer:
+    """Tests for re-slicing irregular chunks into exact frames."""
+
+    def test_emits_exact_frames_across_chunks(self) -> None:
+        """Test audio straddling chunk boundaries is carried into the next frame."""
+        # 1kHz, 10ms -> 10 samples -> 20 bytes per frame
+        repacketizer = FrameRepacketizer(1000, frame_ms=10)
+        audio = bytes(range(70))
+        frames = []
+        for part in (audio[:7], audio[7:33], audio[33:34], audio[34:70]):
+            frames.extend(repacketizer.push(part))
+
+        assert [frame.samples_per_channel for frame in frames] == [10, 10, 10]
+        assert b"".join(bytes(frame.data.cast("B")) for frame in frames) == audio[:60]
+        assert repacketizer.pending_bytes == 10
+
+        tail = repacketizer.flush()
+        assert bytes(tail.data.cast("B")) == audio[60:] + bytes(10)
+        assert repacketizer.flush() is None
+
+    def test_carried_frames_do_not_alias_the_carry_buffer(self) -> None:
+        """Test frames stay intact after later pushes reuse the carry-over buffer."""
+        repacketizer = FrameRepacketizer(1000, frame_ms=10)
+        repacketizer.push(b"a" * 15)
+        (first,) = repacketizer.push(b"b" * 15)
+        repacketizer.push(b"c" * 15)
+        assert bytes(first.data.cast("B")) == b"a" * 15 + b"b" * 5
+
+    def test_frames_survive_chunk_reuse(self) -> None:
+        """Test whole frames do not alias a chunk buffer the caller reuses."""
+        repacketizer = FrameRepacketizer(1000, frame_ms=10)
+        chunk = bytearray(b"a" * 20)
+        (frame,) = repacketizer.push(chunk)
+        chunk[:] = b"b" * 20
+        assert bytes(frame.data.cast("B")) == b"a" * 20
+
+    def test_rejects_fractional_frames(self) -> None:
+        """Test a frame duration that is not a whole number of samples is rejected."""
+        with pytest.raises(ValueError):
+            FrameRepacketizer(22050, frame_ms=10)
+
+
+class TestAudioPublisher:
+    """Tests for the bounded publishing queue."""
+
+    @pytest.mark.asyncio
+    async def test_publishes_all_audio_in_order(self) -> None:
+        """Test every byte reaches the source as exact frames, padded at the end."""
+        source = FakeSource()
+        publisher = AudioPublisher(source=source, frame_ms=20)
+        audio = bytes(range(256)) * 2
+
+        await publisher.publish(chunks(audio[:100], audio[100:350], audio[350:]))
+
+        assert all(len(frame) == 40 for frame in source.frames)
+        assert b"".join(source.frames)[: len(audio)] == audio
+        assert publisher.metrics.frames_published == len(source.frames) == 13
+        assert publisher.metrics.utterances == 1
+        assert publisher.metrics.first_byte_to_publish_sketch.count == 1
+        assert publisher.metrics.enqueue_to_capture_sketch.count == 13
+
+    @pytest.mark.asyncio
+    async def test_backpressure_bounds_read_ahead(self) -> None:
+        """Test a slow source pauses the stream instead of buffering it all."""
+        source = FakeSource(delay=0.01)
+        publisher = AudioPublisher(source=source, frame_ms=20, queue_frames=2)
+        produced: list[bytes] = []
+        frame = bytes(40)
+
+        task = asyncio.ensure_future(publisher.publish(chunks(*[frame] * 20, produced=produced)))
+        await asyncio.sleep(0.035)
+        # Captured + queued + in capture + the frame waiting to be enqueued
+        assert len(produced) <= len(source.frames) + 4
+        await task
+
+        assert len(source.frames) == 20
+        assert publisher.metrics.queue_high_water == 2
+        assert publisher.metrics.enqueue_to_capture_sketch.percentile(99) >= 10
+
+    @pytest.mark.asyncio
+    async def test_capture_failure_stops_publishing(self) -> None:
+        """Test a source error propagates rather than blocking on a full queue."""
+        source = FakeSource(fail_after=2)
+        pool = BufferPool()
+        publisher = AudioPublisher(source=source, frame_ms=20, queue_frames=1, pool=pool)
+
+        with pytest.raises(RuntimeError, match="source closed"):
+            await asyncio.wait_for(publisher.publish(chunks(*[bytes(40)] * 10)), timeout=1)
+        assert publisher.metrics.utterances == 0
+        # Including the frame the source failed on
+        assert pool.metrics.outstanding == 0
+
+    @pytest.mark.asyncio
+    async def test_resamples_to_source_rate(self) -> None:
+        """Test audio at another rate is resampled, not played at the wrong pitch."""
+        source = FakeSource(sample_rate=2000, delay=0.001)
+        publisher = AudioPublisher(source=source, frame_ms=20)
+        # 1s at 1kHz; the resampler reuses its output buffer for every chunk
+        audio = np.random.default_rng(1).integers(-3000, 3000, 1000, dtype=np.int16).tobytes()
+        parts = [audio[i : i + 300] for i in range(0, len(audio), 300)]
+
+        await publisher.publish(chunks(*parts), sample_rate=1000)
+
+        resampler = Resampler(1000, 2000)
+        expected = b"".join(bytes(resampler.process(part)) for part in parts)
+        assert all(len(frame) == 80 for frame in source.frames)
+        assert len(source.frames) == 50
+        assert b"".join(source.frames) == expected
+
+    @pytest.mark.asyncio
+    async def test_frames_return_to_pool(self) -> None:
+        """Test frame and resampler buffers are reused and all returned."""
+        pool = BufferPool()
+        publisher = AudioPublisher(source=FakeSource(sample_rate=2000), pool=pool)
+        parts = [bytes(300)] * 10
+
+        await publisher.publish(chunks(*parts), sample_rate=1000)
+        peak = pool.metrics.peak_outstanding
+        for _ in range(3):
+            await publisher.publish(chunks(*parts), sample_rate=1000)
+
+        assert pool.metrics.outstanding == 0
+        assert pool.metrics.peak_outstanding == peak
+        assert pool.metrics.hit_rate > 0.9
+
+    @pytest.mark.asyncio
+    async def test_rejects_resampling_for_stereo_sources(self) -> None:
+        """Test resampling, which outputs mono, is refused for a stereo source."""
+        source = FakeSource(sample_rate=48000)
+        source.num_channels = 2
+        with pytest.raises(ValueError):
+            await AudioPublisher(source=source).publish(chunks(bytes(40)), sample_rate=24000)
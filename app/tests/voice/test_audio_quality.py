@@ -1,14 +1,14 @@
 """Tests for audio quality metrics and latency tracking."""
 
-import pytest
 import time
-from unittest.mock import patch
+
+import pytest
 
 from src.voice.audio_quality import (
-    LatencyTracker,
+    AudioQualityMetrics,
     LatencyPhase,
+    LatencyTracker,
     PipelineLatency,
-    AudioQualityMetrics,
     create_latency_tracker,
     create_quality_metrics,
 )
@@ -142,14 +142,14 @@ class TestAudioQualityMetrics:
         """Test metrics start empty."""
         metrics = AudioQualityMetrics()
         assert metrics.get_average_quality() == 0.0
-        assert len(metrics.quality_scores) == 0
+        assert len(metrics.recent_scores) == 0
 
     def test_record_quality_score(self) -> None:
         """Test recording quality scores."""
         metrics = AudioQualityMetrics()
         metrics.record_quality_score(8.5)
         metrics.record_quality_score(7.0)
-        assert len(metrics.quality_scores) == 2
+        assert len(metrics.recent_scores) == 2
         assert metrics.get_average_quality() == 7.75
 
     def test_score_clamping(self) -> None:
@@ -157,7 +157,7 @@ class TestAudioQualityMetrics:
         metrics = AudioQualityMetrics()
         metrics.record_quality_score(-5.0)
         metrics.record_quality_score(15.0)
-        assert metrics.quality_scores == [0.0, 10.0]
+        assert metrics.recent_scores == (0.0, 10.0)
 
     def test_rolling_window(self) -> None:
         """Test quality scores maintain rolling window."""
@@ -166,9 +166,9 @@ class TestAudioQualityMetrics:
         for i in range(10):
             metrics.record_quality_score(float(i))
 
-        assert len(metrics.quality_scores) == 5
+        assert len(metrics.recent_scores) == 5
         # Should have scores 5, 6, 7, 8, 9
-        assert metrics.quality_scores == [5.0, 6.0, 7.0, 8.0, 9.0]
+        assert metrics.recent_scores == (5.0, 6.0, 7.0, 8.0, 9.0)
 
     def test_get_quality_stats(self) -> None:
         """Test comprehensive quality statistics."""
@@ -192,12 +192,23 @@ class TestAudioQualityMetrics:
         assert metrics.meets_minimum_standard(min_score=6.0) is True
         assert metrics.meets_minimum_standard(min_score=8.0) is False
 
+    def test_recent_scores_read_only(self) -> None:
+        """Test the score window can only change through record_quality_score."""
+        metrics = AudioQualityMetrics(window_size=3)
+        metrics.record_quality_score(2.0)
+        with pytest.raises(AttributeError):
+            metrics.recent_scores = (1.0,)
+        with pytest.raises(AttributeError):
+            metrics.recent_scores.append(1.0)
+        assert metrics.recent_scores == (2.0,)
+
     def test_reset(self) -> None:
         """Test resetting metrics."""
         metrics = AudioQualityMetrics()
         metrics.record_quality_score(8.0)
         metrics.reset()
-        assert len(metrics.quality_scores) == 0
+        assert len(metrics.recent_scores) == 0
+        assert metrics.get_window_summary(60)["count"] == 0
 
 
 class TestFactoryFunctions:
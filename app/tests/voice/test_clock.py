@@ -0,0 +1,159 @@
+"""Tests for the shared monotonic clock and stream offset mapping."""
+
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from livekit import rtc
+from livekit.agents import stt
+
+from src.voice.clock import StreamClock, elapsed_ms, monotonic, to_epoch_ns
+from src.voice.config import DeepgramConfig
+from src.voice.stt_pipeline import STTConfig, STTPipeline
+
+
+class Clock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self, now: float = 100.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestClock:
+    """Tests for the clock helpers."""
+
+    def test_monotonic_matches_perf_counter(self) -> None:
+        """Test marks taken with perf_counter can be mixed with monotonic()."""
+        before = time.perf_counter()
+        now = monotonic()
+        assert before <= now <= time.perf_counter()
+
+    def test_elapsed_ms(self) -> None:
+        """Test elapsed milliseconds from a mark."""
+        assert elapsed_ms(10.0, now=10.25) == pytest.approx(250)
+        assert elapsed_ms(monotonic()) >= 0
+
+    def test_to_epoch_ns(self) -> None:
+        """Test a mark converts to wall-clock nanoseconds."""
+        converted = to_epoch_ns(monotonic() - 2.0)
+        assert converted == pytest.approx(time.time_ns() - 2e9, abs=5e7)
+
+
+class TestStreamClock:
+    """Tests for StreamClock."""
+
+    def test_offsets_from_start(self) -> None:
+        """Test offsets resolve from the stream start for continuous audio."""
+        now = Clock()
+        clock = StreamClock(clock=now)
+        clock.start()
+        for _ in range(100):
+            now.now += 0.02
+            clock.push(0.02)
+
+        assert clock.sent_s == pytest.approx(2.0)
+        assert clock.to_monotonic(1.5) == pytest.approx(101.5)
+        now.now = 102.3
+        assert clock.latency_ms(1.5) == pytest.approx(800)
+
+    def test_start_is_idempotent(self) -> None:
+        """Test a second start keeps the first anchor."""
+        clock = StreamClock()
+        clock.start(at=5.0)
+        clock.start(at=9.0)
+        assert clock.to_monotonic(0.5) == 5.5
+
+    def test_gap_reanchors(self) -> None:
+        """Test audio sent after dropped silence resolves to its capture time."""
+        clock = StreamClock()
+        clock.start(at=0.0)
+        clock.push(1.0, captured_at=0.0)
+        clock.push(1.0, captured_at=3.0)  # two seconds of silence were not sent
+
+        assert clock.to_monotonic(0.5) == 0.5
+        assert clock.to_monotonic(1.5) == 3.5
+
+    def test_jitter_does_not_reanchor(self) -> None:
+        """Test small delivery jitter keeps the stream on one anchor."""
+        clock = StreamClock()
+        clock.push(1.0, captured_at=0.0)
+        clock.push(1.0, captured_at=1.05)
+        assert clock.to_monotonic(1.5) == 1.5
+
+    def test_unstarted_clock_starts_now(self) -> None:
+        """Test resolving on an unstarted clock anchors it at now."""
+        clock = StreamClock(clock=Clock(7.0))
+        assert clock.latency_ms(0.0) == 0.0
+        assert clock.started
+
+
+def final_event(end_time: float) -> SimpleNamespace:
+    """Deepgram final transcript stand-in ending ``end_time`` into the stream."""
+    return SimpleNamespace(
+        type=stt.SpeechEventType.FINAL_TRANSCRIPT,
+        alternatives=[
+            SimpleNamespace(text="hello", confidence=0.9, start_time=0.4, end_time=end_time)
+        ],
+    )
+
+
+class TestPipelineLatency:
+    """Tests for STT latency from end of speech to final."""
+
+    @pytest.fixture
+    def pipeline(self) -> STTPipeline:
+        """Create a pipeline with the silence gate on, without padding."""
+        with patch.dict("os.environ", {"DEEPGRAM_API_KEY": "test_key"}):
+            config = STTConfig(
+                deepgram_config=DeepgramConfig(),
+                vad_enabled=True,
+                vad_padding_ms=0,
+                endpointing_ms=0,
+            )
+        with patch("src.voice.stt_pipeline.deepgram.STT"):
+            return STTPipeline(config=config)
+
+    async def test_final_latency_from_end_of_speech(self, pipeline: STTPipeline) -> None:
+        """Test latency is measured from the transcript's end offset, not an epoch."""
+        now = Clock()
+        clock = StreamClock(clock=now)
+        clock.start()
+
+        async def events():
+            now.now = 102.35
+            yield final_event(end_time=2.0)
+
+        results = [r async for r in pipeline.process_audio_stream(events(), clock=clock)]
+
+        assert results[0].latency_ms == pytest.approx(350)
+        assert pipeline.metrics.latency_sketch.quantile(0.5) == pytest.approx(350, rel=0.05)
+
+    async def test_forwarding_maps_offsets_past_dropped_silence(
+        self, pipeline: STTPipeline
+    ) -> None:
+        """Test offsets after gated silence resolve to when that speech was captured."""
+        loud = (np.ones(160) * 3000).astype(np.int16).tobytes()
+        quiet = bytes(320)
+        pcm = [loud] * 3 + [quiet] * 20 + [loud] * 2
+        frames = [rtc.AudioFrame(chunk, 16000, 1, 160) for chunk in pcm]
+
+        async def source():
+            for frame in frames:
+                yield frame
+
+        # Frame i arrives 10ms after it starts, at 50.0 + (i + 1) * 10ms
+        arrivals = [50.0 + (i + 1) * 0.01 for i in range(len(frames))]
+        clock = pipeline.create_stream_clock()
+        stream = SimpleNamespace(push_frame=lambda f: None)
+        with patch("src.voice.stt_pipeline.monotonic", side_effect=arrivals):
+            await pipeline.forward_audio(source(), stream, clock)
+
+        assert clock.sent_s == pytest.approx(0.05)
+        assert clock.to_monotonic(0.01) == pytest.approx(50.01)
+        # The second word starts 30ms into the sent audio, captured at frame 23
+        assert clock.to_monotonic(0.03) == pytest.approx(50.23)
@@ -1,13 +1,14 @@
 """Tests for voice configuration management."""
 
 import os
-import pytest
 from unittest.mock import patch
 
+import pytest
+
 from src.voice.config import (
-    LiveKitConfig,
     DeepgramConfig,
     ElevenLabsConfig,
+    LiveKitConfig,
     VoiceProcessingConfig,
 )
 
@@ -97,6 +98,7 @@ class TestVoiceProcessingConfig:
         assert config.target_total_latency_ms == 2000
         assert config.min_audio_quality_score == 6.0
         assert config.min_stt_accuracy == 0.95
+        assert config.prewarm_prompts is False
 
     def test_latency_targets(self) -> None:
         """Test latency target values."""
@@ -0,0 +1,269 @@
+"""Tests for per-turn deadline propagation."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from livekit import rtc
+
+from src.voice.deadline import (
+    PHASE_STT,
+    PHASE_TTS,
+    DeadlineExceededError,
+    TurnDeadline,
+    create_turn_deadline,
+)
+from src.voice.stt_pipeline import create_stt_pipeline, retry_async
+from src.voice.tts_pipeline import create_tts_pipeline
+from src.voice.turn_latency import (
+    SessionLatencyTracker,
+    TurnEvent,
+    current_deadline,
+    session_latency_scope,
+)
+
+
+class TestTurnDeadline:
+    """Tests for the deadline object itself."""
+
+    def test_remaining_budget(self) -> None:
+        """Test remaining budget shrinks with elapsed time."""
+        deadline = TurnDeadline(budget_ms=1000, started_at=time.perf_counter() - 0.4)
+        assert deadline.remaining_ms() == pytest.approx(600, abs=20)
+        assert not deadline.expired()
+
+    def test_phase_budget_caps_remaining(self) -> None:
+        """Test a phase budget caps what that phase may use."""
+        deadline = create_turn_deadline(2000, stt_ms=300)
+        assert deadline.remaining_ms(PHASE_STT) <= 300
+        assert deadline.remaining_ms() > 1900
+
+    def test_phase_accounting(self) -> None:
+        """Test time spent in a phase is accounted to it."""
+        deadline = TurnDeadline(budget_ms=1000)
+        with deadline.phase(PHASE_STT):
+            time.sleep(0.02)
+        assert deadline.consumed_ms[PHASE_STT] >= 15
+        assert deadline.miss is None
+
+    def test_nested_phase_accounted_once(self) -> None:
+        """Test re-entering a running phase (e.g. a hedged request) is not double counted."""
+        deadline = TurnDeadline(budget_ms=1000)
+        with deadline.phase(PHASE_TTS):
+            with deadline.phase(PHASE_TTS):
+                time.sleep(0.02)
+            assert PHASE_TTS not in deadline.consumed_ms
+        assert 15 <= deadline.consumed_ms[PHASE_TTS] < 100
+
+    def test_miss_recorded_once_with_phase(self) -> None:
+        """Test only the first miss is recorded, charged to the running phase."""
+        deadline = TurnDeadline(budget_ms=10, started_at=time.perf_counter() - 1)
+        with pytest.raises(DeadlineExceededError) as exc_info:
+            deadline.check(PHASE_TTS)
+        assert exc_info.value.phase == PHASE_TTS
+        assert deadline.miss.phase == PHASE_TTS
+        assert deadline.record_miss(PHASE_STT) is None
+
+    async def test_run_cancels_when_exhausted(self) -> None:
+        """Test run() cancels a stage that outlasts the budget."""
+        deadline = TurnDeadline(budget_ms=50)
+        with pytest.raises(DeadlineExceededError):
+            await deadline.run(asyncio.sleep(1), PHASE_STT)
+        assert deadline.miss is not None
+
+
+class TestRetryWithDeadline:
+    """Tests for retries bounded by the turn budget."""
+
+    async def test_backoff_skipped_when_budget_short(self) -> None:
+        """Test a backoff that would outlast the budget is not slept."""
+        calls = 0
+
+        async def always_fail():
+            nonlocal calls
+            calls += 1
+            raise ConnectionError("flaky")
+
+        deadline = TurnDeadline(budget_ms=200)
+        start = time.perf_counter()
+        with pytest.raises(DeadlineExceededError) as exc_info:
+            await retry_async(
+                always_fail, max_retries=3, base_delay=0.5, deadline=deadline, phase=PHASE_STT
+            )
+        assert time.perf_counter() - start < 0.1
+        assert calls == 1
+        assert isinstance(exc_info.value.__cause__, ConnectionError)
+        assert deadline.miss.phase == PHASE_STT
+
+    async def test_retries_while_budget_remains(self) -> None:
+        """Test retries still happen inside the budget."""
+        calls = 0
+
+        async def fail_once():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise ConnectionError("flaky")
+            return "ok"
+
+        deadline = TurnDeadline(budget_ms=1000)
+        result = await retry_async(fail_once, base_delay=0.01, deadline=deadline, phase=PHASE_STT)
+        assert result == "ok"
+        assert deadline.miss is None
+
+
+class TestPipelineDeadlines:
+    """Tests for deadline enforcement in the STT and TTS stages."""
+
+    @patch("src.voice.stt_pipeline.deepgram.STT")
+    async def test_transcribe_audio_cancelled(self, mock_stt_class: MagicMock) -> None:
+        """Test a slow transcription is cancelled and counted as failed."""
+
+        async def slow_recognize(**kwargs):
+            await asyncio.sleep(1)
+
+        pipeline = create_stt_pipeline()
+        pipeline._stt = MagicMock(recognize=slow_recognize)
+        deadline = TurnDeadline(budget_ms=50)
+
+        with pytest.raises(DeadlineExceededError):
+            await pipeline.transcribe_audio(b"audio", deadline=deadline)
+
+        assert pipeline.metrics.failed_transcriptions == 1
+        assert deadline.miss.phase == PHASE_STT
+        assert PHASE_STT in deadline.consumed_ms
+
+    @patch("src.voice.stt_pipeline.deepgram.STT")
+    async def test_transcribe_audio_uses_turn_deadline(self, mock_stt_class: MagicMock) -> None:
+        """Test the current turn's deadline is picked up implicitly."""
+        pipeline = create_stt_pipeline()
+        pipeline._stt = MagicMock(recognize=AsyncMock(return_value=MagicMock(text="hi")))
+
+        with session_latency_scope("room") as tracker:
+            tracker.mark(TurnEvent.USER_STOPPED_SPEAKING)
+            assert await pipeline.transcribe_audio(b"audio") == "hi"
+            assert PHASE_STT in current_deadline().consumed_ms
+
+    @patch("src.voice.tts_pipeline.elevenlabs.TTS")
+    async def test_stream_cancelled_before_first_chunk(self, mock_tts_class: MagicMock) -> None:
+        """Test streaming is cancelled when the first audio misses the budget."""
+
+        async def slow_stream(text):
+            await asyncio.sleep(1)
+            yield MagicMock()
+
+        pipeline = create_tts_pipeline()
+        pipeline._tts = MagicMock(synthesize=slow_stream)
+        deadline = TurnDeadline(budget_ms=50)
+
+        with pytest.raises(DeadlineExceededError):
+            async for _ in pipeline.synthesize_stream("Hello", deadline=deadline):
+                pass
+        assert deadline.miss.phase == PHASE_TTS
+        assert pipeline.metrics.failed_syntheses == 1
+
+    @patch("src.voice.tts_pipeline.elevenlabs.TTS")
+    async def test_stream_continues_after_first_chunk(self, mock_tts_class: MagicMock) -> None:
+        """Test audio keeps flowing once the first chunk made the deadline."""
+
+        async def stream(text):
+            for i in range(3):
+                chunk = MagicMock()
+                chunk.frame = rtc.AudioFrame(f"chunk{i}".encode(), 24000, 1, 3)
+                yield chunk
+                await asyncio.sleep(0.05)
+
+        pipeline = create_tts_pipeline()
+        pipeline._tts = MagicMock(synthesize=stream)
+        deadline = TurnDeadline(budget_ms=80)
+
+        chunks = [c async for c in pipeline.synthesize_stream("Hello", deadline=deadline)]
+        assert len(chunks) == 3
+
+    @patch("src.voice.tts_pipeline.elevenlabs.TTS")
+    async def test_synthesize_raises_deadline_unwrapped(self, mock_tts_class: MagicMock) -> None:
+        """Test synthesize surfaces DeadlineExceededError so callers can fall back."""
+
+        async def slow_stream(text):
+            await asyncio.sleep(1)
+            yield MagicMock()
+
+        pipeline = create_tts_pipeline()
+        pipeline._tts = MagicMock(synthesize=slow_stream)
+
+        with pytest.raises(DeadlineExceededError):
+            await pipeline.synthesize("Hello", deadline=TurnDeadline(budget_ms=50))
+
+    @patch("src.voice.tts_pipeline.elevenlabs.TTS")
+    async def test_synthesize_bounds_only_first_audio(self, mock_tts_class: MagicMock) -> None:
+        """Test synthesis that outlasts the budget completes once audio has started."""
+
+        async def stream(text):
+            for i in range(3):
+                chunk = MagicMock()
+                chunk.frame = rtc.AudioFrame(f"chunk{i}".encode(), 24000, 1, 3)
+                yield chunk
+                await asyncio.sleep(0.05)
+
+        pipeline = create_tts_pipeline()
+        pipeline.resilience.hedge = False
+        pipeline._tts = MagicMock(synthesize=stream)
+        deadline = TurnDeadline(budget_ms=80, phase_budgets_ms={PHASE_TTS: 80})
+
+        result = await pipeline.synthesize("Hello", deadline=deadline)
+        assert result.audio_data == b"chunk0chunk1chunk2"
+        assert deadline.consumed_ms[PHASE_TTS] < 80
+
+    @patch("src.voice.tts_pipeline.elevenlabs.TTS")
+    async def test_synthesize_stops_retrying_once_budget_spent(
+        self, mock_tts_class: MagicMock
+    ) -> None:
+        """Test a synthesis failing after the budget ran out is not retried."""
+        calls = 0
+
+        async def dropping_stream(text):
+            nonlocal calls
+            calls += 1
+            chunk = MagicMock()
+            chunk.frame = rtc.AudioFrame(b"chunk0", 24000, 1, 3)
+            yield chunk
+            await asyncio.sleep(0.1)
+            raise ConnectionError("connection reset")
+
+        pipeline = create_tts_pipeline()
+        pipeline.resilience.hedge = False
+        pipeline._tts = MagicMock(synthesize=dropping_stream)
+        deadline = TurnDeadline(budget_ms=50)
+
+        with pytest.raises(DeadlineExceededError):
+            await pipeline.synthesize("Hello", max_retries=3, deadline=deadline)
+        assert calls == 1
+        assert deadline.miss.phase == PHASE_TTS
+
+
+class TestSessionDeadlines:
+    """Tests for deadline creation and miss accounting per session."""
+
+    def test_turn_gets_deadline_from_targets(self) -> None:
+        """Test each turn's budget comes from the session targets."""
+        tracker = SessionLatencyTracker(room_name="room")
+        tracker.session.target_total_ms = 1500
+        tracker.mark(TurnEvent.USER_STOPPED_SPEAKING)
+        deadline = tracker.current_turn.deadline
+        assert deadline.budget_ms == 1500
+        assert deadline.phase_budgets_ms[PHASE_STT] == tracker.session.target_stt_ms
+
+    def test_misses_counted_by_phase(self) -> None:
+        """Test completed and abandoned turns count their misses."""
+        tracker = SessionLatencyTracker(room_name="room")
+        tracker.mark(TurnEvent.USER_STOPPED_SPEAKING)
+        tracker.current_turn.deadline.record_miss(PHASE_TTS)
+        tracker.mark(TurnEvent.AGENT_STARTED_SPEAKING)
+
+        tracker.mark(TurnEvent.USER_STOPPED_SPEAKING)
+        tracker.current_turn.deadline.record_miss(PHASE_STT)
+        tracker.mark(TurnEvent.USER_STOPPED_SPEAKING)
+
+        assert tracker.deadline_misses == {PHASE_TTS: 1, PHASE_STT: 1}
+        assert tracker.get_stats()["deadline_misses"] == {PHASE_TTS: 1, PHASE_STT: 1}
@@ -0,0 +1,236 @@
+"""Tests for adaptive endpointing."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from livekit import rtc
+from livekit.agents import stt
+
+from src.voice.config import DeepgramConfig
+from src.voice.endpointing import EndpointingController, TurnCue, turn_cue
+from src.voice.stt_pipeline import STTConfig, STTPipeline
+
+
+def run_silence(controller: EndpointingController, start: float, seconds: float) -> float:
+    """Feed 10ms silent frames; return when the turn ended (or None)."""
+    now = start
+    while now <= start + seconds:
+        if controller.on_silence(now):
+            return now
+        now = round(now + 0.01, 3)
+    return None
+
+
+def transcript(text: str, is_final: bool = False) -> SimpleNamespace:
+    """Deepgram speech event stand-in."""
+    kinds = stt.SpeechEventType
+    return SimpleNamespace(
+        type=kinds.FINAL_TRANSCRIPT if is_final else kinds.INTERIM_TRANSCRIPT,
+        alternatives=[SimpleNamespace(text=text, confidence=0.9, start_time=0.0, end_time=0.0)],
+    )
+
+
+class TestTurnCue:
+    """Tests for transcript cues."""
+
+    @pytest.mark.parametrize(
+        "text, cue",
+        [
+            ("I want to fly to Denver and", TurnCue.HOLD),
+            ("so, um", TurnCue.HOLD),
+            ("Let me think...", TurnCue.HOLD),
+            ("Book it.", TurnCue.COMMIT),
+            ("Can you do that?", TurnCue.COMMIT),
+            ("Book it for Tuesday", TurnCue.NEUTRAL),
+            ("", TurnCue.NEUTRAL),
+        ],
+    )
+    def test_cues(self, text: str, cue: TurnCue) -> None:
+        """Test trailing words and punctuation are classified."""
+        assert turn_cue(text) is cue
+
+
+class TestEndpointingController:
+    """Tests for learning thresholds and ending turns."""
+
+    def test_base_threshold_until_enough_pauses(self) -> None:
+        """Test the configured endpointing applies until pauses are learned."""
+        controller = EndpointingController(base_ms=300, min_pauses=3)
+        controller.on_speech(0.0)
+        assert run_silence(controller, 1.0, 1.0) == pytest.approx(1.3)
+        assert controller.metrics.turns == 1
+        assert controller.metrics.turn_end_sketch.count == 1
+
+    def test_learns_participant_pauses(self) -> None:
+        """Test the threshold follows the speaker's within-turn pauses."""
+        controller = EndpointingController(base_ms=300, min_pauses=3, margin_ms=50)
+        now = 0.0
+        for pause in (0.4, 0.5, 0.6):
+            controller.on_speech(now)
+            controller.on_silence(now + 0.01)
+            now += 0.01 + pause
+        controller.on_speech(now)
+        # p90 of (~400, ~500, ~600) plus the margin
+        assert controller.threshold_ms == pytest.approx(650, abs=5)
+        assert controller.metrics.pauses == 3
+        assert controller.metrics.turns == 0
+
+    def test_threshold_bounded(self) -> None:
+        """Test learned thresholds stay within the bounds."""
+        controller = EndpointingController(min_pauses=1, max_ms=800)
+        controller.on_speech(0.0)
+        controller.on_silence(0.0)
+        controller.on_speech(0.7)
+        controller.on_silence(0.7)
+        controller.on_speech(5.0)
+        assert controller.threshold_ms == 800
+
+    def test_transcript_cues_scale_threshold(self) -> None:
+        """Test hold cues wait longer and commit cues end the turn sooner."""
+        controller = EndpointingController(base_ms=300)
+        controller.on_transcript("I'd like to book a flight to")
+        assert controller.endpoint_ms() == pytest.approx(480)
+        controller.on_transcript("I'd like to book a flight.")
+        assert controller.endpoint_ms() == pytest.approx(150)
+
+        controller.on_speech(0.0)
+        assert run_silence(controller, 0.0, 1.0) == pytest.approx(0.15)
+        assert controller.metrics.committed_early == 1
+
+    def test_false_cut_counted_and_learned(self) -> None:
+        """Test speech resuming right after a turn end counts as a false cut."""
+        turns = []
+        controller = EndpointingController(base_ms=300, min_pauses=1, on_turn_end=turns.append)
+        controller.on_transcript("my number is")
+        controller.on_speech(0.0)
+        controller.on_transcript("my number is five")
+        ended = run_silence(controller, 0.0, 1.0)
+        controller.on_speech(ended + 0.2)
+
+        assert turns == ["my number is five"]
+        assert controller.metrics.false_cuts == 1
+        assert controller.metrics.false_cut_rate == 1.0
+        assert controller.threshold_ms == pytest.approx(550, abs=5)
+
+
+class TestPipelineEndpointing:
+    """Tests for endpointing in STTPipeline."""
+
+    def _pipeline(self, mock_stt_class: MagicMock, **config_kwargs) -> STTPipeline:
+        with patch.dict("os.environ", {"DEEPGRAM_API_KEY": "test_key"}):
+            config = STTConfig(deepgram_config=DeepgramConfig(), **config_kwargs)
+        return STTPipeline(config=config)
+
+    @patch("src.voice.stt_pipeline.deepgram.STT")
+    def test_endpointing_passed_to_deepgram(self, mock_stt_class: MagicMock) -> None:
+        """Test STTConfig.endpointing_ms configures the provider."""
+        self._pipeline(mock_stt_class, endpointing_ms=450)
+        assert mock_stt_class.call_args.kwargs["endpointing_ms"] == 450
+
+    @patch("src.voice.stt_pipeline.deepgram.STT")
+    def test_gate_pads_for_longest_endpointing(self, mock_stt_class: MagicMock) -> None:
+        """Test the gate passes enough silence for the largest adaptive threshold."""
+        fixed = self._pipeline(mock_stt_class, vad_padding_ms=200)
+        adaptive = self._pipeline(
+            mock_stt_class,
+            vad_padding_ms=200,
+            vad_enabled=True,
+            adaptive_endpointing=True,
+            endpointing_max_ms=900,
+        )
+        assert fixed.create_speech_gate().padding_after_ms == 500
+        assert adaptive.create_speech_gate().padding_after_ms == 1100
+
+    @patch("src.voice.stt_pipeline.deepgram.STT")
+    def test_small_changes_not_sent(self, mock_stt_class: MagicMock) -> None:
+        """Test the provider is reconfigured only for meaningful changes."""
+        pipeline = self._pipeline(mock_stt_class)
+        pipeline.set_endpointing(320)
+        pipeline._stt.update_options.assert_not_called()
+        pipeline.set_endpointing(520.4)
+        pipeline._stt.update_options.assert_called_once_with(endpointing_ms=520)
+
+    def test_adaptive_requires_gate(self) -> None:
+        """Test adaptive endpointing without the speech gate is rejected."""
+        with (
+            patch.dict("os.environ", {"DEEPGRAM_API_KEY": "test_key"}),
+            pytest.raises(ValueError, match="vad_enabled"),
+        ):
+            STTConfig(deepgram_config=DeepgramConfig(), adaptive_endpointing=True)
+
+    @patch("src.voice.stt_pipeline.deepgram.STT")
+    def test_adaptive_backstop_passed_to_deepgram(self, mock_stt_class: MagicMock) -> None:
+        """Test Deepgram only backstops the controller, at its longest (hold) wait."""
+        pipeline = self._pipeline(
+            mock_stt_class, adaptive_endpointing=True, vad_enabled=True, endpointing_ms=300
+        )
+        assert pipeline.endpointing.hold_ms == 480
+        assert mock_stt_class.call_args.kwargs["endpointing_ms"] == 480
+
+    @patch("src.voice.stt_pipeline.deepgram.STT")
+    async def test_stream_drives_controller(self, mock_stt_class: MagicMock) -> None:
+        """Test forwarded frames feed speech/silence and turn ends flush the stream."""
+        pipeline = self._pipeline(mock_stt_class, adaptive_endpointing=True, vad_enabled=True)
+        assert pipeline.endpointing.base_ms == 300
+        pipeline.endpointing = MagicMock(hold_ms=600)
+        pipeline.endpointing.on_silence.side_effect = [False, True, False]
+
+        loud = (np.ones(160) * 3000).astype(np.int16).tobytes()
+        quiet = bytes(320)
+        frames = [rtc.AudioFrame(pcm, 16000, 1, 160) for pcm in (loud, quiet, quiet, quiet)]
+
+        async def source():
+            for frame in frames:
+                yield frame
+
+        stream = SimpleNamespace(push_frame=lambda f: None, flush=MagicMock())
+        await pipeline.forward_audio(source(), stream)
+
+        assert pipeline.endpointing.on_speech.call_count == 1
+        assert pipeline.endpointing.on_silence.call_count == 3
+        stream.flush.assert_called_once()
+        # Reconfiguring now would reconnect the stream before the turn's final
+        pipeline._stt.update_options.assert_not_called()
+
+    @patch("src.voice.stt_pipeline.deepgram.STT")
+    async def test_cues_commit_and_threshold_pushed_between_turns(
+        self, mock_stt_class: MagicMock
+    ) -> None:
+        """Test transcript cues end the turn, and the threshold is pushed after its final."""
+        pipeline = self._pipeline(
+            mock_stt_class, adaptive_endpointing=True, vad_enabled=True, endpointing_ms=400
+        )
+        turn_end = MagicMock()
+        pipeline.set_turn_end_callback(turn_end)
+        controller = pipeline.endpointing
+        stream = SimpleNamespace(flush=MagicMock())
+
+        def frames(speaking: bool, start: float, end: float) -> None:
+            now = start
+            while now < end:
+                pipeline._update_endpointing(controller, speaking, now, stream)
+                now = round(now + 0.01, 3)
+
+        # Five 200ms pauses teach a 250ms threshold (backstop 400ms, was 640ms)
+        for n in range(5):
+            frames(True, n * 0.5, n * 0.5 + 0.3)
+            frames(False, n * 0.5 + 0.3, n * 0.5 + 0.5)
+        frames(True, 2.5, 2.8)
+        assert controller.threshold_ms == pytest.approx(250)
+
+        async def transcripts():
+            yield transcript("book it for friday.")
+            # The commit cue ends the turn after half the threshold
+            frames(False, 2.8, 2.92)
+            assert not stream.flush.called
+            frames(False, 2.92, 2.94)
+            stream.flush.assert_called_once()
+            turn_end.assert_called_once_with("book it for friday.")
+            pipeline._stt.update_options.assert_not_called()
+            yield transcript("book it for friday.", is_final=True)
+
+        _ = [r async for r in pipeline.process_audio_stream(transcripts())]
+
+        pipeline._stt.update_options.assert_called_once_with(endpointing_ms=400)
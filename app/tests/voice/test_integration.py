@@ -1,15 +1,14 @@
 """Integration tests for the voice processing pipeline."""
 
-import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import MagicMock, patch
 
+from src.voice.audio_quality import LatencyPhase, LatencyTracker
 from src.voice.config import (
-    LiveKitConfig,
     DeepgramConfig,
     ElevenLabsConfig,
+    LiveKitConfig,
     VoiceProcessingConfig,
 )
-from src.voice.audio_quality import LatencyTracker, LatencyPhase
 
 
 class TestVoicePipelineIntegration:
@@ -72,9 +71,7 @@ class TestEndToEndPipelineSimulation:
 
     @patch("src.voice.stt_pipeline.deepgram.STT")
     @patch("src.voice.tts_pipeline.elevenlabs.TTS")
-    def test_pipeline_initialization_order(
-        self, mock_tts: MagicMock, mock_stt: MagicMock
-    ) -> None:
+    def test_pipeline_initialization_order(self, mock_tts: MagicMock, mock_stt: MagicMock) -> None:
         """Test pipeline components initialize in correct order."""
         from src.voice.stt_pipeline import create_stt_pipeline
         from src.voice.tts_pipeline import create_tts_pipeline
@@ -119,6 +116,7 @@ class TestConfigurationValidation:
         # Verify all can be loaded
         for var in required_vars:
             import os
+
             assert var in os.environ, f"Missing required env var: {var}"
 
     def test_latency_targets_are_achievable(self) -> None:
@@ -0,0 +1,175 @@
+"""Tests for interim transcript coalescing."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from livekit.agents import stt
+
+from src.voice.config import DeepgramConfig
+from src.voice.interim_coalescer import InterimCoalescer, common_prefix_words
+from src.voice.stt_pipeline import STTConfig, STTPipeline, TranscriptionResult
+
+
+def result(text: str, is_final: bool = False) -> TranscriptionResult:
+    """Transcript with only text and finality set."""
+    return TranscriptionResult(
+        text=text, is_final=is_final, confidence=0.9, start_time=0.0, end_time=0.0, latency_ms=0.0
+    )
+
+
+class Clock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> Clock:
+    """Clock starting at zero."""
+    return Clock()
+
+
+class TestCommonPrefix:
+    """Tests for word-level prefix comparison."""
+
+    def test_shared_words_and_offset(self) -> None:
+        """Test whole words are compared and the offset points after them."""
+        assert common_prefix_words("book a flight", "book a fly to") == (2, 6)
+        assert common_prefix_words("", "hello") == (0, 0)
+        assert common_prefix_words("hello there", "hello there") == (2, 11)
+
+
+class TestInterimCoalescer:
+    """Tests for delta emission, rate limiting and stability stats."""
+
+    def test_delta_against_delivered_text(self, clock: Clock) -> None:
+        """Test each delivery carries the suffix changed since the last one."""
+        coalescer = InterimCoalescer(min_interval_ms=0, clock=clock)
+        first = coalescer.push(result("book a"))
+        second = coalescer.push(result("book a flight"))
+        revised = coalescer.push(result("book a fly to"))
+
+        assert (first.stable_length, first.delta) == (0, "book a")
+        assert (second.stable_length, second.delta) == (6, " flight")
+        assert (revised.stable_length, revised.delta) == (6, " fly to")
+        held = "book a flight"
+        assert held[: revised.stable_length] + revised.delta == revised.text
+
+    def test_repeats_dropped(self, clock: Clock) -> None:
+        """Test an interim repeating the delivered text is not delivered."""
+        coalescer = InterimCoalescer(min_interval_ms=0, clock=clock)
+        assert coalescer.push(result("hello")) is not None
+        assert coalescer.push(result("hello")) is None
+        assert coalescer.metrics.interims_coalesced == 1
+
+    def test_rate_limited_latest_wins(self, clock: Clock) -> None:
+        """Test interims inside the interval are held, keeping only the latest."""
+        coalescer = InterimCoalescer(min_interval_ms=100, clock=clock)
+        assert coalescer.push(result("I")) is not None
+        clock.now = 0.03
+        assert coalescer.push(result("I want")) is None
+        clock.now = 0.06
+        assert coalescer.push(result("I want to")) is None
+        assert coalescer.pop_due() is None
+        assert coalescer.due_in() == pytest.approx(0.04)
+
+        clock.now = 0.1
+        due = coalescer.pop_due()
+        assert due.text == "I want to"
+        assert due.delta == " want to"
+        assert not coalescer.holding
+
+    def test_final_immediate_and_starts_new_utterance(self, clock: Clock) -> None:
+        """Test a final is delivered at once, discarding the held interim."""
+        coalescer = InterimCoalescer(min_interval_ms=100, clock=clock)
+        coalescer.push(result("what time"))
+        clock.now = 0.01
+        coalescer.push(result("what time is"))
+        final = coalescer.push(result("what time is it", is_final=True))
+
+        assert final.delta == " is it"
+        assert not coalescer.holding
+        assert coalescer.push(result("thanks")).stable_length == 0
+
+    def test_stability_stats(self, clock: Clock) -> None:
+        """Test revisions are counted and settled finals time their stability."""
+        coalescer = InterimCoalescer(min_interval_ms=0, clock=clock)
+        coalescer.push(result("I want to fly"))
+        coalescer.push(result("I want to fly to"))
+        coalescer.push(result("I want two flights"))
+        clock.now = 0.25
+        assert coalescer.stable_for_ms() == pytest.approx(250)
+        coalescer.push(result("I want two flights", is_final=True))
+        coalescer.push(result("sure"))
+        coalescer.push(result("no", is_final=True))
+
+        metrics = coalescer.metrics
+        assert metrics.interims_received == 4
+        assert metrics.interim_revisions == 1
+        assert metrics.revised_words == 3
+        assert metrics.revision_rate == 0.25
+        assert metrics.final_revisions == 1
+        assert metrics.final_revision_rate == 0.5
+        assert metrics.final_stable_sketch.count == 1
+        assert metrics.final_stable_sketch.quantile(0.5) == pytest.approx(250, rel=0.05)
+
+
+def event(text: str, is_final: bool = False) -> SimpleNamespace:
+    """Deepgram speech event stand-in."""
+    kinds = stt.SpeechEventType
+    return SimpleNamespace(
+        type=kinds.FINAL_TRANSCRIPT if is_final else kinds.INTERIM_TRANSCRIPT,
+        alternatives=[SimpleNamespace(text=text, confidence=0.9, start_time=0.0, end_time=0.0)],
+    )
+
+
+async def speech_stream(events: list):
+    """Yield events, sleeping for any float in the list."""
+    for item in events:
+        if isinstance(item, float):
+            await asyncio.sleep(item)
+        else:
+            yield item
+
+
+class TestPipelineCoalescing:
+    """Tests for coalescing in STTPipeline.process_audio_stream."""
+
+    @pytest.fixture
+    def pipeline(self) -> STTPipeline:
+        """Create a pipeline delivering at most one interim per 50ms."""
+        with patch.dict("os.environ", {"DEEPGRAM_API_KEY": "test_key"}):
+            config = STTConfig(deepgram_config=DeepgramConfig(), interim_interval_ms=50)
+        with patch("src.voice.stt_pipeline.deepgram.STT"):
+            return STTPipeline(config=config)
+
+    async def test_stream_coalesced(self, pipeline: STTPipeline) -> None:
+        """Test bursts of interims are coalesced, held ones flushed, finals kept."""
+        callback = MagicMock()
+        pipeline.set_transcription_callback(callback)
+        events = [
+            event("can"),
+            event("can you"),
+            event("can you"),
+            event("can you book"),
+            0.1,  # the held "can you book" is delivered during this pause
+            event("can you book it", is_final=True),
+        ]
+
+        delivered = [r async for r in pipeline.process_audio_stream(speech_stream(events))]
+
+        assert [(r.text, r.delta) for r in delivered] == [
+            ("can", "can"),
+            ("can you book", " you book"),
+            ("can you book it", " it"),
+        ]
+        assert callback.call_count == 3
+        assert pipeline.metrics.total_transcriptions == 3
+        assert pipeline.metrics.successful_transcriptions == 1
+        assert pipeline.metrics.stability.interims_coalesced == 2
@@ -0,0 +1,40 @@
+"""Tests for LiveKit helpers."""
+
+import asyncio
+from types import SimpleNamespace
+
+from livekit import rtc
+from structlog.testing import capture_logs
+
+from src.voice.livekit_client import assistant_audio_source
+
+
+def _assistant(source: object) -> SimpleNamespace:
+    """VoiceAssistant stand-in with its track published."""
+    published = asyncio.get_running_loop().create_future()
+    published.set_result(None)
+    return SimpleNamespace(
+        _track_published_fut=published,
+        _agent_output=SimpleNamespace(playout=SimpleNamespace(_audio_source=source)),
+    )
+
+
+class TestAssistantAudioSource:
+    """Tests for reaching the assistant's audio source."""
+
+    async def test_returns_published_source(self) -> None:
+        """Test the playout's source is returned once the track is published."""
+        source = rtc.AudioSource(24000, 1)
+        assert await assistant_audio_source(_assistant(source)) is source
+
+    async def test_missing_attributes_fall_back(self) -> None:
+        """Test renamed private attributes are logged and give None, not an error."""
+        with capture_logs() as logs:
+            assert await assistant_audio_source(SimpleNamespace()) is None
+            assert await assistant_audio_source(_assistant(source=None)) is None
+
+        assert [log["missing"] for log in logs] == [
+            "_track_published_fut",
+            "_agent_output.playout._audio_source",
+        ]
+        assert {log["event"] for log in logs} == {"assistant_audio_source_unavailable"}
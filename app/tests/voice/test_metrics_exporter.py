@@ -0,0 +1,170 @@
+"""Tests for the OpenMetrics exporter."""
+
+import socket
+import urllib.request
+
+import pytest
+
+from src.voice.audio_quality import AudioQualityMetrics, LatencyTracker, PipelineLatency
+from src.voice.livekit_client import ConnectionMetrics
+from src.voice.metrics_exporter import (
+    CONTENT_TYPE,
+    MetricsRegistry,
+    MetricsServer,
+    MetricsSource,
+    start_metrics_server,
+)
+from src.voice.quantile_sketch import QuantileSketch
+from src.voice.stt_pipeline import STTMetrics
+from src.voice.tts_pipeline import TTSMetrics
+
+
+def _sample_lines(text: str, prefix: str) -> list[str]:
+    return [line for line in text.splitlines() if line.startswith(prefix)]
+
+
+@pytest.fixture
+def populated_source() -> MetricsSource:
+    """A session with every metrics object populated."""
+    stt = STTMetrics(total_transcriptions=10, failed_transcriptions=1)
+    for latency in (120.0, 250.0, 900.0):
+        stt.latency_sketch.add(latency)
+    tts = TTSMetrics(total_syntheses=4, failed_syntheses=0, total_characters_processed=321)
+    tts.latency_sketch.add(400.0)
+
+    tracker = LatencyTracker()
+    tracker.record(
+        PipelineLatency(
+            stt_latency_ms=300.0,
+            processing_latency_ms=100.0,
+            tts_latency_ms=400.0,
+            total_latency_ms=800.0,
+        )
+    )
+    quality = AudioQualityMetrics()
+    quality.record_quality_score(7.0)
+
+    return MetricsSource(
+        room="room-a",
+        stt_model="nova-2",
+        tts_model="eleven_turbo_v2",
+        stt_metrics=stt,
+        tts_metrics=tts,
+        connection_metrics=ConnectionMetrics(is_connected=True, reconnect_count=2),
+        latency_tracker=tracker,
+        quality_metrics=quality,
+    )
+
+
+class TestSketchHistogram:
+    """Tests for sketch-to-histogram conversion."""
+
+    def test_cumulative_counts(self) -> None:
+        """Test cumulative counts at bucket bounds."""
+        sketch = QuantileSketch()
+        for v in (10.0, 150.0, 150.0, 700.0):
+            sketch.add(v)
+        assert sketch.cumulative_counts([100.0, 500.0, 1000.0]) == [1, 3, 4]
+
+
+class TestMetricsRegistry:
+    """Tests for rendering registered sources."""
+
+    def test_empty_registry_renders_eof(self) -> None:
+        """Test an empty registry still renders valid output."""
+        text = MetricsRegistry().render()
+        assert text.endswith("# EOF\n")
+        assert "# TYPE launchpad_stt_transcriptions counter" in text
+
+    def test_counters_and_gauges(self, populated_source: MetricsSource) -> None:
+        """Test counters and gauges carry room and model labels."""
+        registry = MetricsRegistry()
+        registry.register(populated_source)
+        text = registry.render()
+
+        assert 'launchpad_stt_transcriptions_total{room="room-a",model="nova-2"} 10' in text
+        assert 'launchpad_tts_characters_total{room="room-a",model="eleven_turbo_v2"} 321' in text
+        assert 'launchpad_livekit_reconnects_total{room="room-a"} 2' in text
+        assert 'launchpad_livekit_connected{room="room-a"} 1' in text
+        assert 'launchpad_audio_quality_score{room="room-a"} 7.0' in text
+
+    def test_histograms(self, populated_source: MetricsSource) -> None:
+        """Test histogram buckets are cumulative and end with +Inf."""
+        registry = MetricsRegistry()
+        registry.register(populated_source)
+        text = registry.render()
+
+        buckets = _sample_lines(text, "launchpad_stt_latency_ms_bucket")
+        counts = [float(line.rsplit(" ", 1)[1]) for line in buckets]
+        assert counts == sorted(counts)
+        assert buckets[-1].endswith('le="+Inf"} 3')
+        assert 'launchpad_pipeline_latency_ms_count{room="room-a",phase="total"} 1' in text
+
+    def test_throughput_per_model_and_voice(self) -> None:
+        """Test throughput is exported per STT model and TTS voice."""
+        stt = STTMetrics()
+        stt.throughput.record(
+            "nova-2", requests=1, audio_ms=2000, processing_ms=300, ttfb_ms=300, bytes_sent=64000
+        )
+        tts = TTSMetrics()
+        tts.throughput.record("turbo/rachel", requests=1, audio_ms=1500)
+        registry = MetricsRegistry()
+        registry.register(MetricsSource(room="room-a", stt_metrics=stt, tts_metrics=tts))
+        text = registry.render()
+
+        labels = 'room="room-a",model="nova-2"'
+        assert f"launchpad_stt_audio_seconds_total{{{labels}}} 2.0" in text
+        assert f"launchpad_stt_processing_seconds_total{{{labels}}} 0.3" in text
+        assert f"launchpad_stt_bytes_sent_total{{{labels}}} 64000" in text
+        assert f"launchpad_stt_ttfb_ms_count{{{labels}}} 1" in text
+        assert 'launchpad_tts_audio_seconds_total{room="room-a",voice="turbo/rachel"} 1.5' in text
+
+    def test_unregister(self, populated_source: MetricsSource) -> None:
+        """Test unregistered sources are no longer exported."""
+        registry = MetricsRegistry()
+        registry.register(populated_source)
+        registry.unregister(populated_source)
+        assert registry.sources == ()
+        assert "room-a" not in registry.render()
+
+    def test_label_values_are_escaped(self) -> None:
+        """Test quotes in label values are escaped."""
+        registry = MetricsRegistry()
+        registry.register(MetricsSource(room='a"b', connection_metrics=ConnectionMetrics()))
+        assert 'room="a\\"b"' in registry.render()
+
+
+class TestMetricsServer:
+    """Tests for the HTTP endpoint."""
+
+    def test_serves_metrics(self, populated_source: MetricsSource) -> None:
+        """Test /metrics is served from the background thread."""
+        registry = MetricsRegistry()
+        registry.register(populated_source)
+        server = MetricsServer(registry, host="127.0.0.1", port=0)
+        server.start()
+        try:
+            url = f"http://127.0.0.1:{server.port}/metrics"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                body = response.read().decode()
+                assert response.headers["Content-Type"] == CONTENT_TYPE
+            assert "launchpad_stt_transcriptions_total" in body
+        finally:
+            server.stop()
+
+    def test_each_process_binds_its_own_port(self) -> None:
+        """Test a taken port moves the server to the next one in the range."""
+        with socket.socket() as taken:
+            taken.bind(("127.0.0.1", 0))
+            taken.listen()
+            port = taken.getsockname()[1]
+
+            assert start_metrics_server(port, host="127.0.0.1", registry=MetricsRegistry()) is None
+            server = start_metrics_server(
+                port, host="127.0.0.1", registry=MetricsRegistry(), port_range=2
+            )
+            assert server is not None
+            try:
+                assert server.port == port + 1
+            finally:
+                server.stop()
@@ -11,20 +11,21 @@ Note: Tests marked with @pytest.mark.integration require real API credentials
 and are skipped in CI. Run with `pytest -m integration` to execute.
 """
 
-import pytest
-import asyncio
 import os
 from unittest.mock import AsyncMock, MagicMock, patch
 
-from src.voice.config import VoiceProcessingConfig
+import pytest
+from livekit import rtc
+
 from src.voice.audio_quality import (
-    LatencyTracker,
+    AudioQualityMetrics,
     LatencyPhase,
+    LatencyTracker,
     PipelineLatency,
-    AudioQualityMetrics,
 )
-from src.voice.stt_pipeline import STTPipeline, STTConfig, create_stt_pipeline, retry_async
-from src.voice.tts_pipeline import TTSPipeline, TTSConfig, create_tts_pipeline
+from src.voice.config import VoiceProcessingConfig
+from src.voice.stt_pipeline import create_stt_pipeline, retry_async
+from src.voice.tts_pipeline import create_tts_pipeline
 
 
 class TestSTTAccuracyValidation:
@@ -89,11 +90,11 @@ class TestAudioQualityValidation:
         metrics = AudioQualityMetrics()
         metrics.record_quality_score(-5.0)  # Should clamp to 0
         metrics.record_quality_score(15.0)  # Should clamp to 10
-        metrics.record_quality_score(6.0)   # Normal score
+        metrics.record_quality_score(6.0)  # Normal score
 
-        assert metrics.quality_scores[0] == 0.0
-        assert metrics.quality_scores[1] == 10.0
-        assert metrics.quality_scores[2] == 6.0
+        assert metrics.recent_scores[0] == 0.0
+        assert metrics.recent_scores[1] == 10.0
+        assert metrics.recent_scores[2] == 6.0
 
 
 class TestLatencyValidation:
@@ -237,6 +238,7 @@ class TestRetryLogicValidation:
     @pytest.mark.asyncio
     async def test_retry_async_exhausts_retries(self) -> None:
         """Test retry_async raises after exhausting retries."""
+
         async def always_fail():
             raise ConnectionError("Permanent failure")
 
@@ -253,9 +255,7 @@ class TestAsyncMethodCoverage:
 
     @patch("src.voice.stt_pipeline.deepgram.STT")
     @pytest.mark.asyncio
-    async def test_stt_pipeline_transcribe_audio_mocked(
-        self, mock_stt_class: MagicMock
-    ) -> None:
+    async def test_stt_pipeline_transcribe_audio_mocked(self, mock_stt_class: MagicMock) -> None:
         """Test transcribe_audio async method with mocked STT."""
         # Setup mock
         mock_stt_instance = MagicMock()
@@ -274,18 +274,14 @@ class TestAsyncMethodCoverage:
 
     @patch("src.voice.tts_pipeline.elevenlabs.TTS")
     @pytest.mark.asyncio
-    async def test_tts_pipeline_synthesize_mocked(
-        self, mock_tts_class: MagicMock
-    ) -> None:
+    async def test_tts_pipeline_synthesize_mocked(self, mock_tts_class: MagicMock) -> None:
         """Test synthesize async method with mocked TTS."""
         # Setup mock with streaming response
         mock_tts_instance = MagicMock()
 
         async def mock_stream(text):
             chunk = MagicMock()
-            chunk.frame = MagicMock()
-            chunk.frame.data = MagicMock()
-            chunk.frame.data.tobytes.return_value = b"audio_data"
+            chunk.frame = rtc.AudioFrame(b"audio_data", 24000, 1, 5)
             yield chunk
 
         mock_tts_instance.synthesize = mock_stream
@@ -301,18 +297,14 @@ class TestAsyncMethodCoverage:
 
     @patch("src.voice.tts_pipeline.elevenlabs.TTS")
     @pytest.mark.asyncio
-    async def test_tts_pipeline_synthesize_stream_mocked(
-        self, mock_tts_class: MagicMock
-    ) -> None:
+    async def test_tts_pipeline_synthesize_stream_mocked(self, mock_tts_class: MagicMock) -> None:
         """Test synthesize_stream async method with mocked TTS."""
         mock_tts_instance = MagicMock()
 
         async def mock_stream(text):
             for i in range(3):
                 chunk = MagicMock()
-                chunk.frame = MagicMock()
-                chunk.frame.data = MagicMock()
-                chunk.frame.data.tobytes.return_value = f"chunk_{i}".encode()
+                chunk.frame = rtc.AudioFrame(f"chunk{i}".encode(), 24000, 1, 3)
                 yield chunk
 
         mock_tts_instance.synthesize = mock_stream
@@ -0,0 +1,96 @@
+"""Tests for prewarmed static prompts."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from livekit import rtc
+
+from src.voice.config import DEFAULT_STATIC_PROMPTS, ElevenLabsConfig, VoiceProcessingConfig
+from src.voice.prompts import PromptLibrary, pcm_to_frames, prepare_prompts, prewarm_prompts
+from src.voice.resilience import CircuitBreaker
+from src.voice.tts_pipeline import TTSConfig, TTSPipeline
+
+
+@pytest.fixture
+def pipeline() -> TTSPipeline:
+    """TTS pipeline whose provider fails on text containing 'fail'."""
+
+    async def synthesize(text):
+        if "fail" in text:
+            raise ConnectionError("provider down")
+        chunk = MagicMock()
+        # 25ms of 24kHz 16-bit mono audio
+        chunk.frame = rtc.AudioFrame(b"\x01\x00" * 600, 24000, 1, 600)
+        yield chunk
+
+    with patch("src.voice.tts_pipeline.elevenlabs.TTS"):
+        pipeline = TTSPipeline(config=TTSConfig(elevenlabs_config=ElevenLabsConfig()))
+    pipeline._tts = MagicMock(synthesize=synthesize)
+    pipeline.resilience.breaker = CircuitBreaker(provider="elevenlabs")
+    return pipeline
+
+
+class TestPcmToFrames:
+    """Tests for framing PCM."""
+
+    def test_fixed_size_frames_with_padding(self) -> None:
+        """Test audio is split into equal frames and the tail is zero padded."""
+        frames = pcm_to_frames(b"\x01\x00" * 600, sample_rate=24000, frame_ms=20)
+        assert len(frames) == 2
+        assert all(frame.samples_per_channel == 480 for frame in frames)
+        assert frames[1].data.tobytes()[240:] == bytes(720)
+
+    def test_cached_views(self) -> None:
+        """Test audio served from the cache as a memoryview is framed the same way."""
+        frames = pcm_to_frames(memoryview(b"\x01\x00" * 600), sample_rate=24000, frame_ms=20)
+        assert [frame.data.tobytes() for frame in frames] == [
+            frame.data.tobytes()
+            for frame in pcm_to_frames(b"\x01\x00" * 600, sample_rate=24000, frame_ms=20)
+        ]
+
+
+class TestPreparePrompts:
+    """Tests for prewarming prompts."""
+
+    async def test_prompts_become_frames(self, pipeline) -> None:
+        """Test each prompt is held as ready-to-publish frames."""
+        library = await prepare_prompts(pipeline, {"greeting": "Hello", "one_moment": "Hold on"})
+
+        greeting = library.get("greeting")
+        assert greeting is not None
+        assert greeting.duration_ms == 40.0
+        assert library.memory_bytes == 2 * 1920
+        assert library.report.prompt_count == 2
+        assert library.report.audio_bytes == library.memory_bytes
+        assert library.report.duration_ms > 0
+
+    async def test_failed_prompt_skipped(self, pipeline) -> None:
+        """Test a prompt that fails to synthesize does not block the others."""
+        pipeline.resilience.max_retries = 0
+        library = await prepare_prompts(pipeline, {"greeting": "Hello", "bad": "fail"})
+        assert library.get("bad") is None
+        assert library.get("greeting") is not None
+        assert library.report.failed == ["bad"]
+
+    async def test_play_publishes_frames(self, pipeline) -> None:
+        """Test playing a prompt captures every frame in order."""
+        library = await prepare_prompts(pipeline, {"greeting": "Hello"})
+        source = MagicMock(capture_frame=AsyncMock())
+
+        assert await library.play("greeting", source) is True
+        assert source.capture_frame.await_count == 2
+        assert await library.play("missing", source) is False
+
+    def test_prewarm_never_raises(self) -> None:
+        """Test the sync prewarm hook degrades to an empty library."""
+        broken = MagicMock(synthesize=MagicMock(side_effect=RuntimeError("no loop")))
+        library = prewarm_prompts(broken, {"greeting": "Hello"})
+        assert isinstance(library, PromptLibrary)
+        assert library.prompts == {}
+        assert library.report.failed == ["greeting"]
+
+    def test_default_prompt_set(self) -> None:
+        """Test the configured prompt set covers the static prompts."""
+        prompts = VoiceProcessingConfig().static_prompts
+        assert prompts == DEFAULT_STATIC_PROMPTS
+        assert {"greeting", "fallback", "one_moment", "error_apology"} <= set(prompts)
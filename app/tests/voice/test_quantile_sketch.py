@@ -0,0 +1,174 @@
+"""Tests for streaming quantile sketches."""
+
+import random
+
+import pytest
+
+from src.voice.audio_quality import LatencyTracker, PipelineLatency
+from src.voice.quantile_sketch import (
+    QuantileSketch,
+    SlidingWindowSketch,
+    merge_sketches,
+)
+
+
+def _exact_percentile(values: list[float], q: float) -> float:
+    """Lower-rank percentile matching the sketch's rank convention."""
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+class TestQuantileSketch:
+    """Tests for the log-bucketed sketch."""
+
+    def test_empty_sketch(self) -> None:
+        """Test an empty sketch reports zeros."""
+        sketch = QuantileSketch()
+        assert sketch.quantile(0.5) == 0.0
+        assert sketch.mean == 0.0
+
+    def test_relative_accuracy(self) -> None:
+        """Test estimates stay within the configured relative error."""
+        rng = random.Random(42)
+        values = [rng.lognormvariate(6.0, 0.8) for _ in range(20000)]
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for v in values:
+            sketch.add(v)
+
+        for q in (0.5, 0.95, 0.99):
+            exact = _exact_percentile(values, q)
+            assert sketch.quantile(q) == pytest.approx(exact, rel=0.02)
+
+    def test_memory_is_bounded(self) -> None:
+        """Test the bucket count never exceeds max_buckets."""
+        sketch = QuantileSketch(max_buckets=64)
+        for i in range(1, 100000, 7):
+            sketch.add(float(i))
+        assert sketch.bucket_count <= 65
+
+    def test_collapse_keeps_lowest_buckets_folded(self) -> None:
+        """Test collapsing folds the lowest buckets and keeps the high tail exact."""
+        sketch = QuantileSketch(max_buckets=8)
+        for value in (1000.0, 1.0, 500.0, 2.0, 250.0, 4.0, 125.0, 8.0, 64.0, 16.0):
+            sketch.add(value)
+        assert sketch.bucket_count == 8
+        assert sketch.count == 10
+        assert sketch.quantile(1.0) == 1000.0
+        assert sketch.quantile(0.2) == pytest.approx(4.0, rel=0.01)  # 1 and 2 folded into 4
+        assert sketch.copy().quantile(0.9) == sketch.quantile(0.9)
+
+    @pytest.mark.parametrize("value", [float("nan"), float("inf"), float("-inf")])
+    def test_non_finite_is_ignored(self, value: float) -> None:
+        """Test NaN and infinite samples are dropped without corrupting the sketch."""
+        sketch = QuantileSketch()
+        sketch.add(10.0)
+        sketch.add(value)
+        assert sketch.count == 1
+        assert (sketch.min, sketch.max, sketch.total) == (10.0, 10.0, 10.0)
+        assert sketch.quantile(0.5) == pytest.approx(10.0, rel=0.01)
+
+    def test_small_values_use_zero_bucket(self) -> None:
+        """Test values at or below min_value do not create buckets."""
+        sketch = QuantileSketch()
+        sketch.add(0.0)
+        sketch.add(-1.0)
+        assert sketch.bucket_count == 1
+        assert sketch.quantile(0.5) == 0.0
+
+    def test_merge_is_exact(self) -> None:
+        """Test merging equals a single sketch fed every sample."""
+        rng = random.Random(7)
+        values = [rng.uniform(1, 3000) for _ in range(5000)]
+        combined = QuantileSketch()
+        parts = [QuantileSketch() for _ in range(4)]
+        for i, v in enumerate(values):
+            combined.add(v)
+            parts[i % 4].add(v)
+
+        merged = merge_sketches(parts)
+        assert merged.count == combined.count
+        for q in (0.1, 0.5, 0.9, 0.99):
+            assert merged.quantile(q) == combined.quantile(q)
+
+    def test_merge_rejects_different_parameters(self) -> None:
+        """Test sketches with different accuracy cannot merge."""
+        with pytest.raises(ValueError, match="different parameters"):
+            QuantileSketch(relative_accuracy=0.01).merge(QuantileSketch(relative_accuracy=0.02))
+        with pytest.raises(ValueError, match="different parameters"):
+            QuantileSketch(max_buckets=64).merge(QuantileSketch(max_buckets=128))
+
+    def test_serialization_roundtrip(self) -> None:
+        """Test to_dict/from_dict preserves quantiles."""
+        sketch = QuantileSketch()
+        for v in range(1, 500):
+            sketch.add(float(v))
+        restored = QuantileSketch.from_dict(sketch.to_dict())
+        assert restored.count == sketch.count
+        assert restored.quantile(0.95) == sketch.quantile(0.95)
+
+
+class TestSlidingWindowSketch:
+    """Tests for the time-windowed sketch."""
+
+    def test_old_slots_expire(self) -> None:
+        """Test samples outside the window are excluded."""
+        window = SlidingWindowSketch(slot_seconds=1.0, num_slots=10)
+        window.add(1000.0, now=0.5)
+        window.add(10.0, now=20.5)
+        merged = window.merged(now=20.5)
+        assert merged.count == 1
+        assert merged.max == 10.0
+
+    def test_partial_window(self) -> None:
+        """Test a window shorter than the ring only merges recent slots."""
+        window = SlidingWindowSketch(slot_seconds=1.0, num_slots=10)
+        for t in range(10):
+            window.add(float(t + 1), now=t + 0.5)
+        assert window.merged(window_seconds=3.0, now=9.5).count == 3
+        assert window.merged(now=9.5).count == 10
+
+
+class TestLatencyTrackerPercentiles:
+    """Tests for percentile queries on LatencyTracker."""
+
+    def _record(self, tracker: LatencyTracker, total_ms: float) -> None:
+        tracker.record(
+            PipelineLatency(
+                stt_latency_ms=total_ms / 4,
+                processing_latency_ms=total_ms / 4,
+                tts_latency_ms=total_ms / 4,
+                total_latency_ms=total_ms,
+            )
+        )
+
+    def test_percentiles_cover_all_time(self) -> None:
+        """Test percentiles are not limited to the rolling window."""
+        tracker = LatencyTracker(window_size=10)
+        for v in range(1, 1001):
+            self._record(tracker, float(v))
+
+        assert tracker.get_percentile_latency(99.0) == pytest.approx(990.0, rel=0.02)
+        assert tracker.get_percentile_latency(50.0, phase="stt") == pytest.approx(125.0, rel=0.02)
+
+    def test_windowed_percentiles(self) -> None:
+        """Test sliding-window percentiles include recent samples."""
+        tracker = LatencyTracker()
+        self._record(tracker, 800.0)
+        result = tracker.get_percentiles(window_seconds=60.0)
+        assert result["p50"] == pytest.approx(800.0, rel=0.02)
+        assert set(result) == {"p50", "p95", "p99"}
+
+    def test_unknown_phase_raises(self) -> None:
+        """Test querying an unknown phase raises."""
+        with pytest.raises(ValueError, match="Unknown latency phase"):
+            LatencyTracker().get_percentile_latency(phase="llm")
+
+    def test_merge_across_workers(self) -> None:
+        """Test trackers from two workers combine their sketches."""
+        worker_a, worker_b = LatencyTracker(), LatencyTracker()
+        self._record(worker_a, 100.0)
+        self._record(worker_b, 1900.0)
+
+        worker_a.merge_sketches({"total": worker_b.get_sketch("total")})
+        assert worker_a.get_sketch("total").count == 2
+        assert worker_a.get_percentile_latency(100.0) == pytest.approx(1900.0, rel=0.02)
@@ -0,0 +1,295 @@
+"""Tests for the shared resilience layer."""
+
+import asyncio
+import random
+
+import pytest
+from livekit.agents import APIConnectionError, APIStatusError
+
+from src.voice.clock import monotonic
+from src.voice.deadline import DeadlineExceededError, TurnDeadline
+from src.voice.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    ProviderHealth,
+    ResiliencePolicy,
+    RetryBudget,
+    decorrelated_jitter,
+    get_circuit_breaker,
+    is_provider_failure,
+)
+
+
+def _policy(**kwargs) -> ResiliencePolicy:
+    """Build a policy with its own provider health and fast backoff."""
+    kwargs.setdefault("health", ProviderHealth(breaker=CircuitBreaker(provider="test")))
+    kwargs.setdefault("base_delay", 0.001)
+    kwargs.setdefault("max_delay", 0.005)
+    return ResiliencePolicy(provider="test", **kwargs)
+
+
+class TestDecorrelatedJitter:
+    """Tests for the backoff delay calculation."""
+
+    def test_delay_bounds(self) -> None:
+        """Test delays stay between base and the cap."""
+        rng = random.Random(1)
+        delay = 0.1
+        for _ in range(100):
+            delay = decorrelated_jitter(delay, 0.1, 2.0, rng)
+            assert 0.1 <= delay <= 2.0
+
+
+class TestCircuitBreaker:
+    """Tests for the per-provider circuit breaker."""
+
+    def test_opens_after_threshold(self) -> None:
+        """Test consecutive failures open the circuit."""
+        breaker = CircuitBreaker(provider="p", failure_threshold=3)
+        for _ in range(3):
+            breaker.record_failure(now=0.0)
+        assert breaker.state == CircuitState.OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call(now=1.0)
+
+    def test_half_open_single_probe(self) -> None:
+        """Test one probe is allowed after the recovery timeout."""
+        breaker = CircuitBreaker(provider="p", failure_threshold=1, recovery_timeout_s=5)
+        breaker.record_failure(now=0.0)
+        assert breaker.allow_request(now=6.0) is True
+        assert breaker.state == CircuitState.HALF_OPEN
+        assert breaker.allow_request(now=6.1) is False
+
+        breaker.record_success()
+        assert breaker.state == CircuitState.CLOSED
+
+    def test_failed_probe_reopens(self) -> None:
+        """Test a failing probe reopens the circuit."""
+        breaker = CircuitBreaker(provider="p", failure_threshold=1, recovery_timeout_s=5)
+        breaker.record_failure(now=0.0)
+        breaker.allow_request(now=6.0)
+        breaker.record_failure(now=6.0)
+        assert breaker.state == CircuitState.OPEN
+        assert breaker.times_opened == 2
+
+    def test_stale_probe_expires(self) -> None:
+        """Test a probe never handed back stops blocking after the recovery timeout."""
+        breaker = CircuitBreaker(provider="p", failure_threshold=1, recovery_timeout_s=5)
+        breaker.record_failure(now=0.0)
+        assert breaker.allow_request(now=6.0) is True
+        assert breaker.allow_request(now=10.0) is False
+        assert breaker.allow_request(now=11.0) is True
+        assert breaker.state == CircuitState.HALF_OPEN
+
+    def test_breakers_shared_per_provider(self) -> None:
+        """Test the registry returns one breaker per provider."""
+        assert get_circuit_breaker("deepgram") is get_circuit_breaker("deepgram")
+        assert get_circuit_breaker("deepgram") is not get_circuit_breaker("elevenlabs")
+
+    def test_policies_share_provider_health(self) -> None:
+        """Test policies for one provider share its breaker, budget and latency."""
+        first = ResiliencePolicy(provider="deepgram")
+        second = ResiliencePolicy(provider="deepgram")
+        assert first.breaker is second.breaker is get_circuit_breaker("deepgram")
+        assert first.budget is second.budget
+        assert first.latency_sketch is second.latency_sketch
+        assert first.stats is not second.stats
+
+    def test_only_provider_failures_count(self) -> None:
+        """Test caller and validation errors are not held against the provider."""
+        assert is_provider_failure(ConnectionError("reset"))
+        assert is_provider_failure(TimeoutError())
+        assert is_provider_failure(APIConnectionError())
+        assert is_provider_failure(APIStatusError("busy", status_code=503))
+        assert is_provider_failure(APIStatusError("slow down", status_code=429))
+        assert not is_provider_failure(APIStatusError("bad voice", status_code=400))
+        assert not is_provider_failure(ValueError("empty text"))
+        assert not is_provider_failure(DeadlineExceededError("tts", 500))
+
+
+class TestRetryBudget:
+    """Tests for the retry budget."""
+
+    def test_budget_limits_retries(self) -> None:
+        """Test retries are capped by deposits from requests."""
+        budget = RetryBudget(ratio=0.5, min_tokens=1)
+        assert budget.try_spend() is True
+        assert budget.try_spend() is False
+        budget.record_request()
+        budget.record_request()
+        assert budget.try_spend() is True
+        assert budget.exhausted == 1
+
+
+class TestResiliencePolicy:
+    """Tests for hedged, retried provider calls."""
+
+    async def test_retries_transient_failures(self) -> None:
+        """Test a transient failure is retried."""
+        calls = 0
+
+        async def flaky():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise ConnectionError("transient")
+            return "ok"
+
+        policy = _policy(hedge=False)
+        assert await policy.call(flaky) == "ok"
+        assert policy.stats.retries == 1
+
+    async def test_raises_after_retries(self) -> None:
+        """Test the last error surfaces once retries are exhausted."""
+
+        async def broken():
+            raise ConnectionError("down")
+
+        with pytest.raises(ConnectionError, match="down"):
+            await _policy(hedge=False).call(broken, max_retries=2)
+
+    async def test_hedge_wins_over_slow_primary(self) -> None:
+        """Test a slow request is hedged and the faster hedge is used."""
+        calls = 0
+
+        async def first_slow():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(1.0 if calls == 1 else 0.01)
+            return calls
+
+        policy = _policy(default_hedge_delay=0.02)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        assert await policy.call(first_slow) == 2
+        assert loop.time() - start < 0.5
+        assert policy.stats.hedges == 1
+        assert policy.stats.hedge_wins == 1
+
+    async def test_losing_result_discarded(self) -> None:
+        """Test a hedge that also succeeded in the same wait has its result discarded."""
+        discarded = []
+        release = asyncio.Event()
+
+        async def provider():
+            await release.wait()
+            return bytearray(b"audio")
+
+        policy = _policy(default_hedge_delay=0.01)
+        call = asyncio.ensure_future(policy.call(provider, discard=discarded.append))
+        await asyncio.sleep(0.05)
+        release.set()  # both requests finish in the same wait
+        result = await call
+
+        assert policy.stats.hedges == 1
+        assert discarded == [bytearray(b"audio")]
+        assert discarded[0] is not result
+
+    async def test_hedge_delay_tracks_p95(self) -> None:
+        """Test the hedge delay follows observed latency once warmed up."""
+        policy = _policy(hedge_min_samples=5)
+        assert policy.hedge_delay == policy.default_hedge_delay
+        for _ in range(10):
+            policy.latency_sketch.add(100.0)
+        assert policy.hedge_delay == pytest.approx(0.1, rel=0.02)
+
+    async def test_no_hedge_without_budget(self) -> None:
+        """Test hedging stops when the retry budget is spent."""
+
+        async def slow():
+            await asyncio.sleep(0.05)
+            return "ok"
+
+        policy = _policy(
+            default_hedge_delay=0.01,
+            health=ProviderHealth(
+                breaker=CircuitBreaker(provider="t"), budget=RetryBudget(min_tokens=0)
+            ),
+        )
+        assert await policy.call(slow) == "ok"
+        assert policy.stats.hedges == 0
+
+    async def test_open_circuit_fails_fast(self) -> None:
+        """Test calls fail fast once the provider's circuit opens."""
+        calls = 0
+
+        async def broken():
+            nonlocal calls
+            calls += 1
+            raise ConnectionError("down")
+
+        policy = _policy(
+            hedge=False,
+            health=ProviderHealth(breaker=CircuitBreaker(provider="t", failure_threshold=2)),
+        )
+        with pytest.raises(CircuitOpenError):
+            await policy.call(broken, max_retries=5)
+        assert calls == 2
+
+        with pytest.raises(CircuitOpenError):
+            await policy.call(broken)
+        assert calls == 2
+        assert policy.stats.fast_failures == 2
+
+    async def test_caller_errors_keep_circuit_closed(self) -> None:
+        """Test rejected requests do not open the provider's circuit."""
+
+        async def rejected():
+            raise ValueError("empty text")
+
+        policy = _policy(
+            hedge=False,
+            health=ProviderHealth(breaker=CircuitBreaker(provider="t", failure_threshold=2)),
+        )
+        for _ in range(3):
+            with pytest.raises(ValueError):
+                await policy.call(rejected, max_retries=1)
+        assert policy.breaker.state == CircuitState.CLOSED
+
+    @staticmethod
+    def _half_open_policy() -> ResiliencePolicy:
+        breaker = CircuitBreaker(provider="t", failure_threshold=1, recovery_timeout_s=5.0)
+        # Opened long enough ago to let a probe through now
+        breaker.record_failure(now=monotonic() - 10)
+        return _policy(hedge=False, health=ProviderHealth(breaker=breaker))
+
+    async def test_cancelled_probe_released(self) -> None:
+        """Test a probe cut off by the deadline lets the next call probe."""
+        policy = self._half_open_policy()
+
+        async def slow():
+            await asyncio.sleep(1)
+
+        with pytest.raises(DeadlineExceededError):
+            await policy.call(slow, deadline=TurnDeadline(budget_ms=20), phase="tts")
+        assert policy.breaker.state == CircuitState.HALF_OPEN
+
+        async def ok():
+            return "ok"
+
+        assert await policy.call(ok) == "ok"
+        assert policy.breaker.state == CircuitState.CLOSED
+
+    async def test_caller_error_probe_released(self) -> None:
+        """Test a probe failing on a caller error neither reopens nor blocks the circuit."""
+        policy = self._half_open_policy()
+
+        async def rejected():
+            raise APIStatusError("bad voice", status_code=400)
+
+        with pytest.raises(APIStatusError):
+            await policy.call(rejected, max_retries=1)
+        assert policy.breaker.state == CircuitState.HALF_OPEN
+        assert policy.breaker.allow_request() is True
+
+    async def test_deadline_cancels_call(self) -> None:
+        """Test the turn deadline bounds hedged attempts."""
+
+        async def slow():
+            await asyncio.sleep(1)
+
+        deadline = TurnDeadline(budget_ms=30)
+        with pytest.raises(DeadlineExceededError):
+            await _policy().call(slow, deadline=deadline, phase="stt")
+        assert deadline.miss.phase == "stt"
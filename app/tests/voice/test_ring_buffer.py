@@ -0,0 +1,123 @@
+"""Tests for the columnar ring buffer and running statistics."""
+
+import random
+import statistics
+
+import numpy as np
+import pytest
+
+from src.voice.audio_quality import LatencyTracker, PipelineLatency
+from src.voice.ring_buffer import ColumnarRingBuffer, RunningStats
+
+
+class TestRunningStats:
+    """Tests for Welford statistics with removal."""
+
+    def test_add_matches_statistics_module(self) -> None:
+        """Test mean and variance match the standard library."""
+        values = [3.0, 7.5, 1.25, 9.0, 4.0]
+        stats = RunningStats()
+        for v in values:
+            stats.add(v)
+        assert stats.mean == pytest.approx(statistics.mean(values))
+        assert stats.variance() == pytest.approx(statistics.variance(values))
+
+    def test_remove_restores_previous_state(self) -> None:
+        """Test removing a sample undoes its contribution."""
+        stats = RunningStats()
+        for v in (2.0, 4.0, 6.0):
+            stats.add(v)
+        stats.remove(2.0)
+        assert stats.count == 2
+        assert stats.mean == pytest.approx(5.0)
+        assert stats.variance() == pytest.approx(2.0)
+
+    def test_remove_last_sample_resets(self) -> None:
+        """Test removing the only sample leaves empty stats."""
+        stats = RunningStats()
+        stats.add(5.0)
+        stats.remove(5.0)
+        assert stats.count == 0
+        assert stats.variance() == 0.0
+
+
+class TestColumnarRingBuffer:
+    """Tests for the ring buffer."""
+
+    def test_requires_positive_capacity(self) -> None:
+        """Test zero capacity is rejected."""
+        with pytest.raises(ValueError, match="capacity"):
+            ColumnarRingBuffer(columns=("a",), capacity=0)
+
+    def test_sliding_statistics_match_recomputation(self) -> None:
+        """Test O(1) stats equal a full recomputation after many evictions."""
+        rng = random.Random(3)
+        buffer = ColumnarRingBuffer(columns=("a", "b"), capacity=32)
+        history: list[tuple[float, float]] = []
+        for i in range(500):
+            row = (rng.uniform(0, 1000), rng.uniform(-5, 5))
+            history.append(row)
+            buffer.append({"a": row[0], "b": row[1]}, timestamp=float(i))
+
+        window_a = [r[0] for r in history[-32:]]
+        window_b = [r[1] for r in history[-32:]]
+        assert len(buffer) == 32
+        assert buffer.mean("a") == pytest.approx(statistics.mean(window_a))
+        assert buffer.std_dev("b") == pytest.approx(statistics.stdev(window_b))
+        assert buffer.min("a") == min(window_a)
+        assert buffer.max("b") == max(window_b)
+        assert buffer.column("a").tolist() == window_a
+
+    def test_columns_are_ordered_before_wrap(self) -> None:
+        """Test columns come back oldest first before the buffer fills."""
+        buffer = ColumnarRingBuffer(columns=("a",), capacity=4)
+        for v in (1.0, 2.0, 3.0):
+            buffer.append({"a": v}, timestamp=v)
+        assert buffer.column("a").tolist() == [1.0, 2.0, 3.0]
+        assert buffer.timestamps().tolist() == [1.0, 2.0, 3.0]
+
+    def test_vectorized_reduce_with_since(self) -> None:
+        """Test ad-hoc reductions can filter by timestamp."""
+        buffer = ColumnarRingBuffer(columns=("a",), capacity=10)
+        for t in range(10):
+            buffer.append({"a": float(t)}, timestamp=float(t))
+        assert buffer.reduce("a", np.median) == 4.5
+        assert buffer.reduce("a", np.max, since=8.0) == 9.0
+        assert buffer.reduce("a", np.max, since=100.0) == 0.0
+
+    def test_unknown_column_raises(self) -> None:
+        """Test unknown columns raise ValueError."""
+        buffer = ColumnarRingBuffer(columns=("a",), capacity=2)
+        with pytest.raises(ValueError, match="Unknown column"):
+            buffer.mean("b")
+
+    def test_clear(self) -> None:
+        """Test clearing empties stats and columns."""
+        buffer = ColumnarRingBuffer(columns=("a",), capacity=2)
+        buffer.append({"a": 1.0})
+        buffer.clear()
+        assert len(buffer) == 0
+        assert buffer.mean("a") == 0.0
+        assert buffer.max("a") == 0.0
+
+
+class TestLatencyTrackerWindowStats:
+    """Tests for O(1) window statistics on LatencyTracker."""
+
+    def test_window_stats(self) -> None:
+        """Test window stats reflect only the last window_size measurements."""
+        tracker = LatencyTracker(window_size=3)
+        for total in (100.0, 200.0, 300.0, 400.0):
+            tracker.record(
+                PipelineLatency(
+                    stt_latency_ms=0.0,
+                    processing_latency_ms=0.0,
+                    tts_latency_ms=0.0,
+                    total_latency_ms=total,
+                )
+            )
+        stats = tracker.get_window_stats("total")
+        assert stats["mean_ms"] == pytest.approx(300.0)
+        assert stats["min_ms"] == 200.0
+        assert stats["max_ms"] == 400.0
+        assert stats["sample_count"] == 3
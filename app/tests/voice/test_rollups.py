@@ -0,0 +1,128 @@
+"""Tests for time-bucketed metric rollups."""
+
+import pytest
+
+from src.voice.audio_quality import AudioQualityMetrics, LatencyTracker, PipelineLatency
+from src.voice.rollups import MetricRollups, RollupResolution
+
+
+@pytest.fixture
+def rollups() -> MetricRollups:
+    """Two-level rollups: 1s x 10 and 10s x 10."""
+    return MetricRollups(
+        metrics=("total",),
+        resolutions=(
+            RollupResolution(step_seconds=10.0, num_buckets=10),
+            RollupResolution(step_seconds=1.0, num_buckets=10),
+        ),
+    )
+
+
+class TestMetricRollups:
+    """Tests for MetricRollups."""
+
+    def test_resolutions_sorted_finest_first(self, rollups: MetricRollups) -> None:
+        """Test resolutions are ordered by step."""
+        assert [r.step_seconds for r in rollups.resolutions] == [1.0, 10.0]
+        assert rollups.max_window_seconds == 100.0
+
+    def test_summary_over_window(self, rollups: MetricRollups) -> None:
+        """Test count, sum, min, max and percentiles over a window."""
+        for t in range(5):
+            rollups.record({"total": 100.0 * (t + 1)}, now=t + 0.5)
+
+        summary = rollups.summary("total", window_seconds=5.0, now=4.5)
+        assert summary["count"] == 5
+        assert summary["sum"] == 1500.0
+        assert summary["min"] == 100.0
+        assert summary["max"] == 500.0
+        assert summary["p50"] == pytest.approx(300.0, rel=0.02)
+
+    def test_fine_buckets_expire_coarse_remain(self, rollups: MetricRollups) -> None:
+        """Test old samples survive only in the coarse level."""
+        rollups.record({"total": 50.0}, now=0.5)
+        # 30s later the 1s level no longer covers the sample
+        assert rollups.query("total", window_seconds=5.0, now=30.5).count == 0
+        assert rollups.query("total", window_seconds=60.0, now=30.5).count == 1
+        # Beyond the coarse span the sample is gone entirely
+        assert rollups.query("total", window_seconds=100.0, now=200.5).count == 0
+
+    def test_window_longer_than_any_level(self, rollups: MetricRollups) -> None:
+        """Test over-long windows fall back to the coarsest level."""
+        rollups.record({"total": 10.0}, now=0.5)
+        assert rollups.query("total", window_seconds=10_000.0, now=1.0).count == 1
+
+    def test_series(self, rollups: MetricRollups) -> None:
+        """Test the per-bucket series of one resolution."""
+        rollups.record({"total": 1.0}, now=0.5)
+        rollups.record({"total": 3.0}, now=0.7)
+        rollups.record({"total": 5.0}, now=2.5)
+        series = rollups.series("total", step_seconds=1.0, now=2.5)
+        assert [(b["start"], b["count"], b["max"]) for b in series] == [
+            (0.0, 2, 3.0),
+            (2.0, 1, 5.0),
+        ]
+
+    def test_closed_buckets_fold_into_coarser_level(self, rollups: MetricRollups) -> None:
+        """Test samples are written once and reach the coarse level as buckets close."""
+        for t in (0.5, 1.5, 12.5):
+            rollups.record({"total": 10.0 * t}, now=t)
+
+        fine, coarse = rollups._levels["total"]
+        assert fine.get_slot(0).count == 1
+        # Buckets [0, 1) and [1, 2) have closed; [12, 13) is still open
+        assert coarse.get_slot(0).count == 2
+        assert coarse.get_slot(1) is None
+        assert rollups.query("total", window_seconds=60.0, now=12.5).count == 3
+        series = rollups.series("total", step_seconds=10.0, now=12.5)
+        assert [(b["start"], b["count"]) for b in series] == [(0.0, 2), (10.0, 1)]
+
+    def test_late_sample_lands_in_open_bucket(self, rollups: MetricRollups) -> None:
+        """Test a sample older than the open bucket is not lost to the coarse level."""
+        rollups.record({"total": 1.0}, now=5.5)
+        rollups.record({"total": 2.0}, now=3.5)
+        rollups.record({"total": 3.0}, now=25.5)
+        assert rollups.query("total", window_seconds=60.0, now=25.5).count == 3
+
+    def test_unknown_metric_and_step(self, rollups: MetricRollups) -> None:
+        """Test unknown metrics and resolutions raise."""
+        with pytest.raises(ValueError, match="Unknown rollup metric"):
+            rollups.record({"stt": 1.0})
+        with pytest.raises(ValueError, match="No rollup resolution"):
+            rollups.series("total", step_seconds=5.0)
+
+    def test_memory_is_constant(self, rollups: MetricRollups) -> None:
+        """Test bucket count does not grow with elapsed time."""
+        for t in range(0, 100_000, 3):
+            rollups.record({"total": float(t % 997)}, now=float(t))
+        live = sum(len(level.slots(now=100_000.0)) for level in rollups._levels["total"])
+        assert live <= 20
+
+
+class TestTrackerRollups:
+    """Tests for rollup queries on the trackers."""
+
+    def test_latency_p95_over_last_five_minutes(self) -> None:
+        """Test the five-minute p95 comes from the rollups."""
+        tracker = LatencyTracker()
+        for total in range(100, 1100, 10):
+            tracker.record(
+                PipelineLatency(
+                    stt_latency_ms=0.0,
+                    processing_latency_ms=0.0,
+                    tts_latency_ms=0.0,
+                    total_latency_ms=float(total),
+                )
+            )
+        summary = tracker.get_window_summary(300.0)
+        assert summary["count"] == 100
+        assert summary["p95"] == pytest.approx(1040.0, rel=0.02)
+
+    def test_quality_window_summary(self) -> None:
+        """Test quality scores are rolled up."""
+        metrics = AudioQualityMetrics()
+        metrics.record_quality_score(6.0)
+        metrics.record_quality_score(8.0)
+        summary = metrics.get_window_summary(60.0)
+        assert summary["count"] == 2
+        assert summary["mean"] == 7.0
@@ -0,0 +1,201 @@
+"""Tests for speculative responses on stable interim transcripts."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from livekit.agents import stt
+
+from src.voice.config import DeepgramConfig, VoiceProcessingConfig
+from src.voice.speculation import (
+    SpeculativeResponder,
+    create_speculative_responder,
+    normalize_transcript,
+)
+from src.voice.stt_pipeline import STTConfig, STTPipeline
+
+
+class FakeStage:
+    """Response stage stand-in taking a fixed time."""
+
+    def __init__(self, duration_s: float = 0.05, fail: bool = False) -> None:
+        self.duration_s = duration_s
+        self.fail = fail
+        self.calls: list[str] = []
+        self.cancelled = 0
+
+    async def __call__(self, text: str) -> str:
+        self.calls.append(text)
+        try:
+            await asyncio.sleep(self.duration_s)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            raise RuntimeError("llm down")
+        return f"reply to {text}"
+
+
+class TestNormalize:
+    """Tests for transcript matching."""
+
+    def test_ignores_case_and_punctuation(self) -> None:
+        """Test smart-formatted finals match their plain interims."""
+        assert normalize_transcript("Book a flight, please.") == "book a flight please"
+        assert normalize_transcript("what's  up") == "what's up"
+
+
+class TestSpeculativeResponder:
+    """Tests for starting, committing and cancelling speculation."""
+
+    async def test_commit_when_final_matches(self) -> None:
+        """Test a stable interim starts the stage and a matching final uses it."""
+        stage = FakeStage(duration_s=0.05)
+        responder = SpeculativeResponder(stage, stable_ms=20)
+        responder.observe("book a flight")
+        await asyncio.sleep(0.04)
+        assert responder.speculating
+
+        assert await responder.resolve("Book a flight.") == "reply to book a flight"
+        assert stage.calls == ["book a flight"]
+        metrics = responder.metrics
+        assert (metrics.turns, metrics.started, metrics.hits) == (1, 1, 1)
+        assert metrics.hit_rate == 1.0
+        # The stage had run ~20ms of its 50ms when the final arrived
+        assert 10 < metrics.latency_saved_sketch.quantile(0.5) < 45
+
+    async def test_cancel_when_final_differs(self) -> None:
+        """Test a different final cancels the speculation."""
+        stage = FakeStage()
+        responder = SpeculativeResponder(stage, stable_ms=10)
+        responder.observe("book a flight")
+        await asyncio.sleep(0.02)
+
+        assert await responder.resolve("book a flight to Denver") is None
+        await asyncio.sleep(0)
+        assert stage.cancelled == 1
+        assert responder.metrics.misses == 1
+        assert responder.metrics.precision == 0.0
+
+    async def test_changing_interims_restart_the_wait(self) -> None:
+        """Test nothing starts while the interim keeps changing."""
+        stage = FakeStage()
+        responder = SpeculativeResponder(stage, stable_ms=30)
+        for text in ("book", "book a", "book a flight"):
+            responder.observe(text)
+            await asyncio.sleep(0.015)
+        assert stage.calls == []
+
+        await asyncio.sleep(0.03)
+        responder.observe("book a flight to")
+        await asyncio.sleep(0)
+        assert stage.cancelled == 1
+        assert responder.metrics.abandoned == 1
+        assert not responder.speculating
+
+    async def test_failed_speculation_falls_back(self) -> None:
+        """Test a failing stage makes resolve return None, not raise."""
+        responder = SpeculativeResponder(FakeStage(duration_s=0, fail=True), stable_ms=5)
+        responder.observe("hello")
+        await asyncio.sleep(0.02)
+        assert await responder.resolve("hello") is None
+        assert responder.metrics.failed == 1
+
+    async def test_already_stable_text_starts_sooner(self) -> None:
+        """Test text observed late only waits out the rest of the window."""
+        stage = FakeStage()
+        responder = SpeculativeResponder(stage, stable_ms=50)
+        responder.observe("book a flight", stable_for_ms=45)
+        await asyncio.sleep(0.02)
+        assert stage.calls == ["book a flight"]
+        responder.reset()
+
+    async def test_final_before_stable(self) -> None:
+        """Test a final arriving before the interim settles just counts the turn."""
+        stage = FakeStage()
+        responder = SpeculativeResponder(stage, stable_ms=50)
+        responder.observe("yes")
+        assert await responder.resolve("yes") is None
+        await asyncio.sleep(0.06)
+        assert stage.calls == []
+        assert responder.metrics.turns == 1
+
+
+class TestCreateSpeculativeResponder:
+    """Tests for the factory function."""
+
+    def test_disabled_by_default(self) -> None:
+        """Test speculation is opt-in."""
+        assert create_speculative_responder(FakeStage(), VoiceProcessingConfig()) is None
+
+    def test_enabled(self) -> None:
+        """Test the configured stability window is used."""
+        config = VoiceProcessingConfig(speculative_responses=True, speculation_stable_ms=250)
+        responder = create_speculative_responder(FakeStage(), config)
+        assert responder is not None
+        assert responder.stable_ms == 250
+
+
+def transcript(text: str, is_final: bool = False) -> SimpleNamespace:
+    """Deepgram speech event stand-in."""
+    kinds = stt.SpeechEventType
+    return SimpleNamespace(
+        type=kinds.FINAL_TRANSCRIPT if is_final else kinds.INTERIM_TRANSCRIPT,
+        alternatives=[SimpleNamespace(text=text, confidence=0.9, start_time=0.0, end_time=0.0)],
+    )
+
+
+class TestPipelineSpeculation:
+    """Tests for speculation on STTPipeline's interim stream."""
+
+    def _pipeline(self) -> STTPipeline:
+        with patch.dict("os.environ", {"DEEPGRAM_API_KEY": "test_key"}):
+            config = STTConfig(deepgram_config=DeepgramConfig())
+        with patch("src.voice.stt_pipeline.deepgram.STT"):
+            return STTPipeline(config=config)
+
+    async def test_stable_interim_answers_final(self) -> None:
+        """Test an interim held stable starts the stage and its final uses the output."""
+        pipeline = self._pipeline()
+        stage = FakeStage(duration_s=0.01)
+        config = VoiceProcessingConfig(speculative_responses=True, speculation_stable_ms=20)
+        assert pipeline.enable_speculation(stage, config) is pipeline.speculation
+
+        async def events():
+            yield transcript("book a")
+            yield transcript("book a flight")
+            await asyncio.sleep(0.04)
+            yield transcript("Book a flight.", is_final=True)
+
+        replies = [
+            await pipeline.speculative_response(result.text)
+            async for result in pipeline.process_audio_stream(events())
+            if result.is_final
+        ]
+
+        assert replies == ["reply to book a flight"]
+        assert stage.calls == ["book a flight"]
+        assert pipeline.speculation.metrics.hits == 1
+
+    async def test_pending_speculation_cancelled_at_stream_end(self) -> None:
+        """Test a speculation with no final is cancelled when the stream ends."""
+        pipeline = self._pipeline()
+        stage = FakeStage(duration_s=1)
+        config = VoiceProcessingConfig(speculative_responses=True, speculation_stable_ms=10)
+        pipeline.enable_speculation(stage, config)
+
+        async def events():
+            yield transcript("book a flight")
+            await asyncio.sleep(0.03)
+
+        _ = [r async for r in pipeline.process_audio_stream(events())]
+        await asyncio.sleep(0)
+
+        assert stage.cancelled == 1
+        assert not pipeline.speculation.speculating
+
+    async def test_disabled_by_config(self) -> None:
+        """Test no responder is created when speculation is off."""
+        pipeline = self._pipeline()
+        assert pipeline.enable_speculation(FakeStage(), VoiceProcessingConfig()) is None
+        assert await pipeline.speculative_response("hello") is None
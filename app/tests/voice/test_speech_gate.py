@@ -0,0 +1,167 @@
+"""Tests for silence trimming and speech gating."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+from livekit import rtc
+
+from src.voice.config import DeepgramConfig
+from src.voice.speech_gate import SpeechGate, trim_silence
+from src.voice.stt_pipeline import STTConfig, STTPipeline
+
+SAMPLE_RATE = 16000
+
+
+def speech(ms: int) -> bytes:
+    """Loud noise standing in for speech."""
+    rng = np.random.default_rng(ms)
+    return (rng.standard_normal(SAMPLE_RATE * ms // 1000) * 3000).astype(np.int16).tobytes()
+
+
+def silence(ms: int) -> bytes:
+    """Quiet background noise, well below the speech threshold."""
+    rng = np.random.default_rng(ms + 1)
+    return (rng.standard_normal(SAMPLE_RATE * ms // 1000) * 10).astype(np.int16).tobytes()
+
+
+def frames(pcm: bytes, frame_ms: int = 10) -> list[rtc.AudioFrame]:
+    """Split PCM into AudioFrames."""
+    step = SAMPLE_RATE * frame_ms // 1000 * 2
+    return [
+        rtc.AudioFrame(pcm[i : i + step], SAMPLE_RATE, 1, step // 2)
+        for i in range(0, len(pcm), step)
+    ]
+
+
+@pytest.fixture
+def pipeline_factory():
+    """Build STT pipelines with a mocked recognizer and the silence gate on."""
+
+    def build(**config_kwargs) -> tuple[STTPipeline, AsyncMock]:
+        config_kwargs.setdefault("vad_enabled", True)
+        with patch.dict("os.environ", {"DEEPGRAM_API_KEY": "test_key"}):
+            config = STTConfig(deepgram_config=DeepgramConfig(), **config_kwargs)
+        with patch("src.voice.stt_pipeline.deepgram.STT"):
+            pipeline = STTPipeline(config=config)
+        pipeline.resilience.hedge = False
+        recognize = AsyncMock(return_value=MagicMock(text="hello"))
+        pipeline._stt = MagicMock(recognize=recognize)
+        return pipeline, recognize
+
+    return build
+
+
+class TestTrimSilence:
+    """Tests for single-shot trimming."""
+
+    def test_keeps_speech_with_padding(self) -> None:
+        """Test leading and trailing silence is cut down to the padding."""
+        pcm = silence(1000) + speech(500) + silence(1000)
+        trimmed = trim_silence(pcm, SAMPLE_RATE, padding_ms=200)
+        assert len(trimmed) == len(speech(900))
+        assert trimmed.tobytes() == pcm[len(silence(800)) : len(silence(1700))]
+
+    def test_no_speech_is_empty(self) -> None:
+        """Test a silent buffer trims to nothing."""
+        assert len(trim_silence(silence(500), SAMPLE_RATE)) == 0
+
+    def test_short_buffers_kept_whole(self) -> None:
+        """Test buffers shorter than an analysis frame are not measured."""
+        assert trim_silence(b"audio", SAMPLE_RATE).tobytes() == b"audio"
+
+    def test_stereo_frames_stay_aligned(self) -> None:
+        """Test trimming interleaved audio cuts on whole sample frames."""
+        mono = np.frombuffer(silence(300) + speech(100) + silence(300), dtype=np.int16)
+        stereo = np.repeat(mono, 2).tobytes()
+        trimmed = trim_silence(stereo, SAMPLE_RATE, num_channels=2, padding_ms=50)
+        assert len(trimmed) == len(speech(200)) * 2
+
+
+class TestSpeechGate:
+    """Tests for live stream gating."""
+
+    def test_drops_silence_between_utterances(self) -> None:
+        """Test silence beyond the padding is dropped and speech is passed whole."""
+        gate = SpeechGate(padding_before_ms=100, padding_after_ms=200)
+        pcm = silence(1000) + speech(300) + silence(1000) + speech(300) + silence(1000)
+        kept = [kept for frame in frames(pcm) for kept in gate.push(frame)]
+
+        # Each utterance: 100ms before, 300ms speech, 200ms after
+        assert len(kept) == 2 * 60
+        assert gate.metrics.speech_segments == 2
+        assert gate.metrics.bytes_in == len(pcm)
+        assert gate.metrics.bytes_saved == len(pcm) - len(speech(1200))
+        assert not gate.in_speech
+
+    def test_onset_released_in_order(self) -> None:
+        """Test held padding is released before the first speech frame."""
+        gate = SpeechGate(padding_before_ms=20, padding_after_ms=0)
+        quiet = frames(silence(50))
+        for frame in quiet:
+            assert gate.push(frame) == []
+        onset = frames(speech(10))[0]
+        assert gate.push(onset) == [quiet[-2], quiet[-1], onset]
+
+
+class FakeStream:
+    """SpeechStream stand-in recording pushed frames."""
+
+    def __init__(self) -> None:
+        self.frames: list[rtc.AudioFrame] = []
+
+    def push_frame(self, frame: rtc.AudioFrame) -> None:
+        self.frames.append(frame)
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+class TestPipelineGating:
+    """Tests for gating in STTPipeline."""
+
+    async def test_single_shot_trimmed(self, pipeline_factory) -> None:
+        """Test only the speech span (plus padding) is uploaded."""
+        pipeline, recognize = pipeline_factory()
+        pcm = silence(1000) + speech(500) + silence(1000)
+
+        assert await pipeline.transcribe_audio(pcm) == "hello"
+
+        assert len(recognize.call_args.kwargs["buffer"]) == len(speech(900))
+        assert pipeline.metrics.vad_bytes_saved == len(pcm) - len(speech(900))
+        assert pipeline.metrics.vad_time_ms > 0
+
+    async def test_silent_buffer_not_sent(self, pipeline_factory) -> None:
+        """Test a buffer without speech is answered without a provider call."""
+        pipeline, recognize = pipeline_factory()
+        assert await pipeline.transcribe_audio(silence(1000)) == ""
+        recognize.assert_not_awaited()
+        assert pipeline.metrics.vad_skipped == 1
+        assert pipeline.metrics.total_transcriptions == 0
+
+    def test_gate_off_by_default(self) -> None:
+        """Test the silence gate is opt-in."""
+        with patch.dict("os.environ", {"DEEPGRAM_API_KEY": "test_key"}):
+            config = STTConfig(deepgram_config=DeepgramConfig())
+        assert not config.vad_enabled
+
+    async def test_gating_disabled(self, pipeline_factory) -> None:
+        """Test vad_enabled=False sends the whole buffer."""
+        pipeline, recognize = pipeline_factory(vad_enabled=False)
+        pcm = silence(500) + speech(100)
+        await pipeline.transcribe_audio(pcm)
+        assert len(recognize.call_args.kwargs["buffer"]) == len(pcm)
+
+    async def test_stream_forwarding(self, pipeline_factory) -> None:
+        """Test silence is kept out of the stream, with endpointing_ms after speech."""
+        pipeline, _ = pipeline_factory(vad_padding_ms=100, endpointing_ms=300)
+        stream = FakeStream()
+        pcm = silence(1000) + speech(300) + silence(2000)
+
+        metrics = await pipeline.forward_audio(_aiter(frames(pcm)), stream)
+
+        # 100ms before, 300ms speech, 100ms padding + 300ms endpointing after
+        assert len(stream.frames) == 80
+        assert pipeline.metrics.vad_bytes_saved == metrics.bytes_saved > 0
@@ -0,0 +1,170 @@
+"""Tests for the transcript cache."""
+
+import asyncio
+import json
+import os
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.voice.config import DeepgramConfig
+from src.voice.stt_cache import DiskTranscriptCache, TranscriptCache, transcript_key
+from src.voice.stt_pipeline import STTConfig, STTMetrics, STTPipeline
+
+AUDIO = bytes(range(256)) * 8
+
+
+def _key(audio: bytes = AUDIO, **overrides) -> str:
+    options = dict(
+        sample_rate=16000,
+        num_channels=1,
+        model="nova-2",
+        language="en-US",
+        punctuate=True,
+        smart_format=True,
+    )
+    options.update(overrides)
+    return transcript_key(audio, **options)
+
+
+@pytest.fixture
+def pipeline_factory():
+    """Build STT pipelines with a mocked recognizer."""
+
+    def build(recognize: AsyncMock, **config_kwargs) -> STTPipeline:
+        with patch.dict("os.environ", {"DEEPGRAM_API_KEY": "test_key"}):
+            config = STTConfig(deepgram_config=DeepgramConfig(), **config_kwargs)
+        with patch("src.voice.stt_pipeline.deepgram.STT"):
+            pipeline = STTPipeline(config=config)
+        pipeline.resilience.hedge = False
+        pipeline._stt = MagicMock(recognize=recognize)
+        return pipeline
+
+    return build
+
+
+class TestTranscriptKey:
+    """Tests for content addressing."""
+
+    def test_audio_and_options_change_key(self) -> None:
+        """Test the audio and every option that changes the transcript change the key."""
+        base = _key()
+        assert base == _key(bytearray(AUDIO))
+        assert base != _key(AUDIO[:-2])
+        assert base != _key(sample_rate=48000)
+        assert base != _key(num_channels=2)
+        assert base != _key(model="nova-3")
+        assert base != _key(language="fr")
+        assert base != _key(punctuate=False)
+        assert base != _key(smart_format=False)
+
+
+class TestTranscriptCache:
+    """Tests for the two-tier cache."""
+
+    def test_memory_then_disk(self, tmp_path) -> None:
+        """Test entries survive a dropped memory tier via the disk tier."""
+        cache = TranscriptCache(directory=str(tmp_path))
+        cache.put("k", "hello there")
+        assert cache.get("k") == "hello there"
+        assert cache.memory_hits == 1
+
+        cache.clear_memory()
+        assert cache.get("k") == "hello there"
+        assert cache.disk_hits == 1
+        # Promoted back into memory
+        assert cache.get("k") == "hello there"
+        assert cache.memory_hits == 2
+
+    def test_empty_transcripts_are_cached(self) -> None:
+        """Test silence (an empty transcript) is a hit, not a miss."""
+        cache = TranscriptCache()
+        cache.put("k", "")
+        assert cache.get("k") == ""
+        assert cache.misses == 0
+
+    def test_disk_ttl(self, tmp_path) -> None:
+        """Test disk entries older than the TTL are deleted on lookup."""
+        disk = DiskTranscriptCache(str(tmp_path), ttl_s=60)
+        disk.put("k", "hello")
+        path = tmp_path / "k.json"
+        entry = json.loads(path.read_text())
+        entry["created_at"] -= 61
+        path.write_text(json.dumps(entry))
+
+        assert disk.get("k") is None
+        assert not path.exists()
+
+    def test_disk_size_bound(self, tmp_path) -> None:
+        """Test the disk tier deletes least recently used files past its bound."""
+        disk = DiskTranscriptCache(str(tmp_path), max_bytes=100)
+        disk.put("old", "a" * 40)
+        os.utime(tmp_path / "old.json", (1, 1))
+        disk.put("new", "b" * 40)
+        assert disk.get("old") is None
+        assert disk.get("new") == "b" * 40
+
+
+class TestPipelineCache:
+    """Tests for caching in STTPipeline."""
+
+    async def test_repeated_audio_hits_cache(self, pipeline_factory) -> None:
+        """Test repeated audio is transcribed once."""
+        recognize = AsyncMock(return_value=MagicMock(text="hello"))
+        pipeline = pipeline_factory(recognize, cache_enabled=True)
+
+        assert await pipeline.transcribe_audio(AUDIO) == "hello"
+        assert await pipeline.transcribe_audio(AUDIO) == "hello"
+
+        assert recognize.await_count == 1
+        assert pipeline.metrics.cache_hits == 1
+        assert pipeline.metrics.cache_misses == 1
+        assert pipeline.metrics.cache_hit_rate == 0.5
+        assert pipeline.metrics.total_transcriptions == 1
+
+    async def test_concurrent_identical_requests_coalesce(self, pipeline_factory) -> None:
+        """Test identical requests in flight share one provider call."""
+
+        async def slow(buffer, sample_rate):
+            await asyncio.sleep(0.01)
+            return MagicMock(text="hello")
+
+        recognize = AsyncMock(side_effect=slow)
+        pipeline = pipeline_factory(recognize, cache_enabled=True)
+
+        results = await pipeline.transcribe_many([AUDIO] * 4 + [AUDIO[:-2]])
+
+        assert [r.text for r in results] == ["hello"] * 5
+        assert recognize.await_count == 2
+        assert pipeline.metrics.cache_misses == 2
+        assert pipeline.metrics.cache_coalesced == 3
+        assert not pipeline._pending
+
+    async def test_coalesced_requests_share_failure(self, pipeline_factory) -> None:
+        """Test a failed call fails the requests that joined it and is not cached."""
+
+        async def failing(buffer, sample_rate):
+            await asyncio.sleep(0.01)
+            raise RuntimeError("provider down")
+
+        recognize = AsyncMock(side_effect=failing)
+        pipeline = pipeline_factory(recognize, cache_enabled=True)
+
+        results = await pipeline.transcribe_many([AUDIO] * 3, max_retries=0)
+
+        assert [str(r.error) for r in results] == ["provider down"] * 3
+        assert recognize.await_count == 1
+        assert pipeline.cache.get(pipeline._cache_key(AUDIO, 16000, 1)) is None
+
+    async def test_cache_disabled_by_default(self, pipeline_factory) -> None:
+        """Test caching is opt-in."""
+        recognize = AsyncMock(return_value=MagicMock(text="hello"))
+        pipeline = pipeline_factory(recognize)
+        await pipeline.transcribe_audio(AUDIO)
+        await pipeline.transcribe_audio(AUDIO)
+        assert pipeline.cache is None
+        assert recognize.await_count == 2
+
+    def test_rate_without_lookups(self) -> None:
+        """Test the hit rate is zero before any lookup."""
+        assert STTMetrics().cache_hit_rate == 0.0
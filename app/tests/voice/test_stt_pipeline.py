@@ -1,18 +1,20 @@
 """Tests for Speech-to-Text pipeline."""
 
-import pytest
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
-from datetime import datetime
 
+import pytest
+
+from src.voice.config import DeepgramConfig
 from src.voice.stt_pipeline import (
-    STTPipeline,
+    BatchTranscription,
     STTConfig,
     STTMetrics,
+    STTPipeline,
     TranscriptionResult,
     TranscriptionState,
     create_stt_pipeline,
 )
-from src.voice.config import DeepgramConfig
 
 
 @pytest.fixture
@@ -115,18 +117,14 @@ class TestSTTPipeline:
         assert pipeline._on_transcription == callback
 
     @patch("src.voice.stt_pipeline.deepgram.STT")
-    def test_get_metrics(
-        self, mock_stt_class: MagicMock, stt_config: STTConfig
-    ) -> None:
+    def test_get_metrics(self, mock_stt_class: MagicMock, stt_config: STTConfig) -> None:
         """Test getting metrics."""
         pipeline = STTPipeline(config=stt_config)
         metrics = pipeline.get_metrics()
         assert isinstance(metrics, STTMetrics)
 
     @patch("src.voice.stt_pipeline.deepgram.STT")
-    def test_reset_metrics(
-        self, mock_stt_class: MagicMock, stt_config: STTConfig
-    ) -> None:
+    def test_reset_metrics(self, mock_stt_class: MagicMock, stt_config: STTConfig) -> None:
         """Test resetting metrics."""
         pipeline = STTPipeline(config=stt_config)
         pipeline.metrics.total_transcriptions = 100
@@ -134,13 +132,114 @@ class TestSTTPipeline:
         assert pipeline.metrics.total_transcriptions == 0
 
     @patch("src.voice.stt_pipeline.deepgram.STT")
-    def test_stt_instance_property(
-        self, mock_stt_class: MagicMock, stt_config: STTConfig
-    ) -> None:
+    def test_stt_instance_property(self, mock_stt_class: MagicMock, stt_config: STTConfig) -> None:
         """Test STT instance property."""
         pipeline = STTPipeline(config=stt_config)
         assert pipeline.stt_instance is not None
 
+    @pytest.mark.asyncio
+    @patch("src.voice.stt_pipeline.deepgram.STT")
+    async def test_transcribe_audio_converts_to_config_rate(
+        self, mock_stt_class: MagicMock, stt_config: STTConfig
+    ) -> None:
+        """Test 48kHz stereo room audio is sent as 16kHz mono."""
+        pipeline = STTPipeline(config=stt_config)
+        pipeline.resilience.hedge = False
+        recognize = AsyncMock(return_value=MagicMock(text="hi"))
+        pipeline._stt = MagicMock(recognize=recognize)
+
+        # 100ms of 48kHz stereo, loud enough to pass the speech gate
+        audio = b"\x00\x10" * 9600
+        assert await pipeline.transcribe_audio(audio, 48000, num_channels=2) == "hi"
+
+        kwargs = recognize.call_args.kwargs
+        assert kwargs["sample_rate"] == 16000
+        assert len(kwargs["buffer"]) == 3200
+
+
+class FakeRecognizer:
+    """Recognizer stand-in that echoes the buffer and tracks concurrency."""
+
+    def __init__(self, fail_on: bytes = b"") -> None:
+        self.fail_on = fail_on
+        self.active = 0
+        self.peak = 0
+
+    async def recognize(self, buffer: bytes, sample_rate: int) -> MagicMock:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            # Later items finish first, so ordering is not by completion
+            await asyncio.sleep(0.01 / (1 + buffer[0]))
+            if buffer == self.fail_on:
+                raise RuntimeError("bad audio")
+            return MagicMock(text=f"item {buffer[0]}")
+        finally:
+            self.active -= 1
+
+
+class TestBatchTranscription:
+    """Tests for concurrent batch transcription."""
+
+    @pytest.fixture
+    def pipeline(self, stt_config: STTConfig) -> STTPipeline:
+        """Create a pipeline without hedging or retry delays."""
+        with patch("src.voice.stt_pipeline.deepgram.STT"):
+            pipeline = STTPipeline(config=stt_config)
+        pipeline.resilience.hedge = False
+        return pipeline
+
+    @pytest.mark.asyncio
+    async def test_results_in_input_order(self, pipeline: STTPipeline) -> None:
+        """Test results come back in input order under bounded concurrency."""
+        recognizer = FakeRecognizer()
+        pipeline._stt = recognizer
+
+        results = await pipeline.transcribe_many(
+            [bytes([i, 0]) for i in range(10)], max_concurrency=3
+        )
+
+        assert [r.text for r in results] == [f"item {i}" for i in range(10)]
+        assert [r.index for r in results] == list(range(10))
+        assert recognizer.peak == 3
+        assert pipeline.metrics.successful_transcriptions == 10
+        assert pipeline.metrics.latency_sketch.count == 10
+        assert pipeline.state == TranscriptionState.IDLE
+
+    @pytest.mark.asyncio
+    async def test_item_errors_do_not_fail_batch(self, pipeline: STTPipeline) -> None:
+        """Test a failed item is reported in its result."""
+        pipeline._stt = FakeRecognizer(fail_on=bytes([1, 0]))
+
+        results = await pipeline.transcribe_many([bytes([i, 0]) for i in range(3)], max_retries=1)
+
+        assert [r.ok for r in results] == [True, False, True]
+        assert isinstance(results[1], BatchTranscription)
+        assert str(results[1].error) == "bad audio"
+        assert results[1].text is None
+        assert pipeline.metrics.total_transcriptions == 3
+        assert pipeline.metrics.failed_transcriptions == 1
+
+    @pytest.mark.asyncio
+    async def test_iterator_pulls_input_lazily(self, pipeline: STTPipeline) -> None:
+        """Test the iterator variant reads an async input only as far as needed."""
+        pipeline._stt = FakeRecognizer()
+        pulled = 0
+
+        async def buffers():
+            nonlocal pulled
+            for i in range(100):
+                pulled += 1
+                yield bytes([i, 0])
+
+        results = pipeline.transcribe_iter(buffers(), max_concurrency=2)
+        first = await results.__anext__()
+        await results.aclose()
+
+        assert first.text == "item 0"
+        assert pulled <= 5
+        assert pipeline.state == TranscriptionState.IDLE
+
 
 class TestCreateSTTPipeline:
     """Tests for STT pipeline factory function."""
@@ -151,9 +250,7 @@ class TestCreateSTTPipeline:
         self, mock_config_class: MagicMock, mock_stt_class: MagicMock
     ) -> None:
         """Test factory creates pipeline with defaults."""
-        mock_config_class.return_value = MagicMock(
-            api_key="test", model="nova-2", language="en-US"
-        )
+        mock_config_class.return_value = MagicMock(api_key="test", model="nova-2", language="en-US")
         pipeline = create_stt_pipeline()
         assert isinstance(pipeline, STTPipeline)
 
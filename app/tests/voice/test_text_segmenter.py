@@ -0,0 +1,57 @@
+"""Tests for splitting text into speakable segments."""
+
+from src.voice.text_segmenter import SegmentBuffer, find_boundary, split_segments
+
+
+class TestSplitSegments:
+    """Tests for sentence and clause segmentation."""
+
+    def test_splits_at_sentences(self) -> None:
+        """Test each sentence becomes a segment."""
+        text = "The weather is sunny today. Tomorrow it will rain! Do you need an umbrella?"
+        assert split_segments(text, min_chars=10) == [
+            "The weather is sunny today.",
+            "Tomorrow it will rain!",
+            "Do you need an umbrella?",
+        ]
+
+    def test_short_sentences_merged(self) -> None:
+        """Test sentences below min_chars are merged with the next."""
+        assert split_segments("Hi. Sure. How can I help you today?", min_chars=12) == [
+            "Hi. Sure. How can I help you today?"
+        ]
+
+    def test_abbreviations_and_numbers_kept_whole(self) -> None:
+        """Test abbreviations and decimals are not sentence ends."""
+        text = "Dr. Smith measured 3.5 liters at the clinic. It was enough."
+        assert split_segments(text, min_chars=5) == [
+            "Dr. Smith measured 3.5 liters at the clinic.",
+            "It was enough.",
+        ]
+
+    def test_long_sentence_cut_at_clause(self) -> None:
+        """Test sentences over max_chars are cut at the last clause boundary."""
+        text = "First we check the order, then we confirm the address, and finally we ship it."
+        segments = split_segments(text, min_chars=5, max_chars=60)
+        assert segments[0] == "First we check the order, then we confirm the address,"
+        assert " ".join(segments) == text
+        assert all(len(segment) <= 60 for segment in segments)
+
+    def test_incomplete_text_has_no_boundary(self) -> None:
+        """Test text without a complete sentence reports no boundary."""
+        assert find_boundary("Let me check that for", min_chars=5) == -1
+        assert find_boundary("Let me check that. For", min_chars=5) == len("Let me check that.")
+
+
+class TestSegmentBuffer:
+    """Tests for aggregating streamed tokens into segments."""
+
+    def test_segments_complete_on_following_whitespace(self) -> None:
+        """Test a sentence is released only once the text after it starts."""
+        buffer = SegmentBuffer(min_chars=5)
+        assert buffer.push("The total is 3.") == []
+        assert buffer.push("5 dollars.") == []
+        assert buffer.push(" Anything else?") == ["The total is 3.5 dollars."]
+        assert buffer.pending == "Anything else?"
+        assert buffer.flush() == "Anything else?"
+        assert buffer.flush() is None
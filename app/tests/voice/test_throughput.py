@@ -0,0 +1,185 @@
+"""Tests for audio throughput accounting in the STT and TTS pipelines."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+from livekit import rtc
+from livekit.agents import stt
+
+from src.voice.config import DeepgramConfig, ElevenLabsConfig
+from src.voice.stt_pipeline import STTConfig, STTPipeline
+from src.voice.throughput import ThroughputBreakdown, ThroughputMetrics
+from src.voice.tts_pipeline import TTSConfig, TTSPipeline
+
+
+class TestThroughputMetrics:
+    """Tests for ThroughputMetrics and ThroughputBreakdown."""
+
+    def test_realtime_factor(self) -> None:
+        """Test RTF is processing time per second of audio."""
+        metrics = ThroughputMetrics()
+        assert metrics.realtime_factor == 0.0
+        metrics.record(requests=1, audio_ms=4000, processing_ms=500, ttfb_ms=120)
+        metrics.record(requests=1, audio_ms=1000, processing_ms=250, ttfb_ms=80)
+        assert metrics.audio_seconds == 5.0
+        assert metrics.realtime_factor == pytest.approx(0.15)
+        assert metrics.ttfb_sketch.count == 2
+
+    def test_partial_records_for_streams(self) -> None:
+        """Test a stream's audio and timing can be recorded separately."""
+        metrics = ThroughputMetrics()
+        metrics.record(audio_ms=2000, bytes_sent=64000)
+        metrics.record(requests=1, processing_ms=2100, bytes_received=40)
+        assert metrics.requests == 1
+        assert metrics.ttfb_sketch.count == 0
+        assert (metrics.bytes_sent, metrics.bytes_received) == (64000, 40)
+
+    def test_breakdown_by_key(self) -> None:
+        """Test work is counted overall and per key."""
+        breakdown = ThroughputBreakdown()
+        breakdown.record("nova-2", requests=1, audio_ms=1000, processing_ms=100)
+        breakdown.record("nova-3", requests=1, audio_ms=1000, processing_ms=300)
+        assert breakdown.total.requests == 2
+        assert breakdown.total.realtime_factor == pytest.approx(0.2)
+        assert breakdown.by_key["nova-2"].realtime_factor == pytest.approx(0.1)
+        assert breakdown.by_key["nova-3"].realtime_factor == pytest.approx(0.3)
+
+
+def make_tts_pipeline(cache_enabled: bool = False) -> TTSPipeline:
+    """Pipeline whose fake provider returns 10ms of 24kHz audio per sentence."""
+    with patch.dict("os.environ", {"ELEVENLABS_API_KEY": "test_key"}):
+        config = TTSConfig(
+            elevenlabs_config=ElevenLabsConfig(),
+            cache_enabled=cache_enabled,
+            segment_requests=True,
+        )
+    with patch("src.voice.tts_pipeline.elevenlabs.TTS"):
+        pipeline = TTSPipeline(config=config)
+    pipeline.resilience.hedge = False
+
+    async def synthesize(text):
+        await asyncio.sleep(0.01)
+        yield MagicMock(frame=rtc.AudioFrame(bytes(480), 24000, 1, 240))
+
+    pipeline._tts = MagicMock(synthesize=synthesize)
+    return pipeline
+
+
+@pytest.fixture
+def tts_pipeline() -> TTSPipeline:
+    """Pipeline without a cache."""
+    return make_tts_pipeline()
+
+
+class TestTTSThroughput:
+    """Tests for TTS throughput on every synthesis path."""
+
+    TEXT = "This is sentence one. This is sentence two."
+
+    async def _run(self, pipeline: TTSPipeline, path: str) -> None:
+        if path == "synthesize":
+            await pipeline.synthesize(self.TEXT)
+        elif path == "stream":
+            async for _ in pipeline.synthesize_stream(self.TEXT):
+                pass
+        else:
+            async for _ in pipeline.synthesize_segmented(self.TEXT):
+                pass
+
+    @pytest.mark.parametrize("path", ["synthesize", "stream", "segmented"])
+    async def test_paths_recorded_alike(self, tts_pipeline: TTSPipeline, path: str) -> None:
+        """Test single-shot, streamed and segmented synthesis count the same work."""
+        await self._run(tts_pipeline, path)
+
+        metrics = tts_pipeline.metrics
+        config = tts_pipeline.config.elevenlabs_config
+        throughput = metrics.throughput.by_key[f"{config.model_id}/{config.voice_id}"]
+        assert throughput.requests == 1
+        assert throughput.audio_ms == pytest.approx(20.0)
+        assert metrics.total_audio_duration_ms == pytest.approx(20.0)
+        # Per-sentence requests send the sentences without the space between them
+        assert len(self.TEXT) - 1 <= throughput.bytes_sent <= len(self.TEXT)
+        assert throughput.bytes_received == 960
+        assert throughput.ttfb_sketch.count == 1
+        assert throughput.ttfb_sketch.quantile(0.5) > 0
+        assert metrics.realtime_factor > 0
+        assert 0 < metrics.min_latency_ms <= metrics.max_latency_ms
+        assert metrics.average_chars_per_second > 0
+
+    async def test_cache_hits_not_counted(self) -> None:
+        """Test audio served from the cache is not provider throughput."""
+        pipeline = make_tts_pipeline(cache_enabled=True)
+        await pipeline.synthesize("Hello.")
+        await pipeline.synthesize("Hello.")
+        async for _ in pipeline.synthesize_stream("Hello."):
+            pass
+        assert pipeline.metrics.throughput.total.requests == 1
+
+
+@pytest.fixture
+def stt_pipeline() -> STTPipeline:
+    """Pipeline with the silence gate on, without gate padding or hedging."""
+    with patch.dict("os.environ", {"DEEPGRAM_API_KEY": "test_key"}):
+        config = STTConfig(
+            deepgram_config=DeepgramConfig(),
+            vad_enabled=True,
+            vad_padding_ms=0,
+            endpointing_ms=0,
+        )
+    with patch("src.voice.stt_pipeline.deepgram.STT"):
+        pipeline = STTPipeline(config=config)
+    pipeline.resilience.hedge = False
+    return pipeline
+
+
+class TestSTTThroughput:
+    """Tests for STT throughput on single-shot and streaming paths."""
+
+    async def test_single_shot(self, stt_pipeline: STTPipeline) -> None:
+        """Test the audio sent, transcript bytes and TTFB of a recognition."""
+        stt_pipeline._stt.recognize = AsyncMock(return_value=MagicMock(text="hello"))
+        loud = (np.ones(16000) * 3000).astype(np.int16).tobytes()
+
+        await stt_pipeline.transcribe_audio(loud, sample_rate=16000)
+
+        metrics = stt_pipeline.metrics
+        throughput = metrics.throughput.by_key[stt_pipeline.config.deepgram_config.model]
+        assert throughput.requests == 1
+        assert throughput.audio_ms == pytest.approx(1000)
+        assert metrics.total_audio_duration_ms == pytest.approx(1000)
+        assert throughput.bytes_sent == len(loud)
+        assert throughput.bytes_received == 5
+        assert throughput.ttfb_sketch.count == 1
+        assert metrics.realtime_factor == pytest.approx(throughput.processing_ms / 1000)
+
+    async def test_stream(self, stt_pipeline: STTPipeline) -> None:
+        """Test a stream counts the audio it sent, once, and its first transcript."""
+        loud = (np.ones(160) * 3000).astype(np.int16).tobytes()
+        frames = [rtc.AudioFrame(pcm, 16000, 1, 160) for pcm in [loud] * 50 + [bytes(320)] * 50]
+
+        async def source():
+            for frame in frames:
+                yield frame
+
+        async def events():
+            yield SimpleNamespace(
+                type=stt.SpeechEventType.FINAL_TRANSCRIPT,
+                alternatives=[
+                    SimpleNamespace(text="hello", confidence=0.9, start_time=0.0, end_time=0.5)
+                ],
+            )
+
+        clock = stt_pipeline.create_stream_clock()
+        stream = SimpleNamespace(push_frame=lambda f: None)
+        await stt_pipeline.forward_audio(source(), stream, clock)
+        _ = [r async for r in stt_pipeline.process_audio_stream(events(), clock)]
+
+        throughput = stt_pipeline.metrics.throughput.total
+        assert throughput.requests == 1
+        assert throughput.audio_ms == pytest.approx(500)  # the silence was not sent
+        assert throughput.bytes_sent == 50 * 320
+        assert throughput.bytes_received == 5
+        assert throughput.ttfb_sketch.count == 1
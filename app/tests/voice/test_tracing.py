@@ -0,0 +1,252 @@
+"""Tests for per-turn tracing."""
+
+import asyncio
+import json
+import queue
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from livekit import rtc
+
+from src.voice.config import ElevenLabsConfig
+from src.voice.tracing import (
+    InMemorySpanExporter,
+    JsonlFileExporter,
+    SpanStatus,
+    Tracer,
+    configure_tracing,
+    get_current_span,
+)
+from src.voice.tts_pipeline import TTSConfig, TTSPipeline
+from src.voice.turn_latency import (
+    SessionLatencyTracker,
+    TurnEvent,
+    current_turn_span,
+    session_latency_scope,
+)
+
+
+@pytest.fixture
+def exporter():
+    """Install an in-memory exporter on the process-wide tracer."""
+    memory_exporter = InMemorySpanExporter()
+    configure_tracing(memory_exporter)
+    yield memory_exporter
+    configure_tracing(None)
+
+
+class TestTracer:
+    """Tests for span creation and export."""
+
+    def test_context_manager_nests_spans(self) -> None:
+        """Test spans opened inside a span become its children."""
+        exporter = InMemorySpanExporter()
+        tracer = Tracer(exporter=exporter)
+
+        with tracer.span("parent", room="r1") as parent:
+            assert get_current_span() is parent
+            with tracer.span("child") as child:
+                pass
+
+        assert get_current_span() is None
+        assert child.trace_id == parent.trace_id
+        assert child.parent_span_id == parent.span_id
+        assert [s.name for s in exporter.spans] == ["child", "parent"]
+        assert parent.attributes == {"room": "r1"}
+
+    def test_exception_marks_span_failed(self) -> None:
+        """Test an exception inside a span is recorded and re-raised."""
+        exporter = InMemorySpanExporter()
+        tracer = Tracer(exporter=exporter)
+
+        with pytest.raises(RuntimeError):
+            with tracer.span("failing"):
+                raise RuntimeError("boom")
+
+        span = exporter.spans[0]
+        assert span.status == SpanStatus.ERROR
+        assert span.events[0]["name"] == "exception"
+
+    def test_cancellation_is_not_an_error(self) -> None:
+        """Test a cancelled span (e.g. barge-in) re-raises without an ERROR status."""
+        exporter = InMemorySpanExporter()
+        tracer = Tracer(exporter=exporter)
+
+        with pytest.raises(asyncio.CancelledError):
+            with tracer.span("interrupted"):
+                raise asyncio.CancelledError()
+
+        span = exporter.spans[0]
+        assert span.status == SpanStatus.UNSET
+        assert span.attributes["cancelled"] is True
+
+    def test_attributes_mapping(self) -> None:
+        """Test attributes can be passed as a mapping alongside keywords."""
+        span = Tracer().start_span("mapped", attributes={"parent": "x"}, count=2)
+        assert span.attributes == {"parent": "x", "count": 2}
+
+    def test_end_is_idempotent(self) -> None:
+        """Test ending a span twice exports it once."""
+        exporter = InMemorySpanExporter()
+        span = Tracer(exporter=exporter).start_span("once")
+        span.end()
+        span.end()
+        assert len(exporter.spans) == 1
+
+    def test_no_exporter_is_noop(self) -> None:
+        """Test spans still work when nothing is exported."""
+        with Tracer().span("quiet") as span:
+            span.set_attribute("text_length", 5)
+        assert span.is_ended
+        assert span.duration_ms >= 0.0
+
+    def test_otlp_encoding(self) -> None:
+        """Test attribute values use OTLP AnyValue encoding."""
+        span = Tracer().start_span("encode", flag=True, count=3, ratio=0.5, label="x")
+        span.end()
+        encoded = span.to_otlp()
+        values = {a["key"]: a["value"] for a in encoded["attributes"]}
+        assert values == {
+            "flag": {"boolValue": True},
+            "count": {"intValue": "3"},
+            "ratio": {"doubleValue": 0.5},
+            "label": {"stringValue": "x"},
+        }
+        assert "parentSpanId" not in encoded
+        assert len(encoded["traceId"]) == 32
+        assert len(encoded["spanId"]) == 16
+
+
+class TestJsonlFileExporter:
+    """Tests for the OTLP/JSON lines file exporter."""
+
+    def test_writes_export_requests(self, tmp_path) -> None:
+        """Test spans are written as ExportTraceServiceRequest lines."""
+        path = tmp_path / "traces.jsonl"
+        exporter = JsonlFileExporter(str(path), service_name="test-agent")
+        tracer = Tracer(exporter=exporter)
+
+        with tracer.span("turn"):
+            with tracer.span("llm"):
+                pass
+        exporter.shutdown()
+
+        lines = path.read_text().splitlines()
+        assert lines
+        requests = [json.loads(line) for line in lines]
+        resource_spans = requests[0]["resourceSpans"][0]
+        assert resource_spans["resource"]["attributes"][0]["value"] == {"stringValue": "test-agent"}
+        names = [
+            span["name"]
+            for request in requests
+            for span in request["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        ]
+        assert names == ["llm", "turn"]
+
+    def test_export_does_not_block(self, tmp_path) -> None:
+        """Test export only enqueues spans."""
+        exporter = JsonlFileExporter(str(tmp_path / "traces.jsonl"))
+        tracer = Tracer(exporter=exporter)
+
+        start = time.perf_counter()
+        for i in range(1000):
+            tracer.start_span("span", index=i).end()
+        elapsed = time.perf_counter() - start
+        exporter.shutdown()
+
+        assert elapsed < 1.0
+
+    def test_bad_path_fails_up_front(self, tmp_path) -> None:
+        """Test a file that cannot be opened raises in the constructor."""
+        with pytest.raises(OSError):
+            JsonlFileExporter(str(tmp_path / "missing" / "traces.jsonl"))
+
+    def test_full_queue_drops_spans(self, tmp_path) -> None:
+        """Test spans are dropped and counted once the queue is full."""
+        exporter = JsonlFileExporter(str(tmp_path / "traces.jsonl"), max_queue_size=1)
+        with patch.object(exporter._queue, "put_nowait", side_effect=queue.Full):
+            Tracer(exporter=exporter).start_span("dropped").end()
+        exporter.shutdown()
+        assert exporter.dropped_spans == 1
+
+
+class TestTurnSpans:
+    """Tests for spans produced by the session latency tracker."""
+
+    def test_completed_turn_exports_trace(self, exporter) -> None:
+        """Test a full turn exports root, VAD and publication spans."""
+        tracker = SessionLatencyTracker(room_name="room-a", participant_identity="user-1")
+        now = time.perf_counter()
+        tracker.mark(TurnEvent.USER_STOPPED_SPEAKING, at=now - 1.0)
+        tracker.mark(TurnEvent.FINAL_TRANSCRIPT, at=now - 0.7)
+        tracker.mark(TurnEvent.LLM_FIRST_TOKEN, at=now - 0.5)
+        tracker.mark(TurnEvent.TTS_FIRST_FRAME, at=now - 0.1)
+        tracker.mark(TurnEvent.AGENT_STARTED_SPEAKING, at=now)
+
+        root = exporter.by_name("turn")[0]
+        vad = exporter.by_name("vad.end_of_speech")[0]
+        publish = exporter.by_name("room.publish")[0]
+
+        assert root.attributes["room"] == "room-a"
+        assert root.attributes["participant"] == "user-1"
+        assert root.attributes["latency.total_ms"] == pytest.approx(1000, abs=1)
+        assert root.duration_ms == pytest.approx(1000, abs=5)
+        assert vad.parent_span_id == root.span_id
+        assert publish.parent_span_id == root.span_id
+        assert publish.duration_ms == pytest.approx(100, abs=5)
+        assert root.attributes["latency.tts_estimated"] is False
+
+    def test_abandoned_turn_is_flagged(self, exporter) -> None:
+        """Test a turn without a reply ends its span as abandoned."""
+        tracker = SessionLatencyTracker(room_name="room-a")
+        tracker.mark(TurnEvent.USER_STOPPED_SPEAKING)
+        tracker.mark(TurnEvent.USER_STOPPED_SPEAKING)
+
+        roots = exporter.by_name("turn")
+        assert len(roots) == 1
+        assert roots[0].attributes["turn.abandoned"] is True
+
+    def test_current_turn_span_follows_session(self, exporter) -> None:
+        """Test stages find the in-flight turn span through the context."""
+        assert current_turn_span() is None
+        with session_latency_scope("room-b") as tracker:
+            assert current_turn_span() is None
+            tracker.mark(TurnEvent.USER_STOPPED_SPEAKING)
+            root = current_turn_span()
+            assert root is not None
+
+            with Tracer(exporter=exporter).span("llm", parent=current_turn_span()) as llm:
+                pass
+            assert llm.trace_id == root.trace_id
+            assert llm.parent_span_id == root.span_id
+
+
+class TestPipelineSpans:
+    """Tests for spans emitted by the TTS pipeline."""
+
+    @patch("src.voice.tts_pipeline.elevenlabs.TTS")
+    async def test_synthesize_stream_span(self, mock_tts_class: MagicMock, exporter) -> None:
+        """Test streaming synthesis records first byte and completion under the turn."""
+        chunk = MagicMock()
+        chunk.frame = rtc.AudioFrame(b"\x00\x01" * 100, 24000, 1, 100)
+
+        async def _stream():
+            yield chunk
+            yield chunk
+
+        mock_tts_class.return_value.synthesize.return_value = _stream()
+        with patch.dict("os.environ", {"ELEVENLABS_API_KEY": "test_key"}):
+            pipeline = TTSPipeline(config=TTSConfig(elevenlabs_config=ElevenLabsConfig()))
+
+        with session_latency_scope("room-c") as tracker:
+            tracker.mark(TurnEvent.USER_STOPPED_SPEAKING)
+            root = current_turn_span()
+            async for _ in pipeline.synthesize_stream("Hello there"):
+                pass
+
+        span = exporter.by_name("tts.synthesize_stream")[0]
+        assert span.parent_span_id == root.span_id
+        assert span.attributes["text_length"] == len("Hello there")
+        assert span.attributes["audio_bytes"] == 400
+        assert [e["name"] for e in span.events] == ["first_byte"]
@@ -0,0 +1,226 @@
+"""Tests for the synthesized audio cache."""
+
+import asyncio
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+from livekit import rtc
+
+from src.utils.lru import LRUCache
+from src.voice.config import ElevenLabsConfig
+from src.voice.tts_cache import DiskAudioCache, TTSCache, cache_key, normalize_text
+from src.voice.tts_pipeline import TTSConfig, TTSMetrics, TTSPipeline
+
+
+def _provider_stream(calls: list, payload: bytes = b"\x01\x02" * 480):
+    """Fake ElevenLabs synthesize() returning two chunks per call."""
+
+    async def synthesize(text):
+        calls.append(text)
+        for _ in range(2):
+            chunk = MagicMock()
+            chunk.frame = rtc.AudioFrame(payload, 24000, 1, len(payload) // 2)
+            yield chunk
+
+    return synthesize
+
+
+@pytest.fixture
+def pipeline_factory(tmp_path):
+    """Build TTS pipelines with a mocked provider."""
+
+    def build(**config_kwargs) -> tuple[TTSPipeline, list]:
+        with patch("src.voice.tts_pipeline.elevenlabs.TTS"):
+            pipeline = TTSPipeline(
+                config=TTSConfig(elevenlabs_config=ElevenLabsConfig(), **config_kwargs)
+            )
+        calls: list = []
+        pipeline._tts = MagicMock(synthesize=_provider_stream(calls))
+        return pipeline, calls
+
+    return build
+
+
+class TestLRUCache:
+    """Tests for the size-bounded LRU."""
+
+    def test_evicts_least_recently_used(self) -> None:
+        """Test the oldest untouched entry is evicted first."""
+        cache = LRUCache(max_size=10)
+        cache.put("a", b"1234")
+        cache.put("b", b"1234")
+        cache.get("a")
+        cache.put("c", b"1234")
+        assert "a" in cache and "c" in cache
+        assert "b" not in cache
+        assert cache.size == 8
+        assert cache.evictions == 1
+
+    def test_rejects_oversized_values(self) -> None:
+        """Test a value larger than the budget is not cached."""
+        cache = LRUCache(max_size=4)
+        assert cache.put("big", b"12345") is False
+        assert len(cache) == 0
+
+    def test_entries_expire_after_ttl(self) -> None:
+        """Test entries are dropped once their TTL has passed."""
+        now = [0.0]
+        cache = LRUCache(max_size=10, ttl_s=5, clock=lambda: now[0])
+        cache.put("a", b"1234")
+        now[0] = 4.9
+        assert cache.get("a") == b"1234"
+        now[0] = 5.0
+        assert cache.get("a") is None
+        assert cache.size == 0
+        assert cache.expirations == 1
+
+
+class TestCacheKey:
+    """Tests for content addressing."""
+
+    def test_whitespace_normalized(self) -> None:
+        """Test spacing differences share a key."""
+        assert normalize_text("  Hello\n  there ") == "Hello there"
+        assert cache_key("Hello  there", "v", "m", 24000) == cache_key(
+            "Hello there ", "v", "m", 24000
+        )
+
+    def test_voice_parameters_change_key(self) -> None:
+        """Test every parameter that changes the audio changes the key."""
+        base = cache_key("Hi", "v", "m", 24000, {"stability": 0.5})
+        assert base != cache_key("Hi", "v2", "m", 24000, {"stability": 0.5})
+        assert base != cache_key("Hi", "v", "m2", 24000, {"stability": 0.5})
+        assert base != cache_key("Hi", "v", "m", 16000, {"stability": 0.5})
+        assert base != cache_key("Hi", "v", "m", 24000, {"stability": 0.6})
+        assert base != cache_key("hi", "v", "m", 24000, {"stability": 0.5})
+
+
+class TestTTSCache:
+    """Tests for the two-tier cache."""
+
+    def test_memory_then_disk(self, tmp_path) -> None:
+        """Test entries survive a dropped memory tier via the disk tier."""
+        cache = TTSCache(directory=str(tmp_path))
+        cache.put("k", b"audio")
+        assert cache.get("k") == b"audio"
+        assert cache.memory_hits == 1
+
+        cache.clear_memory()
+        hit = cache.get("k")
+        assert isinstance(hit, memoryview)
+        assert bytes(hit) == b"audio"
+        assert cache.disk_hits == 1
+
+    def test_shared_directory(self, tmp_path) -> None:
+        """Test a second cache (another worker) sees entries on disk."""
+        TTSCache(directory=str(tmp_path)).put("k", b"audio")
+        assert bytes(TTSCache(directory=str(tmp_path)).get("k")) == b"audio"
+
+    def test_miss(self) -> None:
+        """Test unknown keys count as misses."""
+        cache = TTSCache()
+        assert cache.get("missing") is None
+        assert cache.misses == 1
+
+    def test_disk_size_bound(self, tmp_path) -> None:
+        """Test the disk tier deletes least recently used files past its bound."""
+        disk = DiskAudioCache(str(tmp_path), max_bytes=10)
+        disk.put("old", b"123456")
+        os.utime(tmp_path / "old.pcm", (1, 1))
+        disk.put("new", b"123456")
+        assert disk.get("old") is None
+        assert disk.get("new") is not None
+        assert disk.size_bytes == 6
+
+    def test_scans_only_past_bound(self, tmp_path) -> None:
+        """Test the directory is scanned only when the running total passes the bound."""
+        disk = DiskAudioCache(str(tmp_path), max_bytes=10)
+        with patch("src.voice.tts_cache.os.scandir", wraps=os.scandir) as scandir:
+            disk.put("a", b"1234")
+            disk.put("b", b"1234")
+            assert scandir.call_count == 0
+            disk.put("c", b"1234")
+            assert scandir.call_count == 1
+        assert disk.size_bytes == 8
+
+    def test_unreadable_entry_is_a_miss(self, tmp_path) -> None:
+        """Test an entry that cannot be opened is a miss, not an error."""
+        disk = DiskAudioCache(str(tmp_path))
+        os.mkdir(tmp_path / "k.pcm")
+        assert disk.get("k") is None
+
+    async def test_disk_write_off_event_loop(self, tmp_path) -> None:
+        """Test put() from the event loop hands the disk write to a thread."""
+        cache = TTSCache(directory=str(tmp_path))
+        with patch("src.voice.tts_cache.asyncio.to_thread", wraps=asyncio.to_thread) as to_thread:
+            cache.put("k", b"audio")
+        to_thread.assert_called_once()
+        assert cache.get("k") == b"audio"
+
+        await cache.wait_for_writes()
+        assert (tmp_path / "k.pcm").read_bytes() == b"audio"
+
+
+class TestPipelineCache:
+    """Tests for caching in TTSPipeline."""
+
+    async def test_synthesize_hits_cache(self, pipeline_factory) -> None:
+        """Test repeated text is served from the cache."""
+        pipeline, calls = pipeline_factory()
+        first = await pipeline.synthesize("Hello! I'm the LaunchPad voice assistant.")
+        second = await pipeline.synthesize("Hello!  I'm the LaunchPad voice assistant.")
+
+        assert len(calls) == 1
+        assert second.audio_data == first.audio_data
+        assert pipeline.metrics.cache_hits == 1
+        assert pipeline.metrics.cache_misses == 1
+        assert pipeline.metrics.cache_hit_rate == 0.5
+        assert pipeline.metrics.total_syntheses == 1
+
+    async def test_segment_requests_cache_the_utterance(self, pipeline_factory) -> None:
+        """Test per-sentence requests count one miss and cache the utterance, not sentences."""
+        pipeline, calls = pipeline_factory(segment_requests=True)
+        text = "This is sentence one. This is sentence two."
+        await pipeline.synthesize(text)
+
+        assert len(calls) == 2
+        assert pipeline.metrics.cache_misses == 1
+        assert pipeline.cache.get(pipeline._cache_key("This is sentence one.")) is None
+        assert pipeline.cache.get(pipeline._cache_key(text)) is not None
+
+    async def test_hit_and_miss_share_cached_audio(self, pipeline_factory) -> None:
+        """Test a hit returns the cached buffer, as the miss that stored it did."""
+        pipeline, _ = pipeline_factory()
+        first = await pipeline.synthesize("Hello.")
+        second = await pipeline.synthesize("Hello.")
+        assert second.audio_data is first.audio_data
+
+    async def test_stream_hit_from_disk(self, pipeline_factory, tmp_path) -> None:
+        """Test a streamed miss populates the cache and hits stream in fixed chunks."""
+        pipeline, calls = pipeline_factory(cache_dir=str(tmp_path), cache_chunk_ms=10)
+        streamed = b"".join([c async for c in pipeline.synthesize_stream("One moment please")])
+
+        await pipeline.cache.wait_for_writes()
+        pipeline.cache.clear_memory()
+        chunks = [c async for c in pipeline.synthesize_stream("One moment please")]
+
+        assert len(calls) == 1
+        assert b"".join(chunks) == streamed
+        # 10ms of 24kHz 16-bit mono audio
+        assert len(chunks[0]) == 480
+        assert pipeline.cache.disk_hits == 1
+
+    async def test_cache_disabled(self, pipeline_factory) -> None:
+        """Test caching can be turned off."""
+        pipeline, calls = pipeline_factory(cache_enabled=False)
+        await pipeline.synthesize("Hello")
+        await pipeline.synthesize("Hello")
+        assert len(calls) == 2
+        assert pipeline.metrics.cache_hits == pipeline.metrics.cache_misses == 0
+
+    def test_rates_without_lookups(self) -> None:
+        """Test rates are zero before any lookup."""
+        metrics = TTSMetrics()
+        assert metrics.cache_hit_rate == 0.0
+        assert metrics.cache_miss_rate == 0.0
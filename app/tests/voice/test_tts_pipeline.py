@@ -1,17 +1,25 @@
 """Tests for Text-to-Speech pipeline."""
 
+import asyncio
+from dataclasses import replace
+from unittest.mock import MagicMock, patch
+
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+from livekit import rtc
 
+from src.utils.buffer_pool import BufferPool
+from src.voice.clock import monotonic
+from src.voice.config import ElevenLabsConfig
+from src.voice.resilience import CircuitBreaker, CircuitState
+from src.voice.tts_cache import TTSCache
 from src.voice.tts_pipeline import (
-    TTSPipeline,
-    TTSConfig,
-    TTSMetrics,
     SynthesisResult,
     SynthesisState,
+    TTSConfig,
+    TTSMetrics,
+    TTSPipeline,
     create_tts_pipeline,
 )
-from src.voice.config import ElevenLabsConfig
 
 
 @pytest.fixture
@@ -106,18 +114,14 @@ class TestTTSPipeline:
         mock_tts_class.assert_called_once()
 
     @patch("src.voice.tts_pipeline.elevenlabs.TTS")
-    def test_get_metrics(
-        self, mock_tts_class: MagicMock, tts_config: TTSConfig
-    ) -> None:
+    def test_get_metrics(self, mock_tts_class: MagicMock, tts_config: TTSConfig) -> None:
         """Test getting metrics."""
         pipeline = TTSPipeline(config=tts_config)
         metrics = pipeline.get_metrics()
         assert isinstance(metrics, TTSMetrics)
 
     @patch("src.voice.tts_pipeline.elevenlabs.TTS")
-    def test_reset_metrics(
-        self, mock_tts_class: MagicMock, tts_config: TTSConfig
-    ) -> None:
+    def test_reset_metrics(self, mock_tts_class: MagicMock, tts_config: TTSConfig) -> None:
         """Test resetting metrics."""
         pipeline = TTSPipeline(config=tts_config)
         pipeline.metrics.total_syntheses = 100
@@ -125,9 +129,7 @@ class TestTTSPipeline:
         assert pipeline.metrics.total_syntheses == 0
 
     @patch("src.voice.tts_pipeline.elevenlabs.TTS")
-    def test_tts_instance_property(
-        self, mock_tts_class: MagicMock, tts_config: TTSConfig
-    ) -> None:
+    def test_tts_instance_property(self, mock_tts_class: MagicMock, tts_config: TTSConfig) -> None:
         """Test TTS instance property."""
         pipeline = TTSPipeline(config=tts_config)
         assert pipeline.tts_instance is not None
@@ -179,3 +181,340 @@ class TestCreateTTSPipeline:
         """Test factory creates pipeline with custom config."""
         pipeline = create_tts_pipeline(config=tts_config)
         assert pipeline.config == tts_config
+
+
+@pytest.fixture
+def segment_pipeline(tts_config: TTSConfig) -> TTSPipeline:
+    """Pipeline whose fake provider returns one byte pattern per sentence."""
+    with patch("src.voice.tts_pipeline.elevenlabs.TTS"):
+        pipeline = TTSPipeline(config=replace(tts_config, cache_enabled=False))
+    pipeline.active = 0
+    pipeline.peak = 0
+    pipeline.calls = []
+
+    async def synthesize(text):
+        pipeline.calls.append(text)
+        pipeline.active += 1
+        pipeline.peak = max(pipeline.peak, pipeline.active)
+        try:
+            # Later sentences finish first, to check output stays ordered
+            await asyncio.sleep(0.05 - 0.01 * len(pipeline.calls))
+            chunk = MagicMock()
+            chunk.frame = rtc.AudioFrame(text[-2:-1].encode() * 960, 24000, 1, 480)
+            yield chunk
+        finally:
+            pipeline.active -= 1
+
+    pipeline._tts = MagicMock(synthesize=synthesize)
+    return pipeline
+
+
+class TestSegmentedSynthesis:
+    """Tests for sentence-pipelined synthesis."""
+
+    TEXT = "This is sentence one. This is sentence two. This is sentence three. Then four."
+
+    async def test_audio_streamed_in_order(self, segment_pipeline: TTSPipeline) -> None:
+        """Test segment audio is yielded in text order despite finishing out of order."""
+        audio = b"".join([c async for c in segment_pipeline.synthesize_segmented(self.TEXT)])
+        assert audio == b"e" * 960 + b"o" * 960 + b"e" * 960 + b"r" * 960
+        assert len(segment_pipeline.calls) == 4
+
+    async def test_single_request_when_not_segmented(self, segment_pipeline: TTSPipeline) -> None:
+        """Test synthesize() and streaming send the text whole with segment_requests off."""
+        segment_pipeline.config.segment_requests = False
+        await segment_pipeline.synthesize(self.TEXT)
+        async for _ in segment_pipeline.synthesize_stream(self.TEXT):
+            pass
+        assert segment_pipeline.calls == [self.TEXT, self.TEXT]
+
+    async def test_duration_uses_channel_count(self, segment_pipeline: TTSPipeline) -> None:
+        """Test duration counts frames of all channels, not 16-bit mono samples."""
+        segment_pipeline.config = replace(segment_pipeline.config, num_channels=2)
+        result = await segment_pipeline.synthesize("Hello there.")
+        # 960 bytes of 16-bit stereo at 24kHz
+        assert result.duration_ms == 10.0
+        assert result.num_channels == 2
+
+    async def test_concurrency_bounded(self, segment_pipeline: TTSPipeline) -> None:
+        """Test no more than max_concurrency segments are in flight."""
+        async for _ in segment_pipeline.synthesize_segmented(self.TEXT, max_concurrency=2):
+            pass
+        assert segment_pipeline.peak == 2
+
+    async def test_metrics(self, segment_pipeline: TTSPipeline) -> None:
+        """Test per-segment TTFB and parallelism are recorded."""
+        async for _ in segment_pipeline.synthesize_segmented(self.TEXT, max_concurrency=4):
+            pass
+        metrics = segment_pipeline.metrics
+        assert metrics.segmented_syntheses == 1
+        assert metrics.segments_synthesized == 4
+        assert metrics.segment_ttfb_sketch.count == 4
+        assert metrics.segment_parallelism > 1.5
+        assert metrics.successful_syntheses == 1
+
+    async def test_segment_failure_raises(self, segment_pipeline: TTSPipeline) -> None:
+        """Test a segment failing after its retries fails the stream."""
+        segment_pipeline.resilience.max_retries = 0
+        segment_pipeline.resilience.breaker = MagicMock()
+
+        async def failing(text):
+            raise ConnectionError("provider down")
+            yield  # pragma: no cover
+
+        segment_pipeline._tts = MagicMock(synthesize=failing)
+        with pytest.raises(RuntimeError, match="TTS synthesis failed"):
+            async for _ in segment_pipeline.synthesize_segmented(self.TEXT):
+                pass
+        assert segment_pipeline.metrics.failed_syntheses == 1
+
+
+class TestTextStreamSynthesis:
+    """Tests for synthesizing text while it is still being generated."""
+
+    async def test_speaks_before_generation_finishes(self, segment_pipeline: TTSPipeline) -> None:
+        """Test the first sentence is audible while the LLM is still generating."""
+        first_audio = asyncio.Event()
+        generated = []
+
+        async def llm_tokens():
+            for token in ["Hello there, ", "this is the ", "first sentence. ", "And then"]:
+                generated.append(token)
+                yield token
+            await first_audio.wait()
+            for token in [" the second one."]:
+                generated.append(token)
+                yield token
+
+        chunks = []
+        async for chunk in segment_pipeline.synthesize_text_stream(llm_tokens()):
+            if not chunks:
+                assert len(generated) == 4
+                first_audio.set()
+            chunks.append(chunk)
+
+        assert segment_pipeline.calls == [
+            "Hello there, this is the first sentence.",
+            "And then the second one.",
+        ]
+        assert segment_pipeline.metrics.first_text_to_audio_sketch.count == 1
+        assert segment_pipeline.metrics.average_first_text_to_audio_ms > 0
+
+    async def test_flush_and_close(self, segment_pipeline: TTSPipeline) -> None:
+        """Test flush speaks an incomplete phrase and close ends the stream."""
+        sink = segment_pipeline.create_text_sink()
+        audio = segment_pipeline.synthesize_text_stream(sink)
+        sink.push("Let me look that up")
+        sink.flush()
+        first = await audio.__anext__()
+        assert first == b"u" * 960
+        sink.close()
+        assert [c async for c in audio] == []
+        assert segment_pipeline.calls == ["Let me look that up"]
+        with pytest.raises(RuntimeError, match="closed"):
+            sink.push("more")
+
+    async def test_cancel_stops_audio(self, segment_pipeline: TTSPipeline) -> None:
+        """Test cancel drops unspoken text and ends the audio stream."""
+        sink = segment_pipeline.create_text_sink()
+        sink.push("This is the first sentence. ")
+        audio = segment_pipeline.synthesize_text_stream(sink)
+        await audio.__anext__()
+        sink.push("This one is never spoken. ")
+        sink.cancel()
+        assert [c async for c in audio] == []
+        assert segment_pipeline.calls == ["This is the first sentence."]
+
+    async def test_input_error_propagates(self, segment_pipeline: TTSPipeline) -> None:
+        """Test an LLM stream failure reaches the audio consumer unwrapped."""
+
+        async def llm_tokens():
+            yield "Partial answer"
+            raise ConnectionError("llm stream dropped")
+
+        with pytest.raises(ConnectionError, match="llm stream dropped"):
+            async for _ in segment_pipeline.synthesize_text_stream(llm_tokens()):
+                pass
+        assert segment_pipeline.metrics.failed_syntheses == 1
+
+
+class TestCheckpointResume:
+    """Tests for resuming failed syntheses from the last delivered segment."""
+
+    TEXT = "This is sentence one. This is sentence two. This is sentence three."
+
+    @pytest.fixture
+    def flaky_pipeline(self, tts_config: TTSConfig) -> TTSPipeline:
+        """Pipeline whose provider drops the second sentence mid-stream once."""
+        with patch("src.voice.tts_pipeline.elevenlabs.TTS"):
+            pipeline = TTSPipeline(config=replace(tts_config, cache_enabled=False))
+        pipeline.resilience.breaker = CircuitBreaker(provider="elevenlabs")
+        pipeline.resilience.base_delay = pipeline.resilience.max_delay = 0.001
+        pipeline.calls = []
+        pipeline.failures_left = 1
+
+        async def synthesize(text):
+            pipeline.calls.append(text)
+            for _ in range(2):
+                chunk = MagicMock()
+                chunk.frame = rtc.AudioFrame(text[-2:-1].encode() * 480, 24000, 1, 240)
+                yield chunk
+                if "two" in text and pipeline.failures_left:
+                    pipeline.failures_left -= 1
+                    raise ConnectionError("connection reset")
+
+        pipeline._tts = MagicMock(synthesize=synthesize)
+        return pipeline
+
+    async def test_stream_resumes_at_failed_segment(self, flaky_pipeline: TTSPipeline) -> None:
+        """Test by default a mid-stream failure requests one sentence again, not the utterance."""
+        audio = b"".join([c async for c in flaky_pipeline.synthesize_stream(self.TEXT)])
+
+        assert flaky_pipeline.calls == [
+            "This is sentence one.",
+            "This is sentence two.",
+            "This is sentence two.",
+            "This is sentence three.",
+        ]
+        # Sentence one is kept; sentence two is played again from its start
+        assert audio == b"e" * 960 + b"o" * 480 + b"o" * 960 + b"e" * 960
+        assert flaky_pipeline.metrics.stream_resumes == 1
+        assert flaky_pipeline.metrics.resume_replayed_bytes == 480
+        assert flaky_pipeline.metrics.successful_syntheses == 1
+
+    async def test_stream_gives_up_after_retries(self, flaky_pipeline: TTSPipeline) -> None:
+        """Test resumes are bounded by max_retries."""
+        flaky_pipeline.failures_left = 5
+        with pytest.raises(ConnectionError):
+            async for _ in flaky_pipeline.synthesize_stream(self.TEXT, max_retries=1):
+                pass
+        assert flaky_pipeline.metrics.stream_resumes == 1
+        assert flaky_pipeline.metrics.failed_syntheses == 1
+
+    async def test_unsegmented_stream_replays_utterance(self, flaky_pipeline: TTSPipeline) -> None:
+        """Test without segment_requests a resume plays the new render whole, unspliced."""
+        flaky_pipeline.config.segment_requests = False
+        text = "This is sentence one and two."
+        audio = b"".join([c async for c in flaky_pipeline.synthesize_stream(text)])
+
+        assert flaky_pipeline.calls == [text, text]
+        assert audio == b"o" * 480 + b"o" * 960
+        assert flaky_pipeline.metrics.resume_replayed_bytes == 480
+
+    async def test_resumed_stream_caches_clean_audio(self, flaky_pipeline: TTSPipeline) -> None:
+        """Test the cached utterance holds each sentence once, without the interrupted attempt."""
+        flaky_pipeline.cache = TTSCache()
+        async for _ in flaky_pipeline.synthesize_stream(self.TEXT):
+            pass
+        cached = flaky_pipeline.cache.get(flaky_pipeline._cache_key(self.TEXT))
+        assert cached == b"e" * 960 + b"o" * 960 + b"e" * 960
+
+    async def test_synthesize_retries_only_failed_segment(
+        self, flaky_pipeline: TTSPipeline
+    ) -> None:
+        """Test single-shot synthesis keeps completed segments on a retry."""
+        flaky_pipeline.resilience.hedge = False
+        result = await flaky_pipeline.synthesize(self.TEXT)
+
+        assert sorted(flaky_pipeline.calls) == sorted(
+            [
+                "This is sentence one.",
+                "This is sentence two.",
+                "This is sentence two.",
+                "This is sentence three.",
+            ]
+        )
+        assert result.audio_data == b"e" * 960 + b"o" * 960 + b"e" * 960
+
+    @staticmethod
+    def _half_open(pipeline: TTSPipeline) -> CircuitBreaker:
+        breaker = pipeline.resilience.breaker = CircuitBreaker(
+            provider="elevenlabs", failure_threshold=1, recovery_timeout_s=5.0
+        )
+        # Opened long enough ago to let a probe through now
+        breaker.record_failure(now=monotonic() - 10)
+        return breaker
+
+    async def test_closed_stream_releases_probe(self, flaky_pipeline: TTSPipeline) -> None:
+        """Test a probing stream closed early (barge-in) lets the next call probe."""
+        breaker = self._half_open(flaky_pipeline)
+        stream = flaky_pipeline.synthesize_frames(self.TEXT)
+        await anext(stream)
+        await stream.aclose()
+
+        assert breaker.state == CircuitState.HALF_OPEN
+        assert breaker.allow_request() is True
+
+    async def test_caller_error_releases_probe(self, flaky_pipeline: TTSPipeline) -> None:
+        """Test a probing stream failing on a caller error does not wedge the circuit."""
+        breaker = self._half_open(flaky_pipeline)
+
+        async def rejected(text):
+            raise ValueError("bad voice settings")
+            yield
+
+        flaky_pipeline._tts = MagicMock(synthesize=rejected)
+        with pytest.raises(ValueError):
+            async for _ in flaky_pipeline.synthesize_stream(self.TEXT, max_retries=0):
+                pass
+
+        assert breaker.state == CircuitState.HALF_OPEN
+        assert breaker.allow_request() is True
+
+
+class TestFrameAPI:
+    """Tests for zero-copy frame streaming."""
+
+    async def test_frames_are_views_over_provider_buffers(
+        self, segment_pipeline: TTSPipeline
+    ) -> None:
+        """Test synthesize_frames yields views, not copies, of the provider frames."""
+        frames = []
+
+        async def synthesize(text):
+            for _ in range(2):
+                chunk = MagicMock()
+                chunk.frame = rtc.AudioFrame(b"\x01\x00" * 480, 24000, 1, 480)
+                frames.append(chunk.frame)
+                yield chunk
+
+        segment_pipeline._tts = MagicMock(synthesize=synthesize)
+        views = [v async for v in segment_pipeline.synthesize_frames("Hello there")]
+
+        assert all(isinstance(view, memoryview) for view in views)
+        assert [view.obj for view in views] == [frame.data.obj for frame in frames]
+
+    async def test_synthesize_collects_into_one_buffer(self, segment_pipeline: TTSPipeline) -> None:
+        """Test single-shot synthesis returns the collector's buffer."""
+        result = await segment_pipeline.synthesize("Hello there")
+        assert isinstance(result.audio_data, bytearray)
+        assert result.audio_data == b"r" * 960
+
+    async def test_segment_buffers_return_to_pool(self, segment_pipeline: TTSPipeline) -> None:
+        """Test uncached segment audio is borrowed from the pool and returned."""
+        pool = segment_pipeline.buffer_pool = BufferPool()
+        segment_pipeline.config.segment_requests = True
+        text = "This is sentence one. This is sentence two. This is sentence three."
+
+        await segment_pipeline.synthesize(text)
+        async for _ in segment_pipeline.synthesize_segmented(text):
+            pass
+
+        assert pool.metrics.acquired == 6
+        assert pool.metrics.outstanding == 0
+        assert pool.metrics.hits == 3
+
+    async def test_cached_segments_use_the_pool(self, segment_pipeline: TTSPipeline) -> None:
+        """Test with a cache, misses still borrow from the pool and hits are not released."""
+        pool = segment_pipeline.buffer_pool = BufferPool()
+        segment_pipeline.cache = TTSCache()
+        text = "This is sentence one. This is sentence two. This is sentence three."
+
+        first = b"".join([c async for c in segment_pipeline.synthesize_segmented(text)])
+        second = b"".join([c async for c in segment_pipeline.synthesize_segmented(text)])
+
+        assert second == first
+        assert len(segment_pipeline.calls) == 3
+        assert pool.metrics.acquired == 3
+        assert pool.metrics.released == 3
+        assert pool.metrics.outstanding == 0
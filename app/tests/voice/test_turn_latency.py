@@ -0,0 +1,176 @@
+"""Tests for per-session, per-turn latency tracking."""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.voice.audio_quality import LatencyTracker
+from src.voice.turn_latency import (
+    SessionLatencyTracker,
+    TurnEvent,
+    TurnTimeline,
+    get_session_tracker,
+    mark_turn_event,
+    session_latency_scope,
+)
+
+
+def _run_turn(tracker: SessionLatencyTracker, start: float = 100.0):
+    """Mark a full turn with fixed timestamps (seconds)."""
+    tracker.mark(TurnEvent.USER_STOPPED_SPEAKING, at=start)
+    tracker.mark(TurnEvent.FINAL_TRANSCRIPT, at=start + 0.3)
+    tracker.mark(TurnEvent.LLM_FIRST_TOKEN, at=start + 0.5)
+    tracker.mark(TurnEvent.TTS_FIRST_FRAME, at=start + 0.9)
+    return tracker.mark(TurnEvent.AGENT_STARTED_SPEAKING, at=start + 1.0)
+
+
+class TestTurnTimeline:
+    """Tests for the per-turn timeline."""
+
+    def test_first_mark_wins(self) -> None:
+        """Test a repeated mark does not overwrite the first one."""
+        turn = TurnTimeline(turn_id=1)
+        assert turn.mark(TurnEvent.FINAL_TRANSCRIPT, at=1.0) is True
+        assert turn.mark(TurnEvent.FINAL_TRANSCRIPT, at=2.0) is False
+        assert turn.marks[TurnEvent.FINAL_TRANSCRIPT] == 1.0
+
+    def test_missing_marks_yield_zero(self) -> None:
+        """Test phases without both marks report 0ms."""
+        turn = TurnTimeline(turn_id=1)
+        turn.mark(TurnEvent.USER_STOPPED_SPEAKING, at=1.0)
+        turn.mark(TurnEvent.AGENT_STARTED_SPEAKING, at=2.0)
+        latency = turn.to_pipeline_latency()
+        assert latency.stt_latency_ms == 0.0
+        assert latency.total_latency_ms == pytest.approx(1000.0)
+
+    def test_tts_falls_back_to_agent_speaking(self) -> None:
+        """Test TTS latency uses agent start when no first frame was marked."""
+        turn = TurnTimeline(turn_id=1)
+        turn.mark(TurnEvent.LLM_FIRST_TOKEN, at=1.0)
+        turn.mark(TurnEvent.AGENT_STARTED_SPEAKING, at=1.25)
+        assert turn.to_pipeline_latency().tts_latency_ms == pytest.approx(250.0)
+
+
+class TestSessionLatencyTracker:
+    """Tests for the session-scoped tracker."""
+
+    def test_full_turn_breakdown(self) -> None:
+        """Test a complete turn produces the expected phase breakdown."""
+        tracker = SessionLatencyTracker(room_name="room-a")
+        latency = _run_turn(tracker)
+
+        assert latency is not None
+        assert latency.stt_latency_ms == pytest.approx(300.0)
+        assert latency.processing_latency_ms == pytest.approx(200.0)
+        assert latency.tts_latency_ms == pytest.approx(400.0)
+        assert latency.total_latency_ms == pytest.approx(1000.0)
+        assert tracker.completed_turns == 1
+        assert tracker.current_turn is None
+
+    def test_one_measurement_per_turn(self) -> None:
+        """Test every turn is recorded separately."""
+        tracker = SessionLatencyTracker(room_name="room-a")
+        for i in range(3):
+            _run_turn(tracker, start=10.0 * i)
+        assert tracker.session.get_average_latencies()["sample_count"] == 3
+
+    def test_events_without_turn_are_ignored(self) -> None:
+        """Test the greeting (no user turn) does not record a measurement."""
+        tracker = SessionLatencyTracker(room_name="room-a")
+        assert tracker.mark(TurnEvent.AGENT_STARTED_SPEAKING) is None
+        assert tracker.completed_turns == 0
+
+    def test_interrupted_turn_is_abandoned(self) -> None:
+        """Test a new user turn abandons one that never got a reply."""
+        tracker = SessionLatencyTracker(room_name="room-a")
+        tracker.mark(TurnEvent.USER_STOPPED_SPEAKING, at=1.0)
+        tracker.mark(TurnEvent.USER_STOPPED_SPEAKING, at=2.0)
+        assert tracker.abandoned_turns == 1
+        assert tracker.current_turn is not None
+        assert tracker.current_turn.turn_id == 2
+
+    def test_sessions_share_aggregate_without_interference(self) -> None:
+        """Test interleaved sessions keep separate in-flight state."""
+        aggregate = LatencyTracker()
+        room_a = SessionLatencyTracker(room_name="room-a", aggregate=aggregate)
+        room_b = SessionLatencyTracker(room_name="room-b", aggregate=aggregate)
+
+        room_a.mark(TurnEvent.USER_STOPPED_SPEAKING, at=0.0)
+        room_b.mark(TurnEvent.USER_STOPPED_SPEAKING, at=0.5)
+        latency_a = room_a.mark(TurnEvent.AGENT_STARTED_SPEAKING, at=1.0)
+        latency_b = room_b.mark(TurnEvent.AGENT_STARTED_SPEAKING, at=3.5)
+
+        assert latency_a.total_latency_ms == pytest.approx(1000.0)
+        assert latency_b.total_latency_ms == pytest.approx(3000.0)
+        assert aggregate.get_average_latencies()["sample_count"] == 2
+        assert room_a.session.get_average_latencies()["sample_count"] == 1
+
+    def test_attach_subscribes_to_assistant_events(self) -> None:
+        """Test attach registers the expected VoiceAssistant handlers."""
+        tracker = SessionLatencyTracker(room_name="room-a")
+        assistant = MagicMock()
+        tracker.attach(assistant)
+        events = {call.args[0] for call in assistant.on.call_args_list}
+        assert events == {
+            "user_stopped_speaking",
+            "agent_started_speaking",
+            "metrics_collected",
+        }
+
+    def test_pipeline_metrics_reconstruct_marks(self) -> None:
+        """Test EOU and TTS metrics are translated into turn marks."""
+        tracker = SessionLatencyTracker(room_name="room-a")
+        tracker.mark(TurnEvent.USER_STOPPED_SPEAKING, at=10.0)
+        eou_metrics = MagicMock(spec=["transcription_delay"], transcription_delay=0.2)
+        tracker._on_pipeline_metrics(eou_metrics)
+        tracker.mark(TurnEvent.LLM_FIRST_TOKEN, at=10.4)
+        tracker._on_pipeline_metrics(MagicMock(spec=["ttfb"], ttfb=0.3))
+
+        marks = tracker.current_turn.marks
+        assert marks[TurnEvent.FINAL_TRANSCRIPT] == pytest.approx(10.2)
+        assert marks[TurnEvent.TTS_FIRST_FRAME] == pytest.approx(10.7)
+        assert tracker.current_turn.estimated == {TurnEvent.TTS_FIRST_FRAME}
+
+    def test_measured_first_frame_replaces_estimate(self) -> None:
+        """Test a first frame seen by the pipeline overrides the TTFB estimate."""
+        tracker = SessionLatencyTracker(room_name="room-a")
+        tracker.mark(TurnEvent.USER_STOPPED_SPEAKING, at=10.0)
+        tracker.mark(TurnEvent.LLM_FIRST_TOKEN, at=10.4)
+        tracker._on_pipeline_metrics(MagicMock(spec=["ttfb"], ttfb=0.3))
+        tracker.mark(TurnEvent.TTS_FIRST_FRAME, at=10.9)
+        tracker._on_pipeline_metrics(MagicMock(spec=["ttfb"], ttfb=0.1))
+
+        turn = tracker.current_turn
+        assert turn.marks[TurnEvent.TTS_FIRST_FRAME] == pytest.approx(10.9)
+        assert not turn.estimated
+
+
+class TestSessionScope:
+    """Tests for contextvar scoping."""
+
+    def test_scope_binds_and_resets(self) -> None:
+        """Test the tracker is only visible inside the scope."""
+        assert get_session_tracker() is None
+        with session_latency_scope("room-a") as tracker:
+            assert get_session_tracker() is tracker
+        assert get_session_tracker() is None
+
+    @pytest.mark.asyncio
+    async def test_concurrent_sessions_are_isolated(self) -> None:
+        """Test tasks in different sessions mark their own tracker."""
+
+        async def reply() -> None:
+            await asyncio.sleep(0)
+            mark_turn_event(TurnEvent.AGENT_STARTED_SPEAKING)
+
+        async def session(room: str) -> SessionLatencyTracker:
+            with session_latency_scope(room) as tracker:
+                mark_turn_event(TurnEvent.USER_STOPPED_SPEAKING)
+                # Child task inherits the session binding
+                await asyncio.create_task(reply())
+                return tracker
+
+        trackers = await asyncio.gather(session("room-a"), session("room-b"))
+        assert [t.completed_turns for t in trackers] == [1, 1]
+        assert [t.abandoned_turns for t in trackers] == [0, 0]